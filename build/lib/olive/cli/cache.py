@@ -0,0 +1,82 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+
+from olive.cli.base import BaseOliveCLICommand
+from olive.common.constants import DEFAULT_CACHE_DIR, DEFAULT_WORKFLOW_ID
+
+logger = logging.getLogger(__name__)
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+class CacheCommand(BaseOliveCLICommand):
+    @staticmethod
+    def register_subcommand(parser):
+        sub_parser = parser.add_parser("cache", help="Local cache operations")
+        cache_parsers = sub_parser.add_subparsers(dest="cache_command")
+
+        gc_parser = cache_parsers.add_parser(
+            "gc",
+            help=(
+                "Report the size of the cache and evict the least recently used runs to fit the budget. The runs of"
+                " the output models of workflows and the models they were derived from are never evicted."
+            ),
+        )
+        gc_parser.add_argument(
+            "--cache_dir",
+            type=str,
+            default=DEFAULT_CACHE_DIR,
+            help="The cache directory. Default is %(default)s.",
+        )
+        gc_parser.add_argument(
+            "--workflow_id",
+            type=str,
+            default=DEFAULT_WORKFLOW_ID,
+            help="The workflow id of the cache. Default is %(default)s.",
+        )
+        gc_parser.add_argument(
+            "--max_cache_size",
+            type=str,
+            help="Size budget of the cache in bytes or with a unit such as 100GB.",
+        )
+        gc_parser.add_argument(
+            "--max_cache_age_days",
+            type=float,
+            help="Evict the runs that have not been used for this many days.",
+        )
+        gc_parser.add_argument(
+            "--dry_run",
+            action="store_true",
+            help="Only report the runs that would be evicted.",
+        )
+        gc_parser.set_defaults(func=CacheCommand)
+
+    def run(self):
+        from olive.cache import CacheConfig
+        from olive.hardware.accelerator import AcceleratorSpec
+
+        max_cache_size = (
+            AcceleratorSpec.str_to_int_memory(self.args.max_cache_size) if self.args.max_cache_size else None
+        )
+        # the budget is not set on the cache config so that the collection below runs in the foreground
+        cache = CacheConfig(cache_dir=self.args.cache_dir).create_cache(self.args.workflow_id)
+        # also track the runs that were cached without the index
+        cache.sync_usage()
+
+        num_runs, size = cache.get_usage()
+        print(f"Cache {cache.get_cache_dir()} has {num_runs} runs using {_format_size(size)}.")
+
+        evicted, reclaimed = cache.collect_garbage(
+            max_cache_size, self.args.max_cache_age_days, dry_run=self.args.dry_run
+        )
+        action = "Would evict" if self.args.dry_run else "Evicted"
+        print(f"{action} {len(evicted)} runs, reclaiming {_format_size(reclaimed)}.")
@@ -0,0 +1,77 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+
+from olive.cli.base import BaseOliveCLICommand
+from olive.common.container_client_factory import AzureContainerClientFactory
+from olive.common.shared_cache_backend import create_shared_cache_backend
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCacheCommand(BaseOliveCLICommand):
+    @staticmethod
+    def register_subcommand(parser):
+        sub_parser = parser.add_parser("shared-cache", help="Shared cache model operations")
+        sub_parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete a model cache from the shared cache.",
+        )
+        sub_parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Delete all model cache from the cloud cache.",
+        )
+        sub_parser.add_argument(
+            "-y",
+            "--yes",
+            action="store_true",
+            help="Confirm the deletion without prompting for confirmation.",
+        )
+        sub_parser.add_argument(
+            "--account",
+            type=str,
+            help="The account name for the shared cache in Azure Blob Storage.",
+        )
+        sub_parser.add_argument(
+            "--container",
+            type=str,
+            help="The container name for the shared cache in Azure Blob Storage.",
+        )
+        sub_parser.add_argument(
+            "--shared_cache_dir",
+            type=str,
+            help=(
+                "The url of a shared cache that is not in Azure Blob Storage: s3://<bucket>/<prefix> for an S3"
+                " compatible bucket or file:///<path> for a directory. Used instead of --account and --container."
+            ),
+        )
+        sub_parser.add_argument(
+            "--model_hash",
+            type=str,
+            help="The model hash to remove from the shared cache.",
+        )
+        sub_parser.set_defaults(func=SharedCacheCommand)
+
+    def run(self):
+        if self.args.shared_cache_dir:
+            container_client_factory = create_shared_cache_backend(self.args.shared_cache_dir)
+        elif self.args.account and self.args.container:
+            container_client_factory = AzureContainerClientFactory(
+                self.args.account, self.args.container, exclude_managed_identity_credential=True
+            )
+        else:
+            raise ValueError("Either --shared_cache_dir or both --account and --container must be provided.")
+        if self.args.delete:
+            if self.args.all:
+                if self.args.yes:
+                    container_client_factory.delete_all()
+                else:
+                    confirm = input("Are you sure you want to delete all cache? (y/n): ")
+                    if confirm.lower() == "y":
+                        container_client_factory.delete_all()
+            else:
+                container_client_factory.delete_blob(self.args.model_hash)
@@ -0,0 +1,289 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+import os
+import re
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, List, NamedTuple, Optional, Union
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+AZURE_BLOB_URL_PATTERN = r"https://([^.]+)\.blob\.core\.windows\.net/([^/]+)"
+S3_URL_PREFIX = "s3://"
+FILE_URL_PREFIX = "file://"
+
+# maximum number of keys in a single S3 delete request
+S3_DELETE_BATCH_SIZE = 1000
+
+
+class BlobInfo(NamedTuple):
+    """A blob in the shared cache storage."""
+
+    name: str
+    size: int = None
+
+
+def _get_blob_name(blob: Union[str, Any]) -> str:
+    # blobs are either names or objects with a name attribute, such as the ones returned by get_blob_list
+    return blob if isinstance(blob, str) else blob.name
+
+
+def _get_tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+class SharedCacheBackend(ABC):
+    """Storage of the shared cache.
+
+    The shared cache is stored as blobs whose names are "/" separated paths such as "<model_id>/model.json". Listing
+    and deleting blobs works on name prefixes, the way blob containers and object stores do.
+    """
+
+    @abstractmethod
+    def upload_blob(self, blob_name: str, data: Union[bytes, BinaryIO], overwrite: bool = False):
+        """Upload the data to the blob. Raise an error if the blob exists and overwrite is False."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def download_blob(self, blob: Union[str, Any], file_path: Path):
+        """Download the blob, given by name or as returned by get_blob_list, to the file path."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_blob_list(self, blob_name: Optional[str] = None) -> Iterable[Any]:
+        """List the blobs whose names start with blob_name, or all blobs. Each blob has a name attribute."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_blob(self, blob_name: str):
+        """Delete the blobs whose names start with blob_name."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_all(self):
+        """Delete all the blobs."""
+        raise NotImplementedError
+
+    def exists(self, blob_name: Optional[str] = None) -> bool:
+        """Check if there is any blob whose name starts with blob_name."""
+        return any(True for _ in self.get_blob_list(blob_name))
+
+
+class FileSystemBackend(SharedCacheBackend):
+    """Shared cache stored in a directory, such as a network file system mounted on all the machines.
+
+    Blobs are files under the root directory. Files are written to a temporary file and renamed, so readers on other
+    machines never see a partially written blob.
+    """
+
+    def __init__(self, root_dir: Union[str, Path]):
+        self.root_dir = Path(root_dir).resolve()
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_path(self, blob_name: str) -> Path:
+        path = (self.root_dir / blob_name).resolve()
+        if path != self.root_dir and self.root_dir not in path.parents:
+            raise ValueError(f"Blob {blob_name} is outside of the shared cache directory {self.root_dir}.")
+        return path
+
+    def upload_blob(self, blob_name: str, data: Union[bytes, BinaryIO], overwrite: bool = False):
+        path = self._get_path(blob_name)
+        if path.exists() and not overwrite:
+            raise FileExistsError(f"Blob {blob_name} already exists in the shared cache.")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _get_tmp_path(path)
+        try:
+            with tmp_path.open("wb") as f:
+                if isinstance(data, bytes):
+                    f.write(data)
+                else:
+                    shutil.copyfileobj(data, f)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        logger.info("File %s uploaded to the shared cache successfully.", blob_name)
+
+    def download_blob(self, blob: Union[str, Any], file_path: Path):
+        blob_name = _get_blob_name(blob)
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _get_tmp_path(file_path)
+        try:
+            shutil.copyfile(self._get_path(blob_name), tmp_path)
+            tmp_path.replace(file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        logger.debug("File %s downloaded to %s successfully.", blob_name, file_path)
+
+    def get_blob_list(self, blob_name: Optional[str] = None) -> List[BlobInfo]:
+        if not blob_name:
+            roots = [self.root_dir]
+        else:
+            path = self._get_path(blob_name)
+            if path.is_file():
+                roots = [path]
+            else:
+                # match the names that start with the prefix, without walking the whole shared cache
+                parent = path if blob_name.endswith("/") else path.parent
+                prefix = "" if blob_name.endswith("/") else path.name
+                roots = (
+                    [child for child in parent.iterdir() if child.name.startswith(prefix)] if parent.is_dir() else []
+                )
+
+        blobs = []
+        for root in roots:
+            blobs.extend(
+                BlobInfo(file_path.relative_to(self.root_dir).as_posix(), file_path.stat().st_size)
+                for file_path in ([root] if root.is_file() else root.rglob("*"))
+                # skip directories and the temporary files of uploads in progress
+                if file_path.is_file() and not file_path.name.endswith(".tmp")
+            )
+        return sorted(blobs)
+
+    def delete_blob(self, blob_name: str):
+        for blob in self.get_blob_list(blob_name):
+            logger.info("Deleting %s", blob.name)
+            path = self._get_path(blob.name)
+            path.unlink(missing_ok=True)
+            self._remove_empty_parents(path)
+        logger.info("Files %s removed from the shared cache successfully.", blob_name)
+
+    def delete_all(self):
+        for child in self.root_dir.iterdir():
+            logger.info("Deleting %s", child.name)
+            if child.is_dir():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+        logger.info("All files removed from the shared cache successfully.")
+
+    def _remove_empty_parents(self, path: Path):
+        for parent in path.parents:
+            if parent == self.root_dir:
+                return
+            try:
+                # only succeeds if the directory is empty
+                parent.rmdir()
+            except OSError:
+                return
+
+
+class S3Backend(SharedCacheBackend):
+    """Shared cache stored in a bucket of Amazon S3 or any S3 compatible object store.
+
+    The client is created with boto3 and uses its configuration, so the endpoint of an on-premise object store can be
+    set with the AWS_ENDPOINT_URL environment variable.
+    """
+
+    def __init__(self, bucket_name: str, prefix: str = "", client=None, **client_kwargs):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as exc:
+                raise ImportError("Please install boto3 to use the S3 shared cache.") from exc
+
+            client = boto3.client("s3", **client_kwargs)
+
+        self.client = client
+        self.bucket_name = bucket_name
+        self.prefix = prefix.strip("/")
+
+    def _get_key(self, blob_name: str) -> str:
+        return f"{self.prefix}/{blob_name}" if self.prefix else blob_name
+
+    def upload_blob(self, blob_name: str, data: Union[bytes, BinaryIO], overwrite: bool = False):
+        if not overwrite and any(blob.name == blob_name for blob in self.get_blob_list(blob_name)):
+            raise FileExistsError(f"Blob {blob_name} already exists in the shared cache.")
+        if isinstance(data, bytes):
+            self.client.put_object(Bucket=self.bucket_name, Key=self._get_key(blob_name), Body=data)
+        else:
+            # managed transfer, large files are uploaded in parts
+            self.client.upload_fileobj(data, self.bucket_name, self._get_key(blob_name))
+        logger.info("File %s uploaded to the shared cache successfully.", blob_name)
+
+    def download_blob(self, blob: Union[str, Any], file_path: Path):
+        blob_name = _get_blob_name(blob)
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _get_tmp_path(file_path)
+        try:
+            self.client.download_file(self.bucket_name, self._get_key(blob_name), str(tmp_path))
+            tmp_path.replace(file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        logger.debug("File %s downloaded to %s successfully.", blob_name, file_path)
+
+    def _get_key_prefix(self, blob_name: Optional[str]) -> str:
+        return self._get_key(blob_name) if blob_name else (f"{self.prefix}/" if self.prefix else "")
+
+    def get_blob_list(self, blob_name: Optional[str] = None) -> List[BlobInfo]:
+        num_prefix_chars = len(self.prefix) + 1 if self.prefix else 0
+        blobs = []
+        kwargs = {"Bucket": self.bucket_name, "Prefix": self._get_key_prefix(blob_name)}
+        while True:
+            response = self.client.list_objects_v2(**kwargs)
+            blobs.extend(
+                BlobInfo(content["Key"][num_prefix_chars:], content.get("Size"))
+                for content in response.get("Contents", [])
+            )
+            if not response.get("IsTruncated"):
+                return blobs
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+    def exists(self, blob_name: Optional[str] = None) -> bool:
+        response = self.client.list_objects_v2(
+            Bucket=self.bucket_name, Prefix=self._get_key_prefix(blob_name), MaxKeys=1
+        )
+        return bool(response.get("Contents"))
+
+    def delete_blob(self, blob_name: str):
+        self._delete_blobs(self.get_blob_list(blob_name))
+        logger.info("Files %s removed from the shared cache successfully.", blob_name)
+
+    def delete_all(self):
+        self._delete_blobs(self.get_blob_list())
+        logger.info("All files removed from the shared cache successfully.")
+
+    def _delete_blobs(self, blobs: List[BlobInfo]):
+        for i in range(0, len(blobs), S3_DELETE_BATCH_SIZE):
+            batch = blobs[i : i + S3_DELETE_BATCH_SIZE]
+            for blob in batch:
+                logger.info("Deleting %s", blob.name)
+            self.client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": self._get_key(blob.name)} for blob in batch], "Quiet": True},
+            )
+
+
+def is_shared_cache_url(url: str) -> bool:
+    url = str(url)
+    return bool(re.match(AZURE_BLOB_URL_PATTERN, url)) or url.startswith((S3_URL_PREFIX, FILE_URL_PREFIX))
+
+
+def create_shared_cache_backend(url: str) -> SharedCacheBackend:
+    """Create the backend of the shared cache at the url.
+
+    Supported urls are:
+        - https://<account>.blob.core.windows.net/<container> for an Azure Blob Storage container.
+        - s3://<bucket>/<prefix> for an S3 compatible bucket.
+        - file:///<path> for a directory, such as a mounted network file system.
+    """
+    match = re.match(AZURE_BLOB_URL_PATTERN, url)
+    if match:
+        from olive.common.container_client_factory import AzureContainerClientFactory
+
+        return AzureContainerClientFactory(match.group(1), match.group(2))
+
+    parsed_url = urlparse(url)
+    if url.startswith(S3_URL_PREFIX):
+        return S3Backend(parsed_url.netloc, parsed_url.path)
+    if url.startswith(FILE_URL_PREFIX):
+        # file://host/path is not supported, the path is always local to the machine
+        return FileSystemBackend(unquote(parsed_url.netloc + parsed_url.path))
+    raise ValueError(f"Unsupported shared cache url {url}.")
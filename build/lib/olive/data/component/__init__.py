@@ -0,0 +1,12 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.data.component import dataloader, load_dataset, post_process_data, pre_process_data
+
+__all__ = [
+    "dataloader",
+    "load_dataset",
+    "post_process_data",
+    "pre_process_data",
+]
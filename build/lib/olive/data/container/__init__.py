@@ -0,0 +1,12 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.data.container import data_container, dummy_data_container, huggingface_container, raw_data_container
+
+__all__ = [
+    "data_container",
+    "dummy_data_container",
+    "huggingface_container",
+    "raw_data_container",
+]
@@ -0,0 +1,13 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.engine.config import EngineConfig
+from olive.engine.engine import Engine
+from olive.engine.footprint import Footprint
+
+__all__ = [
+    "Engine",
+    "EngineConfig",
+    "Footprint",
+]
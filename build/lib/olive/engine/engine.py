@@ -0,0 +1,1408 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import json
+import logging
+import shutil
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from olive.cache import CacheConfig, OliveCache
+from olive.common.config_utils import ConfigBase, validate_config
+from olive.common.constants import DEFAULT_WORKFLOW_ID, LOCAL_INPUT_MODEL_ID
+from olive.common.profiling import collect_stages, profile_stage
+from olive.engine.config import FAILED_CONFIG, INVALID_CONFIG, PRUNED_CONFIGS
+from olive.engine.footprint import Footprint, FootprintNode, FootprintNodeMetric, get_best_candidate_node
+from olive.engine.packaging.packaging_generator import generate_output_artifacts
+from olive.engine.scheduler import ResourceRequest, get_model_size
+from olive.engine.worker_pool import EngineWorkerPool
+from olive.evaluator.metric import Metric
+from olive.evaluator.metric_result import MetricResult, joint_metric_key
+from olive.evaluator.olive_evaluator import OliveEvaluatorConfig
+from olive.exception import EXCEPTIONS_TO_RAISE, OlivePassError
+from olive.hardware import AcceleratorSpec
+from olive.logging import enable_filelog
+from olive.model import ModelConfig
+from olive.package_config import OlivePackageConfig
+from olive.strategy.search_strategy import SearchStrategy, SearchStrategyConfig
+from olive.systems.common import SystemType
+from olive.systems.system_config import SystemConfig
+from olive.systems.utils import create_managed_system_with_cache
+
+if TYPE_CHECKING:
+    from olive.engine.packaging.packaging_config import PackagingConfig
+    from olive.passes.olive_pass import Pass
+    from olive.systems.olive_system import OliveSystem
+
+logger = logging.getLogger(__name__)
+
+
+class Engine:
+    """The engine executes the registered Olive Steps.
+
+    It facilitate evaluation of the output models using provided evaluation criteria and produces output model(s).
+    """
+
+    def __init__(
+        self,
+        olive_config: OlivePackageConfig = None,
+        workflow_id: str = DEFAULT_WORKFLOW_ID,
+        search_strategy: Optional[Union[Dict[str, Any], SearchStrategyConfig]] = None,
+        host: Optional[Union[Dict[str, Any], "SystemConfig"]] = None,
+        target: Optional[Union[Dict[str, Any], "SystemConfig"]] = None,
+        evaluator: Optional[Union[Dict[str, Any], "OliveEvaluatorConfig"]] = None,
+        cache_config: Optional[Union[Dict[str, Any], CacheConfig]] = None,
+        plot_pareto_frontier: bool = False,
+        no_artifacts: bool = False,
+        max_workers: int = 1,
+        pipeline_evaluation: bool = False,
+        *,
+        azureml_client_config=None,
+    ):
+        self.olive_config = olive_config or OlivePackageConfig.load_default_config()
+        self.workflow_id = workflow_id
+        self.search_strategy = SearchStrategy(search_strategy) if search_strategy else None
+
+        # default host
+        host = host or {"type": SystemType.Local}
+        self.host_config = validate_config(host, SystemConfig)
+        self.host = None
+
+        # engine target
+        target = target or {"type": SystemType.Local}
+        self.target_config = validate_config(target, SystemConfig)
+        self.target = None
+
+        # default evaluator
+        self.evaluator_config = validate_config(evaluator, OliveEvaluatorConfig) if evaluator else None
+
+        self.cache_config = validate_config(cache_config, CacheConfig) if cache_config else CacheConfig()
+        self.cache: OliveCache = self.cache_config.create_cache(workflow_id)
+
+        self.plot_pareto_frontier = plot_pareto_frontier
+        self.skip_saving_artifacts = no_artifacts
+        # number of local worker processes used to run independent pass flows concurrently
+        self.max_workers = max_workers
+        # evaluate the output model of a search step while the passes of the next step run
+        self.pipeline_evaluation = pipeline_evaluation
+        self.azureml_client_config = azureml_client_config
+
+        # dictionary of passes
+        self.pass_config = OrderedDict()
+
+        # {"pass_name": {"pass": pass, "host": host, "evaluator": evaluator}
+        self.passes = OrderedDict()
+        self.pass_flows = None
+        self.pass_flows_search_spaces = None
+
+        self.footprints = defaultdict(Footprint)
+
+        self._initialized = False
+
+    def __getstate__(self):
+        """Get the state of the engine to replicate it in worker processes.
+
+        Configs with dynamically created config classes cannot be pickled so they are serialized to json. Passes and
+        footprints are not carried over. The passes are set up again for the accelerator spec in the worker.
+        """
+        state = self.__dict__.copy()
+        state["search_strategy"] = (
+            self.search_strategy.config.to_json(check_object=True) if self.search_strategy else None
+        )
+        state["evaluator_config"] = _config_to_json(self.evaluator_config)
+        state["pass_config"] = OrderedDict(
+            (name, {**config, "type": config["type"].__name__, "evaluator": _config_to_json(config["evaluator"])})
+            for name, config in self.pass_config.items()
+        )
+        state["passes"] = OrderedDict()
+        state["footprints"] = defaultdict(Footprint)
+        return state
+
+    def __setstate__(self, state):
+        state["search_strategy"] = SearchStrategy(state["search_strategy"]) if state["search_strategy"] else None
+        state["evaluator_config"] = _config_from_json(state["evaluator_config"], OliveEvaluatorConfig)
+        for config in state["pass_config"].values():
+            # import through the package config so that the class variables of the pass are set
+            config["type"] = state["olive_config"].import_pass_module(config["type"])
+            config["evaluator"] = _config_from_json(config["evaluator"], OliveEvaluatorConfig)
+        self.__dict__.update(state)
+
+    def initialize(self, log_to_file: bool = False, log_severity_level: int = 1):
+        """Initialize engine state. This should be done before running the registered passes."""
+        if log_to_file:
+            enable_filelog(log_severity_level, self.cache.cache_dir, self.workflow_id)
+
+        # set cache dir environment variables
+        # might be used by other parts of olive to cache data
+        self.cache.set_cache_env()
+
+        # prepare non-local resources if host/target is not AzureML
+        # TODO(anyone): Should the shared cache care about this? If so, the shared cache helper can
+        # check for cached non-local resource paths and replace them with the original config
+        # during hash calculation.
+        if self.target_config.type != SystemType.AzureML:
+            if self.evaluator_config:
+                self.evaluator_config = self.cache.prepare_resources_for_local(self.evaluator_config)
+            for pass_config in self.pass_config.values():
+                if pass_config["evaluator"]:
+                    pass_config["evaluator"] = self.cache.prepare_resources_for_local(pass_config["evaluator"])
+
+        for pass_config in self.pass_config.values():
+            host_type = pass_config["host"].system_type if pass_config["host"] else self.host_config.type
+            if host_type == SystemType.AzureML:
+                continue
+            pass_config["config"] = self.cache.prepare_resources_for_local(pass_config["config"])
+
+        self.set_pass_flows(self.pass_flows)
+        self._initialized = True
+
+    def register(
+        self,
+        pass_type: Union[Type["Pass"], str],
+        config: Dict[str, Any] = None,
+        name: str = None,
+        host: "OliveSystem" = None,
+        evaluator_config: "OliveEvaluatorConfig" = None,
+    ):
+        """Register a pass configuration so that it could be instantiated and executed later."""
+        if name is not None:
+            assert name not in self.passes, f"Pass with name {name} already registered"
+        else:
+            idx = 0
+            while True:
+                name = pass_type.__name__
+                if idx > 0:
+                    name = f"{name}_{idx}"
+                idx += 1
+                if name not in self.pass_config:
+                    break
+
+        pass_type_name = pass_type if isinstance(pass_type, str) else pass_type.__name__
+        logger.debug("Registering pass %s", pass_type_name)
+        pass_type = self.olive_config.import_pass_module(pass_type_name)
+
+        self.pass_config[name] = {
+            "type": pass_type,
+            "config": config or {},
+            "host": host,
+            "evaluator": evaluator_config,
+        }
+
+    def register_pass(
+        self, p: "Pass", name: str = None, host: "OliveSystem" = None, evaluator_config: "OliveEvaluatorConfig" = None
+    ):
+        """Register a pass instance."""
+        if name is not None:
+            assert name not in self.passes, f"Pass with name {name} already registered"
+        else:
+            idx = 0
+            while True:
+                name = p.__class__.__name__
+                if idx > 0:
+                    name = f"{name}_{idx}"
+                idx += 1
+                if name not in self.passes:
+                    break
+
+        if not self.search_strategy and len(p.search_space) > 0:
+            raise ValueError(f"Search strategy is None but pass {name} has search space")
+
+        self.passes[name] = {"pass": p, "host": host, "evaluator": evaluator_config}
+
+    def set_pass_flows(self, pass_flows: List[List[str]] = None):
+        """Construct pass flows from a list of pass names.
+
+        Args:
+            pass_flows: a list of pass names, each pass name is a string.
+
+        """
+        if not pass_flows:
+            self.pass_flows = [list(self.pass_config.keys())] if self.pass_config else []
+        else:
+            self.pass_flows = pass_flows
+
+    def run(
+        self,
+        input_model_config: ModelConfig,
+        accelerator_specs: List["AcceleratorSpec"],
+        packaging_config: Optional[Union["PackagingConfig", List["PackagingConfig"]]] = None,
+        output_dir: str = None,
+        evaluate_input_model: bool = True,
+        log_to_file: bool = False,
+        log_severity_level: int = 1,
+    ):
+        """Run all the registered Olive passes on the input model and produce one or more candidate models.
+
+        Args:
+            input_model_config: input Olive model configuration
+            accelerator_specs: list of accelerator specs
+            packaging_config: packaging configuration, if packaging_config is provided, the output
+                model will be packaged into a zip file.
+            output_dir: output directory for the output model
+            evaluate_input_model: if evaluate_input_model is True, run the evaluation on the input model.
+            log_to_file: if save logs to a file.
+            log_severity_level: severity level of the logger.
+
+        Return:
+            Search mode:
+                1. One accelerator spec:
+                    output_dir/footprints.json: footprint of the run
+                    output_dir/trace.json: chrome trace of the time and resources spent in each stage
+                    output_dir/pareto_frontier_footprints.json: pareto frontier footprints
+                    output_dir/run_history.txt: run history
+                    output_dir/input_model_metrics.json: evaluation results of the input model
+                    output_dir/...: output model files
+
+                2. Multiple accelerator specs:
+                    output_dir/{acclerator_spec}/...: Same as 1 but for each accelerator spec
+                    output_dir/...: output model files
+
+            No search mode:
+                1. One accelerator spec
+                    output_dir/footprints.json: footprint of the run
+                    output_dir/trace.json: chrome trace of the time and resources spent in each stage
+                    output_dir/run_history.txt: run history
+                    output_dir/input_model_metrics.json: evaluation results of the input model
+                    output_dir/output_footprints.json: footprint of the output models
+                    output_dir/...: output model files
+
+                    A. One pass flow:
+                        output_dir/metrics.json: evaluation results of the output model
+                        output_dir/...: output model files
+
+                2. Multiple accelerator specs
+                    output_dir/{acclerator_spec}/...: Same as 1 but for each accelerator spec
+                    output_dir/...: output model files
+
+        """
+        if not accelerator_specs:
+            raise ValueError("No accelerator specified")
+
+        if not self._initialized:
+            self.initialize(log_to_file, log_severity_level)
+
+        output_dir: Path = (Path(output_dir) if output_dir else Path.cwd()).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        outputs = {}
+        output_subdirs = {}
+        accelerator_output_dir_list = []
+        for accelerator_spec in accelerator_specs:
+            output_subdirs[accelerator_spec] = accelerator_output_dir = (
+                output_dir / str(accelerator_spec) if len(accelerator_specs) > 1 else output_dir
+            )
+            accelerator_output_dir.mkdir(parents=True, exist_ok=True)
+            accelerator_output_dir_list.append(accelerator_output_dir)
+
+        # optimize the accelerator specs concurrently, one worker per accelerator spec
+        with EngineWorkerPool.create(
+            self, None, min(self.max_workers, len(accelerator_specs))
+        ) or nullcontext() as worker_pool:
+            if worker_pool:
+                self._run_accelerator_agnostic_passes(input_model_config, accelerator_specs)
+                futures = OrderedDict()
+                for accelerator_spec in accelerator_specs:
+                    logger.info("Running Olive on accelerator: %s", accelerator_spec)
+                    futures[accelerator_spec] = worker_pool.submit(
+                        "_run_accelerator_with_system",
+                        input_model_config,
+                        output_subdirs[accelerator_spec],
+                        evaluate_input_model,
+                        accelerator_spec,
+                        resource_request=self._estimate_resources(self.passes, input_model_config),
+                    )
+                run_results = {
+                    accelerator_spec: worker_pool.get_result(future) for accelerator_spec, future in futures.items()
+                }
+            else:
+                run_results = {}
+                for accelerator_spec in accelerator_specs:
+                    logger.info("Running Olive on accelerator: %s", accelerator_spec)
+                    run_results[accelerator_spec] = self._run_accelerator_with_system(
+                        input_model_config,
+                        output_subdirs[accelerator_spec],
+                        evaluate_input_model,
+                        accelerator_spec,
+                    )
+
+        for accelerator_spec, run_result in run_results.items():
+            if run_result is None:
+                continue
+
+            outputs[accelerator_spec] = run_result
+
+        for accelerator_spec in self.footprints:
+            logger.info("Run history for %s:", accelerator_spec)
+            run_history = self.footprints[accelerator_spec].summarize_run_history()
+            self.dump_run_history(run_history, output_subdirs[accelerator_spec] / "run_history.txt")
+
+        if packaging_config and self.passes:
+            # TODO(trajep): should we support packaging pytorch model?
+            logger.info("Package top ranked %d models as artifacts", sum(len(f.nodes) for f in outputs.values()))
+            generate_output_artifacts(
+                packaging_config,
+                self.footprints,
+                outputs,
+                output_dir,
+                self.azureml_client_config,
+            )
+        else:
+            logger.debug("No packaging config provided, skip packaging artifacts")
+
+        # TODO(team): refactor output structure
+        # Do not change condition order. For no search, values of outputs are MetricResult
+        # Consolidate the output structure for search and no search mode
+        if outputs and self.passes and not next(iter(outputs.values())).check_empty_nodes():
+            best_node: FootprintNode = get_best_candidate_node(outputs, self.footprints)
+            self.cache.save_model(model_id=best_node.model_id, output_dir=output_dir, overwrite=True)
+            if len(accelerator_output_dir_list) > 1 and self.skip_saving_artifacts:
+                [shutil.rmtree(folder) for folder in accelerator_output_dir_list if folder.exists()]
+            logger.info("Saved output model to %s", output_dir)
+
+        return outputs
+
+    def _run_accelerator_with_system(
+        self,
+        input_model_config: ModelConfig,
+        output_dir: Path,
+        evaluate_input_model: bool,
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        with self._create_system(accelerator_spec):
+            return self.run_accelerator(input_model_config, output_dir, evaluate_input_model, accelerator_spec)
+
+    def _run_accelerator_agnostic_passes(
+        self, input_model_config: ModelConfig, accelerator_specs: List["AcceleratorSpec"]
+    ):
+        """Run the leading passes of the pass flows that create the same models for all the accelerator specs.
+
+        These passes are accelerator agnostic and have no search space. They are run once before the accelerator specs
+        are optimized concurrently, so that the workers load their output models from the cache instead of all
+        running them at the same time.
+        """
+        input_model_id = input_model_config.get_model_id(self.cache.get_file_hash_memo_path())
+
+        # leading accelerator agnostic passes of each pass flow, as (pass_id, output_model_id) for each spec
+        flow_prefixes = defaultdict(list)
+        for accelerator_spec in accelerator_specs:
+            self.setup_passes(accelerator_spec)
+            for flow_idx, pass_flow in enumerate(self.pass_flows):
+                prefix = []
+                model_id = input_model_id
+                for pass_id in pass_flow:
+                    p: Pass = self.passes[pass_id]["pass"]
+                    if p.search_space or not p.is_accelerator_agnostic(accelerator_spec):
+                        break
+                    model_id = self._get_pass_output_model_id(pass_id, {}, model_id, accelerator_spec)
+                    prefix.append((pass_id, model_id))
+                flow_prefixes[flow_idx].append(prefix)
+
+        # only the passes that create the same models for all the accelerator specs are shared
+        shared_prefixes = []
+        for prefixes in flow_prefixes.values():
+            shared_prefix = []
+            for links in zip(*prefixes):
+                if len(set(links)) > 1:
+                    break
+                shared_prefix.append(links[0][0])
+            if shared_prefix and shared_prefix not in shared_prefixes:
+                shared_prefixes.append(shared_prefix)
+        if not shared_prefixes:
+            return
+
+        accelerator_spec = accelerator_specs[0]
+        self.setup_passes(accelerator_spec)
+        try:
+            with self._create_system(accelerator_spec):
+                for shared_prefix in shared_prefixes:
+                    logger.info("Running accelerator agnostic passes %s for all accelerators ...", shared_prefix)
+                    model_config, model_id = input_model_config, input_model_id
+                    for pass_id in shared_prefix:
+                        model_config, model_id = self._run_pass(pass_id, {}, model_config, model_id, accelerator_spec)
+                        if model_config in PRUNED_CONFIGS:
+                            break
+        except EXCEPTIONS_TO_RAISE:
+            raise
+        except Exception:
+            # the workers run the passes again and handle the failure for each accelerator spec
+            logger.warning("Failed to run accelerator agnostic passes.", exc_info=True)
+
+    def run_accelerator(
+        self,
+        input_model_config: ModelConfig,
+        output_dir: Path,
+        evaluate_input_model: bool,
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        # generate search space and initialize the passes for each hardware accelerator
+        self.setup_passes(accelerator_spec)
+        # hash the input model
+        with collect_stages() as stages, profile_stage("model_hashing"):
+            input_model_id = input_model_config.get_model_id(self.cache.get_file_hash_memo_path())
+        if input_model_id == LOCAL_INPUT_MODEL_ID and self.cache.enable_shared_cache:
+            logger.warning("Input model has callable attributes, shared cache is disabled.")
+            self.cache.disable_shared_cache()
+
+        self.footprints[accelerator_spec].record(model_id=input_model_id)
+        self.footprints[accelerator_spec].record_stages(input_model_id, stages)
+
+        # create the output directory
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            if evaluate_input_model and not self.evaluator_config:
+                logger.debug("evaluate_input_model is True but no evaluator provided. Skipping input model evaluation.")
+            elif evaluate_input_model:
+                results = self._evaluate_model(
+                    input_model_config, input_model_id, self.evaluator_config, accelerator_spec
+                )
+                logger.info("Input model evaluation results: %s", results)
+                if not self.skip_saving_artifacts:
+                    results_path = output_dir / "input_model_metrics.json"
+                    with results_path.open("w") as f:
+                        json.dump(results.to_json(), f, indent=4)
+                    logger.info("Saved evaluation results of input model to %s", results_path)
+                if not self.passes:
+                    logger.debug("No passes registered, return input model evaluation results.")
+                    return results
+
+            if self.search_strategy:
+                logger.debug("Running Olive in search mode ...")
+                output_footprint = self.run_search(
+                    input_model_config,
+                    input_model_id,
+                    accelerator_spec,
+                    output_dir,
+                )
+            else:
+                logger.debug("Running Olive in no-search mode ...")
+                output_footprint = self.run_no_search(input_model_config, input_model_id, accelerator_spec, output_dir)
+        except EXCEPTIONS_TO_RAISE:
+            raise
+        except Exception:
+            logger.warning("Failed to run Olive on %s.", accelerator_spec, exc_info=True)
+            return None
+
+        if output_footprint:
+            # the output models and the models they were derived from are never evicted from the cache
+            self.cache.pin_model_lineage(output_footprint.nodes.keys())
+
+        if not self.skip_saving_artifacts:
+            output_fp_path = output_dir / "footprints.json"
+            logger.info("Save footprint to %s.", output_fp_path)
+            self.footprints[accelerator_spec].to_file(output_fp_path)
+            trace_path = output_dir / "trace.json"
+            logger.info("Save trace of the run to %s.", trace_path)
+            self.footprints[accelerator_spec].to_trace_file(trace_path)
+        logger.debug("run_accelerator done")
+        return output_footprint
+
+    def get_host_device(self):
+        if self.host_config.config.accelerators:
+            # for host device, we will always use the first accelerator device
+            return self.host_config.config.accelerators[0].device
+        else:
+            return None
+
+    def setup_passes(self, accelerator_spec: "AcceleratorSpec"):
+        host_device = self.get_host_device()
+        # clean the passes
+        self.passes.clear()
+        for name, config in self.pass_config.items():
+            pass_cls: Type[Pass] = config["type"]
+            pass_cfg = config["config"]
+            pass_cfg = pass_cls.generate_search_space(accelerator_spec, pass_cfg, self.search_strategy is None)
+            p = pass_cls(accelerator_spec, pass_cfg, host_device)
+            self.register_pass(p, name=name, host=config["host"], evaluator_config=config["evaluator"])
+
+        # list of passes starting from the first pass with non-empty search space
+        # These passes will be added to the search space
+        self.pass_flows_search_spaces = []
+        for pass_flow in self.pass_flows:
+            pass_search_spaces = []
+            for pass_name in pass_flow:
+                p: Pass = self.passes[pass_name]["pass"]
+                pass_search_spaces.append((pass_name, p.search_space))
+            self.pass_flows_search_spaces.append(pass_search_spaces)
+
+    def reset_passes(self):
+        """Cleanup the passes."""
+        self.passes.clear()
+        self.pass_config.clear()
+        self.pass_flows = []
+
+    def run_no_search(
+        self,
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        output_dir: Path,
+    ):
+        """Run all the registered Olive pass flows in no-search mode."""
+        for pass_item in self.passes.values():
+            if len(pass_item["pass"].search_space) > 0:
+                pass_name = pass_item["name"]
+                raise ValueError(f"Pass {pass_name} has search space but search strategy is None")
+
+        output_model_dir = Path(output_dir)
+
+        # run all the pass flows, the shared prefixes of the flows are run only once
+        logger.debug("Running %s with no search ...", self.pass_flows)
+        with EngineWorkerPool.create(self, accelerator_spec, self.max_workers) or nullcontext() as worker_pool:
+            flow_results = self._run_pass_flow_tree(
+                self.pass_flows, input_model_config, input_model_id, accelerator_spec, worker_pool=worker_pool
+            )
+
+        output_model_ids = []
+        for pass_flow, (should_prune, signal, model_ids) in zip(self.pass_flows, flow_results):
+            if should_prune:
+                failed_pass = pass_flow[len(model_ids)]
+                logger.warning(
+                    "Flow %s is pruned due to failed or invalid config for pass '%s'", pass_flow, failed_pass
+                )
+                continue
+
+            # use output_model_dir if there is only one pass flow
+            # else output_model_dir/pass_flow
+            flow_output_dir = output_model_dir / "-".join(pass_flow) if len(self.pass_flows) > 1 else output_model_dir
+            flow_output_dir.mkdir(parents=True, exist_ok=True)
+
+            if signal is not None and not self.skip_saving_artifacts:
+                results_path = flow_output_dir / "metrics.json"
+                with open(results_path, "w") as f:
+                    json.dump(signal.to_json(), f, indent=4)
+                logger.info("Saved evaluation results of output model to %s", results_path)
+
+            output_model_ids.append(model_ids[-1])
+
+        output_footprints = self.footprints[accelerator_spec].create_footprints_by_model_ids(output_model_ids)
+        if not self.skip_saving_artifacts:
+            output_footprints.to_file(output_dir / "output_footprints.json")
+        return output_footprints
+
+    def run_search(
+        self,
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        output_dir: Path,
+    ):
+        """Run all the registered Olive passes in search model where search strategy is not None."""
+        # get objective_dict
+        evaluator_config = self.evaluator_for_pass(list(self.passes.keys())[-1])
+
+        if evaluator_config is None:
+            raise ValueError("No evaluator provided for the last pass")
+        else:
+            objective_dict = self.resolve_objectives(
+                input_model_config, input_model_id, evaluator_config.metrics, accelerator_spec
+            )
+            self.footprints[accelerator_spec].record_objective_dict(objective_dict)
+
+        # initialize the search strategy
+        self.search_strategy.initialize(self.pass_flows_search_spaces, input_model_id, objective_dict)
+        output_model_num = self.search_strategy.get_output_model_num()
+
+        if self.pipeline_evaluation and self.max_workers <= 1:
+            self._run_search_pipelined(input_model_config, input_model_id, accelerator_spec)
+            return self.create_pareto_frontier_footprints(accelerator_spec, output_model_num, output_dir)
+
+        # record start time
+        start_time = time.time()
+        iter_num = 0
+        with EngineWorkerPool.create(self, accelerator_spec, self.max_workers) or nullcontext() as worker_pool:
+            while True:
+                # get the next steps, one per worker so that they can run concurrently
+                next_steps = self.search_strategy.next_steps(worker_pool.max_workers if worker_pool else 1)
+
+                # if no more steps, break
+                if not next_steps:
+                    break
+
+                # get the model id of the first input model
+                # all steps belong to the same search space group and so have the same input model
+                model_id = next_steps[0]["model_id"]
+                if model_id == input_model_id:
+                    model_config = input_model_config
+                else:
+                    model_config = self._load_model(model_id)
+
+                for idx, next_step in enumerate(next_steps):
+                    logger.debug("Step %d with search point %s ...", iter_num + idx + 1, next_step["search_point"])
+
+                # run all the passes in the steps
+                results = self._run_search_steps(next_steps, model_config, accelerator_spec, worker_pool)
+
+                for next_step, (should_prune, signal, model_ids) in zip(next_steps, results):
+                    iter_num += 1
+
+                    # record feedback signal
+                    self.search_strategy.record_feedback_signal(
+                        next_step["search_point"], signal, model_ids, should_prune
+                    )
+
+                    # results of the remaining steps are still recorded once the exit criteria are met
+                    if not self.search_strategy.exit_criteria_met:
+                        time_diff = time.time() - start_time
+                        self.search_strategy.check_exit_criteria(iter_num, time_diff, signal)
+
+        return self.create_pareto_frontier_footprints(accelerator_spec, output_model_num, output_dir)
+
+    def _run_search_pipelined(
+        self, input_model_config: ModelConfig, input_model_id: str, accelerator_spec: "AcceleratorSpec"
+    ):
+        """Run the search steps one at a time, evaluating the output model of a step while the next step runs.
+
+        The feedback signal of a step is recorded once the passes of the next step are done, so the search strategy
+        suggests the next step without it. The strategy only moves on to the next search space group once the
+        feedback of every step in the active group is recorded.
+        """
+        start_time = time.time()
+        iter_num = 0
+        # (step, should_prune, model_ids, future of the signal) of the step whose output model is being evaluated
+        pending = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                next_steps = self.search_strategy.next_steps(1, next_group=pending is None)
+                if not next_steps and pending is None:
+                    break
+
+                if next_steps:
+                    next_step = next_steps[0]
+                    logger.debug("Step %d with search point %s ...", iter_num + 1, next_step["search_point"])
+                    model_id = next_step["model_id"]
+                    model_config = input_model_config if model_id == input_model_id else self._load_model(model_id)
+                    should_prune, model_config, model_id, model_ids = self._run_pass_chain(
+                        next_step["passes"], model_config, model_id, accelerator_spec
+                    )
+
+                # wait for the evaluation of the previous step
+                if pending:
+                    step, step_should_prune, step_model_ids, future = pending
+                    signal = future.result() if future else None
+                    iter_num += 1
+                    self.search_strategy.record_feedback_signal(
+                        step["search_point"], signal, step_model_ids, step_should_prune
+                    )
+                    if not self.search_strategy.exit_criteria_met:
+                        self.search_strategy.check_exit_criteria(iter_num, time.time() - start_time, signal)
+                    pending = None
+
+                if next_steps:
+                    if should_prune:
+                        logger.warning("Skipping evaluation as model was pruned")
+                        future = None
+                    else:
+                        future = executor.submit(
+                            self._evaluate_output_model,
+                            next_step["passes"][-1][0],
+                            model_config,
+                            model_id,
+                            accelerator_spec,
+                        )
+                    pending = (next_step, should_prune, model_ids, future)
+
+    def _run_search_steps(
+        self,
+        steps: List[Dict[str, Any]],
+        model_config: ModelConfig,
+        accelerator_spec: "AcceleratorSpec",
+        worker_pool: Optional[EngineWorkerPool] = None,
+    ) -> List[Tuple[bool, Optional[MetricResult], List[str]]]:
+        """Run the passes of the search steps and return the results in the same order as the steps.
+
+        If a worker pool is provided, the steps are run concurrently in the worker processes. Steps whose first pass
+        produces the same output model share a prefix of the pass flow so they are run one after the other in the
+        same worker. This way the shared passes are run only once and then loaded from the cache.
+        """
+        if worker_pool is None:
+            return [
+                self._run_passes(step["passes"], model_config, step["model_id"], accelerator_spec) for step in steps
+            ]
+
+        step_groups = defaultdict(list)
+        for idx, step in enumerate(steps):
+            pass_id, pass_search_point = step["passes"][0]
+            first_model_id = self._get_pass_output_model_id(
+                pass_id, pass_search_point, step["model_id"], accelerator_spec
+            )
+            step_groups[first_model_id].append(idx)
+
+        futures = {
+            tuple(step_idxs): worker_pool.submit(
+                "_run_search_steps",
+                [steps[idx] for idx in step_idxs],
+                model_config,
+                accelerator_spec,
+                resource_request=self._estimate_resources(
+                    {pass_id for idx in step_idxs for pass_id, _ in steps[idx]["passes"]}, model_config
+                ),
+            )
+            for step_idxs in step_groups.values()
+        }
+        results = [None] * len(steps)
+        for step_idxs, future in futures.items():
+            for idx, result in zip(step_idxs, worker_pool.get_result(future)):
+                results[idx] = result
+        return results
+
+    def _estimate_resources(self, pass_ids: Iterable[str], model_config: ModelConfig) -> ResourceRequest:
+        """Estimate the peak resources of running the passes one after the other on the model.
+
+        The size of the input model stands in for the sizes of the intermediate models.
+        """
+        model_size = get_model_size(model_config)
+        resource_request = ResourceRequest()
+        for pass_id in pass_ids:
+            p: Pass = self.passes[pass_id]["pass"]
+            resource_request = resource_request.union(
+                ResourceRequest(
+                    memory=int(model_size * p.peak_memory_factor),
+                    device_memory=int(model_size * p.peak_device_memory_factor),
+                    num_threads=p.num_threads,
+                )
+            )
+        return resource_request
+
+    def _get_pass_output_model_id(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ) -> str:
+        """Get the id of the model that the pass produces at the search point."""
+        p: Pass = self.passes[pass_id]["pass"]
+        pass_config = p.serialize_config(p.config_at_search_point(pass_search_point))
+        run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
+        return self.cache.get_output_model_id(p.__class__.__name__, pass_config, input_model_id, run_accel)
+
+    def create_pareto_frontier_footprints(
+        self, accelerator_spec: "AcceleratorSpec", output_model_num: int, output_dir: Path
+    ):
+        pf_footprints = self.footprints[accelerator_spec].create_pareto_frontier(output_model_num)
+        if not pf_footprints:
+            return None
+        if not self.skip_saving_artifacts:
+            pf_footprints.to_file(output_dir / "pareto_frontier_footprints.json")
+
+        if self.plot_pareto_frontier:
+            pf_footprints.plot_pareto_frontier_to_html(save_path=output_dir / "pareto_frontier_footprints_chart.html")
+
+        return pf_footprints
+
+    def dump_run_history(self, run_history, output_path: Path):
+        if not run_history:
+            logger.info("No run history to dump!")
+            return
+        headers = run_history[0]._fields
+        try:
+            from tabulate import tabulate
+
+            formatted_rls = tabulate([tuple(rh) for rh in run_history], headers=headers, tablefmt="grid")
+            logger.info("run history:\n%s", formatted_rls)
+        except ImportError:
+            logger.info("Please install tabulate for better run history output")
+            formatted_rls = run_history
+        if not self.skip_saving_artifacts:
+            with Path(output_path).open("w") as f:
+                f.write(f"{formatted_rls}")
+
+    def resolve_objectives(
+        self,
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        metrics: List[Metric],
+        accelerator_spec: "AcceleratorSpec",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return a dictionary of objectives and their higher_is_better and goal values.
+
+        {objective_name: {"higher_is_better": bool, "goal": float}}
+        """
+        goals = self.resolve_goals(input_model_config, input_model_id, metrics, accelerator_spec)
+        objective_dict = {}
+        for metric in metrics:
+            for sub_type in metric.sub_types:
+                if sub_type.priority <= 0:
+                    continue
+                metric_key = joint_metric_key(metric.name, sub_type.name)
+                objective_dict[metric_key] = {
+                    "higher_is_better": sub_type.higher_is_better,
+                    "goal": goals.get(metric_key),
+                    "priority": sub_type.priority,
+                }
+        return dict(sorted(objective_dict.items(), key=lambda x: x[1]["priority"]))
+
+    def resolve_goals(
+        self,
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        metrics: List[Metric],
+        accelerator_spec: "AcceleratorSpec",
+    ) -> Dict[str, float]:
+        """Resolve the goals of the given metrics into thresholds for the given model."""
+        goals = {}
+        multipliers = {}
+        for metric in metrics:
+            # only resolve sub metrics whose priority > 0
+            goals[metric.name] = metric.get_sub_type_info("goal")
+            multipliers[metric.name] = metric.get_sub_type_info(
+                info_name="higher_is_better",
+                callback=lambda x: 1 if x else -1,
+            )
+
+        if goals:
+            logger.debug("Resolving goals: %s", goals)
+
+        baseline = None
+        for goal in goals.values():
+            _evaluated = False
+            for sub_goal in goal.values():
+                if not sub_goal:
+                    break
+                if sub_goal.type != "threshold":
+                    assert self.evaluator_config is not None, "Default evaluator must be provided to resolve goals"
+                    logger.debug("Computing baseline for metrics ...")
+                    baseline = self._evaluate_model(
+                        input_model_config, input_model_id, self.evaluator_config, accelerator_spec
+                    )
+                    _evaluated = True
+                    break
+            if _evaluated:
+                break
+        if not baseline:
+            logger.debug("No baseline got as no goal is provided the the goal is threshold")
+            return {}
+
+        if baseline:
+            logger.debug("Baseline: %s", baseline)
+
+        # resolve goals to thresholds
+        resolved_goals = {}
+        for metric_name, sub_type_goals in goals.items():
+            for sub_type_name, goal in sub_type_goals.items():
+                # TODO(trajep): make the logic cleaner
+                resolved_goal_value = None
+                if goal is not None:
+                    baseline_sub_type = baseline.get_value(metric_name, sub_type_name)
+                    multiplier = multipliers[metric_name][sub_type_name]
+                    if goal.type == "threshold":
+                        resolved_goal_value = goal.value
+                    elif goal.type == "max-degradation":
+                        resolved_goal_value = baseline_sub_type - multiplier * goal.value
+                    elif goal.type == "min-improvement":
+                        resolved_goal_value = baseline_sub_type + multiplier * goal.value
+                    elif goal.type == "percent-max-degradation":
+                        resolved_goal_value = baseline_sub_type * (1 - multiplier * goal.value / 100)
+                    elif goal.type == "percent-min-improvement":
+                        resolved_goal_value = baseline_sub_type * (1 + multiplier * goal.value / 100)
+
+                resolved_goals[joint_metric_key(metric_name, sub_type_name)] = resolved_goal_value
+        if len(resolved_goals) > 0:
+            logger.debug("Resolved goals: %s", resolved_goals)
+
+        return resolved_goals
+
+    def host_for_pass(self, pass_id: str):
+        host = self.passes[pass_id]["host"]
+        if host is None:
+            return self.host
+        return host
+
+    def evaluator_for_pass(self, pass_id: str):
+        """Return evaluator for the given pass."""
+        e = self.passes[pass_id]["evaluator"]
+        if e is None:
+            return self.evaluator_config
+        return e
+
+    def _cache_model(self, model_id: str, model: Union[ModelConfig, str], check_object: bool = True):
+        # TODO(trajep): move model/pass run/evaluation cache into footprints
+        model_json = {} if model == FAILED_CONFIG else model.to_json(check_object=check_object)
+        self.cache.cache_model(model_id, model_json)
+
+    def _load_model(self, model_id: str) -> Union[ModelConfig, str]:
+        model_json = self.cache.load_model(model_id)
+        if model_json is None:
+            return None
+
+        if model_json == {}:
+            return FAILED_CONFIG
+
+        return ModelConfig.from_json(model_json)
+
+    def _run_passes(
+        self,
+        passes: List[Tuple[str, Dict[str, Any]]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        """Run all the passes in the order they were registered.
+
+        the passes is the list of (pass_name, pass_search_point) tuples
+        """
+        should_prune, model_config, model_id, model_ids = self._run_pass_chain(
+            passes, model_config, model_id, accelerator_spec
+        )
+
+        if not should_prune:
+            signal = self._evaluate_output_model(passes[-1][0], model_config, model_id, accelerator_spec)
+        else:
+            signal = None
+            logger.warning("Skipping evaluation as model was pruned")
+
+        return should_prune, signal, model_ids
+
+    def _run_pass_chain(
+        self,
+        passes: List[Tuple[str, Dict[str, Any]]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ) -> Tuple[bool, ModelConfig, str, List[str]]:
+        """Run the passes one after the other without evaluating the output model.
+
+        :return: (should_prune, output model config, output model id, ids of the models created by the passes)
+        """
+        should_prune = False
+        # run all the passes in the step
+        model_ids = []
+
+        for pass_id, pass_search_point in passes:
+            model_config, model_id = self._run_pass(
+                pass_id,
+                pass_search_point,
+                model_config,
+                model_id,
+                accelerator_spec,
+            )
+            if model_config in PRUNED_CONFIGS:
+                should_prune = True
+                logger.debug("Pruned for pass %s", pass_id)
+                break
+            model_ids.append(model_id)
+
+        return should_prune, model_config, model_id, model_ids
+
+    def _evaluate_output_model(
+        self,
+        pass_id: str,
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ) -> Optional[MetricResult]:
+        """Evaluate the final model of a pass flow using the evaluator of its last pass."""
+        if model_config.config.get("shared_cache", False):
+            model_config = self.cache.download_shared_cache_model(model_config, model_id)
+
+        evaluator_config = self.evaluator_for_pass(pass_id)
+        if not self.search_strategy and evaluator_config is None:
+            # skip evaluation if no search and no evaluator
+            signal = None
+        else:
+            logger.info("Run model evaluation for the final model...")
+            signal = self._evaluate_model(model_config, model_id, evaluator_config, accelerator_spec)
+        logger.debug("Signal: %s", signal)
+        return signal
+
+    def _run_pass_flow_tree(
+        self,
+        pass_flows: List[List[str]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        pass_id: Optional[str] = None,
+        worker_pool: Optional[EngineWorkerPool] = None,
+    ) -> List[Tuple[bool, Optional[MetricResult], List[str]]]:
+        """Run the remaining passes of the pass flows on a model and evaluate the output model of each flow.
+
+        The pass flows are treated as a prefix tree rooted at the model: flows that continue with the same pass share
+        a branch, so every shared prefix is run only once. If a worker pool is provided, the branches are run
+        concurrently in the worker processes.
+
+        :param pass_flows: remaining pass ids of each pass flow. Empty flows end at the model.
+        :param pass_id: id of the pass that produced the model. It selects the evaluator for flows that end here.
+        :return: list of (should_prune, signal, model_ids) for each pass flow, model_ids are the ids of the models
+            created after the given model.
+        """
+        results = [None] * len(pass_flows)
+
+        # evaluate the model once for all the flows that end here
+        ended_flows = [idx for idx, pass_flow in enumerate(pass_flows) if not pass_flow]
+        if ended_flows:
+            signal = self._evaluate_output_model(pass_id, model_config, model_id, accelerator_spec)
+            for idx in ended_flows:
+                results[idx] = (False, signal, [])
+
+        # group the remaining flows by their next pass
+        branches = OrderedDict()
+        for idx, pass_flow in enumerate(pass_flows):
+            if pass_flow:
+                branches.setdefault(pass_flow[0], []).append(idx)
+
+        if worker_pool and len(branches) > 1:
+            # each branch runs serially within its worker
+            branch_results = OrderedDict(
+                (
+                    next_pass_id,
+                    worker_pool.submit(
+                        "_run_pass_flow_branch",
+                        next_pass_id,
+                        [pass_flows[idx][1:] for idx in flow_idxs],
+                        model_config,
+                        model_id,
+                        accelerator_spec,
+                        resource_request=self._estimate_resources(
+                            {pass_id for idx in flow_idxs for pass_id in pass_flows[idx]}, model_config
+                        ),
+                    ),
+                )
+                for next_pass_id, flow_idxs in branches.items()
+            )
+            branch_results = {k: worker_pool.get_result(future) for k, future in branch_results.items()}
+        else:
+            # a single branch is a prefix shared by all the remaining flows
+            branch_results = {
+                next_pass_id: self._run_pass_flow_branch(
+                    next_pass_id,
+                    [pass_flows[idx][1:] for idx in flow_idxs],
+                    model_config,
+                    model_id,
+                    accelerator_spec,
+                    worker_pool=worker_pool,
+                )
+                for next_pass_id, flow_idxs in branches.items()
+            }
+
+        for next_pass_id, flow_idxs in branches.items():
+            for idx, result in zip(flow_idxs, branch_results[next_pass_id]):
+                results[idx] = result
+        return results
+
+    def _run_pass_flow_branch(
+        self,
+        pass_id: str,
+        pass_flows: List[List[str]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        worker_pool: Optional[EngineWorkerPool] = None,
+    ) -> List[Tuple[bool, Optional[MetricResult], List[str]]]:
+        """Run a pass shared by the pass flows and then the remaining passes of the flows on its output model."""
+        # search point is empty since there is no search
+        output_model_config, output_model_id = self._run_pass(pass_id, {}, model_config, model_id, accelerator_spec)
+        if output_model_config in PRUNED_CONFIGS:
+            logger.debug("Pruned for pass %s", pass_id)
+            logger.warning("Skipping evaluation as model was pruned")
+            return [(True, None, [])] * len(pass_flows)
+
+        results = self._run_pass_flow_tree(
+            pass_flows, output_model_config, output_model_id, accelerator_spec, pass_id, worker_pool
+        )
+        return [(should_prune, signal, [output_model_id, *model_ids]) for should_prune, signal, model_ids in results]
+
+    def _run_pass(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        """Run a pass on the input model."""
+        with collect_stages() as stages:
+            output_model_config, output_model_id = self._run_pass_stages(
+                pass_id, pass_search_point, input_model_config, input_model_id, accelerator_spec
+            )
+        if output_model_id is not None:
+            self.footprints[accelerator_spec].record_stages(output_model_id, stages)
+        return output_model_config, output_model_id
+
+    def _run_pass_stages(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        # pass
+        run_start_time = datetime.now().timestamp()
+        p: Pass = self.passes[pass_id]["pass"]
+        pass_name = p.__class__.__name__
+        logger.info("Running pass %s:%s %s", pass_id, pass_name, pass_search_point)
+        pass_config = p.config_at_search_point(pass_search_point)
+        pass_config = p.serialize_config(pass_config)
+        output_model_config = None
+
+        # check whether the config is valid
+        if not p.validate_search_point(pass_search_point, accelerator_spec, with_fixed_value=True):
+            logger.warning("Invalid search point, prune")
+            output_model_config = INVALID_CONFIG
+            # no need to record in footprint since there was no run and thus no valid/failed model
+            # invalid configs are also not cached since the same config can be valid for other accelerator specs
+            # a pass can be accelerator agnostic but still have accelerator specific invalid configs
+            # this helps reusing cached models for different accelerator specs
+            return output_model_config, None
+
+        # load run from cache if it exists
+        with profile_stage("cache_lookup"):
+            run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
+            output_model_id = self.cache.get_output_model_id(pass_name, pass_config, input_model_id, run_accel)
+            output_model_config = self._load_run(output_model_id)
+        if output_model_config is None:
+            # another process using the same cache might be running the same pass on the same input model
+            # wait for it to finish and load its output instead of running the pass again
+            with self.cache.lock_run(output_model_id):
+                output_model_config = self._load_run(output_model_id)
+                if output_model_config is None:
+                    return self._run_pass_and_cache(
+                        pass_id,
+                        pass_search_point,
+                        pass_config,
+                        input_model_config,
+                        input_model_id,
+                        output_model_id,
+                        accelerator_spec,
+                        run_start_time,
+                    )
+
+        # footprint model and run
+        self.footprints[accelerator_spec].record(
+            model_id=output_model_id,
+            model_config=output_model_config.to_json() if output_model_config != FAILED_CONFIG else {"is_pruned": True},
+            parent_model_id=input_model_id,
+            from_pass=pass_name,
+            pass_run_config=pass_config,
+            start_time=run_start_time,
+            end_time=datetime.now().timestamp(),
+        )
+        logger.info("Loaded model from cache: %s", output_model_id)
+        return output_model_config, output_model_id
+
+    def _load_run(self, output_model_id: str) -> Optional[Union[ModelConfig, str]]:
+        """Load the output model of a cached run. Return None if the run is not cached."""
+        run_cache = self.cache.load_run_from_model_id(output_model_id)
+        if not run_cache:
+            return None
+        logger.debug("Loading model from cache ...")
+        return self._load_model(output_model_id)
+
+    def _run_pass_and_cache(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        pass_config: Dict[str, Any],
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        output_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        run_start_time: float,
+    ):
+        p: Pass = self.passes[pass_id]["pass"]
+        pass_name = p.__class__.__name__
+        run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
+
+        output_model_path = str(self.cache.get_model_cache_path(output_model_id))
+        host = self.host_for_pass(pass_id)
+        with profile_stage("prepare_input_model"):
+            if input_model_config.config.get("shared_cache", False):
+                input_model_config = self.cache.download_shared_cache_model(input_model_config, input_model_id)
+            if host.system_type != SystemType.AzureML:
+                input_model_config = self.cache.prepare_resources_for_local(input_model_config)
+
+        try:
+            if p.run_on_target:
+                if self.target.system_type == SystemType.IsolatedORT:
+                    logger.warning(
+                        "Cannot run pass %s on IsolatedORT target, will use the host to run the pass.", pass_id
+                    )
+                else:
+                    host = self.target
+
+            with profile_stage("run_pass"):
+                output_model_config = host.run_pass(p, input_model_config, output_model_path, pass_search_point)
+        except OlivePassError:
+            logger.exception("Pass run_pass failed")
+            output_model_config = FAILED_CONFIG
+        except EXCEPTIONS_TO_RAISE:
+            # Don't catch these errors since most of time, it is caused by the user errors and need not retry.
+            raise
+        except Exception:
+            output_model_config = FAILED_CONFIG
+            # TODO(jambayk): from the time being, we need to catch all exceptions to make the
+            #      search process robust. We need rethrow the exception only when
+            #      it is not pass specific. For example, for olive bugs and user errors
+            logger.exception("Pass run failed.")
+            if not self.search_strategy:
+                raise  # rethrow the exception if no search is performed
+
+        run_end_time = datetime.now().timestamp()
+        logger.info("Pass %s:%s finished in %f seconds", pass_id, pass_name, run_end_time - run_start_time)
+
+        with profile_stage("cache_model"):
+            # cache model
+            self._cache_model(output_model_id, output_model_config)
+
+            # cache run
+            self.cache.cache_run(pass_name, pass_config, input_model_id, output_model_id, run_accel)
+
+        # footprint model and run
+        self.footprints[accelerator_spec].record(
+            model_id=output_model_id,
+            model_config=output_model_config.to_json() if output_model_config != FAILED_CONFIG else {"is_pruned": True},
+            parent_model_id=input_model_id,
+            from_pass=pass_name,
+            pass_run_config=pass_config,
+            start_time=run_start_time,
+            end_time=run_end_time,
+        )
+
+        return output_model_config, output_model_id
+
+    def _cache_evaluation(self, model_id: str, signal: MetricResult):
+        """Cache the evaluation in the cache directory."""
+        evaluation_json = {
+            "model_id": model_id,
+            "signal": signal.dict(),
+        }
+        self.cache.cache_evaluation(model_id, evaluation_json)
+
+    def _load_evaluation(self, model_id: str):
+        """Load the evaluation from the cache directory."""
+        evaluation_json = self.cache.load_evaluation(model_id)
+        if evaluation_json is None:
+            return None
+
+        try:
+            signal = MetricResult(**evaluation_json["signal"])
+        except Exception:
+            logger.exception("Failed to load evaluation")
+            signal = None
+        return signal
+
+    def _evaluate_model(
+        self,
+        model_config: ModelConfig,
+        model_id: str,
+        evaluator_config: "OliveEvaluatorConfig",
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        """Evaluate a model."""
+        with collect_stages() as stages:
+            signal = self._evaluate_model_stages(model_config, model_id, evaluator_config, accelerator_spec)
+        self.footprints[accelerator_spec].record_stages(model_id, stages)
+        return signal
+
+    def _evaluate_model_stages(
+        self,
+        model_config: ModelConfig,
+        model_id: str,
+        evaluator_config: "OliveEvaluatorConfig",
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        logger.debug("Evaluating model ...")
+        accelerator_suffix = f"-{accelerator_spec}" if accelerator_spec else ""
+        if not model_id.endswith(accelerator_suffix):
+            # append the suffix if the model is accelerator independent
+            model_id_with_accelerator = f"{model_id}{accelerator_suffix}"
+        else:
+            model_id_with_accelerator = model_id
+
+        # load evaluation from cache if it exists
+        with profile_stage("evaluation_cache_lookup"):
+            signal = self._load_evaluation(model_id_with_accelerator)
+        if signal is not None:
+            logger.debug("Loading evaluation from cache ...")
+            # footprint evaluation
+            self.footprints[accelerator_spec].record(
+                model_id=model_id,
+                metrics=FootprintNodeMetric(
+                    value=signal,
+                    if_goals_met=False,
+                ),
+            )
+            return signal
+
+        # evaluate model
+        if self.target.system_type != SystemType.AzureML:
+            with profile_stage("prepare_model"):
+                model_config = self.cache.prepare_resources_for_local(model_config)
+        with profile_stage("evaluate_model"):
+            signal = self.target.evaluate_model(model_config, evaluator_config, accelerator_spec)
+
+        # cache evaluation
+        with profile_stage("cache_evaluation"):
+            self._cache_evaluation(model_id_with_accelerator, signal)
+
+        # footprint evaluation
+        self.footprints[accelerator_spec].record(
+            model_id=model_id,
+            metrics=FootprintNodeMetric(
+                value=signal,
+                if_goals_met=False,
+            ),
+        )
+        return signal
+
+    @contextmanager
+    def _create_system(self, accelerator_spec):
+        def create_system(config: "SystemConfig", accelerator_spec):
+            assert config, "System config is not provided"
+            if config.olive_managed_env:
+                logger.debug(
+                    "Creating olive_managed_env %s with EP %s", config.type, accelerator_spec.execution_provider
+                )
+                return create_managed_system_with_cache(config, accelerator_spec)
+            else:
+                logger.debug("create native OliveSystem %s", config.type)
+                return config.create_system()
+
+        if not self.target:
+            logger.info("Creating target system ...")
+            target_start_time = time.time()
+            self.target = create_system(self.target_config, accelerator_spec)
+            logger.info("Target system created in %f seconds", time.time() - target_start_time)
+        if not self.host:
+            host_accelerators = self.host_config.config.accelerators
+            if host_accelerators and host_accelerators[0].execution_providers:
+                host_accelerator_spec = AcceleratorSpec(
+                    host_accelerators[0].device,
+                    host_accelerators[0].execution_providers[0],
+                    memory=host_accelerators[0].memory,
+                )
+            else:
+                host_accelerator_spec = None
+            logger.info("Creating host system ...")
+            host_start_time = time.time()
+            self.host = create_system(self.host_config, host_accelerator_spec)
+            logger.info("Host system created in %f seconds", time.time() - host_start_time)
+
+        yield
+
+        if self.target_config.olive_managed_env:
+            # could we put it under cache system for reusing?
+            logger.info("Removing target system ...")
+            self.target.remove()
+            self.target = None
+        if self.host_config.olive_managed_env:
+            logger.info("Removing host system ...")
+            self.host.remove()
+            self.host = None
+
+        create_managed_system_with_cache.cache_clear()
+
+
+def _config_to_json(config: Optional[ConfigBase]) -> Optional[Dict[str, Any]]:
+    return config.to_json(check_object=True) if config else None
+
+
+def _config_from_json(config_json: Optional[Dict[str, Any]], config_class: Type[ConfigBase]) -> Optional[ConfigBase]:
+    return validate_config(config_json, config_class) if config_json else None
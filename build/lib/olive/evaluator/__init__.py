@@ -0,0 +1,17 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+
+from olive.evaluator.metric import Metric, SubMetric
+from olive.evaluator.metric_result import MetricResult, SubMetricResult, flatten_metric_result
+from olive.evaluator.olive_evaluator import OliveEvaluator
+
+__all__ = [
+    "Metric",
+    "MetricResult",
+    "OliveEvaluator",
+    "SubMetric",
+    "SubMetricResult",
+    "flatten_metric_result",
+]
@@ -0,0 +1,8 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.model.config import ModelConfig
+from olive.model.handler import *  # noqa: F403
+
+__all__ = ["ModelConfig"]
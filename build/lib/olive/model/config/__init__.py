@@ -0,0 +1,21 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.model.config.hf_config import HfLoadKwargs
+from olive.model.config.io_config import (
+    IoConfig,
+    complete_kv_cache_with_model_attributes,
+    extend_io_config_with_kv_cache,
+)
+from olive.model.config.kv_cache_config import KVCacheConfig
+from olive.model.config.model_config import ModelConfig
+
+__all__ = [
+    "HfLoadKwargs",
+    "IoConfig",
+    "KVCacheConfig",
+    "ModelConfig",
+    "complete_kv_cache_with_model_attributes",
+    "extend_io_config_with_kv_cache",
+]
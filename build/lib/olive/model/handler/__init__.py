@@ -0,0 +1,27 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.model.handler.base import OliveModelHandler
+from olive.model.handler.composite import CompositeModelHandler
+from olive.model.handler.hf import DistributedHfModelHandler, HfModelHandler
+from olive.model.handler.onnx import DistributedOnnxModelHandler, ONNXModelHandler
+from olive.model.handler.openvino import OpenVINOModelHandler
+from olive.model.handler.pytorch import PyTorchModelHandler
+from olive.model.handler.qnn import QNNModelHandler
+from olive.model.handler.snpe import SNPEModelHandler
+from olive.model.handler.tensorflow import TensorFlowModelHandler
+
+__all__ = [
+    "CompositeModelHandler",
+    "DistributedHfModelHandler",
+    "DistributedOnnxModelHandler",
+    "HfModelHandler",
+    "ONNXModelHandler",
+    "OliveModelHandler",
+    "OpenVINOModelHandler",
+    "PyTorchModelHandler",
+    "QNNModelHandler",
+    "SNPEModelHandler",
+    "TensorFlowModelHandler",
+]
@@ -0,0 +1,25 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.model.handler.mixin.dummy_inputs import DummyInputsMixin
+from olive.model.handler.mixin.hf import HfMixin
+from olive.model.handler.mixin.io_config import IoConfigMixin
+from olive.model.handler.mixin.json import JsonMixin
+from olive.model.handler.mixin.kv_cache import PytorchKvCacheMixin
+from olive.model.handler.mixin.mlflow import MLFlowTransformersMixin
+from olive.model.handler.mixin.onnx_ep import OnnxEpValidateMixin
+from olive.model.handler.mixin.onnx_graph import OnnxGraphMixin
+from olive.model.handler.mixin.resource import ResourceMixin
+
+__all__ = [
+    "DummyInputsMixin",
+    "HfMixin",
+    "IoConfigMixin",
+    "JsonMixin",
+    "MLFlowTransformersMixin",
+    "OnnxEpValidateMixin",
+    "OnnxGraphMixin",
+    "PytorchKvCacheMixin",
+    "ResourceMixin",
+]
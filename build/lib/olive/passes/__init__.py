@@ -0,0 +1,17 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.passes.olive_pass import FullPassConfig, Pass
+from olive.passes.pass_config import AbstractPassConfig, PassModuleConfig, PassParamDefault
+
+REGISTRY = Pass.registry
+
+__all__ = [
+    "REGISTRY",
+    "AbstractPassConfig",
+    "FullPassConfig",
+    "Pass",
+    "PassModuleConfig",
+    "PassParamDefault",
+]
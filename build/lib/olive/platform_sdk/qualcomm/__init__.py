@@ -0,0 +1,10 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+
+from olive.platform_sdk.qualcomm.snpe.env import SNPESDKEnv
+
+__all__ = [
+    "SNPESDKEnv",
+]
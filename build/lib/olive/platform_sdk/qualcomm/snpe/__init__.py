@@ -0,0 +1,7 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.platform_sdk.qualcomm.snpe.snpe import SNPEInferenceSession, SNPESessionOptions
+
+__all__ = ["SNPEInferenceSession", "SNPESessionOptions"]
@@ -0,0 +1,59 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from typing import Dict
+
+import optuna
+
+from olive.common.config_utils import ConfigParam
+from olive.strategy.search_algorithm.optuna_sampler import OptunaSearchAlgorithm
+
+
+class TPESearchAlgorithm(OptunaSearchAlgorithm):
+    """Sample using TPE (Tree-structured Parzen Estimator) algorithm. Uses optuna TPESampler underneath.
+
+    Refer to https://optuna.readthedocs.io/en/stable/reference/samplers/generated/optuna.samplers.TPESampler.html
+    for more details about the sampler.
+    """
+
+    name = "tpe"
+
+    @classmethod
+    def _default_config(cls) -> Dict[str, ConfigParam]:
+        return {
+            **super()._default_config(),
+            "multivariate": ConfigParam(
+                type_=bool, default_value=True, description="Use multivariate TPE when suggesting parameters."
+            ),
+            "group": ConfigParam(
+                type_=bool,
+                default_value=True,
+                description=(
+                    "If this and multivariate are True, the multivariate TPE with the group decomposed search space is"
+                    " used when suggesting parameters. Refer to 'group' at"
+                    " https://optuna.readthedocs.io/en/stable/reference/samplers/generated/"
+                    "optuna.samplers.TPESampler.html for more information."
+                ),
+            ),
+            "constant_liar": ConfigParam(
+                type_=bool,
+                default_value=False,
+                description=(
+                    "If True, trials that have been suggested but not reported yet are treated as if they had the"
+                    " worst objective values. This avoids suggesting the same region of the search space repeatedly"
+                    " when several trials are run concurrently. Refer to 'constant_liar' at"
+                    " https://optuna.readthedocs.io/en/stable/reference/samplers/generated/"
+                    "optuna.samplers.TPESampler.html for more information."
+                ),
+            ),
+        }
+
+    def _create_sampler(self) -> optuna.samplers.TPESampler:
+        """Create the sampler."""
+        return optuna.samplers.TPESampler(
+            multivariate=self.config.multivariate,
+            group=self.config.group,
+            constant_liar=self.config.constant_liar,
+            seed=self.config.seed,
+        )
@@ -0,0 +1,8 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.systems.azureml.aml_system import AzureMLSystem
+from olive.systems.common import AzureMLDockerConfig
+
+__all__ = ["AzureMLDockerConfig", "AzureMLSystem"]
@@ -0,0 +1,8 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.systems.common import LocalDockerConfig
+from olive.systems.docker.docker_system import DockerSystem
+
+__all__ = ["DockerSystem", "LocalDockerConfig"]
@@ -0,0 +1,22 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from olive.systems.utils.arg_parser import get_common_args, parse_config
+from olive.systems.utils.misc import (
+    create_managed_system,
+    create_managed_system_with_cache,
+    create_new_environ,
+    get_package_name_from_ep,
+    run_available_providers_runner,
+)
+
+__all__ = [
+    "create_managed_system",
+    "create_managed_system_with_cache",
+    "create_new_environ",
+    "get_common_args",
+    "get_package_name_from_ep",
+    "parse_config",
+    "run_available_providers_runner",
+]
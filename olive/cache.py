@@ -8,29 +8,50 @@ import logging
 import os
 import re
 import shutil
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from filelock import FileLock, Timeout
+
+from olive.cache_index import CacheIndex
 from olive.common.config_utils import ConfigBase, convert_configs_to_dicts, validate_config
-from olive.common.constants import DEFAULT_CACHE_DIR, DEFAULT_WORKFLOW_ID
+from olive.common.constants import DATASET_CACHE_DIR_ENV, DEFAULT_CACHE_DIR, DEFAULT_WORKFLOW_ID
 from olive.common.container_client_factory import AzureContainerClientFactory
 from olive.common.pydantic_v1 import root_validator, validator
-from olive.common.utils import hash_dict, hf_repo_exists, set_nested_dict_value
+from olive.common.shared_cache_backend import (
+    AZURE_BLOB_URL_PATTERN,
+    SharedCacheBackend,
+    create_shared_cache_backend,
+    is_shared_cache_url,
+)
+from olive.common.utils import hash_dict, hash_files, hf_repo_exists, set_nested_dict_value
+from olive.data.dataset_cache import get_dataset_stores, remove_dataset_store, remove_stale_dataset_stores
+from olive.hardware.accelerator import AcceleratorSpec
 from olive.model.config.model_config import ModelConfig
 from olive.resource_path import ResourcePath, create_resource_path, find_all_resources
 
-if TYPE_CHECKING:
-    from olive.hardware import AcceleratorSpec
-
 logger = logging.getLogger(__name__)
 
-SHARED_CACHE_PATTERN = r"https://([^.]+)\.blob\.core\.windows\.net/([^/]+)"
+SHARED_CACHE_PATTERN = AZURE_BLOB_URL_PATTERN
+
+# number of runs looked up and evicted at a time by the garbage collection of the cache
+GC_BATCH_SIZE = 64
+# suffix of the run directories that are being deleted
+RUN_TOMBSTONE_SUFFIX = ".deleting"
+# number of runs downloaded at a time by the prefetch of the shared cache, each download is concurrent on its own
+PREFETCH_MAX_WORKERS = 4
 
 
 def is_shared_cache_dir(s) -> bool:
-    return bool(re.match(SHARED_CACHE_PATTERN, str(s)))
+    return is_shared_cache_url(s)
 
 
 @dataclass
@@ -40,6 +61,9 @@ class CacheSubDirs:
     evaluations: Path
     resources: Path
     mlflow: Path
+    blobs: Path
+    locks: Path
+    datasets: Path
 
     @classmethod
     def from_cache_dir(cls, cache_dir: Path) -> "CacheSubDirs":
@@ -49,6 +73,9 @@ class CacheSubDirs:
             evaluations=cache_dir / "evaluations",
             resources=cache_dir / "resources",
             mlflow=cache_dir / "mlflow",
+            blobs=cache_dir / "blobs",
+            locks=cache_dir / "locks",
+            datasets=cache_dir / "datasets",
         )
 
 
@@ -58,8 +85,25 @@ class CacheConfig(ConfigBase):
     clean_evaluation_cache: bool = False
     account_name: str = None
     container_name: str = None
+    # url of a shared cache that is not in Azure Blob Storage
+    # s3://<bucket>/<prefix> for an S3 compatible bucket or file:///<path> for a directory such as a network share
+    shared_cache_dir: str = None
     enable_shared_cache: bool = False
     update_shared_cache: bool = True
+    # size budget of the cache in bytes or as a string such as "100GB"
+    # least recently used runs are evicted in the background when the cache grows larger
+    max_cache_size: Union[int, str] = None
+    # runs that have not been used for this many days are evicted in the background
+    max_cache_age_days: float = None
+    # store the model files of runs once per content in the blobs directory and hardlink them into the run directories
+    dedup_model_files: bool = True
+    # store the preprocessed batches of the evaluation data configs in the datasets directory and reuse them
+    # the stored batches count towards max_cache_size and max_cache_age_days like the runs
+    cache_datasets: bool = True
+
+    @validator("max_cache_size")
+    def validate_max_cache_size(cls, v):
+        return AcceleratorSpec.str_to_int_memory(v) if v is not None else None
 
     @validator("cache_dir", pre=True, always=True)
     def validate_cache_dir(cls, v):
@@ -85,23 +129,34 @@ class CacheConfig(ConfigBase):
             return [DEFAULT_CACHE_DIR, v]
         return [v]
 
-    @validator("account_name")
+    @validator("account_name", always=True)
     def validate_account_name(cls, v, values):
         if v:
             return v
         match = cls._get_shared_cache_match(values.get("cache_dir"))
         return match.group(1) if match else None
 
-    @validator("container_name")
+    @validator("container_name", always=True)
     def validate_container_name(cls, v, values):
         if v:
             return v
         match = cls._get_shared_cache_match(values.get("cache_dir"))
         return match.group(2) if match else None
 
+    @validator("shared_cache_dir", always=True)
+    def validate_shared_cache_dir(cls, v, values):
+        if v:
+            if not is_shared_cache_dir(v):
+                raise ValueError(f"Unsupported shared cache url {v}.")
+            return v
+        for cache_dir in values.get("cache_dir") or []:
+            if is_shared_cache_dir(cache_dir) and not re.match(SHARED_CACHE_PATTERN, str(cache_dir)):
+                return str(cache_dir)
+        return None
+
     @root_validator()
     def validate_enable_shared_cache(cls, values):
-        if values.get("account_name") and values.get("container_name"):
+        if values.get("shared_cache_dir") or (values.get("account_name") and values.get("container_name")):
             values["enable_shared_cache"] = True
         elif values.get("enable_shared_cache"):
             values["account_name"] = values.get("account_name") or "olivepublicmodels"
@@ -125,12 +180,46 @@ class CacheConfig(ConfigBase):
                 return cache_dir
         return DEFAULT_CACHE_DIR
 
+    def create_shared_cache_backend(self) -> SharedCacheBackend:
+        """Create the storage backend of the shared cache."""
+        if self.shared_cache_dir:
+            return create_shared_cache_backend(self.shared_cache_dir)
+        return AzureContainerClientFactory(self.account_name, self.container_name)
+
     def create_cache(self, workflow_id: str = DEFAULT_WORKFLOW_ID) -> "OliveCache":
         local_cache_dir = Path(self.get_local_cache_dir()) / workflow_id
         self.cache_dir = [str(local_cache_dir)]
         return OliveCache(self)
 
 
+def _write_json(path: Path, data: Dict):
+    """Write the json file atomically so that concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_path.open("w") as f:
+            json.dump(data, f, indent=4)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _get_dir_size(path: Path) -> int:
+    """Get the size in bytes of the files in the directory.
+
+    Files with several hardlinks only count for their share of the size, one of the links being the blob.
+    """
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat_result = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            size += stat_result.st_size // max(stat_result.st_nlink - 1, 1)
+    return size
+
+
 class OliveCache:
     def __init__(self, cache_config: Union[CacheConfig, Dict]):
         cache_config = validate_config(cache_config, CacheConfig)
@@ -147,12 +236,102 @@ class OliveCache:
         cache_dir.mkdir(parents=True, exist_ok=True)
         for sub_dir in asdict(self.dirs).values():
             sub_dir.mkdir(parents=True, exist_ok=True)
+        # finish deleting the runs of processes that died while evicting them
+        for tombstone in self.dirs.runs.glob(f".*{RUN_TOMBSTONE_SUFFIX}"):
+            shutil.rmtree(tombstone, ignore_errors=True)
+        remove_stale_dataset_stores(self.dirs.datasets)
+
+        self.index = self._create_index()
+        if cache_config.clean_evaluation_cache:
+            self._update_index("clear_evaluations")
 
         self.enable_shared_cache = cache_config.enable_shared_cache
         if self.enable_shared_cache:
-            self.shared_cache = SharedCache(cache_config.account_name, cache_config.container_name)
+            self.shared_cache = SharedCache(backend=cache_config.create_shared_cache_backend())
         self.update_shared_cache = cache_config.update_shared_cache
 
+        self.dedup_model_files = cache_config.dedup_model_files
+        self.cache_datasets = cache_config.cache_datasets
+        self.max_cache_size = cache_config.max_cache_size
+        self.max_cache_age_days = cache_config.max_cache_age_days
+        # runs used since the cache was opened are never evicted in the background, they might still be in use
+        self._session_start_time = time.time()
+        self._gc_lock = threading.Lock()
+        self._gc_event = None
+        self._gc_stop_event = None
+        self._gc_thread = None
+        self._schedule_garbage_collection()
+        # downloads of shared cache runs started by prefetch_shared_cache
+        self._prefetch_executor = None
+        self._prefetches: Dict[str, Future] = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the background garbage collection and prefetches are not shared with other processes
+        for key in ("_gc_lock", "_gc_event", "_gc_stop_event", "_gc_thread", "_prefetch_executor", "_prefetches"):
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._gc_lock = threading.Lock()
+        self._gc_event = None
+        self._gc_stop_event = None
+        self._gc_thread = None
+        self._prefetch_executor = None
+        self._prefetches = {}
+
+    def _create_index(self) -> Optional[CacheIndex]:
+        try:
+            return CacheIndex(self.dirs.cache_dir / "cache_index.db")
+        except sqlite3.Error:
+            logger.warning("Failed to open the cache index, falling back to the json files.", exc_info=True)
+            return None
+
+    def _update_index(self, method_name: str, *args):
+        if self.index is None:
+            return
+        try:
+            getattr(self.index, method_name)(*args)
+        except sqlite3.Error:
+            logger.warning("Failed to update the cache index.", exc_info=True)
+
+    def _query_index(self, method_name: str, *args):
+        if self.index is None:
+            return None
+        try:
+            return getattr(self.index, method_name)(*args)
+        except sqlite3.Error:
+            logger.warning("Failed to query the cache index.", exc_info=True)
+            return None
+
+    def _query_index_entry(self, method_name: str, key: str, json_path: Path) -> Optional[Dict]:
+        """Query the index for the entry of a json file in the cache directory.
+
+        The entry is stale if the json file was deleted, such as a run directory removed by hand. Stale entries are
+        removed from the index and not returned.
+        """
+        entry = self._query_index(method_name, key)
+        if entry is None or json_path.exists():
+            return entry
+        logger.debug("Removing stale cache index entry %s of %s.", key, json_path)
+        if method_name == "get_evaluation":
+            self._update_index("remove_evaluation", key)
+        elif method_name == "get_resource":
+            self._update_index("remove_resource", key)
+        else:
+            self._remove_stale_run(key)
+        return None
+
+    def _remove_stale_run(self, model_id: str):
+        """Remove the run of the model from the index and delete the blobs that no run links to anymore."""
+        with self.lock_run(model_id, blocking=False) as locked:
+            if not locked:
+                # another process is caching the run
+                return
+            for blob_hash in self._query_index("remove_run", model_id) or []:
+                self.get_blob_path(blob_hash).unlink(missing_ok=True)
+
     @staticmethod
     def get_run_json(pass_name: int, pass_config: dict, input_model_id: str, accelerator_spec: "AcceleratorSpec"):
         accelerator_spec = str(accelerator_spec) if accelerator_spec else None
@@ -174,25 +353,38 @@ class OliveCache:
 
     def cache_model(self, model_id: str, model_json: Dict):
         model_json_path = self.get_model_json_path(model_id)
+        if model_json:
+            self._store_model_files(model_id)
         try:
-            with model_json_path.open("w") as f:
-                json.dump(model_json, f, indent=4)
+            _write_json(model_json_path, model_json)
             logger.debug("Cached model %s to %s", model_id, model_json_path)
-
+            self._update_index("add_model", model_id, model_json)
+            self._update_index("touch_run", model_id, _get_dir_size(model_json_path.parent))
         except Exception:
             logger.exception("Failed to cache model to local cache.")
+        self._schedule_garbage_collection()
 
         if self.enable_shared_cache and self.update_shared_cache:
             self.shared_cache.cache_model(model_id, model_json)
 
     def load_model(self, model_id: str) -> Optional[ModelConfig]:
         """Load the model from the cache directory."""
+        self._wait_for_prefetch(model_id)
+        model_json = self._query_index_entry("get_model", model_id, self.get_model_json_path(model_id))
+        if model_json is not None:
+            logger.info("Loading model %s from cache.", model_id)
+            self._update_index("touch_run", model_id)
+            return model_json
+
         model_json_path = self.get_model_json_path(model_id)
         if model_json_path.exists():
             try:
                 logger.info("Loading model %s from cache.", model_id)
                 with model_json_path.open() as f:
-                    return json.load(f)
+                    model_json = json.load(f)
+                self._update_index("add_model", model_id, model_json)
+                self._update_index("touch_run", model_id)
+                return model_json
             except Exception:
                 logger.exception("Failed to load model from local cache.")
 
@@ -217,9 +409,9 @@ class OliveCache:
         run_json["output_model_id"] = output_model_id
         run_json_path = self.get_run_json_path(output_model_id)
         try:
-            with run_json_path.open("w") as f:
-                json.dump(run_json, f, indent=4)
+            _write_json(run_json_path, run_json)
             logger.debug("Cached run %s to %s", output_model_id, run_json_path)
+            self._update_index("add_run", output_model_id, run_json)
         except Exception:
             logger.exception("Failed to cache run to local cache.")
 
@@ -227,26 +419,418 @@ class OliveCache:
             self.shared_cache.cache_run(output_model_id, run_json_path)
 
     def load_run_from_model_id(self, model_id: str):
+        self._wait_for_prefetch(model_id)
+        run_json = self._query_index_entry("get_run", model_id, self.get_run_json_path(model_id))
+        if run_json is not None:
+            logger.info("Loading run %s from cache.", model_id)
+            self._update_index("touch_run", model_id)
+            return run_json
+
         run_json_path = self.get_run_json_path(model_id)
         if run_json_path.exists():
             try:
                 logger.info("Loading run %s from cache.", model_id)
                 with run_json_path.open() as f:
-                    return json.load(f)
+                    run_json = json.load(f)
+                self._update_index("add_run", model_id, run_json)
+                self._update_index("touch_run", model_id)
+                return run_json
             except Exception:
                 logger.exception("Failed to load run from local cache.")
         if self.enable_shared_cache:
             return self.shared_cache.load_run(model_id, run_json_path)
         return {}
 
+    def prefetch_shared_cache(self, model_ids: Iterable[str]):
+        """Download the runs of the models that are in the shared cache but not in the local cache in the background.
+
+        The shared cache is checked for all the models at once. Loading a run or model that is being prefetched waits
+        for its download instead of starting another one.
+        """
+        if not self.enable_shared_cache:
+            return
+
+        model_ids = [
+            model_id
+            for model_id in dict.fromkeys(model_ids)
+            if model_id not in self._prefetches and not self._is_run_cached_locally(model_id)
+        ]
+        if not model_ids:
+            return
+
+        # a run is only complete in the shared cache once both its run and model are uploaded
+        blob_names = [f"{model_id}/{name}" for model_id in model_ids for name in ("run.json", "model.json")]
+        exists = self.shared_cache.exist_in_shared_cache_batch(blob_names)
+        hits = [
+            model_id for model_id in model_ids if exists[f"{model_id}/run.json"] and exists[f"{model_id}/model.json"]
+        ]
+        if not hits:
+            return
+
+        logger.info("Prefetching %d runs from the shared cache.", len(hits))
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="olive_cache_prefetch"
+            )
+        for model_id in hits:
+            self._prefetches[model_id] = self._prefetch_executor.submit(self._prefetch_run, model_id)
+
+    def _is_run_cached_locally(self, model_id: str) -> bool:
+        return self.get_run_json_path(model_id).exists()
+
+    def _prefetch_run(self, model_id: str):
+        """Download the run, the model and its files from the shared cache into the local cache."""
+        try:
+            with self.lock_run(model_id):
+                if self._is_run_cached_locally(model_id):
+                    return
+
+                model_json_path = self.get_model_json_path(model_id)
+                model_json = self.shared_cache.load_model(model_id, model_json_path)
+                if not model_json:
+                    return
+                model_config = ModelConfig.from_json(model_json)
+                if model_config.config.get("shared_cache", False):
+                    model_config = self.download_shared_cache_model(model_config, model_id)
+                # the local model config points to the downloaded files so they are not downloaded again
+                model_json = model_config.to_json()
+                _write_json(model_json_path, model_json)
+                self._update_index("add_model", model_id, model_json)
+
+                # the run is written last, it marks the run as complete
+                run_json = self.shared_cache.load_run(model_id, self.get_run_json_path(model_id))
+                if run_json:
+                    self._update_index("add_run", model_id, run_json)
+                    self._update_index("touch_run", model_id, _get_dir_size(model_json_path.parent))
+                logger.debug("Prefetched run %s from the shared cache.", model_id)
+        except Exception:
+            logger.warning("Failed to prefetch run %s from the shared cache.", model_id, exc_info=True)
+
+    def _wait_for_prefetch(self, model_id: str):
+        future = self._prefetches.get(model_id)
+        if future is not None and not future.done():
+            logger.debug("Waiting for the prefetch of run %s.", model_id)
+            future.result()
+
+    def find_runs(self, pass_name: Optional[str] = None, input_model_id: Optional[str] = None) -> List[Dict]:
+        """Find the cached runs of a pass and/or on an input model.
+
+        Return an empty list if the cache index is not available.
+        """
+        return self._query_index("find_runs", pass_name, input_model_id) or []
+
+    def pin_model_lineage(self, model_ids: Iterable[str]):
+        """Protect the runs of the models and of all the models they were derived from against eviction."""
+        lineage = []
+        for output_model_id in model_ids:
+            model_id = output_model_id
+            while model_id and model_id not in lineage:
+                lineage.append(model_id)
+                run_json = self._query_index("get_run", model_id) or {}
+                model_id = run_json.get("input_model_id")
+        self._update_index("pin_runs", lineage)
+
+    def get_usage(self) -> Tuple[int, int]:
+        """Get the number of runs tracked in the cache and the total size in bytes of the runs and dataset stores."""
+        num_runs, size = self._query_index("get_usage") or (0, 0)
+        return num_runs, size + sum(store_size for _, store_size, _ in get_dataset_stores(self.dirs.datasets))
+
+    def sync_usage(self):
+        """Track the size and last use of the run directories that are missing from the cache index.
+
+        This scans the runs directory, so it is only meant for offline maintenance of caches created by older
+        versions or with the index unavailable.
+        """
+        tracked = set(self._query_index("get_usage_model_ids") or [])
+        for run_path in self.dirs.runs.iterdir():
+            # skip the tombstones of runs that are being deleted
+            if run_path.is_dir() and not run_path.name.startswith(".") and run_path.name not in tracked:
+                self._update_index("touch_run", run_path.name, _get_dir_size(run_path), run_path.stat().st_mtime)
+
+    def collect_garbage(
+        self,
+        max_cache_size: Optional[int] = None,
+        max_cache_age_days: Optional[float] = None,
+        dry_run: bool = False,
+        protect_recent: bool = False,
+        max_runs: Optional[int] = None,
+    ) -> Tuple[List[str], int]:
+        """Evict the least recently used runs until the cache fits the size and age budgets.
+
+        Runs in the lineage of output models are never evicted. Runs derived from an evicted model are evicted with
+        it since their models can refer to the files of the evicted model. The stores of the dataset cache count
+        towards the budgets too and are evicted along with the runs in the order of their last use.
+
+        :param max_cache_size: size budget of the cache in bytes.
+        :param max_cache_age_days: runs that have not been used for this many days are evicted.
+        :param dry_run: only report the runs that would be evicted.
+        :param protect_recent: do not evict the runs used since the cache was opened.
+        :param max_runs: maximum number of runs to evict, for incremental collection.
+        :return: the ids of the evicted models and the number of bytes reclaimed, including the evicted dataset stores.
+        """
+        if self.index is None or (max_cache_size is None and max_cache_age_days is None):
+            return [], 0
+
+        size = self.get_usage()[1]
+        expire_time = time.time() - max_cache_age_days * 24 * 3600 if max_cache_age_days is not None else None
+        accessed_before = self._session_start_time if protect_recent else None
+        dataset_stores = deque(
+            store
+            for store in get_dataset_stores(self.dirs.datasets)
+            if accessed_before is None or store[2] < accessed_before
+        )
+
+        evicted = {}
+        skipped = set()
+        datasets_reclaimed = 0
+        offset = 0
+        while max_runs is None or len(evicted) < max_runs:
+            candidates = self._query_index("get_eviction_candidates", GC_BATCH_SIZE, accessed_before, offset)
+            if not candidates:
+                break
+            for model_id, run_size, accessed_at in candidates:
+                if max_runs is not None and len(evicted) >= max_runs:
+                    break
+                if model_id in evicted or model_id in skipped:
+                    continue
+                reclaimed = self._evict_dataset_stores(
+                    dataset_stores, accessed_at, size, max_cache_size, expire_time, dry_run
+                )
+                size -= reclaimed
+                datasets_reclaimed += reclaimed
+                over_budget = max_cache_size is not None and size > max_cache_size
+                expired = expire_time is not None and accessed_at < expire_time
+                if not over_budget and not expired:
+                    # the remaining candidates were used more recently
+                    return list(evicted), sum(evicted.values()) + datasets_reclaimed
+                evicted_runs = self._evict_run(model_id, run_size, dry_run)
+                if not evicted_runs:
+                    skipped.add(model_id)
+                for evicted_id, evicted_size in evicted_runs:
+                    evicted[evicted_id] = evicted_size
+                    size -= evicted_size
+            # move past the candidates that are still in the index
+            offset = offset + len(candidates) if dry_run else len(skipped)
+        datasets_reclaimed += self._evict_dataset_stores(
+            dataset_stores, float("inf"), size, max_cache_size, expire_time, dry_run
+        )
+        return list(evicted), sum(evicted.values()) + datasets_reclaimed
+
+    def _evict_dataset_stores(
+        self,
+        dataset_stores: "deque[Tuple[Path, int, float]]",
+        used_before: float,
+        size: int,
+        max_cache_size: Optional[int],
+        expire_time: Optional[float],
+        dry_run: bool,
+    ) -> int:
+        """Evict the dataset stores last used before the given time while the cache is over budget or they expired.
+
+        :param dataset_stores: (store_dir, size, last_used) of the stores that can be evicted, least recently used
+            first. The stores that were considered are removed from it.
+        :param size: current size of the cache in bytes.
+        :return: the number of bytes reclaimed.
+        """
+        reclaimed = 0
+        while dataset_stores and dataset_stores[0][2] < used_before:
+            store_dir, store_size, last_used = dataset_stores.popleft()
+            over_budget = max_cache_size is not None and size - reclaimed > max_cache_size
+            expired = expire_time is not None and last_used < expire_time
+            if not over_budget and not expired:
+                # the remaining stores were used more recently
+                dataset_stores.clear()
+                break
+            logger.debug("Evicting dataset store %s from cache.", store_dir)
+            if dry_run or remove_dataset_store(store_dir):
+                reclaimed += store_size
+        return reclaimed
+
+    def _store_model_files(self, model_id: str):
+        """Move the model files of the run into the content addressed blobs directory.
+
+        Each file is replaced by a hardlink to the blob with the same content, so byte-identical files produced by
+        different runs are stored once. Files are left in place if the filesystem does not support hardlinks.
+        """
+        models_dir = self.dirs.runs / model_id / "models"
+        if not self.dedup_model_files or self.index is None or not models_dir.is_dir():
+            return
+
+        file_paths = [
+            file_path
+            for file_path in models_dir.rglob("*")
+            if file_path.is_file() and not file_path.is_symlink() and file_path.stat().st_size > 0
+        ]
+        if not file_paths:
+            return
+
+        blob_hashes = []
+        for file_path, blob_hash in zip(file_paths, hash_files(file_paths, self.get_file_hash_memo_path())):
+            blob_path = self.get_blob_path(blob_hash)
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                try:
+                    os.link(file_path, blob_path)
+                except FileExistsError:
+                    if not file_path.samefile(blob_path):
+                        # link to a temporary path and replace so that the file is never missing
+                        tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+                        os.link(blob_path, tmp_path)
+                        tmp_path.replace(file_path)
+            except OSError as e:
+                logger.debug("Failed to store %s in the blobs directory: %s", file_path, e)
+                continue
+            blob_hashes.append(blob_hash)
+        self._update_index("add_run_blobs", model_id, blob_hashes)
+
+    def get_blob_path(self, blob_hash: str) -> Path:
+        """Get the path of the blob with the given content hash."""
+        return self.dirs.blobs / blob_hash[:2] / blob_hash
+
+    def _evict_run(self, model_id: str, size: int, dry_run: bool) -> List[Tuple[str, int]]:
+        """Evict the run of the model and the runs derived from it. Return the evicted model ids and sizes."""
+        evicted = [(model_id, size)]
+        for run_json in self.find_runs(input_model_id=model_id):
+            child_id = run_json.get("output_model_id")
+            child_usage = self._query_index("get_run_usage", child_id) if child_id else None
+            if child_usage is not None and not child_usage[1]:
+                evicted.extend(self._evict_run(child_id, child_usage[0], dry_run))
+
+        if dry_run:
+            return evicted
+
+        removed = []
+        for evicted_id, evicted_size in evicted:
+            with self.lock_run(evicted_id, blocking=False) as locked:
+                if not locked:
+                    # another process is using the run
+                    continue
+                logger.debug("Evicting run %s from cache.", evicted_id)
+                tombstone = self._remove_run_dir(evicted_id)
+                orphan_blob_hashes = self._query_index("remove_run", evicted_id) or []
+                if tombstone is not None:
+                    shutil.rmtree(tombstone, ignore_errors=True)
+                for blob_hash in orphan_blob_hashes:
+                    self.get_blob_path(blob_hash).unlink(missing_ok=True)
+                for evaluation_json_path in self.dirs.evaluations.glob(f"{evicted_id}*.json"):
+                    if evaluation_json_path.stem == evicted_id or evaluation_json_path.stem.startswith(
+                        f"{evicted_id}-"
+                    ):
+                        evaluation_json_path.unlink(missing_ok=True)
+            removed.append((evicted_id, evicted_size))
+        return removed
+
+    def _remove_run_dir(self, model_id: str) -> Optional[Path]:
+        """Remove the run from the runs directory so that it is never loaded while its files are being deleted.
+
+        The run directory is renamed to a tombstone, so run.json and the model files disappear at once even if the
+        process dies or the deletion fails partway. Tombstones left behind are deleted when the cache is next opened.
+        If the directory cannot be renamed, its json files are deleted first instead.
+
+        :return: the directory to delete, None if the run directory does not exist.
+        """
+        run_path = self.get_run_path(model_id)
+        tombstone = self.dirs.runs / f".{model_id}.{os.getpid()}.{threading.get_ident()}{RUN_TOMBSTONE_SUFFIX}"
+        try:
+            run_path.rename(tombstone)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            # for instance, a file of the run is open on windows
+            logger.debug("Failed to rename run directory %s: %s", run_path, e)
+            self.get_run_json_path(model_id).unlink(missing_ok=True)
+            self.get_model_json_path(model_id).unlink(missing_ok=True)
+            return run_path
+        return tombstone
+
+    def _schedule_garbage_collection(self):
+        """Wake up the background garbage collection if the cache has a budget."""
+        if self.index is None or (self.max_cache_size is None and self.max_cache_age_days is None):
+            return
+        with self._gc_lock:
+            if self._gc_thread is None:
+                self._gc_event = threading.Event()
+                self._gc_stop_event = threading.Event()
+                self._gc_thread = threading.Thread(
+                    target=self._run_garbage_collection,
+                    args=(self._gc_event, self._gc_stop_event),
+                    name="olive-cache-gc",
+                    daemon=True,
+                )
+                self._gc_thread.start()
+            self._gc_event.set()
+
+    def stop_garbage_collection(self):
+        """Stop the background garbage collection and wait for the runs being evicted.
+
+        Call it before the process exits so that it does not exit in the middle of an eviction. The garbage collection
+        is started again by the next cached model.
+        """
+        with self._gc_lock:
+            gc_thread = self._gc_thread
+            if gc_thread is None:
+                return
+            self._gc_stop_event.set()
+            self._gc_event.set()
+            self._gc_thread = None
+        gc_thread.join()
+
+    def _run_garbage_collection(self, gc_event: threading.Event, stop_event: threading.Event):
+        # evict a batch of runs at a time so that the cache is never blocked on a full collection
+        while True:
+            gc_event.wait()
+            gc_event.clear()
+            if stop_event.is_set():
+                return
+            try:
+                evicted, reclaimed = self.collect_garbage(
+                    self.max_cache_size, self.max_cache_age_days, protect_recent=True, max_runs=GC_BATCH_SIZE
+                )
+            except Exception:
+                logger.warning("Failed to collect garbage in the cache.", exc_info=True)
+                continue
+            if evicted:
+                logger.debug("Evicted %d runs from cache, reclaimed %d bytes.", len(evicted), reclaimed)
+            if len(evicted) >= GC_BATCH_SIZE:
+                gc_event.set()
+
     def get_run_path(self, model_id: str) -> Path:
-        run_path = self.dirs.runs / model_id
-        run_path.mkdir(parents=True, exist_ok=True)
-        return run_path
+        return self.dirs.runs / model_id
 
     def get_run_json_path(self, model_id: str):
-        run_path = self.get_run_path(model_id)
-        return run_path / "run.json"
+        return self.get_run_path(model_id) / "run.json"
+
+    def get_lock_path(self, name: str) -> Path:
+        return self.dirs.locks / f"{name}.lock"
+
+    @contextmanager
+    def lock_run(self, model_id: str, blocking: bool = True) -> Iterator[bool]:
+        """Hold the advisory lock of the run of the model.
+
+        The lock is shared by all the processes that use the cache directory. The process that holds the lock of a
+        run owns its directory: it runs the pass and caches the run, while other processes that want the same run wait
+        for the lock and then load the cached run. Locks are released if their process dies, in which case the partial
+        model files left by the run are removed when the lock is next acquired.
+
+        :param model_id: the output model id of the run.
+        :param blocking: wait for the lock if another process holds it. Otherwise, yield False without waiting.
+        :return: whether the lock is held.
+        """
+        lock = FileLock(self.get_lock_path(model_id))
+        try:
+            lock.acquire(timeout=-1 if blocking else 0)
+        except Timeout:
+            yield False
+            return
+
+        try:
+            models_dir = self.get_run_path(model_id) / "models"
+            if models_dir.exists() and not self.get_run_json_path(model_id).exists():
+                logger.debug("Removing partial model files of run %s.", model_id)
+                shutil.rmtree(models_dir, ignore_errors=True)
+            yield True
+        finally:
+            lock.release()
 
     def get_model_json_path(self, model_id: str) -> Path:
         return self.get_run_path(model_id) / "model.json"
@@ -254,12 +838,29 @@ class OliveCache:
     def cache_evaluation(self, model_id: str, evaluation_json: Dict):
         evaluation_json_path = self.get_evaluation_json_path(model_id)
         try:
-            with evaluation_json_path.open("w") as f:
-                json.dump(evaluation_json, f, indent=4)
-                logger.debug("Cached evaluation %s to %s", model_id, evaluation_json_path)
+            _write_json(evaluation_json_path, evaluation_json)
+            logger.debug("Cached evaluation %s to %s", model_id, evaluation_json_path)
+            self._update_index("add_evaluation", model_id, evaluation_json)
         except Exception:
             logger.exception("Failed to cache evaluation")
 
+    def load_evaluation(self, model_id: str) -> Optional[Dict]:
+        """Load the evaluation from the cache directory."""
+        evaluation_json = self._query_index_entry("get_evaluation", model_id, self.get_evaluation_json_path(model_id))
+        if evaluation_json is not None:
+            return evaluation_json
+
+        evaluation_json_path = self.get_evaluation_json_path(model_id)
+        if evaluation_json_path.exists():
+            try:
+                with evaluation_json_path.open() as f:
+                    evaluation_json = json.load(f)
+                self._update_index("add_evaluation", model_id, evaluation_json)
+                return evaluation_json
+            except Exception:
+                logger.exception("Failed to load evaluation from local cache.")
+        return None
+
     def get_evaluation_json_path(self, model_id: str) -> Path:
         """Get the path to the evaluation json."""
         return self.dirs.evaluations / f"{model_id}.json"
@@ -267,8 +868,7 @@ class OliveCache:
     def cache_olive_config(self, olive_config: Dict):
         olive_config_path = self.dirs.cache_dir / "olive_config.json"
         try:
-            with olive_config_path.open("w") as f:
-                json.dump(olive_config, f, indent=4)
+            _write_json(olive_config_path, olive_config)
             logger.debug("Cached olive config to %s", olive_config_path)
         except Exception:
             logger.exception("Failed to cache olive config")
@@ -279,6 +879,10 @@ class OliveCache:
         run_json = self.get_run_json(pass_name, pass_config, input_model_id, accelerator_spec)
         return hash_dict(run_json)[:8]
 
+    def get_file_hash_memo_path(self) -> Path:
+        """Get the path of the json file that memoizes the hashes of local model files."""
+        return self.dirs.cache_dir / "file_hashes.json"
+
     def get_cache_dir(self) -> Path:
         """Return the cache directory."""
         return self.dirs.cache_dir
@@ -287,6 +891,11 @@ class OliveCache:
         """Set environment variable for the cache directory."""
         os.environ["OLIVE_CACHE_DIR"] = str(self.dirs.cache_dir)
         logger.debug("Set OLIVE_CACHE_DIR: %s", self.dirs.cache_dir)
+        if self.cache_datasets:
+            os.environ[DATASET_CACHE_DIR_ENV] = str(self.dirs.datasets)
+            logger.debug("Set %s: %s", DATASET_CACHE_DIR_ENV, self.dirs.datasets)
+        else:
+            os.environ.pop(DATASET_CACHE_DIR_ENV, None)
 
     def prepare_resources_for_local(self, config: Union[Dict, ConfigBase]) -> Union[Dict, ConfigBase]:
         """Prepare all resources in the config for local execution.
@@ -334,38 +943,51 @@ class OliveCache:
         resource_path_json = self.dirs.resources / f"{resource_path_hash}.json"
 
         # check if resource path is cached
-        if resource_path_json.exists():
+        local_resource_path = self._load_resource(resource_path_hash, resource_path_json)
+        if local_resource_path is not None:
             logger.debug("Using cached resource path %s", resource_path.to_json())
-            with resource_path_json.open("r") as f:
-                resource_path_data = json.load(f)["dest"]
-            return create_resource_path(resource_path_data)
-
-        # cache resource path
-        save_dir = self.dirs.resources / resource_path_hash
-        # ensure save directory is empty
-        if save_dir.exists():
-            shutil.rmtree(save_dir)
-        save_dir.mkdir(parents=True, exist_ok=True)
-
-        # download resource to save directory
-        logger.debug("Downloading non-local resource %s to %s", resource_path.to_json(), save_dir)
-        local_resource_path = create_resource_path(resource_path.save_to_dir(save_dir))
-
-        # cache resource path
-        logger.debug("Caching resource path %s", resource_path)
-        with resource_path_json.open("w") as f:
+            return local_resource_path
+
+        # only one process downloads the resource, the others wait for it and use the cached resource
+        with FileLock(self.get_lock_path(f"resource-{resource_path_hash}")):
+            local_resource_path = self._load_resource(resource_path_hash, resource_path_json)
+            if local_resource_path is not None:
+                logger.debug("Using cached resource path %s", resource_path.to_json())
+                return local_resource_path
+
+            # cache resource path
+            save_dir = self.dirs.resources / resource_path_hash
+            # ensure save directory is empty
+            if save_dir.exists():
+                shutil.rmtree(save_dir)
+            save_dir.mkdir(parents=True, exist_ok=True)
+
+            # download resource to save directory
+            logger.debug("Downloading non-local resource %s to %s", resource_path.to_json(), save_dir)
+            local_resource_path = create_resource_path(resource_path.save_to_dir(save_dir))
+
+            # cache resource path
+            logger.debug("Caching resource path %s", resource_path)
             data = {"source": resource_path.to_json(), "dest": local_resource_path.to_json()}
-            json.dump(data, f, indent=4)
+            _write_json(resource_path_json, data)
+            self._update_index("add_resource", resource_path_hash, data)
 
-            return local_resource_path
+        return local_resource_path
+
+    def _load_resource(self, resource_path_hash: str, resource_path_json: Path) -> Optional[ResourcePath]:
+        resource_json = self._query_index_entry("get_resource", resource_path_hash, resource_path_json)
+        if resource_json is None and resource_path_json.exists():
+            with resource_path_json.open("r") as f:
+                resource_json = json.load(f)
+            self._update_index("add_resource", resource_path_hash, resource_json)
+        return create_resource_path(resource_json["dest"]) if resource_json is not None else None
 
     def get_resource_cache_path(self):
         return self.dirs.resources
 
     def get_model_cache_path(self, model_id: str) -> Path:
-        """Get the path to the model output directory."""
-        run_path = self.get_run_path(model_id)
-        output_path = run_path / "models"
+        """Get the path to the model output directory. The directory is created if it does not exist."""
+        output_path = self.get_run_path(model_id) / "models"
         output_path.mkdir(parents=True, exist_ok=True)
         return output_path
 
@@ -466,6 +1088,7 @@ class OliveCache:
             additional_files[i] = str(dst_filepath)
 
             if not dst_filepath.exists():
+                # copy since the files in the cache can be hardlinks to blobs shared with other runs
                 shutil.copy(str(src_filepath), str(dst_filepath))
 
         if additional_files:
@@ -479,8 +1102,14 @@ class OliveCache:
 
 
 class SharedCache:
-    def __init__(self, account_name: str, container_name: str):
-        self.container_client_factory = AzureContainerClientFactory(account_name, container_name)
+    def __init__(
+        self,
+        account_name: Optional[str] = None,
+        container_name: Optional[str] = None,
+        backend: Optional[SharedCacheBackend] = None,
+    ):
+        """Shared cache in the storage backend, or in the Azure Blob Storage container if no backend is given."""
+        self.container_client_factory = backend or AzureContainerClientFactory(account_name, container_name)
 
     def cache_run(self, model_id: str, run_json_path: Path) -> None:
         """Cache run json to shared cache."""
@@ -548,7 +1177,8 @@ class SharedCache:
             if model_json["config"].get("model_attributes"):
                 model_json_copy["config"]["model_attributes"].pop("additional_files", None)
 
-            if model_json["type"].lower() == "hfmodel" and Path(model_path).exists():
+            # local model files are stored relative to the model directory of the shared cache
+            if Path(model_path).exists():
                 model_json_copy["config"]["model_path"] = Path(model_path).name
             else:
                 model_json_copy["config"]["model_path"] = model_path
@@ -571,11 +1201,12 @@ class SharedCache:
             if model_json["config"].get("model_attributes") and model_json["config"]["model_attributes"].get(
                 "additional_files"
             ):
-                additional_files = model_json["config"]["model_attributes"]["additional_files"]
-                for file in additional_files:
-                    file_path = Path(file)
-                    if file_path.exists():
-                        self._upload_file_to_blob(file_path, f"{model_files_blob}/additional_files/{file_path.name}")
+                additional_files = [Path(file) for file in model_json["config"]["model_attributes"]["additional_files"]]
+                self.container_client_factory.upload_files(
+                    (file_path, f"{model_files_blob}/additional_files/{file_path.name}")
+                    for file_path in additional_files
+                    if file_path.exists()
+                )
 
             # upload model config file
             model_config_bytes = json.dumps(model_json_copy).encode()
@@ -646,19 +1277,17 @@ class SharedCache:
         logger.debug("Updating model config with shared model path: %s", shared_model_path)
         output_model_path = Path(output_model_path) / "model"
 
-        model_directory_prefix = f"{input_model_id}/model/model"
-        blob_list = self.container_client_factory.get_blob_list(model_directory_prefix)
-        self._download_blob_list(blob_list, model_directory_prefix, output_model_path)
-
-        adapter_directory_prefix = f"{input_model_id}/model/adapter"
-        blob_list = self.container_client_factory.get_blob_list(adapter_directory_prefix)
-        self._download_blob_list(blob_list, adapter_directory_prefix, output_model_path, "adapter")
-
-        additional_files_directory_prefix = f"{input_model_id}/model/additional_files"
-        additional_files_blob_list = self.container_client_factory.get_blob_list(additional_files_directory_prefix)
-        self._download_blob_list(
-            additional_files_blob_list, additional_files_directory_prefix, output_model_path, "additional_files"
-        )
+        # list the model, adapter and additional files at once and download them concurrently
+        model_files_prefix = f"{input_model_id}/model"
+        blob_list = list(self.container_client_factory.get_blob_list(f"{model_files_prefix}/"))
+        downloads = [
+            *self._get_blob_downloads(blob_list, f"{model_files_prefix}/model", output_model_path),
+            *self._get_blob_downloads(blob_list, f"{model_files_prefix}/adapter", output_model_path, "adapter"),
+            *self._get_blob_downloads(
+                blob_list, f"{model_files_prefix}/additional_files", output_model_path, "additional_files"
+            ),
+        ]
+        self.container_client_factory.download_blobs(downloads)
 
         if model_config.type.lower() == "hfmodel" and hf_repo_exists(shared_model_path):
             model_config.config["model_path"] = shared_model_path
@@ -683,6 +1312,15 @@ class SharedCache:
             logger.exception("Failed to check shared cache for %s.", blob_name)
             return False
 
+    def exist_in_shared_cache_batch(self, blob_names: List[str]) -> Dict[str, bool]:
+        """Check the shared cache for all the blob names with one listing per model id."""
+        logger.debug("Checking shared cache for: %s", blob_names)
+        try:
+            return self.container_client_factory.exists_many(blob_names)
+        except Exception:
+            logger.exception("Failed to check shared cache for %s.", blob_names)
+            return dict.fromkeys(blob_names, False)
+
     def upload_model_files(self, model_path: str, model_blob: str):
         if model_path:
             model_path = Path(model_path)
@@ -694,26 +1332,30 @@ class SharedCache:
                     self._upload_dir_to_blob(model_path, model_blob)
 
     def _upload_dir_to_blob(self, dir_path: Path, blob_folder_name: str):
-        for item in dir_path.iterdir():
-            if item.is_dir():
-                self._upload_dir_to_blob(item, f"{blob_folder_name}/{item.name}")
-            else:
-                blob_name = f"{blob_folder_name}/{item.name}"
-                self._upload_file_to_blob(item, blob_name)
+        files = [
+            (file_path, f"{blob_folder_name}/{file_path.relative_to(dir_path).as_posix()}")
+            for file_path in sorted(dir_path.rglob("*"))
+            if file_path.is_file()
+        ]
+        self.container_client_factory.upload_files(files)
 
     def _upload_file_to_blob(self, file_path: Path, blob_name: str):
         logger.info("Uploading %s to %s", file_path, blob_name)
         with open(file_path, "rb") as data:
             self.container_client_factory.upload_blob(blob_name, data)
 
-    def _download_blob_list(
-        self, blob_list, directory_prefix: str, output_model_path: Path, prefix: str = None
-    ) -> None:
+    @staticmethod
+    def _get_blob_downloads(
+        blob_list, directory_prefix: str, output_model_path: Path, prefix: str = None
+    ) -> List[Tuple[Any, Path]]:
+        downloads = []
         for blob in blob_list:
+            if not blob.name.startswith(f"{directory_prefix}/"):
+                continue
             local_file_path = (
                 output_model_path / prefix / blob.name[len(directory_prefix) + 1 :]
                 if prefix
                 else output_model_path / blob.name[len(directory_prefix) + 1 :]
             )
-            logger.info("Downloading %s to %s", blob.name, local_file_path)
-            self.container_client_factory.download_blob(blob, local_file_path)
+            downloads.append((blob, local_file_path))
+        return downloads
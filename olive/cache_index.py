@@ -0,0 +1,250 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    model_id TEXT PRIMARY KEY,
+    input_model_id TEXT,
+    pass_name TEXT,
+    accelerator_spec TEXT,
+    run_json TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_input_model_id ON runs (input_model_id);
+CREATE INDEX IF NOT EXISTS runs_pass_name ON runs (pass_name);
+CREATE TABLE IF NOT EXISTS models (
+    model_id TEXT PRIMARY KEY,
+    model_json TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    model_id TEXT PRIMARY KEY,
+    evaluation_json TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resources (
+    resource_hash TEXT PRIMARY KEY,
+    resource_json TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_usage (
+    model_id TEXT PRIMARY KEY,
+    size INTEGER NOT NULL DEFAULT 0,
+    accessed_at REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS run_usage_accessed_at ON run_usage (accessed_at);
+CREATE TABLE IF NOT EXISTS run_blobs (
+    model_id TEXT NOT NULL,
+    blob_hash TEXT NOT NULL,
+    PRIMARY KEY (model_id, blob_hash)
+);
+CREATE INDEX IF NOT EXISTS run_blobs_blob_hash ON run_blobs (blob_hash);
+"""
+
+
+class CacheIndex:
+    """SQLite index of the runs, models, evaluations and resources in the cache directory.
+
+    The index answers lookups with a single query and supports queries over the cache contents, such as all the runs
+    of a pass. Each write is an atomic transaction. The json files in the cache directory remain the source of truth
+    that is shared with other tools, so a missing or corrupt index never loses cached results.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def __getstate__(self):
+        # connections cannot be shared between processes
+        return {"db_path": self.db_path}
+
+    def __setstate__(self, state):
+        self.db_path = state["db_path"]
+        self._local = threading.local()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # one connection per thread, concurrent writers from other threads or processes wait for the lock
+            conn = sqlite3.connect(str(self.db_path), timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = self._get_connection()
+        # commit on success, rollback on failure
+        with conn:
+            yield conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def add_run(self, model_id: str, run_json: Dict):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    model_id,
+                    run_json.get("input_model_id"),
+                    run_json.get("pass_name"),
+                    run_json.get("accelerator_spec"),
+                    json.dumps(run_json),
+                    time.time(),
+                ),
+            )
+
+    def get_run(self, model_id: str) -> Optional[Dict]:
+        return self._get_json("SELECT run_json FROM runs WHERE model_id = ?", model_id)
+
+    def find_runs(self, pass_name: Optional[str] = None, input_model_id: Optional[str] = None) -> List[Dict]:
+        """Find the runs of a pass and/or on an input model."""
+        conditions, params = [], []
+        if pass_name is not None:
+            conditions.append("pass_name = ?")
+            params.append(pass_name)
+        if input_model_id is not None:
+            conditions.append("input_model_id = ?")
+            params.append(input_model_id)
+        query = "SELECT run_json FROM runs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._connect() as conn:
+            return [json.loads(row[0]) for row in conn.execute(query + " ORDER BY created_at", params)]
+
+    def add_model(self, model_id: str, model_json: Dict):
+        self._add_json("models", model_id, model_json)
+
+    def get_model(self, model_id: str) -> Optional[Dict]:
+        return self._get_json("SELECT model_json FROM models WHERE model_id = ?", model_id)
+
+    def add_evaluation(self, model_id: str, evaluation_json: Dict):
+        self._add_json("evaluations", model_id, evaluation_json)
+
+    def get_evaluation(self, model_id: str) -> Optional[Dict]:
+        return self._get_json("SELECT evaluation_json FROM evaluations WHERE model_id = ?", model_id)
+
+    def remove_evaluation(self, model_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM evaluations WHERE model_id = ?", (model_id,))
+
+    def clear_evaluations(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM evaluations")
+
+    def add_resource(self, resource_hash: str, resource_json: Dict):
+        self._add_json("resources", resource_hash, resource_json)
+
+    def get_resource(self, resource_hash: str) -> Optional[Dict]:
+        return self._get_json("SELECT resource_json FROM resources WHERE resource_hash = ?", resource_hash)
+
+    def remove_resource(self, resource_hash: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM resources WHERE resource_hash = ?", (resource_hash,))
+
+    def touch_run(self, model_id: str, size: Optional[int] = None, accessed_at: Optional[float] = None):
+        """Record an access to the run directory of the model and its size in bytes, if given."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO run_usage (model_id, size, accessed_at) VALUES (?, ?, ?) ON CONFLICT (model_id) DO UPDATE"
+                " SET accessed_at = excluded.accessed_at, size = COALESCE(?, size)",
+                (model_id, size or 0, accessed_at or time.time(), size),
+            )
+
+    def pin_runs(self, model_ids: List[str]):
+        """Protect the run directories of the models from eviction."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO run_usage (model_id, accessed_at, pinned) VALUES (?, ?, 1)"
+                " ON CONFLICT (model_id) DO UPDATE SET pinned = 1",
+                [(model_id, time.time()) for model_id in model_ids],
+            )
+
+    def get_usage(self) -> Tuple[int, int]:
+        """Get the number of run directories and their total size in bytes."""
+        with self._connect() as conn:
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM run_usage").fetchone()
+        return count, size
+
+    def get_run_usage(self, model_id: str) -> Optional[Tuple[int, bool]]:
+        """Get the size in bytes of the run directory of the model and whether it is pinned."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT size, pinned FROM run_usage WHERE model_id = ?", (model_id,)).fetchone()
+        return (row[0], bool(row[1])) if row else None
+
+    def get_usage_model_ids(self) -> List[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT model_id FROM run_usage")]
+
+    def get_eviction_candidates(
+        self, limit: int, accessed_before: Optional[float] = None, offset: int = 0
+    ) -> List[Tuple[str, int, float]]:
+        """Get the least recently used unpinned runs as (model_id, size, accessed_at), oldest first."""
+        query = "SELECT model_id, size, accessed_at FROM run_usage WHERE pinned = 0"
+        params = []
+        if accessed_before is not None:
+            query += " AND accessed_at < ?"
+            params.append(accessed_before)
+        with self._connect() as conn:
+            return [
+                tuple(row)
+                for row in conn.execute(query + " ORDER BY accessed_at LIMIT ? OFFSET ?", [*params, limit, offset])
+            ]
+
+    def add_run_blobs(self, model_id: str, blob_hashes: List[str]):
+        """Record the blobs that the run directory of the model links to."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO run_blobs VALUES (?, ?)", [(model_id, blob_hash) for blob_hash in blob_hashes]
+            )
+
+    def remove_run(self, model_id: str) -> List[str]:
+        """Remove the run of the model, the model and its evaluations from the index.
+
+        Return the hashes of the blobs that are no longer linked by any run.
+        """
+        with self._connect() as conn:
+            blob_hashes = [
+                row[0] for row in conn.execute("SELECT blob_hash FROM run_blobs WHERE model_id = ?", (model_id,))
+            ]
+            for table in ("runs", "models", "run_usage", "run_blobs"):
+                conn.execute(f"DELETE FROM {table} WHERE model_id = ?", (model_id,))
+            # evaluations are keyed by the model id, optionally followed by the accelerator spec
+            conn.execute(
+                "DELETE FROM evaluations WHERE model_id = ? OR model_id LIKE ? ESCAPE '\\'",
+                (model_id, model_id.replace("_", "\\_").replace("%", "\\%") + "-%"),
+            )
+            return [
+                blob_hash
+                for blob_hash in blob_hashes
+                if conn.execute("SELECT 1 FROM run_blobs WHERE blob_hash = ?", (blob_hash,)).fetchone() is None
+            ]
+
+    def _add_json(self, table: str, key: str, value: Dict):
+        with self._connect() as conn:
+            conn.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)", (key, json.dumps(value), time.time()))
+
+    def _get_json(self, query: str, key: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(query, (key,)).fetchone()
+        return json.loads(row[0]) if row else None
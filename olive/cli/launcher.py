@@ -7,6 +7,7 @@ from argparse import ArgumentParser
 from warnings import warn
 
 from olive.cli.auto_opt import AutoOptCommand
+from olive.cli.cache import CacheCommand
 from olive.cli.capture_onnx import CaptureOnnxGraphCommand
 from olive.cli.configure_qualcomm_sdk import ConfigureQualcommSDKCommand
 from olive.cli.convert_adapters import ConvertAdaptersCommand
@@ -44,6 +45,7 @@ def get_cli_parser(called_as_console_script: bool = True) -> ArgumentParser:
     ConfigureQualcommSDKCommand.register_subcommand(commands_parser)
     ManageAMLComputeCommand.register_subcommand(commands_parser)
     SharedCacheCommand.register_subcommand(commands_parser)
+    CacheCommand.register_subcommand(commands_parser)
 
     return parser
 
@@ -6,6 +6,7 @@ import logging
 
 from olive.cli.base import BaseOliveCLICommand
 from olive.common.container_client_factory import AzureContainerClientFactory
+from olive.common.shared_cache_backend import create_shared_cache_backend
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +34,20 @@ class SharedCacheCommand(BaseOliveCLICommand):
         sub_parser.add_argument(
             "--account",
             type=str,
-            required=True,
-            help="The account name for the shared cache.",
+            help="The account name for the shared cache in Azure Blob Storage.",
         )
         sub_parser.add_argument(
             "--container",
             type=str,
-            required=True,
-            help="The container name for the shared cache.",
+            help="The container name for the shared cache in Azure Blob Storage.",
+        )
+        sub_parser.add_argument(
+            "--shared_cache_dir",
+            type=str,
+            help=(
+                "The url of a shared cache that is not in Azure Blob Storage: s3://<bucket>/<prefix> for an S3"
+                " compatible bucket or file:///<path> for a directory. Used instead of --account and --container."
+            ),
         )
         sub_parser.add_argument(
             "--model_hash",
@@ -50,9 +57,14 @@ class SharedCacheCommand(BaseOliveCLICommand):
         sub_parser.set_defaults(func=SharedCacheCommand)
 
     def run(self):
-        container_client_factory = AzureContainerClientFactory(
-            self.args.account, self.args.container, exclude_managed_identity_credential=True
-        )
+        if self.args.shared_cache_dir:
+            container_client_factory = create_shared_cache_backend(self.args.shared_cache_dir)
+        elif self.args.account and self.args.container:
+            container_client_factory = AzureContainerClientFactory(
+                self.args.account, self.args.container, exclude_managed_identity_credential=True
+            )
+        else:
+            raise ValueError("Either --shared_cache_dir or both --account and --container must be provided.")
         if self.args.delete:
             if self.args.all:
                 if self.args.yes:
@@ -22,6 +22,8 @@ KEYVAULT_NAME = "KEYVAULT_NAME"
 
 DEFAULT_WORKFLOW_ID = "default_workflow"
 DEFAULT_CACHE_DIR = ".olive-cache"
+# set by the engine to the directory of the dataset cache, unset if the datasets are not cached
+DATASET_CACHE_DIR_ENV = "OLIVE_DATASET_CACHE_DIR"
 
 
 ############# Packaging #############
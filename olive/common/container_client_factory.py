@@ -1,12 +1,17 @@
 import logging
 
 from olive.common.constants import ACCOUNT_URL_TEMPLATE
+from olive.common.shared_cache_backend import SharedCacheBackend
 from olive.common.utils import get_credentials, retry_func
 
 logger = logging.getLogger(__name__)
 
 
-class AzureContainerClientFactory:
+class AzureContainerClientFactory(SharedCacheBackend):
+    """Shared cache stored in an Azure Blob Storage container."""
+
+    supports_range_reads = True
+
     def __init__(self, account_name, container_name, **credential_kwargs):
         try:
             from azure.storage.blob import ContainerClient
@@ -58,6 +63,13 @@ class AzureContainerClientFactory:
             download_file.write(download_stream.readall())
         logger.debug("File %s downloaded to %s successfully.", blob_name, file_path)
 
+    def read_blob_range(self, blob_name, offset, length):
+        return retry_func(self._read_blob_range, [blob_name, offset, length])
+
+    def _read_blob_range(self, blob_name, offset, length):
+        blob_client = self.client.get_blob_client(blob_name)
+        return blob_client.download_blob(offset=offset, length=length).readall()
+
     def exists(self, blob_name=None):
         blob_list = self.get_blob_list(blob_name)
         return any(blob_list)
@@ -8,6 +8,7 @@
 import collections
 import logging
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
 
@@ -76,11 +77,14 @@ def get_ort_inference_session(
     inter_op_num_threads = session_options.get("inter_op_num_threads")
     intra_op_num_threads = session_options.get("intra_op_num_threads")
     enable_profiling = session_options.get("enable_profiling", False)
+    profile_file_prefix = session_options.get("profile_file_prefix")
     execution_mode = session_options.get("execution_mode")
     graph_optimization_level = session_options.get("graph_optimization_level")
     extra_session_config = session_options.get("extra_session_config")
     if enable_profiling:
         sess_options.enable_profiling = True
+    if profile_file_prefix:
+        sess_options.profile_file_prefix = profile_file_prefix
     if inter_op_num_threads:
         sess_options.inter_op_num_threads = inter_op_num_threads
     if intra_op_num_threads:
@@ -310,8 +314,17 @@ class OrtInferenceSession:
         self, input_feed: Dict[str, "NDArray"], num_runs: int, num_warmup: int = 0, sleep_time: int = 0
     ) -> Sequence[float]:
         """Time inference runs with the given input data."""
-        input_feed = self.get_full_input_feed(input_feed)
         latencies = []
+        with self.timed_runner(input_feed) as run:
+            for _ in range(num_warmup + num_runs):
+                latencies.append(run())
+                time.sleep(sleep_time)
+        return latencies[num_warmup:]
+
+    @contextmanager
+    def timed_runner(self, input_feed: Dict[str, "NDArray"]):
+        """Bind the input data and yield a function that runs the session once and returns the latency in seconds."""
+        input_feed = self.get_full_input_feed(input_feed)
         if self.io_bind:
             bind_input_data(
                 self.io_binding,
@@ -322,22 +335,22 @@ class OrtInferenceSession:
                 kv_cache_ortvalues=self.kv_cache_ortvalues,
             )
 
-        for _ in range(num_warmup + num_runs):
+        def run() -> float:
             if self.io_bind:
                 self.io_binding.synchronize_inputs()
                 t = time.perf_counter()
                 self.session.run_with_iobinding(self.io_binding)
                 self.io_binding.synchronize_outputs()
-                latencies.append(time.perf_counter() - t)
-            else:
-                t = time.perf_counter()
-                self.session.run(None, input_feed)
-                latencies.append(time.perf_counter() - t)
-            time.sleep(sleep_time)
-
-        if self.io_bind:
-            self.io_binding.clear_binding_inputs()
-        return latencies[num_warmup:]
+                return time.perf_counter() - t
+            t = time.perf_counter()
+            self.session.run(None, input_feed)
+            return time.perf_counter() - t
+
+        try:
+            yield run
+        finally:
+            if self.io_bind:
+                self.io_binding.clear_binding_inputs()
 
 
 def bind_input_data(
@@ -0,0 +1,150 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from olive.common.config_utils import ConfigBase
+
+logger = logging.getLogger(__name__)
+
+# interval in seconds between samples of the resident set size of the process
+RSS_SAMPLING_INTERVAL = 0.05
+
+# stacks of stage collectors of each thread
+_local = threading.local()
+
+
+class StageProfile(ConfigBase):
+    """Time and resources spent by the process in a stage of the workflow."""
+
+    name: str
+    start_time: float
+    end_time: float
+    # peak resident set size of the process during the stage, in bytes
+    peak_rss: Optional[int] = None
+    # bytes read from and written to storage by the process during the stage
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+    pid: int = None
+    thread_id: int = None
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+
+class _ResourceSampler:
+    """Sample the resident set size of the process in a background thread and track its io counters.
+
+    All the values are None if psutil is not installed or the platform does not provide them.
+    """
+
+    def __init__(self):
+        try:
+            import psutil
+
+            self._process = psutil.Process()
+        except ImportError:
+            self._process = None
+
+        self._peak_rss = None
+        self._io_counters = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _sample_rss(self):
+        try:
+            rss = self._process.memory_info().rss
+        except Exception:
+            return
+        self._peak_rss = rss if self._peak_rss is None else max(self._peak_rss, rss)
+
+    def _get_io_counters(self) -> Optional[Tuple[int, int]]:
+        try:
+            io_counters = self._process.io_counters()
+        except Exception:
+            return None
+        return io_counters.read_bytes, io_counters.write_bytes
+
+    def _run(self):
+        while not self._stop_event.wait(RSS_SAMPLING_INTERVAL):
+            self._sample_rss()
+
+    def start(self):
+        if self._process is None:
+            return
+        self._io_counters = self._get_io_counters()
+        self._sample_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """Stop sampling and return the peak rss, bytes read and bytes written since the start."""
+        if self._process is None:
+            return None, None, None
+        self._stop_event.set()
+        self._thread.join()
+        self._sample_rss()
+
+        read_bytes = write_bytes = None
+        io_counters = self._get_io_counters()
+        if self._io_counters and io_counters:
+            read_bytes = io_counters[0] - self._io_counters[0]
+            write_bytes = io_counters[1] - self._io_counters[1]
+        return self._peak_rss, read_bytes, write_bytes
+
+
+@contextmanager
+def collect_stages() -> Iterator[List[StageProfile]]:
+    """Collect the profiles of the stages run by the current thread within the context.
+
+    Stages profiled within a nested collector are only collected by the nested collector.
+    """
+    if not hasattr(_local, "collectors"):
+        _local.collectors = []
+    stages = []
+    _local.collectors.append(stages)
+    try:
+        yield stages
+    finally:
+        _local.collectors.pop()
+
+
+@contextmanager
+def profile_stage(name: str):
+    """Profile the time, peak memory and io of a stage.
+
+    The profile is added to the innermost stage collector of the current thread. Does nothing if there is none.
+    """
+    collectors = getattr(_local, "collectors", None)
+    if not collectors:
+        yield
+        return
+
+    stages = collectors[-1]
+    sampler = _ResourceSampler()
+    sampler.start()
+    start_time = time.time()
+    try:
+        yield
+    finally:
+        end_time = time.time()
+        peak_rss, read_bytes, write_bytes = sampler.stop()
+        stages.append(
+            StageProfile(
+                name=name,
+                start_time=start_time,
+                end_time=end_time,
+                peak_rss=peak_rss,
+                read_bytes=read_bytes,
+                write_bytes=write_bytes,
+                pid=os.getpid(),
+                thread_id=threading.get_native_id(),
+            )
+        )
@@ -8,6 +8,7 @@ import inspect
 import io
 import json
 import logging
+import multiprocessing
 import os
 import pickle
 import platform
@@ -17,9 +18,12 @@ import subprocess
 import sys
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
+from filelock import FileLock
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,6 +82,16 @@ def run_subprocess(cmd, env=None, cwd=None, check=False):
     return returncode, stdout, stderr
 
 
+def run_in_fresh_process(func, *args, **kwargs):
+    """Run the function in a new spawned process and return its result.
+
+    func must be picklable. Spawn is used since a forked process inherits the memory, the loaded libraries and the
+    thread pools of the parent.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(func, *args, **kwargs).result()
+
+
 def hash_string(string):  # pragma: no cover
     md5_hash = hashlib.sha256()
     md5_hash.update(string.encode())
@@ -92,15 +106,91 @@ def hash_io_stream(f, block_size=4096):  # pragma: no cover
     return md5_hash.hexdigest()
 
 
-def hash_file(filename, block_size=4096):  # pragma: no cover
-    with open(filename, "rb") as f:
-        return hash_io_stream(f, block_size)
+def hash_file(filename, block_size=8 * 1024 * 1024):  # pragma: no cover
+    file_hash = hashlib.sha256()
+    # read into a reused buffer so that large files are not copied block by block
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    with open(filename, "rb", buffering=0) as f:
+        for size in iter(lambda: f.readinto(buffer), 0):
+            file_hash.update(view[:size])
+    return file_hash.hexdigest()
+
+
+def _file_hash_memo_key(stat_result: os.stat_result) -> List[int]:
+    return [stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino]
+
+
+def _load_file_hash_memo(memo_path: Union[str, Path]) -> Dict[str, Dict]:
+    if not Path(memo_path).exists():
+        return {}
+    try:
+        with Path(memo_path).open() as f:
+            return json.load(f)
+    except Exception:
+        logger.warning("Failed to load file hash memo %s, hashing all files.", memo_path, exc_info=True)
+        return {}
+
+
+def _save_file_hash_memo(memo_path: Union[str, Path], new_entries: Dict[str, Dict]):
+    """Merge the new entries into the memo on disk and drop the entries of files that no longer exist.
+
+    The memo is locked while it is merged, so concurrent writers do not drop each other's entries.
+    """
+    with FileLock(f"{memo_path}.lock"):
+        memo = _load_file_hash_memo(memo_path)
+        memo.update(new_entries)
+        memo = {file_path: entry for file_path, entry in memo.items() if Path(file_path).exists()}
+        # write to a temporary file and replace so that readers without the lock never see a partial memo
+        tmp_memo_path = Path(f"{memo_path}.{os.getpid()}.tmp")
+        with tmp_memo_path.open("w") as f:
+            json.dump(memo, f)
+        tmp_memo_path.replace(memo_path)
+
+
+def hash_files(
+    file_paths: List[Union[str, Path]], memo_path: Optional[Union[str, Path]] = None, max_workers: Optional[int] = None
+) -> List[str]:
+    """Hash the files concurrently and return their hashes in the same order.
+
+    If memo_path is provided, the hashes are memoized in that json file keyed by the absolute path of each file. A
+    file is only hashed again if its size, modification time or inode changed since it was memoized.
+    """
+    file_paths = [Path(file_path).resolve() for file_path in file_paths]
+
+    memo = _load_file_hash_memo(memo_path) if memo_path else {}
+
+    hashes = {}
+    to_hash = {}
+    for file_path in file_paths:
+        memo_key = _file_hash_memo_key(file_path.stat())
+        entry = memo.get(str(file_path))
+        if entry and entry["key"] == memo_key:
+            hashes[file_path] = entry["hash"]
+        else:
+            to_hash[file_path] = memo_key
+
+    if to_hash:
+        new_entries = {}
+        # hashlib releases the GIL while hashing large buffers, so threads hash files in parallel
+        with ThreadPoolExecutor(max_workers=max_workers or min(len(to_hash), os.cpu_count() or 1)) as executor:
+            for file_path, file_hash in zip(to_hash, executor.map(hash_file, to_hash)):
+                hashes[file_path] = file_hash
+                new_entries[str(file_path)] = {"key": to_hash[file_path], "hash": file_hash}
+
+        if memo_path:
+            try:
+                _save_file_hash_memo(memo_path, new_entries)
+            except Exception:
+                logger.warning("Failed to save file hash memo %s.", memo_path, exc_info=True)
+
+    return [hashes[file_path] for file_path in file_paths]
 
 
 def hash_update_from_file(filename, hash_value):
     assert Path(filename).is_file()
     with open(str(filename), "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             hash_value.update(chunk)
     return hash_value
 
@@ -0,0 +1,320 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader
+
+from olive.common.constants import DATASET_CACHE_DIR_ENV
+from olive.common.utils import hash_dict, hash_file, hash_function
+
+if TYPE_CHECKING:
+    from olive.data.config import DataConfig
+    from olive.data.container.data_container import DataContainer
+
+logger = logging.getLogger(__name__)
+
+# arrays are aligned in the data file so that the memory mapped views are aligned for any dtype
+ARRAY_ALIGNMENT = 64
+# suffixes of the store directories that are being written and deleted
+STORE_TMP_SUFFIX = ".tmp"
+STORE_TOMBSTONE_SUFFIX = ".deleting"
+# stores that have not been written to for this long were left behind by processes that died while writing them
+STALE_STORE_WRITE_SECONDS = 24 * 3600
+
+
+class UnsupportedBatchError(TypeError):
+    """The batch contains values that cannot be stored."""
+
+
+def get_dataset_cache_dir() -> Optional[Path]:
+    """Get the directory of the dataset cache, or None if the datasets are not cached."""
+    cache_dir = os.environ.get(DATASET_CACHE_DIR_ENV)
+    return Path(cache_dir) if cache_dir else None
+
+
+def _get_path_stamp(value: Any) -> Optional[List[int]]:
+    # the size and modification time of the data files stand in for their contents which can be large
+    if not isinstance(value, (str, Path)) or not value:
+        return None
+    try:
+        stat_result = Path(value).stat()
+    except (OSError, ValueError):
+        return None
+    return [stat_result.st_size, stat_result.st_mtime_ns]
+
+
+def get_data_config_hash(data_config: "DataConfig") -> Optional[str]:
+    """Get the hash of the data config, the code of its components and its local data files.
+
+    Return None if the data config cannot be hashed, such as when its parameters are python objects.
+    """
+    try:
+        components = {}
+        for name, component in (
+            ("load_dataset", data_config.load_dataset),
+            ("pre_process_data", data_config.pre_process),
+            ("post_process_data", data_config.post_process),
+            ("dataloader", data_config.dataloader),
+        ):
+            params = data_config.components[name].params or {}
+            components[name] = {
+                "source": hash_function(component) if component else None,
+                "paths": {key: _get_path_stamp(value) for key, value in params.items() if _get_path_stamp(value)},
+            }
+        return hash_dict(
+            {
+                "data_config": data_config.to_json(),
+                "components": components,
+                "user_script": hash_file(data_config.user_script) if _get_path_stamp(data_config.user_script) else None,
+            }
+        )
+    except (TypeError, ValueError, OSError):
+        logger.debug("Cannot hash data config %s, it is not cached.", data_config.name, exc_info=True)
+        return None
+
+
+def _flatten(obj: Any, arrays: List[np.ndarray]) -> Dict:
+    """Get the structure of the batch and collect its arrays."""
+    if isinstance(obj, torch.Tensor):
+        if obj.dtype == torch.bfloat16:
+            raise UnsupportedBatchError("bfloat16 tensors cannot be stored.")
+        arrays.append(np.ascontiguousarray(obj.detach().cpu().numpy()))
+        return {"tensor": len(arrays) - 1}
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            raise UnsupportedBatchError("Object arrays cannot be stored.")
+        arrays.append(np.ascontiguousarray(obj))
+        return {"ndarray": len(arrays) - 1}
+    if isinstance(obj, dict):
+        if not all(isinstance(key, str) for key in obj):
+            raise UnsupportedBatchError("Only dicts with string keys can be stored.")
+        return {"dict": {key: _flatten(value, arrays) for key, value in obj.items()}}
+    if isinstance(obj, (list, tuple)):
+        return {type(obj).__name__: [_flatten(value, arrays) for value in obj]}
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"value": obj}
+    raise UnsupportedBatchError(f"Values of type {type(obj)} cannot be stored.")
+
+
+def _unflatten(structure: Dict, arrays: List[np.ndarray]) -> Any:
+    kind, value = next(iter(structure.items()))
+    if kind == "tensor":
+        return torch.from_numpy(arrays[value])
+    if kind == "ndarray":
+        return arrays[value]
+    if kind == "dict":
+        return {key: _unflatten(item, arrays) for key, item in value.items()}
+    if kind == "list":
+        return [_unflatten(item, arrays) for item in value]
+    if kind == "tuple":
+        return tuple(_unflatten(item, arrays) for item in value)
+    return value
+
+
+class DatasetStore:
+    """Collated batches of a data config stored in a directory of the dataset cache.
+
+    The arrays of all the batches are written back to back to data.bin and read back through a memory map, so the
+    batches are not loaded into memory up front. index.json holds the structure of each batch and the dtype, shape and
+    offset of its arrays. It is written last and the directory is renamed into place, so a store either is complete or
+    does not exist.
+    """
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        with (self.store_dir / "index.json").open() as f:
+            self.batches = json.load(f)["batches"]
+        self._data = None
+
+    @staticmethod
+    def exists(store_dir: Union[str, Path]) -> bool:
+        return (Path(store_dir) / "index.json").exists()
+
+    def __len__(self) -> int:
+        return len(self.batches)
+
+    def __iter__(self) -> Iterator[Any]:
+        for idx in range(len(self.batches)):
+            yield self[idx]
+
+    def __getitem__(self, idx: int) -> Any:
+        if self._data is None:
+            data_path = self.store_dir / "data.bin"
+            # copy on write, the tensors are writable without changing the store
+            self._data = np.memmap(data_path, mode="c") if data_path.stat().st_size else np.empty(0, dtype=np.uint8)
+        batch = self.batches[idx]
+        arrays = [
+            self._data[offset : offset + nbytes].view(dtype).reshape(shape)
+            for dtype, shape, offset, nbytes in batch["arrays"]
+        ]
+        return _unflatten(batch["structure"], arrays)
+
+
+class _DatasetStoreWriter:
+    def __init__(self, store_dir: Path):
+        self.store_dir = store_dir
+        self.tmp_dir = store_dir.with_name(f".{store_dir.name}.{os.getpid()}.{threading.get_ident()}{STORE_TMP_SUFFIX}")
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.data_file = (self.tmp_dir / "data.bin").open("wb")
+        self.offset = 0
+        self.batches = []
+
+    def add(self, batch: Any):
+        arrays = []
+        structure = _flatten(batch, arrays)
+        array_infos = []
+        for array in arrays:
+            padding = -self.offset % ARRAY_ALIGNMENT
+            self.data_file.write(b"\0" * padding)
+            self.offset += padding
+            self.data_file.write(array.tobytes())
+            array_infos.append([array.dtype.str, list(array.shape), self.offset, array.nbytes])
+            self.offset += array.nbytes
+        self.batches.append({"structure": structure, "arrays": array_infos})
+
+    def commit(self):
+        self.data_file.close()
+        with (self.tmp_dir / "index.json").open("w") as f:
+            json.dump({"batches": self.batches}, f)
+        try:
+            self.tmp_dir.replace(self.store_dir)
+            logger.debug("Cached %d batches to %s.", len(self.batches), self.store_dir)
+        except OSError:
+            # another process stored the same dataset first
+            self.abort()
+
+    def abort(self):
+        self.data_file.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class CachingDataLoader:
+    """Dataloader that stores the batches of the wrapped dataloader while they are iterated.
+
+    The store is only kept once the dataloader is iterated to the end. Attributes of the wrapped dataloader, such as
+    batch_size, are passed through.
+    """
+
+    def __init__(self, dataloader, store_dir: Path):
+        self.dataloader = dataloader
+        self.store_dir = store_dir
+
+    def __len__(self) -> int:
+        return len(self.dataloader)
+
+    def __getattr__(self, name: str):
+        return getattr(self.__dict__["dataloader"], name)
+
+    def __iter__(self) -> Iterator[Any]:
+        writer = None if DatasetStore.exists(self.store_dir) else _DatasetStoreWriter(self.store_dir)
+        try:
+            for batch in self.dataloader:
+                if writer:
+                    try:
+                        writer.add(batch)
+                    except UnsupportedBatchError as e:
+                        logger.debug("Not caching the batches in %s: %s", self.store_dir, e)
+                        writer.abort()
+                        writer = None
+                yield batch
+            if writer:
+                writer.commit()
+                writer = None
+        finally:
+            # the iteration stopped early or failed
+            if writer:
+                writer.abort()
+
+
+def get_dataset_stores(cache_dir: Path) -> List[Tuple[Path, int, float]]:
+    """Get the complete stores of the dataset cache, least recently used first.
+
+    :return: list of (store_dir, size in bytes, time of last use) of the stores.
+    """
+    stores = []
+    for store_dir in cache_dir.iterdir() if cache_dir.is_dir() else []:
+        if store_dir.name.startswith("."):
+            continue
+        try:
+            # the index is touched every time the store is loaded
+            last_used = (store_dir / "index.json").stat().st_mtime
+            size = sum(path.stat().st_size for path in store_dir.iterdir())
+        except OSError:
+            continue
+        stores.append((store_dir, size, last_used))
+    return sorted(stores, key=lambda store: store[2])
+
+
+def remove_dataset_store(store_dir: Path) -> bool:
+    """Delete the store. Return False if it cannot be deleted, such as when it is in use on windows.
+
+    The store directory is renamed to a tombstone first so that it is never loaded partially deleted.
+    """
+    tombstone = store_dir.with_name(f".{store_dir.name}.{os.getpid()}.{threading.get_ident()}{STORE_TOMBSTONE_SUFFIX}")
+    try:
+        store_dir.rename(tombstone)
+    except OSError as e:
+        logger.debug("Failed to remove dataset store %s: %s", store_dir, e)
+        return False
+    shutil.rmtree(tombstone, ignore_errors=True)
+    return True
+
+
+def remove_stale_dataset_stores(cache_dir: Path):
+    """Delete the stores left behind by processes that died while writing or deleting them."""
+    stale_time = time.time() - STALE_STORE_WRITE_SECONDS
+    for store_dir in cache_dir.glob(f".*{STORE_TOMBSTONE_SUFFIX}"):
+        shutil.rmtree(store_dir, ignore_errors=True)
+    for store_dir in cache_dir.glob(f".*{STORE_TMP_SUFFIX}"):
+        try:
+            # data.bin is appended to while the store is written
+            last_write = max(path.stat().st_mtime for path in [store_dir, *store_dir.iterdir()])
+        except OSError:
+            continue
+        if last_write < stale_time:
+            logger.debug("Removing stale dataset store %s.", store_dir)
+            shutil.rmtree(store_dir, ignore_errors=True)
+
+
+def create_cached_dataloader(data_container: "DataContainer", cache_dir: Optional[Path] = None):
+    """Create the dataloader of the data container, reusing the batches stored in the dataset cache.
+
+    The first dataloader of a data config stores its batches while it is iterated. The dataloaders created after that
+    read the stored batches instead of loading and preprocessing the dataset again. The dataloader is created as usual
+    if there is no dataset cache, the batches are shuffled or the data config cannot be hashed.
+    """
+    cache_dir = cache_dir or get_dataset_cache_dir()
+    # shuffled batches are not cached, the order would be the same every time
+    if not cache_dir or (data_container.config.dataloader_params or {}).get("shuffle"):
+        return data_container.create_dataloader()
+    data_config_hash = get_data_config_hash(data_container.config)
+    if not data_config_hash:
+        return data_container.create_dataloader()
+
+    store_dir = Path(cache_dir) / data_config_hash
+    if DatasetStore.exists(store_dir):
+        try:
+            logger.debug("Loading the batches of data config %s from %s.", data_container.config.name, store_dir)
+            store = DatasetStore(store_dir)
+            # record the use of the store for the garbage collection of the cache
+            with suppress(OSError):
+                os.utime(store_dir / "index.json")
+            return store
+        except (OSError, ValueError):
+            logger.warning("Failed to load the cached batches from %s.", store_dir, exc_info=True)
+            return data_container.create_dataloader()
+    dataloader = data_container.create_dataloader()
+    # only torch dataloaders are cached, other dataloaders such as the file list dataloaders of SNPE are used as is
+    return CachingDataLoader(dataloader, store_dir) if isinstance(dataloader, DataLoader) else dataloader
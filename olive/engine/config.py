@@ -25,3 +25,5 @@ class EngineConfig(ConfigBase, extra=Extra.forbid):
     evaluator: OliveEvaluatorConfig = None
     plot_pareto_frontier: bool = False
     no_artifacts: bool = False
+    max_workers: int = 1
+    pipeline_evaluation: bool = False
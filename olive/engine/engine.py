@@ -7,18 +7,24 @@ import logging
 import shutil
 import time
 from collections import OrderedDict, defaultdict
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from olive.cache import CacheConfig, OliveCache
-from olive.common.config_utils import validate_config
+from olive.common.config_utils import ConfigBase, validate_config
 from olive.common.constants import DEFAULT_WORKFLOW_ID, LOCAL_INPUT_MODEL_ID
+from olive.common.profiling import collect_stages, profile_stage
 from olive.engine.config import FAILED_CONFIG, INVALID_CONFIG, PRUNED_CONFIGS
 from olive.engine.footprint import Footprint, FootprintNode, FootprintNodeMetric, get_best_candidate_node
 from olive.engine.packaging.packaging_generator import generate_output_artifacts
-from olive.evaluator.metric import Metric
+from olive.engine.scheduler import ResourceRequest, get_model_size
+from olive.engine.worker_pool import EngineWorkerPool
+from olive.evaluator.metric import Metric, MetricType
+from olive.evaluator.metric_config import MetricGoal
 from olive.evaluator.metric_result import MetricResult, joint_metric_key
 from olive.evaluator.olive_evaluator import OliveEvaluatorConfig
 from olive.exception import EXCEPTIONS_TO_RAISE, OlivePassError
@@ -56,6 +62,8 @@ class Engine:
         cache_config: Optional[Union[Dict[str, Any], CacheConfig]] = None,
         plot_pareto_frontier: bool = False,
         no_artifacts: bool = False,
+        max_workers: int = 1,
+        pipeline_evaluation: bool = False,
         *,
         azureml_client_config=None,
     ):
@@ -81,6 +89,17 @@ class Engine:
 
         self.plot_pareto_frontier = plot_pareto_frontier
         self.skip_saving_artifacts = no_artifacts
+        # number of local worker processes used to run independent pass flows concurrently
+        self.max_workers = max_workers
+        # evaluate the output model of a search step while the passes of the next step run
+        self.pipeline_evaluation = pipeline_evaluation
+        if pipeline_evaluation and max_workers > 1:
+            logger.warning(
+                "pipeline_evaluation is disabled since max_workers is %d. The worker pool already runs the search"
+                " steps concurrently.",
+                max_workers,
+            )
+            self.pipeline_evaluation = False
         self.azureml_client_config = azureml_client_config
 
         # dictionary of passes
@@ -93,8 +112,41 @@ class Engine:
 
         self.footprints = defaultdict(Footprint)
 
+        # output model configs of the accelerator agnostic runs done before the accelerator specs were optimized
+        # {"output_model_id": model_config}
+        self.agnostic_runs: Dict[str, ModelConfig] = {}
+
         self._initialized = False
 
+    def __getstate__(self):
+        """Get the state of the engine to replicate it in worker processes.
+
+        Configs with dynamically created config classes cannot be pickled so they are serialized to json. Passes and
+        footprints are not carried over. The passes are set up again for the accelerator spec in the worker.
+        """
+        state = self.__dict__.copy()
+        state["search_strategy"] = (
+            self.search_strategy.config.to_json(check_object=True) if self.search_strategy else None
+        )
+        state["evaluator_config"] = _config_to_json(self.evaluator_config)
+        state["pass_config"] = OrderedDict(
+            (name, {**config, "type": config["type"].__name__, "evaluator": _config_to_json(config["evaluator"])})
+            for name, config in self.pass_config.items()
+        )
+        state["passes"] = OrderedDict()
+        state["footprints"] = defaultdict(Footprint)
+        state["agnostic_runs"] = {}
+        return state
+
+    def __setstate__(self, state):
+        state["search_strategy"] = SearchStrategy(state["search_strategy"]) if state["search_strategy"] else None
+        state["evaluator_config"] = _config_from_json(state["evaluator_config"], OliveEvaluatorConfig)
+        for config in state["pass_config"].values():
+            # import through the package config so that the class variables of the pass are set
+            config["type"] = state["olive_config"].import_pass_module(config["type"])
+            config["evaluator"] = _config_from_json(config["evaluator"], OliveEvaluatorConfig)
+        self.__dict__.update(state)
+
     def initialize(self, log_to_file: bool = False, log_severity_level: int = 1):
         """Initialize engine state. This should be done before running the registered passes."""
         if log_to_file:
@@ -215,6 +267,7 @@ class Engine:
             Search mode:
                 1. One accelerator spec:
                     output_dir/footprints.json: footprint of the run
+                    output_dir/trace.json: chrome trace of the time and resources spent in each stage
                     output_dir/pareto_frontier_footprints.json: pareto frontier footprints
                     output_dir/run_history.txt: run history
                     output_dir/input_model_metrics.json: evaluation results of the input model
@@ -227,6 +280,7 @@ class Engine:
             No search mode:
                 1. One accelerator spec
                     output_dir/footprints.json: footprint of the run
+                    output_dir/trace.json: chrome trace of the time and resources spent in each stage
                     output_dir/run_history.txt: run history
                     output_dir/input_model_metrics.json: evaluation results of the input model
                     output_dir/output_footprints.json: footprint of the output models
@@ -250,58 +304,167 @@ class Engine:
         output_dir: Path = (Path(output_dir) if output_dir else Path.cwd()).resolve()
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        outputs = {}
-        output_subdirs = {}
-        accelerator_output_dir_list = []
-        for accelerator_spec in accelerator_specs:
-            logger.info("Running Olive on accelerator: %s", accelerator_spec)
-            output_subdirs[accelerator_spec] = accelerator_output_dir = (
-                output_dir / str(accelerator_spec) if len(accelerator_specs) > 1 else output_dir
-            )
-            accelerator_output_dir.mkdir(parents=True, exist_ok=True)
-            accelerator_output_dir_list.append(accelerator_output_dir)
-            with self._create_system(accelerator_spec):
-                run_result = self.run_accelerator(
-                    input_model_config,
-                    accelerator_output_dir,
-                    evaluate_input_model,
-                    accelerator_spec,
+        try:
+            outputs = {}
+            output_subdirs = {}
+            accelerator_output_dir_list = []
+            for accelerator_spec in accelerator_specs:
+                output_subdirs[accelerator_spec] = accelerator_output_dir = (
+                    output_dir / str(accelerator_spec) if len(accelerator_specs) > 1 else output_dir
                 )
-
+                accelerator_output_dir.mkdir(parents=True, exist_ok=True)
+                accelerator_output_dir_list.append(accelerator_output_dir)
+
+            # optimize the accelerator specs concurrently, one worker per accelerator spec
+            with EngineWorkerPool.create(
+                self, None, min(self.max_workers, len(accelerator_specs))
+            ) or nullcontext() as worker_pool:
+                if worker_pool:
+                    agnostic_runs = self._run_accelerator_agnostic_passes(input_model_config, accelerator_specs)
+                    futures = OrderedDict()
+                    for accelerator_spec in accelerator_specs:
+                        logger.info("Running Olive on accelerator: %s", accelerator_spec)
+                        futures[accelerator_spec] = worker_pool.submit(
+                            "_run_accelerator_with_system",
+                            input_model_config,
+                            output_subdirs[accelerator_spec],
+                            evaluate_input_model,
+                            accelerator_spec,
+                            agnostic_runs,
+                            resource_request=self._estimate_resources(self.passes, input_model_config),
+                        )
+                    run_results = {
+                        accelerator_spec: worker_pool.get_result(future) for accelerator_spec, future in futures.items()
+                    }
+                else:
+                    run_results = {}
+                    for accelerator_spec in accelerator_specs:
+                        logger.info("Running Olive on accelerator: %s", accelerator_spec)
+                        run_results[accelerator_spec] = self._run_accelerator_with_system(
+                            input_model_config,
+                            output_subdirs[accelerator_spec],
+                            evaluate_input_model,
+                            accelerator_spec,
+                        )
+
+            for accelerator_spec, run_result in run_results.items():
                 if run_result is None:
                     continue
 
                 outputs[accelerator_spec] = run_result
 
-        for accelerator_spec in self.footprints:
-            logger.info("Run history for %s:", accelerator_spec)
-            run_history = self.footprints[accelerator_spec].summarize_run_history()
-            self.dump_run_history(run_history, output_subdirs[accelerator_spec] / "run_history.txt")
-
-        if packaging_config and self.passes:
-            # TODO(trajep): should we support packaging pytorch model?
-            logger.info("Package top ranked %d models as artifacts", sum(len(f.nodes) for f in outputs.values()))
-            generate_output_artifacts(
-                packaging_config,
-                self.footprints,
-                outputs,
-                output_dir,
-                self.azureml_client_config,
-            )
-        else:
-            logger.debug("No packaging config provided, skip packaging artifacts")
+            for accelerator_spec in self.footprints:
+                logger.info("Run history for %s:", accelerator_spec)
+                run_history = self.footprints[accelerator_spec].summarize_run_history()
+                self.dump_run_history(run_history, output_subdirs[accelerator_spec] / "run_history.txt")
+
+            if packaging_config and self.passes:
+                # TODO(trajep): should we support packaging pytorch model?
+                logger.info("Package top ranked %d models as artifacts", sum(len(f.nodes) for f in outputs.values()))
+                generate_output_artifacts(
+                    packaging_config,
+                    self.footprints,
+                    outputs,
+                    output_dir,
+                    self.azureml_client_config,
+                )
+            else:
+                logger.debug("No packaging config provided, skip packaging artifacts")
+
+            # TODO(team): refactor output structure
+            # Do not change condition order. For no search, values of outputs are MetricResult
+            # Consolidate the output structure for search and no search mode
+            if outputs and self.passes and not next(iter(outputs.values())).check_empty_nodes():
+                best_node: FootprintNode = get_best_candidate_node(outputs, self.footprints)
+                self.cache.save_model(model_id=best_node.model_id, output_dir=output_dir, overwrite=True)
+                if len(accelerator_output_dir_list) > 1 and self.skip_saving_artifacts:
+                    [shutil.rmtree(folder) for folder in accelerator_output_dir_list if folder.exists()]
+                logger.info("Saved output model to %s", output_dir)
+
+            return outputs
+        finally:
+            # wait for the background garbage collection of the cache so that the process does not exit in the middle
+            # of an eviction
+            self.cache.stop_garbage_collection()
+
+    def _run_accelerator_with_system(
+        self,
+        input_model_config: ModelConfig,
+        output_dir: Path,
+        evaluate_input_model: bool,
+        accelerator_spec: "AcceleratorSpec",
+        agnostic_runs: Optional[Dict[str, ModelConfig]] = None,
+    ):
+        self.agnostic_runs = agnostic_runs or {}
+        try:
+            with self._create_system(accelerator_spec):
+                return self.run_accelerator(input_model_config, output_dir, evaluate_input_model, accelerator_spec)
+        finally:
+            self.agnostic_runs = {}
+
+    def _run_accelerator_agnostic_passes(
+        self, input_model_config: ModelConfig, accelerator_specs: List["AcceleratorSpec"]
+    ) -> Dict[str, ModelConfig]:
+        """Run the leading passes of the pass flows that create the same models for all the accelerator specs.
 
-        # TODO(team): refactor output structure
-        # Do not change condition order. For no search, values of outputs are MetricResult
-        # Consolidate the output structure for search and no search mode
-        if outputs and self.passes and not next(iter(outputs.values())).check_empty_nodes():
-            best_node: FootprintNode = get_best_candidate_node(outputs, self.footprints)
-            self.cache.save_model(model_id=best_node.model_id, output_dir=output_dir, overwrite=True)
-            if len(accelerator_output_dir_list) > 1 and self.skip_saving_artifacts:
-                [shutil.rmtree(folder) for folder in accelerator_output_dir_list if folder.exists()]
-            logger.info("Saved output model to %s", output_dir)
+        These passes are accelerator agnostic and have no search space. They are run once before the accelerator specs
+        are optimized concurrently instead of all the workers running them at the same time.
 
-        return outputs
+        The workers still walk through these passes so that the footprint of each accelerator spec records the models
+        its output models are derived from, and so that the search steps start from the input model as usual. They take
+        the output models from the returned runs instead of reading the run and model jsons back from the cache.
+
+        :return: output model configs of the runs, as {"output_model_id": model_config}.
+        """
+        input_model_id = input_model_config.get_model_id(self.cache.get_file_hash_memo_path())
+
+        # leading accelerator agnostic passes of each pass flow, as (pass_id, output_model_id) for each spec
+        flow_prefixes = defaultdict(list)
+        for accelerator_spec in accelerator_specs:
+            self.setup_passes(accelerator_spec)
+            for flow_idx, pass_flow in enumerate(self.pass_flows):
+                prefix = []
+                model_id = input_model_id
+                for pass_id in pass_flow:
+                    p: Pass = self.passes[pass_id]["pass"]
+                    if p.search_space or not p.is_accelerator_agnostic(accelerator_spec):
+                        break
+                    model_id = self._get_pass_output_model_id(pass_id, {}, model_id, accelerator_spec)
+                    prefix.append((pass_id, model_id))
+                flow_prefixes[flow_idx].append(prefix)
+
+        # only the passes that create the same models for all the accelerator specs are shared
+        shared_prefixes = []
+        for prefixes in flow_prefixes.values():
+            shared_prefix = []
+            for links in zip(*prefixes):
+                if len(set(links)) > 1:
+                    break
+                shared_prefix.append(links[0][0])
+            if shared_prefix and shared_prefix not in shared_prefixes:
+                shared_prefixes.append(shared_prefix)
+        agnostic_runs = {}
+        if not shared_prefixes:
+            return agnostic_runs
+
+        accelerator_spec = accelerator_specs[0]
+        self.setup_passes(accelerator_spec)
+        try:
+            with self._create_system(accelerator_spec):
+                for shared_prefix in shared_prefixes:
+                    logger.info("Running accelerator agnostic passes %s for all accelerators ...", shared_prefix)
+                    model_config, model_id = input_model_config, input_model_id
+                    for pass_id in shared_prefix:
+                        model_config, model_id = self._run_pass(pass_id, {}, model_config, model_id, accelerator_spec)
+                        if model_config in PRUNED_CONFIGS:
+                            break
+                        agnostic_runs[model_id] = model_config
+        except EXCEPTIONS_TO_RAISE:
+            raise
+        except Exception:
+            # the workers run the passes again and handle the failure for each accelerator spec
+            logger.warning("Failed to run accelerator agnostic passes.", exc_info=True)
+        return agnostic_runs
 
     def run_accelerator(
         self,
@@ -313,12 +476,14 @@ class Engine:
         # generate search space and initialize the passes for each hardware accelerator
         self.setup_passes(accelerator_spec)
         # hash the input model
-        input_model_id = input_model_config.get_model_id()
+        with collect_stages() as stages, profile_stage("model_hashing"):
+            input_model_id = input_model_config.get_model_id(self.cache.get_file_hash_memo_path())
         if input_model_id == LOCAL_INPUT_MODEL_ID and self.cache.enable_shared_cache:
             logger.warning("Input model has callable attributes, shared cache is disabled.")
             self.cache.disable_shared_cache()
 
         self.footprints[accelerator_spec].record(model_id=input_model_id)
+        self.footprints[accelerator_spec].record_stages(input_model_id, stages)
 
         # create the output directory
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -357,10 +522,17 @@ class Engine:
             logger.warning("Failed to run Olive on %s.", accelerator_spec, exc_info=True)
             return None
 
+        if output_footprint:
+            # the output models and the models they were derived from are never evicted from the cache
+            self.cache.pin_model_lineage(output_footprint.nodes.keys())
+
         if not self.skip_saving_artifacts:
             output_fp_path = output_dir / "footprints.json"
             logger.info("Save footprint to %s.", output_fp_path)
             self.footprints[accelerator_spec].to_file(output_fp_path)
+            trace_path = output_dir / "trace.json"
+            logger.info("Save trace of the run to %s.", trace_path)
+            self.footprints[accelerator_spec].to_trace_file(trace_path)
         logger.debug("run_accelerator done")
         return output_footprint
 
@@ -413,20 +585,20 @@ class Engine:
 
         output_model_dir = Path(output_dir)
 
-        output_model_ids = []
-        for pass_flow in self.pass_flows:
-            # search point is empty since there is no search
-            passes_to_run = [(pass_id, {}) for pass_id in pass_flow]
-
-            # run all the passes in the pass flow
-            logger.debug("Running %s with no search ...", pass_flow)
-            should_prune, signal, model_ids = self._run_passes(
-                passes_to_run,
-                input_model_config,
-                input_model_id,
-                accelerator_spec,
+        # run all the pass flows, the shared prefixes of the flows are run only once
+        logger.debug("Running %s with no search ...", self.pass_flows)
+        self._prefetch_pass_chains(
+            [[(pass_id, {}) for pass_id in pass_flow] for pass_flow in self.pass_flows],
+            input_model_id,
+            accelerator_spec,
+        )
+        with EngineWorkerPool.create(self, accelerator_spec, self.max_workers) or nullcontext() as worker_pool:
+            flow_results = self._run_pass_flow_tree(
+                self.pass_flows, input_model_config, input_model_id, accelerator_spec, worker_pool=worker_pool
             )
 
+        output_model_ids = []
+        for pass_flow, (should_prune, signal, model_ids) in zip(self.pass_flows, flow_results):
             if should_prune:
                 failed_pass = pass_flow[len(model_ids)]
                 logger.warning(
@@ -475,43 +647,201 @@ class Engine:
         self.search_strategy.initialize(self.pass_flows_search_spaces, input_model_id, objective_dict)
         output_model_num = self.search_strategy.get_output_model_num()
 
+        if self.pipeline_evaluation:
+            self._run_search_pipelined(input_model_config, input_model_id, accelerator_spec)
+            return self.create_pareto_frontier_footprints(accelerator_spec, output_model_num, output_dir)
+
         # record start time
         start_time = time.time()
         iter_num = 0
-        while True:
-            iter_num += 1
+        with EngineWorkerPool.create(self, accelerator_spec, self.max_workers) or nullcontext() as worker_pool:
+            while True:
+                # get the next steps, one per worker so that they can run concurrently
+                next_steps = self.search_strategy.next_steps(worker_pool.max_workers if worker_pool else 1)
 
-            # get the next step
-            next_step = self.search_strategy.next_step()
+                # if no more steps, break
+                if not next_steps:
+                    break
 
-            # if no more steps, break
-            if next_step is None:
-                break
+                # get the model id of the first input model
+                # all steps belong to the same search space group and so have the same input model
+                model_id = next_steps[0]["model_id"]
+                if model_id == input_model_id:
+                    model_config = input_model_config
+                else:
+                    model_config = self._load_model(model_id)
 
-            # get the model id of the first input model
-            model_id = next_step["model_id"]
-            if model_id == input_model_id:
-                model_config = input_model_config
-            else:
-                model_config = self._load_model(model_id)
+                for idx, next_step in enumerate(next_steps):
+                    logger.debug("Step %d with search point %s ...", iter_num + idx + 1, next_step["search_point"])
+
+                # run all the passes in the steps
+                results = self._run_search_steps(next_steps, model_config, accelerator_spec, worker_pool)
 
-            logger.debug("Step %d with search point %s ...", iter_num, next_step["search_point"])
+                for next_step, (should_prune, signal, model_ids) in zip(next_steps, results):
+                    iter_num += 1
 
-            # run all the passes in the step
-            should_prune, signal, model_ids = self._run_passes(
-                next_step["passes"],
+                    # record feedback signal
+                    self.search_strategy.record_feedback_signal(
+                        next_step["search_point"], signal, model_ids, should_prune
+                    )
+
+                    # results of the remaining steps are still recorded once the exit criteria are met
+                    if not self.search_strategy.exit_criteria_met:
+                        time_diff = time.time() - start_time
+                        self.search_strategy.check_exit_criteria(iter_num, time_diff, signal)
+
+        return self.create_pareto_frontier_footprints(accelerator_spec, output_model_num, output_dir)
+
+    def _run_search_pipelined(
+        self, input_model_config: ModelConfig, input_model_id: str, accelerator_spec: "AcceleratorSpec"
+    ):
+        """Run the search steps one at a time, evaluating the output model of a step while the next step runs.
+
+        The feedback signal of a step is recorded once the passes of the next step are done, so the search strategy
+        suggests the next step without it. The strategy only moves on to the next search space group once the
+        feedback of every step in the active group is recorded.
+        """
+        start_time = time.time()
+        iter_num = 0
+        # (step, should_prune, model_ids, future of the signal) of the step whose output model is being evaluated
+        pending = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                next_steps = self.search_strategy.next_steps(1, next_group=pending is None)
+                if not next_steps and pending is None:
+                    break
+
+                if next_steps:
+                    next_step = next_steps[0]
+                    logger.debug("Step %d with search point %s ...", iter_num + 1, next_step["search_point"])
+                    model_id = next_step["model_id"]
+                    model_config = input_model_config if model_id == input_model_id else self._load_model(model_id)
+                    should_prune, model_config, model_id, model_ids = self._run_pass_chain(
+                        next_step["passes"], model_config, model_id, accelerator_spec
+                    )
+
+                # wait for the evaluation of the previous step
+                if pending:
+                    step, step_should_prune, step_model_ids, future = pending
+                    signal = future.result() if future else None
+                    iter_num += 1
+                    self.search_strategy.record_feedback_signal(
+                        step["search_point"], signal, step_model_ids, step_should_prune
+                    )
+                    if not self.search_strategy.exit_criteria_met:
+                        self.search_strategy.check_exit_criteria(iter_num, time.time() - start_time, signal)
+                    pending = None
+
+                if next_steps:
+                    if should_prune:
+                        logger.warning("Skipping evaluation as model was pruned")
+                        future = None
+                    else:
+                        future = executor.submit(
+                            self._evaluate_output_model,
+                            next_step["passes"][-1][0],
+                            model_config,
+                            model_id,
+                            accelerator_spec,
+                        )
+                    pending = (next_step, should_prune, model_ids, future)
+
+    def _run_search_steps(
+        self,
+        steps: List[Dict[str, Any]],
+        model_config: ModelConfig,
+        accelerator_spec: "AcceleratorSpec",
+        worker_pool: Optional[EngineWorkerPool] = None,
+    ) -> List[Tuple[bool, Optional[MetricResult], List[str]]]:
+        """Run the passes of the search steps and return the results in the same order as the steps.
+
+        If a worker pool is provided, the steps are run concurrently in the worker processes. Steps whose first pass
+        produces the same output model share a prefix of the pass flow so they are run one after the other in the
+        same worker. This way the shared passes are run only once and then loaded from the cache.
+        """
+        if worker_pool is None:
+            return [
+                self._run_passes(step["passes"], model_config, step["model_id"], accelerator_spec) for step in steps
+            ]
+
+        step_groups = defaultdict(list)
+        for idx, step in enumerate(steps):
+            pass_id, pass_search_point = step["passes"][0]
+            first_model_id = self._get_pass_output_model_id(
+                pass_id, pass_search_point, step["model_id"], accelerator_spec
+            )
+            step_groups[first_model_id].append(idx)
+
+        futures = {
+            tuple(step_idxs): worker_pool.submit(
+                "_run_search_steps",
+                [steps[idx] for idx in step_idxs],
                 model_config,
-                model_id,
                 accelerator_spec,
+                resource_request=self._estimate_resources(
+                    {pass_id for idx in step_idxs for pass_id, _ in steps[idx]["passes"]}, model_config
+                ),
             )
+            for step_idxs in step_groups.values()
+        }
+        results = [None] * len(steps)
+        for step_idxs, future in futures.items():
+            for idx, result in zip(step_idxs, worker_pool.get_result(future)):
+                results[idx] = result
+        return results
 
-            # record feedback signal
-            self.search_strategy.record_feedback_signal(next_step["search_point"], signal, model_ids, should_prune)
+    def _estimate_resources(self, pass_ids: Iterable[str], model_config: ModelConfig) -> ResourceRequest:
+        """Estimate the peak resources of running the passes one after the other on the model.
 
-            time_diff = time.time() - start_time
-            self.search_strategy.check_exit_criteria(iter_num, time_diff, signal)
+        The size of the input model stands in for the sizes of the intermediate models.
+        """
+        model_size = get_model_size(model_config)
+        resource_request = ResourceRequest()
+        for pass_id in pass_ids:
+            p: Pass = self.passes[pass_id]["pass"]
+            resource_request = resource_request.union(
+                ResourceRequest(
+                    memory=int(model_size * p.peak_memory_factor),
+                    device_memory=int(model_size * p.peak_device_memory_factor),
+                    num_threads=p.num_threads,
+                )
+            )
+        return resource_request
 
-        return self.create_pareto_frontier_footprints(accelerator_spec, output_model_num, output_dir)
+    def _get_pass_output_model_id(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ) -> str:
+        """Get the id of the model that the pass produces at the search point."""
+        p: Pass = self.passes[pass_id]["pass"]
+        pass_config = p.serialize_config(p.config_at_search_point(pass_search_point))
+        run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
+        return self.cache.get_output_model_id(p.__class__.__name__, pass_config, input_model_id, run_accel)
+
+    def _prefetch_pass_chains(
+        self,
+        pass_chains: Iterable[List[Tuple[str, Dict[str, Any]]]],
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ):
+        """Start downloading the output models of the pass chains that are in the shared cache.
+
+        The output model ids only depend on the pass configs and the input model id, so the whole chains are checked
+        before the first pass runs and the hits are downloaded while the earlier passes run.
+        """
+        if not self.cache.enable_shared_cache:
+            return
+
+        model_ids = []
+        for passes in pass_chains:
+            model_id = input_model_id
+            for pass_id, pass_search_point in passes:
+                model_id = self._get_pass_output_model_id(pass_id, pass_search_point, model_id, accelerator_spec)
+                model_ids.append(model_id)
+        self.cache.prefetch_shared_cache(model_ids)
 
     def create_pareto_frontier_footprints(
         self, accelerator_spec: "AcceleratorSpec", output_model_num: int, output_dir: Path
@@ -678,10 +1008,34 @@ class Engine:
 
         the passes is the list of (pass_name, pass_search_point) tuples
         """
+        should_prune, model_config, model_id, model_ids = self._run_pass_chain(
+            passes, model_config, model_id, accelerator_spec
+        )
+
+        if not should_prune:
+            signal = self._evaluate_output_model(passes[-1][0], model_config, model_id, accelerator_spec)
+        else:
+            signal = None
+            logger.warning("Skipping evaluation as model was pruned")
+
+        return should_prune, signal, model_ids
+
+    def _run_pass_chain(
+        self,
+        passes: List[Tuple[str, Dict[str, Any]]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ) -> Tuple[bool, ModelConfig, str, List[str]]:
+        """Run the passes one after the other without evaluating the output model.
+
+        :return: (should_prune, output model config, output model id, ids of the models created by the passes)
+        """
+        self._prefetch_pass_chains([passes], model_id, accelerator_spec)
+
         should_prune = False
         # run all the passes in the step
         model_ids = []
-        pass_id = None
 
         for pass_id, pass_search_point in passes:
             model_config, model_id = self._run_pass(
@@ -697,24 +1051,124 @@ class Engine:
                 break
             model_ids.append(model_id)
 
-        if model_config not in PRUNED_CONFIGS and model_config.config.get("shared_cache", False):
+        return should_prune, model_config, model_id, model_ids
+
+    def _evaluate_output_model(
+        self,
+        pass_id: str,
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ) -> Optional[MetricResult]:
+        """Evaluate the final model of a pass flow using the evaluator of its last pass."""
+        if model_config.config.get("shared_cache", False):
             model_config = self.cache.download_shared_cache_model(model_config, model_id)
 
-        if not should_prune:
-            # evaluate the model
-            evaluator_config = self.evaluator_for_pass(pass_id)
-            if not self.search_strategy and evaluator_config is None:
-                # skip evaluation if no search and no evaluator
-                signal = None
-            else:
-                logger.info("Run model evaluation for the final model...")
-                signal = self._evaluate_model(model_config, model_id, evaluator_config, accelerator_spec)
-            logger.debug("Signal: %s", signal)
-        else:
+        evaluator_config = self.evaluator_for_pass(pass_id)
+        if not self.search_strategy and evaluator_config is None:
+            # skip evaluation if no search and no evaluator
             signal = None
+        else:
+            logger.info("Run model evaluation for the final model...")
+            signal = self._evaluate_model(model_config, model_id, evaluator_config, accelerator_spec)
+        logger.debug("Signal: %s", signal)
+        return signal
+
+    def _run_pass_flow_tree(
+        self,
+        pass_flows: List[List[str]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        pass_id: Optional[str] = None,
+        worker_pool: Optional[EngineWorkerPool] = None,
+    ) -> List[Tuple[bool, Optional[MetricResult], List[str]]]:
+        """Run the remaining passes of the pass flows on a model and evaluate the output model of each flow.
+
+        The pass flows are treated as a prefix tree rooted at the model: flows that continue with the same pass share
+        a branch, so every shared prefix is run only once. If a worker pool is provided, the branches are run
+        concurrently in the worker processes.
+
+        :param pass_flows: remaining pass ids of each pass flow. Empty flows end at the model.
+        :param pass_id: id of the pass that produced the model. It selects the evaluator for flows that end here.
+        :return: list of (should_prune, signal, model_ids) for each pass flow, model_ids are the ids of the models
+            created after the given model.
+        """
+        results = [None] * len(pass_flows)
+
+        # evaluate the model once for all the flows that end here
+        ended_flows = [idx for idx, pass_flow in enumerate(pass_flows) if not pass_flow]
+        if ended_flows:
+            signal = self._evaluate_output_model(pass_id, model_config, model_id, accelerator_spec)
+            for idx in ended_flows:
+                results[idx] = (False, signal, [])
+
+        # group the remaining flows by their next pass
+        branches = OrderedDict()
+        for idx, pass_flow in enumerate(pass_flows):
+            if pass_flow:
+                branches.setdefault(pass_flow[0], []).append(idx)
+
+        if worker_pool and len(branches) > 1:
+            # each branch runs serially within its worker
+            branch_results = OrderedDict(
+                (
+                    next_pass_id,
+                    worker_pool.submit(
+                        "_run_pass_flow_branch",
+                        next_pass_id,
+                        [pass_flows[idx][1:] for idx in flow_idxs],
+                        model_config,
+                        model_id,
+                        accelerator_spec,
+                        resource_request=self._estimate_resources(
+                            {pass_id for idx in flow_idxs for pass_id in pass_flows[idx]}, model_config
+                        ),
+                    ),
+                )
+                for next_pass_id, flow_idxs in branches.items()
+            )
+            branch_results = {k: worker_pool.get_result(future) for k, future in branch_results.items()}
+        else:
+            # a single branch is a prefix shared by all the remaining flows
+            branch_results = {
+                next_pass_id: self._run_pass_flow_branch(
+                    next_pass_id,
+                    [pass_flows[idx][1:] for idx in flow_idxs],
+                    model_config,
+                    model_id,
+                    accelerator_spec,
+                    worker_pool=worker_pool,
+                )
+                for next_pass_id, flow_idxs in branches.items()
+            }
+
+        for next_pass_id, flow_idxs in branches.items():
+            for idx, result in zip(flow_idxs, branch_results[next_pass_id]):
+                results[idx] = result
+        return results
+
+    def _run_pass_flow_branch(
+        self,
+        pass_id: str,
+        pass_flows: List[List[str]],
+        model_config: ModelConfig,
+        model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        worker_pool: Optional[EngineWorkerPool] = None,
+    ) -> List[Tuple[bool, Optional[MetricResult], List[str]]]:
+        """Run a pass shared by the pass flows and then the remaining passes of the flows on its output model."""
+        # search point is empty since there is no search
+        output_model_config, output_model_id = self._run_pass(pass_id, {}, model_config, model_id, accelerator_spec)
+        if output_model_config in PRUNED_CONFIGS:
+            logger.debug("Pruned for pass %s", pass_id)
             logger.warning("Skipping evaluation as model was pruned")
+            return [(True, None, [])] * len(pass_flows)
 
-        return should_prune, signal, model_ids
+        results = self._run_pass_flow_tree(
+            pass_flows, output_model_config, output_model_id, accelerator_spec, pass_id, worker_pool
+        )
+        return [(should_prune, signal, [output_model_id, *model_ids]) for should_prune, signal, model_ids in results]
 
     def _run_pass(
         self,
@@ -725,6 +1179,22 @@ class Engine:
         accelerator_spec: "AcceleratorSpec",
     ):
         """Run a pass on the input model."""
+        with collect_stages() as stages:
+            output_model_config, output_model_id = self._run_pass_stages(
+                pass_id, pass_search_point, input_model_config, input_model_id, accelerator_spec
+            )
+        if output_model_id is not None:
+            self.footprints[accelerator_spec].record_stages(output_model_id, stages)
+        return output_model_config, output_model_id
+
+    def _run_pass_stages(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+    ):
         # pass
         run_start_time = datetime.now().timestamp()
         p: Pass = self.passes[pass_id]["pass"]
@@ -745,35 +1215,72 @@ class Engine:
             return output_model_config, None
 
         # load run from cache if it exists
-        run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
-        output_model_id = self.cache.get_output_model_id(pass_name, pass_config, input_model_id, run_accel)
+        with profile_stage("cache_lookup"):
+            run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
+            output_model_id = self.cache.get_output_model_id(pass_name, pass_config, input_model_id, run_accel)
+            output_model_config = self.agnostic_runs.get(output_model_id)
+            if output_model_config is None:
+                output_model_config = self._load_run(output_model_id)
+        if output_model_config is None:
+            # another process using the same cache might be running the same pass on the same input model
+            # wait for it to finish and load its output instead of running the pass again
+            with self.cache.lock_run(output_model_id):
+                output_model_config = self._load_run(output_model_id)
+                if output_model_config is None:
+                    return self._run_pass_and_cache(
+                        pass_id,
+                        pass_search_point,
+                        pass_config,
+                        input_model_config,
+                        input_model_id,
+                        output_model_id,
+                        accelerator_spec,
+                        run_start_time,
+                    )
+
+        # footprint model and run
+        self.footprints[accelerator_spec].record(
+            model_id=output_model_id,
+            model_config=output_model_config.to_json() if output_model_config != FAILED_CONFIG else {"is_pruned": True},
+            parent_model_id=input_model_id,
+            from_pass=pass_name,
+            pass_run_config=pass_config,
+            start_time=run_start_time,
+            end_time=datetime.now().timestamp(),
+        )
+        logger.info("Loaded model from cache: %s", output_model_id)
+        return output_model_config, output_model_id
+
+    def _load_run(self, output_model_id: str) -> Optional[Union[ModelConfig, str]]:
+        """Load the output model of a cached run. Return None if the run is not cached."""
         run_cache = self.cache.load_run_from_model_id(output_model_id)
-        if run_cache:
-            logger.debug("Loading model from cache ...")
-            output_model_config = self._load_model(output_model_id)
-            if output_model_config is not None:
-                # footprint model and run
-                self.footprints[accelerator_spec].record(
-                    model_id=output_model_id,
-                    model_config=(
-                        output_model_config.to_json() if output_model_config != FAILED_CONFIG else {"is_pruned": True}
-                    ),
-                    parent_model_id=input_model_id,
-                    from_pass=pass_name,
-                    pass_run_config=pass_config,
-                    start_time=run_start_time,
-                    end_time=datetime.now().timestamp(),
-                )
-                logger.info("Loaded model from cache: %s", output_model_id)
-                return output_model_config, output_model_id
+        if not run_cache:
+            return None
+        logger.debug("Loading model from cache ...")
+        return self._load_model(output_model_id)
 
-        output_model_path = str(self.cache.get_model_cache_path(output_model_id))
-        if input_model_config.config.get("shared_cache", False):
-            input_model_config = self.cache.download_shared_cache_model(input_model_config, input_model_id)
+    def _run_pass_and_cache(
+        self,
+        pass_id: str,
+        pass_search_point: Dict[str, Any],
+        pass_config: Dict[str, Any],
+        input_model_config: ModelConfig,
+        input_model_id: str,
+        output_model_id: str,
+        accelerator_spec: "AcceleratorSpec",
+        run_start_time: float,
+    ):
+        p: Pass = self.passes[pass_id]["pass"]
+        pass_name = p.__class__.__name__
+        run_accel = None if p.is_accelerator_agnostic(accelerator_spec) else accelerator_spec
 
+        output_model_path = str(self.cache.get_model_cache_path(output_model_id))
         host = self.host_for_pass(pass_id)
-        if host.system_type != SystemType.AzureML:
-            input_model_config = self.cache.prepare_resources_for_local(input_model_config)
+        with profile_stage("prepare_input_model"):
+            if input_model_config.config.get("shared_cache", False):
+                input_model_config = self.cache.download_shared_cache_model(input_model_config, input_model_id)
+            if host.system_type != SystemType.AzureML:
+                input_model_config = self.cache.prepare_resources_for_local(input_model_config)
 
         try:
             if p.run_on_target:
@@ -784,7 +1291,8 @@ class Engine:
                 else:
                     host = self.target
 
-            output_model_config = host.run_pass(p, input_model_config, output_model_path, pass_search_point)
+            with profile_stage("run_pass"):
+                output_model_config = host.run_pass(p, input_model_config, output_model_path, pass_search_point)
         except OlivePassError:
             logger.exception("Pass run_pass failed")
             output_model_config = FAILED_CONFIG
@@ -803,11 +1311,12 @@ class Engine:
         run_end_time = datetime.now().timestamp()
         logger.info("Pass %s:%s finished in %f seconds", pass_id, pass_name, run_end_time - run_start_time)
 
-        # cache model
-        self._cache_model(output_model_id, output_model_config)
+        with profile_stage("cache_model"):
+            # cache model
+            self._cache_model(output_model_id, output_model_config)
 
-        # cache run
-        self.cache.cache_run(pass_name, pass_config, input_model_id, output_model_id, run_accel)
+            # cache run
+            self.cache.cache_run(pass_name, pass_config, input_model_id, output_model_id, run_accel)
 
         # footprint model and run
         self.footprints[accelerator_spec].record(
@@ -832,20 +1341,17 @@ class Engine:
 
     def _load_evaluation(self, model_id: str):
         """Load the evaluation from the cache directory."""
-        evaluation_json_path = self.cache.get_evaluation_json_path(model_id)
-        if evaluation_json_path.exists():
-            try:
-                with evaluation_json_path.open() as f:
-                    evaluation_json = json.load(f)
-                signal = evaluation_json["signal"]
-                signal = MetricResult(**signal)
-            except Exception:
-                logger.exception("Failed to load evaluation")
-                signal = None
-            return signal
-        else:
+        evaluation_json = self.cache.load_evaluation(model_id)
+        if evaluation_json is None:
             return None
 
+        try:
+            signal = MetricResult(**evaluation_json["signal"])
+        except Exception:
+            logger.exception("Failed to load evaluation")
+            signal = None
+        return signal
+
     def _evaluate_model(
         self,
         model_config: ModelConfig,
@@ -854,6 +1360,18 @@ class Engine:
         accelerator_spec: "AcceleratorSpec",
     ):
         """Evaluate a model."""
+        with collect_stages() as stages:
+            signal = self._evaluate_model_stages(model_config, model_id, evaluator_config, accelerator_spec)
+        self.footprints[accelerator_spec].record_stages(model_id, stages)
+        return signal
+
+    def _evaluate_model_stages(
+        self,
+        model_config: ModelConfig,
+        model_id: str,
+        evaluator_config: "OliveEvaluatorConfig",
+        accelerator_spec: "AcceleratorSpec",
+    ):
         logger.debug("Evaluating model ...")
         accelerator_suffix = f"-{accelerator_spec}" if accelerator_spec else ""
         if not model_id.endswith(accelerator_suffix):
@@ -863,7 +1381,8 @@ class Engine:
             model_id_with_accelerator = model_id
 
         # load evaluation from cache if it exists
-        signal = self._load_evaluation(model_id_with_accelerator)
+        with profile_stage("evaluation_cache_lookup"):
+            signal = self._load_evaluation(model_id_with_accelerator)
         if signal is not None:
             logger.debug("Loading evaluation from cache ...")
             # footprint evaluation
@@ -878,11 +1397,19 @@ class Engine:
 
         # evaluate model
         if self.target.system_type != SystemType.AzureML:
-            model_config = self.cache.prepare_resources_for_local(model_config)
-        signal = self.target.evaluate_model(model_config, evaluator_config, accelerator_spec)
-
-        # cache evaluation
-        self._cache_evaluation(model_id_with_accelerator, signal)
+            with profile_stage("prepare_model"):
+                model_config = self.cache.prepare_resources_for_local(model_config)
+        evaluator_config = self._resolve_early_stop_goals(evaluator_config, accelerator_spec)
+        with profile_stage("evaluate_model"):
+            signal = self.target.evaluate_model(model_config, evaluator_config, accelerator_spec)
+
+        if signal.is_pruned():
+            # the evaluation depends on the goals, so it is not cached
+            logger.info("Model %s was pruned as it cannot meet the goals", model_id)
+        else:
+            # cache evaluation
+            with profile_stage("cache_evaluation"):
+                self._cache_evaluation(model_id_with_accelerator, signal)
 
         # footprint evaluation
         self.footprints[accelerator_spec].record(
@@ -890,10 +1417,40 @@ class Engine:
             metrics=FootprintNodeMetric(
                 value=signal,
                 if_goals_met=False,
+                is_pruned=signal.is_pruned(),
             ),
         )
         return signal
 
+    def _resolve_early_stop_goals(
+        self, evaluator_config: "OliveEvaluatorConfig", accelerator_spec: "AcceleratorSpec"
+    ) -> "OliveEvaluatorConfig":
+        """Replace the goals of the accuracy metrics that stop early with the thresholds they were resolved to.
+
+        The evaluator tests the partial results against threshold goals only, the other goals are relative to the
+        baseline of the input model.
+        """
+        objective_dict = self.footprints[accelerator_spec].objective_dict
+        if not (evaluator_config and objective_dict):
+            return evaluator_config
+        early_stop_metrics = [
+            metric.name
+            for metric in evaluator_config.metrics
+            if metric.type == MetricType.ACCURACY and getattr(metric.user_config, "early_stop", False)
+        ]
+        if not early_stop_metrics:
+            return evaluator_config
+
+        evaluator_config = deepcopy(evaluator_config)
+        for metric in evaluator_config.metrics:
+            if metric.name not in early_stop_metrics:
+                continue
+            for sub_type in metric.sub_types:
+                objective = objective_dict.get(joint_metric_key(metric.name, sub_type.name))
+                if objective and objective["goal"] is not None:
+                    sub_type.goal = MetricGoal(type="threshold", value=objective["goal"])
+        return evaluator_config
+
     @contextmanager
     def _create_system(self, accelerator_spec):
         def create_system(config: "SystemConfig", accelerator_spec):
@@ -940,3 +1497,11 @@ class Engine:
             self.host = None
 
         create_managed_system_with_cache.cache_clear()
+
+
+def _config_to_json(config: Optional[ConfigBase]) -> Optional[Dict[str, Any]]:
+    return config.to_json(check_object=True) if config else None
+
+
+def _config_from_json(config_json: Optional[Dict[str, Any]], config_class: Type[ConfigBase]) -> Optional[ConfigBase]:
+    return validate_config(config_json, config_class) if config_json else None
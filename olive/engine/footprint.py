@@ -3,12 +3,14 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
 
+import json
 import logging
 from collections import OrderedDict, defaultdict
 from copy import deepcopy
 from typing import TYPE_CHECKING, DefaultDict, Dict, List, NamedTuple, Optional
 
 from olive.common.config_utils import ConfigBase, config_json_dumps, config_json_loads
+from olive.common.profiling import StageProfile
 from olive.evaluator.metric_result import MetricResult
 
 if TYPE_CHECKING:
@@ -35,11 +37,13 @@ class FootprintNodeMetric(ConfigBase):
     cmp_direction: will be auto suggested. The format will be like: {"metric_name": 1, ...},
         1: higher is better, -1: lower is better
     if_goals_met: if the goals set by users are met
+    is_pruned: if the evaluation stopped early as the goals cannot be met
     """
 
     value: MetricResult = None
     cmp_direction: DefaultDict[str, int] = None
     if_goals_met: bool = False
+    is_pruned: bool = False
 
 
 class FootprintNode(ConfigBase):
@@ -55,6 +59,8 @@ class FootprintNode(ConfigBase):
 
     start_time: float = 0
     end_time: float = 0
+    # time and resources spent in each stage of creating and evaluating the model
+    stages: List[StageProfile] = None
 
     def update(self, **kwargs):
         for k, v in kwargs.items():
@@ -92,6 +98,28 @@ class Footprint:
             self.nodes[_model_id] = FootprintNode(**kwargs)
         self._resolve_metrics()
 
+    def record_stages(self, model_id: str, stages: List[StageProfile]):
+        """Add the profiles of stages run for the model."""
+        if not stages:
+            return
+        node = self.nodes.get(model_id)
+        if node is None:
+            node = self.nodes[model_id] = FootprintNode(model_id=model_id)
+        node.stages = (node.stages or []) + stages
+
+    def merge(self, footprint: "Footprint"):
+        """Merge the nodes recorded in another footprint, such as one recorded by a worker process, into this one."""
+        if footprint.objective_dict:
+            self.objective_dict = footprint.objective_dict
+        for model_id, node in footprint.nodes.items():
+            if model_id in self.nodes:
+                # only update the fields that were recorded in the other footprint, add to the existing stages
+                self.nodes[model_id].update(**{k: getattr(node, k) for k in node.__fields_set__ if k != "stages"})
+                self.record_stages(model_id, node.stages)
+            else:
+                self.nodes[model_id] = node
+        self._resolve_metrics()
+
     def create_footprints_by_model_ids(self, model_ids) -> "Footprint":
         nodes = OrderedDict()
         for model_id in model_ids:
@@ -189,6 +217,32 @@ class Footprint:
         with open(file_path) as f:
             return cls.from_json(f.read())
 
+    def to_trace_file(self, file_path):
+        """Export the stage profiles of the nodes as a Chrome trace file, viewable in Perfetto or chrome://tracing."""
+        trace_events = [
+            {
+                "name": stage.name,
+                "cat": node.from_pass or "input_model",
+                "ph": "X",
+                # timestamps and durations are in microseconds
+                "ts": stage.start_time * 1e6,
+                "dur": stage.duration * 1e6,
+                "pid": stage.pid,
+                "tid": stage.thread_id,
+                "args": {
+                    "model_id": model_id,
+                    "peak_rss": stage.peak_rss,
+                    "read_bytes": stage.read_bytes,
+                    "write_bytes": stage.write_bytes,
+                },
+            }
+            for model_id, node in self.nodes.items()
+            for stage in node.stages or []
+        ]
+        trace_events.sort(key=lambda event: event["ts"])
+        with open(file_path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
     def get_output_model_id(self):
         # TODO(anyone): Make this more robust by ensuring there is only one pass flow and one output model
         return next(reversed(self.nodes.keys()))
@@ -232,7 +286,8 @@ class Footprint:
         return 0
 
     def _resolve_metrics(self):
-        for k, v in self.nodes.items():
+        # iterate over a snapshot since nodes can be recorded by an evaluation running in another thread
+        for k, v in list(self.nodes.items()):
             if not v.metrics:
                 continue
             if self.nodes[k].metrics.cmp_direction is None:
@@ -256,7 +311,8 @@ class Footprint:
                         if cmp_direction == 1
                         else v.metrics.value[metric_name].value <= _goal
                     )
-            self.nodes[k].metrics.if_goals_met = all(if_goals_met)
+            # the values of a pruned evaluation are measured on part of the data
+            self.nodes[k].metrics.if_goals_met = all(if_goals_met) and not v.metrics.is_pruned
 
     def _get_candidates(self) -> Dict[str, FootprintNode]:
         candidates = {
@@ -0,0 +1,123 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from olive.resource_path import create_resource_path
+
+if TYPE_CHECKING:
+    from olive.hardware import AcceleratorSpec
+    from olive.model import ModelConfig
+
+logger = logging.getLogger(__name__)
+
+# fraction of the available host memory that concurrent jobs are allowed to use
+HOST_MEMORY_BUDGET_FRACTION = 0.9
+
+
+class ResourceRequest(NamedTuple):
+    """Estimated peak resources of a job."""
+
+    # host memory in bytes
+    memory: int = 0
+    # accelerator memory in bytes
+    device_memory: int = 0
+    # number of cpu threads, None if the job uses all the cores
+    num_threads: Optional[int] = 1
+
+    def union(self, other: "ResourceRequest") -> "ResourceRequest":
+        """Resources of a job that runs the jobs of both requests one after the other."""
+        return ResourceRequest(
+            memory=max(self.memory, other.memory),
+            device_memory=max(self.device_memory, other.device_memory),
+            num_threads=(
+                None if None in (self.num_threads, other.num_threads) else max(self.num_threads, other.num_threads)
+            ),
+        )
+
+
+def get_model_size(model_config: "ModelConfig") -> int:
+    """Get the size in bytes of the local files of the model. Return 0 if the model is not local."""
+    try:
+        model_path = create_resource_path(model_config.config.get("model_path"))
+    except Exception:
+        return 0
+    if model_path is None or not model_path.is_local_resource():
+        return 0
+
+    model_path = Path(model_path.get_path())
+    if model_path.is_file():
+        return model_path.stat().st_size
+    if model_path.is_dir():
+        return sum(f.stat().st_size for f in model_path.rglob("*") if f.is_file())
+    return 0
+
+
+class ResourceScheduler:
+    """Admit jobs only while their estimated peak resources fit the budget of the host.
+
+    The host memory budget comes from the memory available when the scheduler is created, the cpu budget from the
+    number of cores and the accelerator memory budget from the accelerator spec, if it has one. A job is always
+    admitted when no other job is running, so that jobs larger than the budget still run, one at a time.
+    """
+
+    def __init__(self, accelerator_spec: Optional["AcceleratorSpec"] = None):
+        self.memory_budget = self._get_host_memory_budget()
+        self.device_memory_budget = accelerator_spec.memory if accelerator_spec and accelerator_spec.memory else None
+        self.num_threads_budget = os.cpu_count() or 1
+
+        self._lock = threading.Lock()
+        self._num_jobs = 0
+        self._memory = 0
+        self._device_memory = 0
+        self._num_threads = 0
+
+    @staticmethod
+    def _get_host_memory_budget() -> Optional[int]:
+        try:
+            import psutil
+        except ImportError:
+            logger.debug("psutil is not installed, the host memory of concurrent jobs is not budgeted.")
+            return None
+        return int(psutil.virtual_memory().available * HOST_MEMORY_BUDGET_FRACTION)
+
+    @property
+    def num_jobs(self) -> int:
+        return self._num_jobs
+
+    def _get_num_threads(self, request: ResourceRequest) -> int:
+        return self.num_threads_budget if request.num_threads is None else request.num_threads
+
+    def try_acquire(self, request: ResourceRequest) -> bool:
+        """Reserve the resources of the job if it fits the remaining budget. Return whether the job is admitted."""
+        with self._lock:
+            if self._num_jobs > 0 and not self._fits(request):
+                return False
+            self._num_jobs += 1
+            self._memory += request.memory
+            self._device_memory += request.device_memory
+            self._num_threads += self._get_num_threads(request)
+            return True
+
+    def release(self, request: ResourceRequest):
+        """Release the resources reserved for a finished job."""
+        with self._lock:
+            self._num_jobs -= 1
+            self._memory -= request.memory
+            self._device_memory -= request.device_memory
+            self._num_threads -= self._get_num_threads(request)
+
+    def _fits(self, request: ResourceRequest) -> bool:
+        if self.memory_budget is not None and self._memory + request.memory > self.memory_budget:
+            return False
+        if (
+            self.device_memory_budget is not None
+            and self._device_memory + request.device_memory > self.device_memory_budget
+        ):
+            return False
+        return self._num_threads + self._get_num_threads(request) <= self.num_threads_budget
@@ -0,0 +1,179 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+import multiprocessing
+import pickle
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Deque, NamedTuple, Optional
+
+from olive.engine.footprint import Footprint
+from olive.engine.scheduler import ResourceRequest, ResourceScheduler
+from olive.logging import get_olive_logger, set_verbosity
+
+if TYPE_CHECKING:
+    from olive.engine.engine import Engine
+    from olive.hardware import AcceleratorSpec
+
+logger = logging.getLogger(__name__)
+
+# replica of the engine in the current worker process
+_worker_engine: Optional["Engine"] = None
+
+
+def _initialize_worker(
+    engine: "Engine", accelerator_spec: Optional["AcceleratorSpec"], max_workers: int, log_level: int
+):
+    global _worker_engine  # pylint: disable=global-statement
+
+    set_verbosity(log_level)
+    # split the worker budget between the workers so that nested pools don't oversubscribe the host
+    engine.max_workers = max(engine.max_workers // max_workers, 1)
+    if accelerator_spec is not None:
+        engine.setup_passes(accelerator_spec)
+    _worker_engine = engine
+
+
+def _run_engine_method(method_name: str, *args, **kwargs):
+    # start from empty footprints so that only the nodes recorded by this job are sent back
+    _worker_engine.footprints = defaultdict(Footprint)
+    try:
+        result = getattr(_worker_engine, method_name)(*args, **kwargs)
+    finally:
+        # the worker process can be shut down once the job is done, so don't leave an eviction running
+        _worker_engine.cache.stop_garbage_collection()
+    return result, dict(_worker_engine.footprints)
+
+
+class _Job(NamedTuple):
+    future: Future
+    method_name: str
+    args: tuple
+    kwargs: dict
+    resource_request: ResourceRequest
+
+
+class EngineWorkerPool:
+    """Pool of local worker processes that run engine methods on replicas of the engine.
+
+    Each worker process holds a copy of the engine with the passes set up for the accelerator spec, if one is given.
+    Otherwise the jobs are expected to set up the passes themselves. The footprint
+    nodes recorded by a job are merged into the footprints of the engine when the result of the job is collected.
+    Workers share the engine's cache directory, so models created by one worker are reused by the others.
+
+    Jobs are started only while their estimated resources fit the host budget. If a worker process is killed, which
+    is most likely the host running out of memory, the pool is restarted with half the workers and the jobs that were
+    running are run again.
+    """
+
+    def __init__(self, engine: "Engine", accelerator_spec: Optional["AcceleratorSpec"], max_workers: int):
+        self.engine = engine
+        self.accelerator_spec = accelerator_spec
+        self.max_workers = max_workers
+        self.scheduler = ResourceScheduler(accelerator_spec)
+
+        self._lock = threading.RLock()
+        self._pending_jobs: Deque[_Job] = deque()
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # use spawn since forking a process that has initialized torch or onnxruntime thread pools can deadlock
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.engine, self.accelerator_spec, self.max_workers, get_olive_logger().getEffectiveLevel()),
+        )
+
+    @classmethod
+    def create(
+        cls, engine: "Engine", accelerator_spec: Optional["AcceleratorSpec"], max_workers: int
+    ) -> Optional["EngineWorkerPool"]:
+        """Create a worker pool for the engine.
+
+        Return None if max_workers is not greater than 1 or the engine cannot be replicated in worker processes, in
+        which case the caller should run the jobs serially.
+        """
+        if max_workers is None or max_workers <= 1:
+            return None
+
+        try:
+            pickle.dumps(engine)
+        except Exception as e:
+            logger.warning("Cannot replicate the engine in worker processes, running serially instead: %s", e)
+            return None
+
+        logger.info("Created a pool of %d worker processes", max_workers)
+        return cls(engine, accelerator_spec, max_workers)
+
+    def submit(self, method_name: str, *args, resource_request: Optional[ResourceRequest] = None, **kwargs) -> Future:
+        """Run the engine method with the given arguments in a worker process.
+
+        The job is started once its estimated peak resources fit the remaining budget of the host.
+        """
+        job = _Job(Future(), method_name, args, kwargs, resource_request or ResourceRequest())
+        with self._lock:
+            self._pending_jobs.append(job)
+            self._dispatch()
+        return job.future
+
+    def _dispatch(self):
+        """Start the pending jobs that fit the budget, in submission order."""
+        with self._lock:
+            for job in list(self._pending_jobs):
+                if self.scheduler.num_jobs >= self.max_workers:
+                    break
+                if not self.scheduler.try_acquire(job.resource_request):
+                    continue
+                self._pending_jobs.remove(job)
+                executor = self._executor
+                executor_future = executor.submit(_run_engine_method, job.method_name, *job.args, **job.kwargs)
+                executor_future.add_done_callback(
+                    lambda f, job=job, executor=executor: self._on_job_done(job, executor, f)
+                )
+
+    def _on_job_done(self, job: _Job, executor: ProcessPoolExecutor, executor_future: Future):
+        with self._lock:
+            self.scheduler.release(job.resource_request)
+            exception = executor_future.exception()
+            if isinstance(exception, BrokenProcessPool) and self.max_workers > 1:
+                if executor is self._executor:
+                    # a worker was killed, restart the pool with fewer workers
+                    self.max_workers = max(self.max_workers // 2, 1)
+                    logger.warning(
+                        "A worker process terminated abruptly, possibly out of memory. Restarting with %d workers.",
+                        self.max_workers,
+                    )
+                    executor.shutdown(wait=False)
+                    self._executor = self._create_executor()
+                # run the job again, before the jobs that have not been started yet
+                self._pending_jobs.appendleft(job)
+            elif exception is not None:
+                job.future.set_exception(exception)
+            else:
+                job.future.set_result(executor_future.result())
+            self._dispatch()
+
+    def get_result(self, future: Future) -> Any:
+        """Wait for the job to finish and merge the footprints it recorded into the engine."""
+        result, footprints = future.result()
+        for accelerator_spec, footprint in footprints.items():
+            self.engine.footprints[accelerator_spec].merge(footprint)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._pending_jobs:
+                job.future.cancel()
+            self._pending_jobs.clear()
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
@@ -7,6 +7,7 @@ from abc import abstractmethod
 from inspect import isfunction, signature
 from typing import Any, Callable, ClassVar, Dict, Type, Union
 
+import numpy as np
 import torch
 import torchmetrics
 
@@ -28,9 +29,13 @@ class AccuracyBase(AutoConfigClass):
         "perplexity": torchmetrics.text.perplexity.Perplexity,
     }
 
+    # whether the metric is computed from the logits instead of the predictions
+    requires_logits: ClassVar[bool] = False
+
     def __init__(self, config: Union[ConfigBase, Dict[str, Any]] = None) -> None:
         super().__init__(config)
         self.resolve_kwargs()
+        self._metric = None
 
     def resolve_kwargs(self):
         config_dict = self.config.dict()
@@ -70,79 +75,113 @@ class AccuracyBase(AutoConfigClass):
     def prepare_tensors(preds, target, dtypes=torch.int):
         dtypes = dtypes if isinstance(dtypes, (list, tuple)) else [dtypes, dtypes]
         assert len(dtypes) == 2, "dtypes should be a list or tuple with two elements."
-        preds = torch.tensor(preds, dtype=dtypes[0]) if not isinstance(preds, torch.Tensor) else preds.to(dtypes[0])
-        target = torch.tensor(target, dtype=dtypes[1]) if not isinstance(target, torch.Tensor) else target.to(dtypes[1])
-        return preds, target
+        return AccuracyBase._to_tensor(preds, dtypes[0]), AccuracyBase._to_tensor(target, dtypes[1])
+
+    @staticmethod
+    def _to_tensor(data, dtype) -> torch.Tensor:
+        # tensors and numpy arrays of the right dtype are used as is, the logits can be large
+        if isinstance(data, np.ndarray) and not data.dtype.hasobject:
+            data = torch.from_numpy(data)
+        if isinstance(data, torch.Tensor):
+            return data.to(dtype)
+        return torch.tensor(data, dtype=dtype)
 
     @abstractmethod
-    def measure(self, model_output, target):
+    def create_metric(self) -> torchmetrics.Metric:
         raise NotImplementedError
 
+    def update(self, model_output, target):
+        """Update the metric with the outputs and targets of a batch.
+
+        Only the state of the metric is kept, so the memory does not grow with the number of batches.
+        """
+        if self._metric is None:
+            self._metric = self.create_metric()
+        preds_tensor, target_tensor = self.prepare_tensors(model_output.preds, target)
+        self._metric.update(preds_tensor, target_tensor)
+
+    def compute(self) -> float:
+        """Compute the metric over all the batches since the last compute."""
+        result = self._metric.compute()
+        self._metric = None
+        return result.item()
+
+    def peek(self) -> float:
+        """Compute the metric over the batches so far without resetting it."""
+        return self._metric.compute().item()
+
+    def measure(self, model_output, target):
+        self._metric = None
+        self.update(model_output, target)
+        return self.compute()
+
 
 class AccuracyScore(AccuracyBase):
     name: str = "accuracy_score"
 
-    def measure(self, model_output, target):
-        preds_tensor, target_tensor = self.prepare_tensors(model_output.preds, target)
-        accuracy = torchmetrics.Accuracy(**self.config_dict)
-        result = accuracy(preds_tensor, target_tensor)
-        return result.item()
+    def create_metric(self):
+        return torchmetrics.Accuracy(**self.config_dict)
 
 
 class F1Score(AccuracyBase):
     name: str = "f1_score"
 
-    def measure(self, model_output, target):
-        preds_tensor, target_tensor = self.prepare_tensors(model_output.preds, target)
-        f1 = torchmetrics.F1Score(**self.config_dict)
-        result = f1(preds_tensor, target_tensor)
-        return result.item()
+    def create_metric(self):
+        return torchmetrics.F1Score(**self.config_dict)
 
 
 class Precision(AccuracyBase):
     name: str = "precision"
 
-    def measure(self, model_output, target):
-        preds_tensor, target_tensor = self.prepare_tensors(model_output.preds, target)
-        precision = torchmetrics.Precision(**self.config_dict)
-        result = precision(preds_tensor, target_tensor)
-        return result.item()
+    def create_metric(self):
+        return torchmetrics.Precision(**self.config_dict)
 
 
 class Recall(AccuracyBase):
     name: str = "recall"
 
-    def measure(self, model_output, target):
-        preds_tensor, target_tensor = self.prepare_tensors(model_output.preds, target)
-        recall = torchmetrics.Recall(**self.config_dict)
-        result = recall(preds_tensor, target_tensor)
-        return result.item()
+    def create_metric(self):
+        return torchmetrics.Recall(**self.config_dict)
 
 
 class AUROC(AccuracyBase):
     name: str = "auroc"
+    requires_logits: ClassVar[bool] = True
 
-    def measure(self, model_output, target):
-        logits_tensor, target_tensor = self.prepare_tensors(model_output.logits, target, [torch.float, torch.int32])
+    @classmethod
+    def _default_config(cls) -> Dict[str, ConfigParam]:
+        config = super()._default_config()
+        # bin the logits so that the state of the metric does not grow with the number of samples
+        # thresholds=None computes the exact auroc from all the logits and targets instead
+        config["thresholds"].default_value = 200
+        return config
+
+    def create_metric(self):
+        return torchmetrics.AUROC(**self.config_dict)
+
+    def update(self, model_output, target):
+        if self._metric is None:
+            self._metric = self.create_metric()
+        # binned multiclass auroc one-hot encodes the targets, which requires int64
+        logits_tensor, target_tensor = self.prepare_tensors(model_output.logits, target, [torch.float, torch.long])
         if self.config_dict.get("task") == "binary" and len(logits_tensor.shape) > 1 and logits_tensor.shape[-1] == 2:
             logits_tensor = torch.softmax(logits_tensor, dim=-1)[:, 1]
-        auroc = torchmetrics.AUROC(**self.config_dict)
-        target_tensor = target_tensor.flatten()
-        result = auroc(logits_tensor, target_tensor)
-        return result.item()
+        self._metric.update(logits_tensor, target_tensor.flatten())
 
 
 class Perplexity(AccuracyBase):
     name: str = "perplexity"
 
-    def measure(self, model_output, target):
+    def create_metric(self):
         # update ignore_index if not set
         config = self.config_dict
         if config["ignore_index"] is None:
             config["ignore_index"] = IGNORE_INDEX
+        return torchmetrics.text.perplexity.Perplexity(**config)
 
-        # create perplexity metric
-        perplexity = torchmetrics.text.perplexity.Perplexity(**config)
+    def update(self, model_output, target):
+        if self._metric is None:
+            self._metric = self.create_metric()
 
         # loop through samples
         # the logits are large matrix, so converting all to tensors at once is slow
@@ -154,6 +193,4 @@ class Perplexity(AccuracyBase):
             # shift targets to the right by one, and drop the last token of logits
             logits = logits[..., :-1, :]
             targets = targets[..., 1:]
-            perplexity.update(logits, targets)
-        result = perplexity.compute()
-        return result.item()
+            self._metric.update(logits, targets)
@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from olive.common.utils import run_in_fresh_process
+from olive.evaluator.metric import ColdStartSubType
+from olive.hardware import Device
+
+logger = logging.getLogger(__name__)
+
+# events of the onnxruntime profiler for loading the model, the name depends on whether it is loaded from a file
+_MODEL_LOADING_EVENTS = ("model_loading_uri", "model_loading_array")
+_SESSION_INITIALIZATION_EVENT = "session_initialization"
+
+
+def _get_profile_durations(profile_path: str) -> Dict[str, float]:
+    """Get the duration in ms of the session events in the onnxruntime profile."""
+    events = json.loads(Path(profile_path).read_text())
+    # the durations are in microseconds
+    return {event["name"]: event["dur"] / 1000 for event in events if event.get("cat") == "Session"}
+
+
+def _measure_cold_start(
+    model_config: Dict[str, Any],
+    inference_settings: Dict[str, Any],
+    device: Device,
+    execution_providers: Optional[List[str]],
+    input_feed: Dict[str, Any],
+    run_kwargs: Dict[str, Any],
+    profile: bool = False,
+) -> Dict[str, float]:
+    """Create the session and run the first inference, return the cold start sub types in ms.
+
+    Runs in a fresh process. If profile is True, only the session is created and the onnxruntime profiler splits its
+    creation into loading the model and initializing the session. The profiler slows down the session creation and
+    the inference, so the first inference and the total are only measured without it.
+    """
+    import onnxruntime  # noqa: F401 # pylint: disable=unused-import
+
+    from olive.model import ModelConfig
+
+    model = ModelConfig.parse_obj(model_config).create_model()
+    if not profile:
+        start_time = time.perf_counter()
+        session = model.prepare_session(
+            inference_settings=inference_settings, device=device, execution_providers=execution_providers
+        )
+        session_time = time.perf_counter()
+        model.run_session(session, input_feed, **run_kwargs)
+        end_time = time.perf_counter()
+        return {
+            ColdStartSubType.FIRST_INFERENCE: (end_time - session_time) * 1000,
+            ColdStartSubType.TOTAL: (end_time - start_time) * 1000,
+        }
+
+    with tempfile.TemporaryDirectory(prefix="olive_cold_start_") as tmp_dir:
+        session_options = {
+            **(inference_settings.get("session_options") or {}),
+            "enable_profiling": True,
+            "profile_file_prefix": str(Path(tmp_dir) / "profile"),
+        }
+        inference_settings = {**inference_settings, "session_options": session_options}
+
+        start_time = time.perf_counter()
+        session = model.prepare_session(
+            inference_settings=inference_settings, device=device, execution_providers=execution_providers
+        )
+        session_time = time.perf_counter()
+        durations = _get_profile_durations(session.end_profiling())
+
+    session_creation = (session_time - start_time) * 1000
+    model_load = next((durations[name] for name in _MODEL_LOADING_EVENTS if name in durations), 0)
+    return {
+        ColdStartSubType.MODEL_LOAD: model_load,
+        ColdStartSubType.SESSION_INITIALIZATION: durations.get(
+            _SESSION_INITIALIZATION_EVENT, session_creation - model_load
+        ),
+    }
+
+
+def measure_cold_start(
+    model_config: Dict[str, Any],
+    inference_settings: Dict[str, Any],
+    device: Device,
+    execution_providers: Optional[List[str]],
+    input_feed: Dict[str, Any],
+    run_kwargs: Dict[str, Any],
+    num_processes: int,
+    profile: bool = True,
+) -> Dict[str, List[float]]:
+    """Measure the cold start of the model in num_processes fresh processes, one after the other.
+
+    If profile is True, the model load and session initialization are measured in another num_processes fresh
+    processes with the onnxruntime profiler.
+    """
+    cold_starts = {sub_type: [] for sub_type in ColdStartSubType}
+    for _ in range(num_processes):
+        for profile_process in [False, True] if profile else [False]:
+            cold_start = run_in_fresh_process(
+                _measure_cold_start,
+                model_config,
+                inference_settings,
+                device,
+                execution_providers,
+                input_feed,
+                run_kwargs,
+                profile_process,
+            )
+            logger.debug("Cold start in ms: %s", cold_start)
+            for sub_type, value in cold_start.items():
+                cold_starts[sub_type].append(value)
+    return cold_starts
@@ -0,0 +1,84 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import math
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import numpy as np
+import torch
+
+from olive.evaluator.metric import AccuracySubType
+
+if TYPE_CHECKING:
+    from olive.evaluator.metric import Metric
+
+# sub types that are the mean of a score in [0, 1] over the samples, which the hoeffding bound applies to
+BOUNDED_MEAN_SUB_TYPES = (AccuracySubType.ACCURACY_SCORE,)
+
+
+def get_num_samples(targets: Any) -> int:
+    """Get the number of samples in the targets of a batch."""
+    if isinstance(targets, (torch.Tensor, np.ndarray)):
+        return targets.shape[0] if targets.ndim else 1
+    if isinstance(targets, dict):
+        return get_num_samples(next(iter(targets.values())))
+    return len(targets)
+
+
+def hoeffding_radius(num_samples: int, delta: float) -> float:
+    """Get the radius the mean of num_samples scores in [0, 1] is within one side of with probability 1 - delta."""
+    return math.sqrt(math.log(1 / delta) / (2 * num_samples))
+
+
+class SequentialGoalTest:
+    """Test whether the goals of the accuracy sub types can still be met from the samples evaluated so far.
+
+    The partial value of each sub type is compared to its threshold at 1, 2, 4, ... times min_samples samples. A goal
+    is rejected once the hoeffding confidence bound of the partial value is on the wrong side of the threshold. The
+    error probability of the k-th look is split as (1 - confidence) / (k * (k + 1)) between the sub types, so the
+    probability of ever rejecting a goal the whole dataset would meet is at most 1 - confidence. The bound assumes
+    the order of the batches is unrelated to how hard the samples are, such as a shuffled dataset.
+    """
+
+    def __init__(self, goals: Dict[str, Tuple[float, bool]], confidence: float = 0.99, min_samples: int = 100):
+        # sub type name -> (threshold, higher_is_better)
+        self.goals = goals
+        self.confidence = confidence
+        self.num_samples = 0
+        self._num_looks = 0
+        self._next_look = min_samples
+
+    @classmethod
+    def from_metric(cls, metric: "Metric") -> Optional["SequentialGoalTest"]:
+        """Create the test for the threshold goals of the metric if early stopping is enabled, None otherwise."""
+        user_config = metric.user_config
+        if not getattr(user_config, "early_stop", False):
+            return None
+        goals = {
+            sub_type.name: (sub_type.goal.value, sub_type.higher_is_better)
+            for sub_type in metric.sub_types
+            if sub_type.name in BOUNDED_MEAN_SUB_TYPES and sub_type.goal and sub_type.goal.type == "threshold"
+        }
+        if not goals:
+            return None
+        return cls(goals, user_config.early_stop_confidence, user_config.early_stop_min_samples)
+
+    def update(self, num_samples: int) -> bool:
+        """Add the samples of a batch, return True if the goals are due to be tested."""
+        self.num_samples += num_samples
+        return self.num_samples >= self._next_look
+
+    def test(self, values: Dict[str, float]) -> Optional[str]:
+        """Test the partial values of the sub types, return the name of a sub type whose goal cannot be met."""
+        self._num_looks += 1
+        self._next_look = 2 * self.num_samples
+        delta = (1 - self.confidence) / (len(self.goals) * self._num_looks * (self._num_looks + 1))
+        radius = hoeffding_radius(self.num_samples, delta)
+        for name, (threshold, higher_is_better) in self.goals.items():
+            value = values[name]
+            if (higher_is_better and value + radius < threshold) or (
+                not higher_is_better and value - radius > threshold
+            ):
+                return name
+        return None
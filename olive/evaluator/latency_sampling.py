@@ -0,0 +1,166 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from statistics import NormalDist
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from olive.evaluator.metric_config import LatencyMetricConfig
+
+logger = logging.getLogger(__name__)
+
+# the warmup is over when the median of a window of runs is within this fraction of the median of the previous window
+STEADY_STATE_TOLERANCE = 0.05
+MIN_WINDOW_SIZE = 5
+# scale of the median absolute deviation to the standard deviation of a normal distribution
+MAD_SCALE = 1.4826
+
+LATENCY_PERCENTILES = {"p50": 50, "p75": 75, "p90": 90, "p95": 95, "p99": 99, "p999": 99.9}
+
+
+def sample_latencies(run: Callable[[], float], config: LatencyMetricConfig) -> List[float]:
+    """Measure the latency of run until the estimate of the target percentile is precise enough.
+
+    run executes the model once and returns its latency in seconds. The runs are warmed up until the latency is
+    steady and then sampled until the confidence interval of the target percentile is narrower than ci_rel_width of
+    its value, or the maximum number of runs or duration is reached. The outliers are removed from the returned
+    latencies.
+    """
+
+    def run_many(num_runs: int) -> List[float]:
+        latencies = []
+        for _ in range(num_runs):
+            latencies.append(run())
+            time.sleep(config.sleep_num)
+        return latencies
+
+    # warm up until the median of consecutive windows stops changing
+    window_size = max(MIN_WINDOW_SIZE, config.warmup_num // 2)
+    previous_median = float(np.median(run_many(max(config.warmup_num, window_size))))
+    num_warmup = max(config.warmup_num, window_size)
+    while num_warmup < config.max_warmup_num:
+        median = float(np.median(run_many(window_size)))
+        num_warmup += window_size
+        if abs(median - previous_median) <= STEADY_STATE_TOLERANCE * previous_median:
+            break
+        previous_median = median
+    else:
+        logger.debug("Latency is not steady after %d warmup runs.", num_warmup)
+
+    start_time = time.perf_counter()
+    latencies = run_many(max(config.repeat_test_num, MIN_WINDOW_SIZE))
+    while True:
+        samples = reject_outliers(latencies, config.outlier_threshold)
+        estimate = float(np.percentile(samples, config.target_percentile))
+        lower, upper = get_percentile_confidence_interval(samples, config.target_percentile, config.confidence_level)
+        if upper - lower <= config.ci_rel_width * estimate:
+            break
+        if len(latencies) >= config.max_repeat_test_num or time.perf_counter() - start_time >= config.max_duration:
+            logger.warning(
+                "Latency confidence interval (%.5f, %.5f) ms is wider than %.1f%% of p%s %.5f ms after %d runs.",
+                lower * 1000,
+                upper * 1000,
+                config.ci_rel_width * 100,
+                config.target_percentile,
+                estimate * 1000,
+                len(latencies),
+            )
+            break
+        # grow the sample by half, the width of the interval shrinks with the square root of the sample size
+        latencies.extend(
+            run_many(min(max(len(latencies) // 2, MIN_WINDOW_SIZE), config.max_repeat_test_num - len(latencies)))
+        )
+    logger.debug(
+        "Sampled %d latencies after %d warmup runs, rejected %d outliers.",
+        len(latencies),
+        num_warmup,
+        len(latencies) - len(samples),
+    )
+    return samples
+
+
+def reject_outliers(latencies: Sequence[float], threshold: Optional[float]) -> List[float]:
+    """Remove the latencies with a modified z-score above the threshold."""
+    if not threshold:
+        return list(latencies)
+    values = np.asarray(latencies)
+    median = np.median(values)
+    mad = np.median(np.abs(values - median)) * MAD_SCALE
+    if mad == 0:
+        return list(latencies)
+    return values[np.abs(values - median) <= threshold * mad].tolist()
+
+
+def get_percentile_confidence_interval(
+    latencies: Sequence[float], percentile: float, confidence_level: float
+) -> Tuple[float, float]:
+    """Get the distribution-free confidence interval of the percentile from the order statistics of the latencies."""
+    values = np.sort(latencies)
+    n = len(values)
+    q = percentile / 100
+    z = NormalDist().inv_cdf((1 + confidence_level) / 2)
+    half_width = z * math.sqrt(n * q * (1 - q))
+    lower_rank = max(math.floor(n * q - half_width), 0)
+    upper_rank = min(math.ceil(n * q + half_width), n - 1)
+    return float(values[lower_rank]), float(values[upper_rank])
+
+
+def get_mean_confidence_interval(latencies: Sequence[float], confidence_level: float) -> Tuple[float, float]:
+    values = np.asarray(latencies)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, mean
+    z = NormalDist().inv_cdf((1 + confidence_level) / 2)
+    half_width = z * float(values.std(ddof=1)) / math.sqrt(len(values))
+    return mean - half_width, mean + half_width
+
+
+def get_latency_confidence_interval(
+    latencies: Sequence[float], sub_type: str, confidence_level: float
+) -> Optional[Tuple[float, float]]:
+    """Get the confidence interval of the latency sub type in seconds, or None for min and max."""
+    if sub_type == "avg":
+        return get_mean_confidence_interval(latencies, confidence_level)
+    if sub_type in LATENCY_PERCENTILES:
+        return get_percentile_confidence_interval(latencies, LATENCY_PERCENTILES[sub_type], confidence_level)
+    return None
+
+
+@contextmanager
+def pin_to_cpu_cores(cpu_cores: Optional[List[int]]):
+    """Pin all the threads of the process to the cpu cores while in the context."""
+    if not cpu_cores:
+        yield
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("Pinning to cpu cores is not supported on this platform. Running without pinning.")
+        yield
+        return
+
+    # the thread pools of the inference session are already running, so every thread is pinned
+    task_dir = Path("/proc/self/task")
+    thread_ids = [int(path.name) for path in task_dir.iterdir()] if task_dir.is_dir() else [0]
+    original_affinities = {}
+    for thread_id in thread_ids:
+        try:
+            original_affinities[thread_id] = os.sched_getaffinity(thread_id)
+            os.sched_setaffinity(thread_id, cpu_cores)
+        except OSError:
+            # the thread exited
+            continue
+    try:
+        yield
+    finally:
+        for thread_id, affinity in original_affinities.items():
+            try:
+                os.sched_setaffinity(thread_id, affinity)
+            except OSError:
+                continue
@@ -0,0 +1,83 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple
+
+import numpy as np
+
+
+class LoadTestResult(NamedTuple):
+    batch_size: int
+    concurrency: int
+    # latencies of all the requests in seconds
+    latencies: List[float]
+    # wall time of the measured requests in seconds
+    duration: float
+
+    @property
+    def key(self) -> str:
+        return f"batch_size={self.batch_size},concurrency={self.concurrency}"
+
+    @property
+    def throughput(self) -> float:
+        """Get the sustained number of samples per second."""
+        return self.batch_size * len(self.latencies) / self.duration
+
+
+def run_load_test(
+    run: Callable[[int], None], batch_size: int, concurrency: int, num_warmup: int, num_requests: int
+) -> LoadTestResult:
+    """Send requests from concurrent client threads and measure the latency of each request.
+
+    run sends one request and is called with the index of the client thread. Each client sends num_warmup requests,
+    waits for the other clients to finish warming up and then sends num_requests measured requests back to back.
+    """
+    # the measurement starts when the last client finishes warming up
+    start_times = []
+    barrier = threading.Barrier(concurrency, action=lambda: start_times.append(time.perf_counter()))
+
+    def client(stream_index: int):
+        try:
+            for _ in range(num_warmup):
+                run(stream_index)
+            barrier.wait()
+        except BaseException:
+            # release the other clients
+            barrier.abort()
+            raise
+        latencies = []
+        for _ in range(num_requests):
+            t = time.perf_counter()
+            run(stream_index)
+            latencies.append(time.perf_counter() - t)
+        return latencies, time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="olive-load-test") as executor:
+        futures = [executor.submit(client, stream_index) for stream_index in range(concurrency)]
+        errors = [future.exception() for future in futures]
+    if any(errors):
+        # raise the error of the client that failed rather than the broken barrier of the others
+        raise next(e for e in errors if e and not isinstance(e, threading.BrokenBarrierError))
+    results = [future.result() for future in futures]
+
+    return LoadTestResult(
+        batch_size=batch_size,
+        concurrency=concurrency,
+        latencies=[latency for latencies, _ in results for latency in latencies],
+        duration=max(end_time for _, end_time in results) - start_times[0],
+    )
+
+
+def resize_batch(input_feed: Dict[str, np.ndarray], batch_size: int) -> Dict[str, np.ndarray]:
+    """Repeat or truncate the samples of the inputs along the first axis to the batch size."""
+    resized = {}
+    for name, value in input_feed.items():
+        if not isinstance(value, np.ndarray) or value.ndim == 0:
+            resized[name] = value
+            continue
+        resized[name] = np.take(value, np.arange(batch_size) % value.shape[0], axis=0)
+    return resized
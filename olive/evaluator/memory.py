@@ -0,0 +1,179 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from olive.common.utils import run_in_fresh_process
+from olive.constants import Framework
+from olive.evaluator.metric import MemorySubType
+from olive.hardware import Device
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# interval in seconds between samples of the resident set size when the kernel does not track its peak
+RSS_SAMPLING_INTERVAL = 0.001
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+class PeakRssTracker:
+    """Track the peak resident set size of the process since the last reset.
+
+    On Linux the peak is the high water mark kept by the kernel. Elsewhere, or if the high water mark cannot be reset
+    such as in some containers, the rss is sampled with psutil in a background thread, which can miss short peaks.
+    """
+
+    def __init__(self):
+        self._use_proc = _PROC_STATUS.exists() and self._can_reset_proc_peak()
+        self._process = None
+        self._peak = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+        if not self._use_proc:
+            try:
+                import psutil
+            except ImportError:
+                raise ImportError("psutil is required to measure the memory of the model on this platform") from None
+            self._process = psutil.Process()
+
+    @staticmethod
+    def _can_reset_proc_peak() -> bool:
+        if not _PROC_CLEAR_REFS.exists():
+            return False
+        try:
+            _PROC_CLEAR_REFS.write_text("5")
+        except OSError as e:
+            logger.debug("Cannot reset the peak rss with %s, sampling the rss instead: %s", _PROC_CLEAR_REFS, e)
+            return False
+        return True
+
+    def _read_proc_status(self, field: str) -> int:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith(f"{field}:"):
+                # the value is in kB
+                return int(line.split()[1]) * 1024
+        raise RuntimeError(f"{field} is not in {_PROC_STATUS}")
+
+    def _sample(self):
+        self._peak = max(self._peak, self._process.memory_info().rss)
+
+    def _run(self):
+        while not self._stop_event.wait(RSS_SAMPLING_INTERVAL):
+            self._sample()
+
+    def current(self) -> int:
+        """Get the current rss in bytes."""
+        if self._use_proc:
+            return self._read_proc_status("VmRSS")
+        return self._process.memory_info().rss
+
+    def peak(self) -> int:
+        """Get the peak rss in bytes since the last reset."""
+        if self._use_proc:
+            return self._read_proc_status("VmHWM")
+        self._sample()
+        return self._peak
+
+    def reset(self) -> int:
+        """Reset the peak to the current rss and return it."""
+        if self._use_proc:
+            # writing 5 resets the high water mark of the rss to the current rss
+            _PROC_CLEAR_REFS.write_text("5")
+        else:
+            self._peak = 0
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return self.current()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+
+def _get_device_memory_used(device: Device) -> int:
+    """Get the memory used on the cuda device in bytes, 0 for other devices."""
+    if device != Device.GPU:
+        return 0
+    import torch
+
+    if not torch.cuda.is_available():
+        return 0
+    free, total = torch.cuda.mem_get_info()
+    return total - free
+
+
+def _measure_memory(
+    model_config: Dict[str, Any],
+    inference_settings: Optional[Dict[str, Any]],
+    device: Device,
+    execution_providers: Optional[List[str]],
+    input_feeds: List[Any],
+    run_kwargs: Dict[str, Any],
+    repeat_test_num: int,
+) -> Dict[str, float]:
+    """Create the session and run the inputs through it, return the memory sub types in MB.
+
+    Runs in a fresh process so that the memory of the evaluator and of other models is not counted.
+    """
+    from olive.model import ModelConfig
+
+    model = ModelConfig.parse_obj(model_config).create_model()
+    if model.framework == Framework.ONNX:
+        # the libraries of the runtime are not part of the memory of the session
+        import onnxruntime  # noqa: F401 # pylint: disable=unused-import
+
+    tracker = PeakRssTracker()
+    device_memory_baseline = _get_device_memory_used(device)
+    try:
+        baseline = tracker.reset()
+        session = model.prepare_session(
+            inference_settings=inference_settings, device=device, execution_providers=execution_providers
+        )
+        session_peak = tracker.peak()
+
+        session_rss = tracker.reset()
+        for input_feed in input_feeds:
+            for _ in range(repeat_test_num):
+                model.run_session(session, input_feed, **run_kwargs)
+        inference_peak = tracker.peak()
+        device_memory = _get_device_memory_used(device) - device_memory_baseline
+    finally:
+        tracker.stop()
+
+    return {
+        MemorySubType.SESSION_RSS: (session_peak - baseline) / MB,
+        MemorySubType.INFERENCE_RSS: (inference_peak - session_rss) / MB,
+        MemorySubType.PEAK_RSS: (max(session_peak, inference_peak) - baseline) / MB,
+        MemorySubType.DEVICE: device_memory / MB,
+    }
+
+
+def measure_memory(
+    model_config: Dict[str, Any],
+    inference_settings: Optional[Dict[str, Any]],
+    device: Device,
+    execution_providers: Optional[List[str]],
+    input_feeds: List[Any],
+    run_kwargs: Dict[str, Any],
+    repeat_test_num: int = 1,
+) -> Dict[str, float]:
+    """Measure the memory used to create the session of the model and to run the inputs in a child process."""
+    return run_in_fresh_process(
+        _measure_memory,
+        model_config,
+        inference_settings,
+        device,
+        execution_providers,
+        input_feeds,
+        run_kwargs,
+        repeat_test_num,
+    )
@@ -10,7 +10,14 @@ from olive.common.pydantic_v1 import validator
 from olive.common.utils import StrEnumBase
 from olive.data.config import DataConfig
 from olive.evaluator.accuracy import AccuracyBase
-from olive.evaluator.metric_config import LatencyMetricConfig, MetricGoal, ThroughputMetricConfig, get_user_config_class
+from olive.evaluator.metric_config import (
+    ColdStartMetricConfig,
+    LatencyMetricConfig,
+    MemoryMetricConfig,
+    MetricGoal,
+    ThroughputMetricConfig,
+    get_user_config_class,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +27,8 @@ class MetricType(StrEnumBase):
     ACCURACY = "accuracy"
     LATENCY = "latency"
     THROUGHPUT = "throughput"
+    MEMORY = "memory"
+    COLD_START = "cold_start"
     CUSTOM = "custom"
 
 
@@ -58,6 +67,29 @@ class ThroughputSubType(StrEnumBase):
     P999 = "p999"
 
 
+class MemorySubType(StrEnumBase):
+    # unit: megabyte
+    # peak increase of the resident set size while creating the session
+    SESSION_RSS = "session_rss"
+    # peak increase of the resident set size while running inference, over the size after creating the session
+    INFERENCE_RSS = "inference_rss"
+    # peak increase of the resident set size while creating the session and running inference
+    PEAK_RSS = "peak_rss"
+    # memory held on the gpu after inference, 0 on other devices
+    DEVICE = "device"
+
+
+class ColdStartSubType(StrEnumBase):
+    # unit: millisecond, average over fresh processes
+    # loading the model into the runtime
+    MODEL_LOAD = "model_load"
+    # optimizing the graph, partitioning it between the execution providers and allocating the initializers
+    SESSION_INITIALIZATION = "session_initialization"
+    FIRST_INFERENCE = "first_inference"
+    # creating the session and running the first inference
+    TOTAL = "total"
+
+
 class SubMetric(ConfigBase):
     name: Union[AccuracySubType, LatencyMetricConfig, str]
     metric_config: ConfigBase = None
@@ -156,6 +188,10 @@ class Metric(ConfigBase):
                     sub_metric_type_cls = LatencySubType
                 elif values["type"] == MetricType.THROUGHPUT:
                     sub_metric_type_cls = ThroughputSubType
+                elif values["type"] == MetricType.MEMORY:
+                    sub_metric_type_cls = MemorySubType
+                elif values["type"] == MetricType.COLD_START:
+                    sub_metric_type_cls = ColdStartSubType
                 # if not exist, will raise ValueError
                 v["name"] = sub_metric_type_cls(v["name"])
             except ValueError:
@@ -180,6 +216,12 @@ class Metric(ConfigBase):
         elif values["type"] == MetricType.THROUGHPUT:
             v["higher_is_better"] = v.get("higher_is_better", True)
             metric_config_cls = ThroughputMetricConfig
+        elif values["type"] == MetricType.MEMORY:
+            v["higher_is_better"] = v.get("higher_is_better", False)
+            metric_config_cls = MemoryMetricConfig
+        elif values["type"] == MetricType.COLD_START:
+            v["higher_is_better"] = v.get("higher_is_better", False)
+            metric_config_cls = ColdStartMetricConfig
         v["metric_config"] = validate_config(v.get("metric_config", {}), metric_config_cls)
 
         return v
@@ -202,3 +244,10 @@ def get_latency_config_from_metric(metric: Metric):
             sleep_num = sub_type.metric_config.sleep_num
             break
     return warmup_num, repeat_test_num, sleep_num
+
+
+def get_latency_metric_config(metric: Metric) -> Optional[LatencyMetricConfig]:
+    for sub_type in metric.sub_types:
+        if sub_type.metric_config:
+            return sub_type.metric_config
+    return None
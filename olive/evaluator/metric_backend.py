@@ -3,7 +3,7 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, NamedTuple, Tuple, Type, Union
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Iterable, NamedTuple, Optional, Tuple, Type, Union
 
 from olive.common.auto_config import AutoConfigClass, ConfigBase
 from olive.common.config_utils import ConfigParam
@@ -37,6 +37,52 @@ class MetricBackend(AutoConfigClass):
             metric_results_dict[sub_metric.name] = self.measure_sub_metric(model_output, targets, sub_metric)
         return MetricResult.parse_obj(metric_results_dict)
 
+    def create_accumulator(self, metric: "Metric") -> Optional["TorchMetricsAccumulator"]:
+        """Create an accumulator that measures the metric batch by batch.
+
+        Return None if the backend needs the outputs of the whole dataset at once.
+        """
+        return None
+
+
+class TorchMetricsAccumulator:
+    """Measure the torchmetrics sub metrics of a metric by updating them with the outputs of each batch."""
+
+    def __init__(self, metric: "Metric"):
+        self.sub_metrics = [
+            (sub_metric, AccuracyBase.registry[sub_metric.name.value](sub_metric.metric_config))
+            for sub_metric in metric.sub_types
+        ]
+
+    @property
+    def requires_logits(self) -> bool:
+        return any(metric_obj.requires_logits for _, metric_obj in self.sub_metrics)
+
+    def update(self, model_output: Union[Tuple, NamedTuple], targets: Any):
+        for _, metric_obj in self.sub_metrics:
+            metric_obj.update(model_output, targets)
+
+    def peek(self, sub_metric_names: Iterable[str]) -> Dict[str, float]:
+        """Compute the given sub metrics over the batches so far without resetting them."""
+        return {
+            sub_metric.name: metric_obj.peek()
+            for sub_metric, metric_obj in self.sub_metrics
+            if sub_metric.name in sub_metric_names
+        }
+
+    def compute(self, pruned: bool = False) -> MetricResult:
+        return MetricResult.parse_obj(
+            {
+                sub_metric.name: SubMetricResult(
+                    value=metric_obj.compute(),
+                    priority=sub_metric.priority,
+                    higher_is_better=sub_metric.higher_is_better,
+                    pruned=pruned,
+                )
+                for sub_metric, metric_obj in self.sub_metrics
+            }
+        )
+
 
 class TorchMetrics(MetricBackend):
     name: str = "torch_metrics"
@@ -51,6 +97,9 @@ class TorchMetrics(MetricBackend):
             higher_is_better=sub_metric.higher_is_better,
         )
 
+    def create_accumulator(self, metric: "Metric") -> TorchMetricsAccumulator:
+        return TorchMetricsAccumulator(metric)
+
 
 class HuggingfaceMetrics(MetricBackend):
     name: str = "huggingface_metrics"
@@ -4,7 +4,7 @@
 # --------------------------------------------------------------------------
 import logging
 from pathlib import Path
-from typing import Any, Callable, Dict, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from olive.common.config_utils import ConfigBase, ConfigParam, ParamCategory, create_config_class
 from olive.common.pydantic_v1 import validator
@@ -22,11 +22,22 @@ _common_user_config = {
     "shared_kv_buffer": ConfigParam(type_=bool, default_value=False),
     "io_bind": ConfigParam(type_=bool, default_value=False),
     "run_kwargs": ConfigParam(type_=dict),
+    # keep the dtype of the onnx session outputs instead of casting them to float32, which avoids copying them
+    "keep_output_dtype": ConfigParam(type_=bool, default_value=False),
 }
 
 _common_user_config_validators = {}
 
 _type_to_user_config = {
+    "accuracy": {
+        # number of onnx sessions that run the batches in parallel threads on cpu
+        "num_sessions": ConfigParam(type_=int, default_value=1),
+        # stop the evaluation once a threshold goal of accuracy_score cannot be met with early_stop_confidence
+        "early_stop": ConfigParam(type_=bool, default_value=False),
+        "early_stop_confidence": ConfigParam(type_=float, default_value=0.99),
+        # samples evaluated before the goals are first tested
+        "early_stop_min_samples": ConfigParam(type_=int, default_value=100),
+    },
     "custom": {
         "evaluate_func": ConfigParam(type_=Union[Callable, str], required=False, category=ParamCategory.OBJECT),
         "evaluate_func_kwargs": ConfigParam(type_=Dict[str, Any]),
@@ -35,7 +46,20 @@ _type_to_user_config = {
     },
 }
 
-_type_to_user_config_validators = {}
+
+def _validate_early_stop_confidence(cls, v):
+    if v is not None and not 0 < v < 1:
+        raise ValueError("early_stop_confidence must be between 0 and 1")
+    return v
+
+
+_type_to_user_config_validators = {
+    "accuracy": {
+        "validate_early_stop_confidence": validator("early_stop_confidence", allow_reuse=True)(
+            _validate_early_stop_confidence
+        ),
+    },
+}
 
 
 def get_user_config_class(metric_type: str):
@@ -51,12 +75,75 @@ class LatencyMetricConfig(ConfigBase):
     warmup_num: int = WARMUP_NUM
     repeat_test_num: int = REPEAT_TEST_NUM
     sleep_num: int = SLEEP_NUM
+    # adaptive sampling: warm up until the latency is steady, then sample until the confidence interval of
+    # target_percentile is narrower than ci_rel_width of its value. warmup_num and repeat_test_num are the minimums.
+    adaptive: bool = False
+    max_warmup_num: int = 200
+    max_repeat_test_num: int = 1000
+    # seconds spent sampling before giving up on the target width
+    max_duration: float = 60
+    target_percentile: float = 50
+    confidence_level: float = 0.95
+    ci_rel_width: float = 0.02
+    # samples with a modified z-score above the threshold are rejected in adaptive mode, None keeps all samples
+    outlier_threshold: Optional[float] = 3.5
+    # cpu cores to pin the process to while measuring, only supported on linux
+    cpu_cores: Optional[List[int]] = None
+    # batches of the data to measure, grouped into buckets by the shapes of their inputs. The latency is the average
+    # of the buckets weighted by their number of batches. None measures all the batches.
+    num_batches: Optional[int] = 1
+
+    @validator("target_percentile")
+    def validate_target_percentile(cls, v):
+        if not 0 < v < 100:
+            raise ValueError("target_percentile must be between 0 and 100")
+        return v
 
+    @validator("num_batches")
+    def validate_num_batches(cls, v):
+        if v is not None and v < 1:
+            raise ValueError("num_batches must be positive")
+        return v
 
-class ThroughputMetricConfig(ConfigBase):
-    warmup_num: int = WARMUP_NUM
-    repeat_test_num: int = REPEAT_TEST_NUM
-    sleep_num: int = SLEEP_NUM
+    @validator("confidence_level")
+    def validate_confidence_level(cls, v):
+        if not 0 < v < 1:
+            raise ValueError("confidence_level must be between 0 and 1")
+        return v
+
+
+class ThroughputMetricConfig(LatencyMetricConfig):
+    # number of concurrent client threads of the multi-stream load test, one result per level. None derives the
+    # throughput from the single-stream latency. warmup_num and repeat_test_num are the requests per client.
+    concurrency: Optional[List[int]] = None
+    # batch sizes of the load test requests, the first batch of the data is repeated or truncated to each size
+    batch_sizes: Optional[List[int]] = None
+    # inference sessions shared by the clients of the load test
+    num_sessions: int = 1
+
+    @validator("concurrency", "batch_sizes", each_item=True)
+    def validate_positive(cls, v, field):
+        if v < 1:
+            raise ValueError(f"{field.name} must be positive")
+        return v
+
+
+class MemoryMetricConfig(ConfigBase):
+    # batches of the data run during inference, None runs all the batches
+    num_batches: Optional[int] = 1
+    # runs of each batch
+    repeat_test_num: int = 1
+
+    @validator("num_batches")
+    def validate_num_batches(cls, v):
+        if v is not None and v < 1:
+            raise ValueError("num_batches must be positive")
+        return v
+
+
+class ColdStartMetricConfig(ConfigBase):
+    # fresh processes that create the session and run the first inference
+    repeat_test_num: int = 5
 
 
 class MetricGoal(ConfigBase):
@@ -3,7 +3,7 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
 import json
-from typing import ClassVar, Dict, Union
+from typing import ClassVar, Dict, Optional, Tuple, Union
 
 from olive.common.config_utils import ConfigBase, ConfigDictBase
 
@@ -12,6 +12,12 @@ class SubMetricResult(ConfigBase):
     value: Union[float, int]
     priority: int
     higher_is_better: bool
+    # lower and upper bound of the value, only measured by adaptive latency sampling
+    confidence_interval: Optional[Tuple[float, float]] = None
+    # value of each configuration the metric is measured at, such as the levels of a multi-stream load test
+    breakdown: Optional[Dict[str, float]] = None
+    # the evaluation stopped early as the goal cannot be met, the value is measured on part of the data
+    pruned: bool = False
 
 
 class MetricResult(ConfigDictBase):
@@ -23,6 +29,9 @@ class MetricResult(ConfigDictBase):
             return None
         return self.__root__[joint_metric_key(metric_name, sub_type_name)].value
 
+    def is_pruned(self) -> bool:
+        return any(v.pruned for v in self.__root__.values())
+
     def get_all_sub_type_metric_value(self, metric_name):
         return {k.split(self.delimiter)[-1]: v.value for k, v in self.__root__.items() if k.startswith(metric_name)}
 
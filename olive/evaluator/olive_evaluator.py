@@ -4,13 +4,18 @@
 # --------------------------------------------------------------------------
 import collections
 import logging
+import os
+import queue
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from copy import deepcopy
 from functools import partial
+from itertools import islice
 from numbers import Number
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -18,17 +23,39 @@ import torch
 from olive.common.config_utils import NestedConfig, validate_config
 from olive.common.import_lib import import_user_module
 from olive.common.ort_inference import OrtInferenceSession, prepare_io_bindings
+from olive.common.profiling import profile_stage
 from olive.common.pydantic_v1 import Field, root_validator, validator
 from olive.common.user_module_loader import UserModuleLoader
-from olive.common.utils import load_weights, tensor_data_to_device
+from olive.common.utils import hash_dict, load_weights, tensor_data_to_device
 from olive.constants import Framework
 from olive.data.config import DataConfig
 from olive.data.container.dummy_data_container import TRANSFORMER_DUMMY_DATA_CONTAINER
+from olive.data.dataset_cache import create_cached_dataloader
 from olive.data.template import dummy_data_config_template
-from olive.evaluator.metric import LatencySubType, Metric, MetricType, ThroughputSubType, get_latency_config_from_metric
+from olive.evaluator.cold_start import measure_cold_start
+from olive.evaluator.early_stop import SequentialGoalTest, get_num_samples
+from olive.evaluator.latency_sampling import get_latency_confidence_interval, pin_to_cpu_cores, sample_latencies
+from olive.evaluator.load_test import LoadTestResult, resize_batch, run_load_test
+from olive.evaluator.memory import measure_memory
+from olive.evaluator.metric import (
+    ColdStartSubType,
+    LatencySubType,
+    Metric,
+    MetricType,
+    ThroughputSubType,
+    get_latency_config_from_metric,
+    get_latency_metric_config,
+)
 from olive.evaluator.metric_backend import MetricBackend
 from olive.evaluator.metric_result import MetricResult, SubMetricResult, flatten_metric_result, joint_metric_key
 from olive.evaluator.registry import Registry
+from olive.evaluator.shape_buckets import (
+    ShapeBucket,
+    bucket_by_shape,
+    get_batch_size,
+    pool_shape_buckets,
+    weighted_percentile,
+)
 from olive.hardware import Device
 from olive.model import DistributedOnnxModelHandler, ONNXModelHandler
 from olive.model.config.io_config import is_io_config_static
@@ -79,7 +106,7 @@ class OliveEvaluator(ABC):
         if metric.data_config:
             return metric
 
-        if metric.type != MetricType.LATENCY:
+        if metric.type not in (MetricType.LATENCY, MetricType.MEMORY, MetricType.COLD_START):
             return metric
 
         io_config = model.io_config
@@ -133,7 +160,7 @@ class OliveEvaluator(ABC):
                 metric.data_config.load_dataset_config.params["model_framework"] = framework
 
             dc = metric.data_config.to_data_container()
-            dataloader = dc.create_dataloader()
+            dataloader = create_cached_dataloader(dc)
             post_func = dc.config.post_process
 
         return dataloader, eval_func, post_func
@@ -145,29 +172,58 @@ class OliveEvaluator(ABC):
         return evaluate_backend_cls().measure(model_outputs, targets, metric)
 
     @staticmethod
-    def latency_helper(latencies) -> Dict:
+    def latency_helper(latencies, weights=None) -> Dict:
+        if weights is None:
+            average = sum(latencies) / len(latencies)
+            percentile = partial(np.percentile, latencies)
+        else:
+            average = np.average(latencies, weights=weights)
+            percentile = partial(weighted_percentile, latencies, weights)
         return {
-            LatencySubType.AVG: round(sum(latencies) / len(latencies) * 1000, 5),
+            LatencySubType.AVG: round(average * 1000, 5),
             LatencySubType.MAX: round(max(latencies) * 1000, 5),
             LatencySubType.MIN: round(min(latencies) * 1000, 5),
-            LatencySubType.P50: round(np.percentile(latencies, 50) * 1000, 5),
-            LatencySubType.P75: round(np.percentile(latencies, 75) * 1000, 5),
-            LatencySubType.P90: round(np.percentile(latencies, 90) * 1000, 5),
-            LatencySubType.P95: round(np.percentile(latencies, 95) * 1000, 5),
-            LatencySubType.P99: round(np.percentile(latencies, 99) * 1000, 5),
-            LatencySubType.P999: round(np.percentile(latencies, 99.9) * 1000, 5),
+            LatencySubType.P50: round(percentile(50) * 1000, 5),
+            LatencySubType.P75: round(percentile(75) * 1000, 5),
+            LatencySubType.P90: round(percentile(90) * 1000, 5),
+            LatencySubType.P95: round(percentile(95) * 1000, 5),
+            LatencySubType.P99: round(percentile(99) * 1000, 5),
+            LatencySubType.P999: round(percentile(99.9) * 1000, 5),
         }
 
+    @staticmethod
+    def throughput_to_latency_sub_type(sub_type_name: str) -> LatencySubType:
+        """Get the latency sub type the throughput sub type is derived from."""
+        if sub_type_name == ThroughputSubType.MIN:
+            return LatencySubType.MAX
+        if sub_type_name == ThroughputSubType.MAX:
+            return LatencySubType.MIN
+        return LatencySubType(sub_type_name)
+
+    @staticmethod
+    def latency_confidence_interval(
+        metric: Metric, latencies: Any, latency_sub_type_name: str
+    ) -> Optional[Tuple[float, float]]:
+        """Get the confidence interval of the latency sub type in seconds if the latencies were sampled adaptively."""
+        latency_config = get_latency_metric_config(metric)
+        if not (latency_config and latency_config.adaptive):
+            return None
+        return get_latency_confidence_interval(latencies, latency_sub_type_name, latency_config.confidence_level)
+
     @staticmethod
     def compute_latency(metric: Metric, latencies: Any) -> MetricResult:
         """Compute latency metrics."""
         latency_metrics = OliveEvaluator.latency_helper(latencies)
         metric_res = {}
         for sub_type in metric.sub_types:
+            confidence_interval = OliveEvaluator.latency_confidence_interval(metric, latencies, sub_type.name)
             metric_res[sub_type.name] = SubMetricResult(
                 value=latency_metrics[sub_type.name],
                 priority=sub_type.priority,
                 higher_is_better=sub_type.higher_is_better,
+                confidence_interval=(
+                    tuple(round(bound * 1000, 5) for bound in confidence_interval) if confidence_interval else None
+                ),
             )
         return MetricResult.parse_obj(metric_res)
 
@@ -178,22 +234,154 @@ class OliveEvaluator(ABC):
         metric_res = {}
         batch_size = metric.data_config.dataloader_params.get("batch_size", 1) if metric.data_config else 1
         for sub_type in metric.sub_types:
-            if sub_type.name == ThroughputSubType.MIN:
-                latency_sub_type_name = LatencySubType.MAX
-            elif sub_type.name == ThroughputSubType.MAX:
-                latency_sub_type_name = LatencySubType.MIN
-            else:
-                latency_sub_type_name = LatencySubType(sub_type.name)
+            latency_sub_type_name = OliveEvaluator.throughput_to_latency_sub_type(sub_type.name)
+            confidence_interval = OliveEvaluator.latency_confidence_interval(metric, latencies, latency_sub_type_name)
             metric_res[sub_type.name] = SubMetricResult(
                 # per second, so multiply by 1000
                 value=round(batch_size / latency_metrics[latency_sub_type_name] * 1000, 5),
                 priority=sub_type.priority,
                 higher_is_better=sub_type.higher_is_better,
+                # the upper bound of the latency is the lower bound of the throughput
+                confidence_interval=(
+                    tuple(round(batch_size / bound, 5) for bound in reversed(confidence_interval))
+                    if confidence_interval
+                    else None
+                ),
+            )
+        return MetricResult.parse_obj(metric_res)
+
+    @staticmethod
+    def compute_memory(metric: Metric, memory_metrics: Dict[str, float]) -> MetricResult:
+        """Compute memory metrics."""
+        metric_res = {}
+        for sub_type in metric.sub_types:
+            metric_res[sub_type.name] = SubMetricResult(
+                value=round(memory_metrics[sub_type.name], 5),
+                priority=sub_type.priority,
+                higher_is_better=sub_type.higher_is_better,
+            )
+        return MetricResult.parse_obj(metric_res)
+
+    @staticmethod
+    def compute_cold_start(metric: Metric, cold_starts: Dict[str, List[float]]) -> MetricResult:
+        """Compute cold start metrics as the average over the fresh processes."""
+        metric_res = {}
+        for sub_type in metric.sub_types:
+            values = cold_starts[sub_type.name]
+            metric_res[sub_type.name] = SubMetricResult(
+                value=round(sum(values) / len(values), 5),
+                priority=sub_type.priority,
+                higher_is_better=sub_type.higher_is_better,
+            )
+        return MetricResult.parse_obj(metric_res)
+
+    @staticmethod
+    def compute_load_test_throughput(metric: Metric, load_test_results: List[LoadTestResult]) -> MetricResult:
+        """Compute throughput metrics at the load test level with the highest sustained throughput.
+
+        avg is the sustained number of samples per second. The other sub types are derived from the latency of the
+        requests, each of the concurrent clients completes batch_size samples per request.
+        """
+
+        def get_throughput(result: LoadTestResult, sub_type_name: str) -> float:
+            if sub_type_name == ThroughputSubType.AVG:
+                return round(result.throughput, 5)
+            latency_sub_type_name = OliveEvaluator.throughput_to_latency_sub_type(sub_type_name)
+            latency = OliveEvaluator.latency_helper(result.latencies)[latency_sub_type_name]
+            return round(result.concurrency * result.batch_size / latency * 1000, 5)
+
+        for result in load_test_results:
+            latency_metrics = OliveEvaluator.latency_helper(result.latencies)
+            logger.info(
+                "Load test %s: %.2f samples/s, p50 latency %.3f ms, p99 latency %.3f ms",
+                result.key,
+                result.throughput,
+                latency_metrics[LatencySubType.P50],
+                latency_metrics[LatencySubType.P99],
+            )
+        best_result = max(load_test_results, key=lambda result: result.throughput)
+        metric_res = {}
+        for sub_type in metric.sub_types:
+            metric_res[sub_type.name] = SubMetricResult(
+                value=get_throughput(best_result, sub_type.name),
+                priority=sub_type.priority,
+                higher_is_better=sub_type.higher_is_better,
+                breakdown={result.key: get_throughput(result, sub_type.name) for result in load_test_results},
+            )
+        return MetricResult.parse_obj(metric_res)
+
+    @staticmethod
+    def compute_bucketed_latency(metric: Metric, buckets: List[ShapeBucket]) -> MetricResult:
+        """Compute latency metrics over the input shape buckets, weighted by their number of batches.
+
+        The confidence interval of adaptive sampling is only reported if there is one bucket, the sampled latencies of
+        several buckets are not from one distribution.
+        """
+        latency_metrics = OliveEvaluator.latency_helper(*pool_shape_buckets(buckets))
+        bucket_metrics = {bucket.key: OliveEvaluator.latency_helper(bucket.latencies) for bucket in buckets}
+        metric_res = {}
+        for sub_type in metric.sub_types:
+            confidence_interval = (
+                OliveEvaluator.latency_confidence_interval(metric, buckets[0].latencies, sub_type.name)
+                if len(buckets) == 1
+                else None
+            )
+            metric_res[sub_type.name] = SubMetricResult(
+                value=latency_metrics[sub_type.name],
+                priority=sub_type.priority,
+                higher_is_better=sub_type.higher_is_better,
+                breakdown={key: bucket_metric[sub_type.name] for key, bucket_metric in bucket_metrics.items()},
+                confidence_interval=(
+                    tuple(round(bound * 1000, 5) for bound in confidence_interval) if confidence_interval else None
+                ),
+            )
+        return MetricResult.parse_obj(metric_res)
+
+    @staticmethod
+    def compute_bucketed_throughput(metric: Metric, buckets: List[ShapeBucket]) -> MetricResult:
+        """Compute throughput metrics over the input shape buckets, weighted by their number of samples.
+
+        Each bucket counts its own batch size, so a partial last batch is not counted as a full batch. The confidence
+        interval of adaptive sampling is only reported if there is one bucket.
+        """
+        latency_metrics = OliveEvaluator.latency_helper(*pool_shape_buckets(buckets, per_sample=True))
+        bucket_metrics = {bucket.key: OliveEvaluator.latency_helper(bucket.latencies) for bucket in buckets}
+        metric_res = {}
+        for sub_type in metric.sub_types:
+            latency_sub_type_name = OliveEvaluator.throughput_to_latency_sub_type(sub_type.name)
+            confidence_interval = (
+                OliveEvaluator.latency_confidence_interval(metric, buckets[0].latencies, latency_sub_type_name)
+                if len(buckets) == 1
+                else None
+            )
+            metric_res[sub_type.name] = SubMetricResult(
+                # the pooled latencies are per sample, per second so multiply by 1000
+                value=round(1 / latency_metrics[latency_sub_type_name] * 1000, 5),
+                priority=sub_type.priority,
+                higher_is_better=sub_type.higher_is_better,
+                breakdown={
+                    bucket.key: round(bucket.batch_size / bucket_metrics[bucket.key][latency_sub_type_name] * 1000, 5)
+                    for bucket in buckets
+                },
+                # the upper bound of the latency is the lower bound of the throughput
+                confidence_interval=(
+                    tuple(round(buckets[0].batch_size / bound, 5) for bound in reversed(confidence_interval))
+                    if confidence_interval
+                    else None
+                ),
             )
         return MetricResult.parse_obj(metric_res)
 
 
 class _OliveEvaluator(OliveEvaluator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # state shared by the metrics of one evaluate call, released once the evaluation is done
+        self._sessions: Dict[str, Any] = None
+        self._inference_outputs: Dict[str, Tuple[OliveModelOutput, Any]] = None
+        self._metrics: List[Metric] = None
+        self._accuracy_results: Dict[str, MetricResult] = None
+
     @staticmethod
     def device_string_to_torch_device(device: Device):
         return torch.device("cuda") if device == Device.GPU else torch.device(device)
@@ -205,7 +393,6 @@ class _OliveEvaluator(OliveEvaluator):
 
         return inference_settings and inference_settings.get("io_bind")
 
-    @abstractmethod
     def _inference(
         self,
         model: "OliveModelHandler",
@@ -215,7 +402,197 @@ class _OliveEvaluator(OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> Tuple[OliveModelOutput, Any]:
-        raise NotImplementedError
+        """Run the model on the whole dataset and return the concatenated outputs and targets.
+
+        Subclasses implement either this method or _inference_batches.
+        """
+        batches = self._inference_batches(model, metric, dataloader, post_func, device, execution_providers)
+        return _OliveEvaluator._concat_batches(batches)
+
+    def _inference_batches(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        post_func=None,
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+        keep_logits: bool = True,
+    ) -> Iterator[Tuple[OliveModelOutput, Any]]:
+        """Run the model batch by batch and yield the outputs and targets of each batch.
+
+        The logits are None if keep_logits is False. Evaluators that only implement _inference yield the outputs of
+        the whole dataset as one batch.
+        """
+        yield self._inference(model, metric, dataloader, post_func, device, execution_providers)
+
+    @staticmethod
+    def _concat_batches(batches: Iterable[Tuple[OliveModelOutput, Any]]) -> Tuple[OliveModelOutput, Any]:
+        def concat(values):
+            if values[0] is None:
+                return None
+            if isinstance(values[0], dict):
+                return {k: torch.cat([value[k] for value in values], dim=0) for k in values[0]}
+            # concatenate along the batch dimension
+            return torch.cat(values, dim=0)
+
+        preds = []
+        logits = []
+        targets = []
+        for model_output, labels in batches:
+            preds.append(model_output.preds)
+            logits.append(model_output.logits)
+            targets.append(labels)
+        return OliveModelOutput(preds=concat(preds), logits=concat(logits)), concat(targets)
+
+    @staticmethod
+    def _get_inference_key(model: "OliveModelHandler", metric: Metric) -> Optional[str]:
+        """Get the key of the model outputs of the metric.
+
+        Metrics with the same key run the model on the same data with the same settings, so they get the same outputs.
+        """
+        if not metric.data_config:
+            return None
+        user_config = metric.user_config
+        try:
+            return hash_dict(
+                {
+                    "data_config": metric.data_config.to_json(),
+                    "inference_settings": metric.get_inference_settings(model.framework.lower()),
+                    "run_kwargs": metric.get_run_kwargs(),
+                    "io_bind": getattr(user_config, "io_bind", None),
+                    "shared_kv_buffer": getattr(user_config, "shared_kv_buffer", None),
+                }
+            )
+        except TypeError:
+            # settings that cannot be serialized, such as python objects, cannot be compared
+            return None
+
+    def _shared_inference(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        post_func=None,
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> Tuple[OliveModelOutput, Any]:
+        """Run the inference for the metric or reuse the outputs of an earlier metric of the same evaluation."""
+        key = self._get_inference_key(model, metric) if self._inference_outputs is not None else None
+        if key is None:
+            return self._inference(model, metric, dataloader, post_func, device, execution_providers)
+        if key in self._inference_outputs:
+            logger.debug("Reusing the model outputs of an earlier metric for metric %s.", metric.name)
+        else:
+            self._inference_outputs[key] = self._inference(
+                model, metric, dataloader, post_func, device, execution_providers
+            )
+        return self._inference_outputs[key]
+
+    def _accumulate_accuracy(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        post_func=None,
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        """Evaluate the accuracy metric by updating it with the outputs of each batch.
+
+        Only the state of the metric is kept between the batches, so the memory does not grow with the size of the
+        dataset. The other accuracy metrics of the evaluation with the same inference key are updated in the same pass.
+        Metric backends that need the outputs of the whole dataset get them concatenated. If a custom metric with a
+        metric_func has the same inference key, the outputs of the pass are also kept for it, and outputs that an
+        earlier custom metric kept are used instead of running the model again.
+
+        With early_stop in the user config, the partial values are tested against the threshold goals of the metric
+        and the evaluation stops once a goal cannot be met. The sub metric results are then marked as pruned.
+        """
+        if self._accuracy_results and metric.name in self._accuracy_results:
+            logger.debug("Reusing the result of metric %s measured with an earlier metric.", metric.name)
+            return self._accuracy_results.pop(metric.name)
+
+        accumulator = MetricBackend.registry[metric.backend]().create_accumulator(metric)
+        if accumulator is None:
+            inference_output, targets = self._shared_inference(
+                model, metric, dataloader, post_func, device, execution_providers
+            )
+            return OliveEvaluator.compute_accuracy(metric, inference_output, targets)
+
+        accumulators = {metric.name: accumulator}
+        key = self._get_inference_key(model, metric) if self._metrics else None
+        shared_outputs = None
+        collected_batches = None
+        if key is not None:
+            for other_metric in self._metrics:
+                if (
+                    other_metric.type != MetricType.ACCURACY
+                    or other_metric.name in accumulators
+                    or self._get_inference_key(model, other_metric) != key
+                ):
+                    continue
+                other_accumulator = MetricBackend.registry[other_metric.backend]().create_accumulator(other_metric)
+                if other_accumulator is not None:
+                    accumulators[other_metric.name] = other_accumulator
+
+            if self._inference_outputs is not None:
+                shared_outputs = self._inference_outputs.get(key)
+                if shared_outputs is None and any(
+                    other_metric.type == MetricType.CUSTOM
+                    and not other_metric.user_config.evaluate_func
+                    and self._get_inference_key(model, other_metric) == key
+                    for other_metric in self._metrics
+                ):
+                    # the custom metric needs the outputs of the whole dataset
+                    collected_batches = []
+
+        goal_test = SequentialGoalTest.from_metric(metric)
+        pruned = False
+        if shared_outputs is not None:
+            logger.debug("Reusing the model outputs of an earlier metric for metric %s.", metric.name)
+            batches = (batch for batch in [shared_outputs])
+        else:
+            keep_logits = collected_batches is not None or any(acc.requires_logits for acc in accumulators.values())
+            batches = self._inference_batches(
+                model, metric, dataloader, post_func, device, execution_providers, keep_logits=keep_logits
+            )
+        with closing(batches):
+            for model_output, targets in batches:
+                for acc in accumulators.values():
+                    acc.update(model_output, targets)
+                if collected_batches is not None:
+                    collected_batches.append((model_output, targets))
+                if goal_test and goal_test.update(get_num_samples(targets)):
+                    rejected = goal_test.test(accumulator.peek(goal_test.goals))
+                    if rejected:
+                        logger.info(
+                            "Stopping the evaluation of metric %s after %d samples as the goal of %s cannot be met.",
+                            metric.name,
+                            goal_test.num_samples,
+                            rejected,
+                        )
+                        pruned = True
+                        break
+
+        if collected_batches is not None and not pruned:
+            self._inference_outputs[key] = self._concat_batches(collected_batches)
+
+        # the other metrics measured in the same pass are also partial if the evaluation stopped early
+        result = accumulators.pop(metric.name).compute(pruned=pruned)
+        for name, acc in accumulators.items():
+            self._accuracy_results[name] = acc.compute(pruned=pruned)
+        return result
+
+    def _get_session(self, key: str, create_session):
+        """Get the session from the pool of the evaluation, creating it on first use."""
+        if self._sessions is None:
+            return create_session()
+        if key not in self._sessions:
+            self._sessions[key] = create_session()
+        else:
+            logger.debug("Reusing the inference session of an earlier metric.")
+        return self._sessions[key]
 
     @abstractmethod
     def _evaluate_accuracy(
@@ -242,6 +619,26 @@ class _OliveEvaluator(OliveEvaluator):
         """For given repeat_test_num, return a list of latencies(ms)."""
         raise NotImplementedError
 
+    def _evaluate_memory(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        raise TypeError(f"Cannot evaluate memory for model of type: {type(model)}")
+
+    def _evaluate_cold_start(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        raise TypeError(f"Cannot evaluate cold start for model of type: {type(model)}")
+
     def _evaluate_latency(
         self,
         model: "OliveModelHandler",
@@ -251,6 +648,9 @@ class _OliveEvaluator(OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> List[float]:
+        if self._measures_shape_buckets(metric):
+            buckets = self._evaluate_shape_buckets(model, metric, dataloader, post_func, device, execution_providers)
+            return OliveEvaluator.compute_bucketed_latency(metric, buckets)
         latencies = self._evaluate_raw_latency(model, metric, dataloader, post_func, device, execution_providers)
         return OliveEvaluator.compute_latency(metric, latencies)
 
@@ -263,9 +663,39 @@ class _OliveEvaluator(OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
+        if self._measures_shape_buckets(metric):
+            buckets = self._evaluate_shape_buckets(model, metric, dataloader, post_func, device, execution_providers)
+            return OliveEvaluator.compute_bucketed_throughput(metric, buckets)
         latencies = self._evaluate_raw_latency(model, metric, dataloader, post_func, device, execution_providers)
         return OliveEvaluator.compute_throughput(metric, latencies)
 
+    @staticmethod
+    def _measures_shape_buckets(metric: Metric) -> bool:
+        latency_config = get_latency_metric_config(metric)
+        return bool(latency_config) and latency_config.num_batches != 1
+
+    def _evaluate_shape_buckets(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        post_func=None,
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> List[ShapeBucket]:
+        """Measure the latency of each input shape in the sampled batches of the dataloader.
+
+        The latency depends on the shapes of the inputs rather than their values, so only the first batch of each
+        shape is measured.
+        """
+        num_batches = get_latency_metric_config(metric).num_batches
+        buckets = []
+        for key, (batch, count) in bucket_by_shape(dataloader, num_batches).items():
+            logger.debug("Measuring latency of %d batches with input shapes %s", count, key)
+            latencies = self._evaluate_raw_latency(model, metric, [batch], post_func, device, execution_providers)
+            buckets.append(ShapeBucket(key, count, latencies, get_batch_size(batch[0])))
+        return buckets
+
     def _evaluate_custom(
         self,
         model: "OliveModelHandler",
@@ -280,7 +710,7 @@ class _OliveEvaluator(OliveEvaluator):
         if metric.user_config.evaluate_func:
             raw_res = eval_func(model, device, execution_providers)
         else:
-            inference_output, targets = self._inference(
+            inference_output, targets = self._shared_inference(
                 model, metric, dataloader, post_func, device, execution_providers
             )
             raw_res = eval_func(inference_output, targets)
@@ -309,30 +739,49 @@ class _OliveEvaluator(OliveEvaluator):
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
         metrics_res = {}
-        for original_metric in metrics:
-            # use model io_config if user does not specify input_names and input_shapes
-            metric = OliveEvaluator.generate_metric_user_config_with_model_io(original_metric, model)
-            dataloader, eval_func, post_func = OliveEvaluator.get_user_config(model.framework, metric)
-            if metric.type == MetricType.ACCURACY:
-                metrics_res[metric.name] = self._evaluate_accuracy(
-                    model, metric, dataloader, post_func, device, execution_providers
-                )
-            elif metric.type == MetricType.LATENCY:
-                metrics_res[metric.name] = self._evaluate_latency(
-                    model, metric, dataloader, post_func, device, execution_providers
-                )
-            elif metric.type == MetricType.THROUGHPUT:
-                metrics_res[metric.name] = self._evaluate_throughput(
-                    model, metric, dataloader, post_func, device, execution_providers
-                )
-            elif metric.type == MetricType.CUSTOM:
-                metrics_res[metric.name] = self._evaluate_custom(
-                    model, metric, dataloader, eval_func, post_func, device, execution_providers
-                )
-            else:
-                raise TypeError(f"{metric.type} is not a supported metric type")
+        # the metrics share the inference sessions and the model outputs of the same data
+        self._sessions = {}
+        self._inference_outputs = {}
+        self._metrics = metrics
+        self._accuracy_results = {}
+        try:
+            for original_metric in metrics:
+                with profile_stage(f"metric:{original_metric.name}"):
+                    metrics_res[original_metric.name] = self._evaluate_metric(
+                        model, original_metric, device, execution_providers
+                    )
+        finally:
+            self._sessions = None
+            self._inference_outputs = None
+            self._metrics = None
+            self._accuracy_results = None
         return flatten_metric_result(metrics_res)
 
+    def _evaluate_metric(
+        self,
+        model: "OliveModelHandler",
+        original_metric: Metric,
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        # use model io_config if user does not specify input_names and input_shapes
+        metric = OliveEvaluator.generate_metric_user_config_with_model_io(original_metric, model)
+        dataloader, eval_func, post_func = OliveEvaluator.get_user_config(model.framework, metric)
+        if metric.type == MetricType.ACCURACY:
+            return self._evaluate_accuracy(model, metric, dataloader, post_func, device, execution_providers)
+        elif metric.type == MetricType.LATENCY:
+            return self._evaluate_latency(model, metric, dataloader, post_func, device, execution_providers)
+        elif metric.type == MetricType.THROUGHPUT:
+            return self._evaluate_throughput(model, metric, dataloader, post_func, device, execution_providers)
+        elif metric.type == MetricType.MEMORY:
+            return self._evaluate_memory(model, metric, dataloader, device, execution_providers)
+        elif metric.type == MetricType.COLD_START:
+            return self._evaluate_cold_start(model, metric, dataloader, device, execution_providers)
+        elif metric.type == MetricType.CUSTOM:
+            return self._evaluate_custom(model, metric, dataloader, eval_func, post_func, device, execution_providers)
+        else:
+            raise TypeError(f"{metric.type} is not a supported metric type")
+
 
 class OnnxEvaluatorMixin:
 
@@ -354,6 +803,20 @@ class OnnxEvaluatorMixin:
             if k in input_names
         }
 
+    @staticmethod
+    def output_to_tensor(output, keep_dtype: bool = False) -> torch.Tensor:
+        """Wrap the output of the inference session in a torch tensor.
+
+        The output is cast to float32 unless keep_dtype is True. The tensor shares the memory of the output if it is
+        not cast.
+        """
+        try:
+            tensor = torch.from_numpy(output)
+        except TypeError:
+            # outputs with dtypes that torch does not support are copied to a float tensor
+            return torch.Tensor(output)
+        return tensor if keep_dtype else tensor.float()
+
     @staticmethod
     def get_inference_settings(metric: Metric, model: ONNXModelHandler) -> Dict[str, Any]:
         # user.config.inference_settings > model.inference_settings > default inference_settings
@@ -375,22 +838,54 @@ class OnnxEvaluatorMixin:
 @Registry.register("OnnxEvaluator")
 class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
 
-    @staticmethod
     def get_session_wrapper(
+        self,
         model: ONNXModelHandler,
         metric: Metric,
         dataloader: "DataLoader",
         device: Device,
         execution_providers: List[str],
+        intra_op_num_threads: Optional[int] = None,
+        session_index: int = 0,
     ) -> Tuple[OrtInferenceSession, Dict[str, Any]]:
-        """Get the session wrapper for the model."""
+        """Get the session wrapper for the model.
+
+        The inference session is shared by the metrics of the evaluation that use the same model path, device,
+        execution providers and inference settings. The wrapper is created for each metric.
+
+        intra_op_num_threads is used if the inference settings do not set it. session_index tells apart the sessions
+        with the same settings that run in parallel.
+        """
         # user.config.inference_settings > model.inference_settings > default inference_settings
         inference_settings = OnnxEvaluator.get_inference_settings(metric, model)
-        session = model.prepare_session(
-            inference_settings=inference_settings,
-            device=device,
-            execution_providers=execution_providers,
-        )
+        if intra_op_num_threads:
+            inference_settings["session_options"] = {
+                "intra_op_num_threads": intra_op_num_threads,
+                **(inference_settings.get("session_options") or {}),
+            }
+
+        def create_session():
+            return model.prepare_session(
+                inference_settings=inference_settings,
+                device=device,
+                execution_providers=execution_providers,
+            )
+
+        try:
+            session_key = hash_dict(
+                {
+                    "model_path": model.model_path,
+                    "device": str(device),
+                    "execution_providers": execution_providers,
+                    "inference_settings": inference_settings,
+                    "session_index": session_index,
+                }
+            )
+        except TypeError:
+            # settings that cannot be serialized cannot be compared, the session is not shared
+            session = create_session()
+        else:
+            session = self._get_session(session_key, create_session)
 
         # prepare for io binding
         io_config = model.io_config
@@ -419,7 +914,7 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
 
         return session_wrapper, inference_settings
 
-    def _inference(
+    def _inference_batches(
         self,
         model: ONNXModelHandler,
         metric: Metric,
@@ -427,47 +922,121 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         post_func=None,
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
-    ) -> Tuple[OliveModelOutput, Any]:
-        session, inference_settings = OnnxEvaluator.get_session_wrapper(
-            model, metric, dataloader, device, execution_providers
-        )
-        io_config = model.io_config
+        keep_logits: bool = True,
+    ) -> Iterator[Tuple[OliveModelOutput, Any]]:
+        num_sessions = self._get_num_sessions(model, metric, device)
+        if num_sessions > 1:
+            yield from self._parallel_inference_batches(
+                model, metric, dataloader, post_func, device, execution_providers, keep_logits, num_sessions
+            )
+            return
+
+        session, inference_settings = self.get_session_wrapper(model, metric, dataloader, device, execution_providers)
         run_kwargs = metric.get_run_kwargs()
+        keep_output_dtype = getattr(metric.user_config, "keep_output_dtype", False)
+        for input_data, labels in dataloader:
+            yield self._run_batch(
+                model, session, input_data, labels, post_func, keep_logits, run_kwargs, keep_output_dtype
+            )
 
-        preds = []
-        targets = []
-        logits = []
-        logits_dict = collections.defaultdict(list)
+        tuning_result_file = inference_settings.get("tuning_result_file")
+        if tuning_result_file:
+            dump_tuning_result(session.session, tuning_result_file)
+
+    @staticmethod
+    def _run_batch(
+        model: ONNXModelHandler,
+        session: OrtInferenceSession,
+        input_data: Any,
+        labels: Any,
+        post_func,
+        keep_logits: bool,
+        run_kwargs: Dict[str, Any],
+        keep_output_dtype: bool = False,
+    ) -> Tuple[OliveModelOutput, Any]:
+        io_config = model.io_config
         output_names = io_config["output_names"]
-        is_single_tensor_output = len(output_names) == 1
-        for input_data, labels in dataloader:
-            input_feed = OnnxEvaluator.format_input(input_data, io_config)
-            result = model.run_session(session, input_feed, **run_kwargs)
-            if is_single_tensor_output:
-                result = torch.Tensor(result[0])
-            else:
-                # convert to dict of torch tensor
-                result = {name: torch.Tensor(result[i]) for i, name in enumerate(output_names)}
-            outputs = post_func(result) if post_func else result
-            # keep as numpy or torch arrays
-            preds.append(outputs.cpu())
-            targets.append(labels.cpu())
-            if is_single_tensor_output:
-                logits.append(result.cpu())
-            else:
-                for k in output_names:
-                    logits_dict[k].append(result[k].cpu())
-        preds = torch.cat(preds, dim=0)
-        targets = torch.cat(targets, dim=0)
-        if is_single_tensor_output:
-            logits = torch.cat(logits, dim=0)
+        input_feed = OnnxEvaluator.format_input(input_data, io_config)
+        result = model.run_session(session, input_feed, **run_kwargs)
+        if len(output_names) == 1:
+            result = OnnxEvaluator.output_to_tensor(result[0], keep_output_dtype)
         else:
-            logits = {k: torch.cat(logits[k], dim=0) for k in output_names}
+            # convert to dict of torch tensor
+            result = {
+                name: OnnxEvaluator.output_to_tensor(result[i], keep_output_dtype)
+                for i, name in enumerate(output_names)
+            }
+        outputs = post_func(result) if post_func else result
+        # keep as numpy or torch arrays
+        return OliveModelOutput(preds=outputs.cpu(), logits=result if keep_logits else None), labels.cpu()
+
+    @staticmethod
+    def _get_num_sessions(model: ONNXModelHandler, metric: Metric, device: Device) -> int:
+        num_sessions = getattr(metric.user_config, "num_sessions", None) or 1
+        if num_sessions <= 1:
+            return 1
+        if device != Device.CPU or OnnxEvaluator.io_bind_enabled(metric, model.inference_settings):
+            logger.warning("num_sessions is only supported on CPU without io binding. Using a single session.")
+            return 1
+        return num_sessions
+
+    def _parallel_inference_batches(
+        self,
+        model: ONNXModelHandler,
+        metric: Metric,
+        dataloader: "DataLoader",
+        post_func,
+        device: Device,
+        execution_providers: Union[str, List[str]],
+        keep_logits: bool,
+        num_sessions: int,
+    ) -> Iterator[Tuple[OliveModelOutput, Any]]:
+        """Run the batches on several sessions in parallel threads and yield the outputs in the order of the batches.
+
+        onnxruntime releases the GIL while a session runs, so the sessions run at the same time. The cores of the host
+        are split between the intra op thread pools of the sessions. At most two batches per session are in flight.
+        The tuning results are dumped from the first session.
+        """
+        intra_op_num_threads = max(1, (os.cpu_count() or 1) // num_sessions)
+        logger.debug("Running %d sessions with %d intra op threads each.", num_sessions, intra_op_num_threads)
+        sessions = queue.SimpleQueue()
+        first_session = inference_settings = None
+        for session_index in range(num_sessions):
+            session, settings = self.get_session_wrapper(
+                model, metric, dataloader, device, execution_providers, intra_op_num_threads, session_index
+            )
+            if first_session is None:
+                first_session, inference_settings = session, settings
+            sessions.put(session)
+        run_kwargs = metric.get_run_kwargs()
+        keep_output_dtype = getattr(metric.user_config, "keep_output_dtype", False)
+
+        def run_batch(input_data, labels):
+            session = sessions.get()
+            try:
+                return self._run_batch(
+                    model, session, input_data, labels, post_func, keep_logits, run_kwargs, keep_output_dtype
+                )
+            finally:
+                sessions.put(session)
+
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(max_workers=num_sessions, thread_name_prefix="olive-eval")
+        try:
+            for input_data, labels in dataloader:
+                if len(pending) >= 2 * num_sessions:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(run_batch, input_data, labels))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
 
         tuning_result_file = inference_settings.get("tuning_result_file")
         if tuning_result_file:
-            dump_tuning_result(session.session, tuning_result_file)
-        return OliveModelOutput(preds=preds, logits=logits), targets
+            dump_tuning_result(first_session.session, tuning_result_file)
 
     def _evaluate_onnx_accuracy(
         self,
@@ -478,8 +1047,7 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
-        inference_output, targets = self._inference(model, metric, dataloader, post_func, device, execution_providers)
-        return OliveEvaluator.compute_accuracy(metric, inference_output, targets)
+        return self._accumulate_accuracy(model, metric, dataloader, post_func, device, execution_providers)
 
     def _evaluate_onnx_latency(
         self,
@@ -491,20 +1059,24 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         execution_providers: Union[str, List[str]] = None,
     ) -> List[float]:
         warmup_num, repeat_test_num, sleep_num = get_latency_config_from_metric(metric)
-        session, inference_settings = OnnxEvaluator.get_session_wrapper(
-            model, metric, dataloader, device, execution_providers
-        )
+        latency_config = get_latency_metric_config(metric)
+        session, inference_settings = self.get_session_wrapper(model, metric, dataloader, device, execution_providers)
         io_config = model.io_config
 
         input_data, _ = next(iter(dataloader))
         input_feed = OnnxEvaluator.format_input(input_data, io_config)
 
-        latencies = session.time_run(
-            input_feed,
-            num_runs=repeat_test_num,
-            num_warmup=warmup_num,
-            sleep_time=sleep_num,
-        )
+        with pin_to_cpu_cores(latency_config and latency_config.cpu_cores):
+            if latency_config and latency_config.adaptive:
+                with session.timed_runner(input_feed) as run:
+                    latencies = sample_latencies(run, latency_config)
+            else:
+                latencies = session.time_run(
+                    input_feed,
+                    num_runs=repeat_test_num,
+                    num_warmup=warmup_num,
+                    sleep_time=sleep_num,
+                )
 
         tuning_result_file = inference_settings.get("tuning_result_file")
         if tuning_result_file:
@@ -520,8 +1092,6 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         execution_providers = config["providers"]
         metric = Metric.from_json(config["metric"])
 
-        import os
-
         os.environ["OMPI_COMM_WORLD_RANK"] = str(local_rank)
         os.environ["OMPI_COMM_WORLD_SIZE"] = str(world_size)
 
@@ -603,8 +1173,6 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         execution_providers = config["providers"]
         metric = Metric.from_json(config["metric"])
 
-        import os
-
         os.environ["OMPI_COMM_WORLD_RANK"] = str(local_rank)
         os.environ["OMPI_COMM_WORLD_SIZE"] = str(world_size)
 
@@ -718,12 +1286,146 @@ class OnnxEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         else:
             raise TypeError(f"Cannot evaluate latency for model of type: {type(model)}")
 
+    def _evaluate_memory(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        """Measure the memory used to create the session and run the batches in a fresh process."""
+        if not isinstance(model, ONNXModelHandler):
+            return super()._evaluate_memory(model, metric, dataloader, device, execution_providers)
+
+        memory_config = metric.sub_types[0].metric_config
+        memory_metrics = measure_memory(
+            model.to_json(),
+            OnnxEvaluator.get_inference_settings(metric, model),
+            device,
+            execution_providers,
+            OnnxEvaluator._get_full_input_feeds(model, dataloader, memory_config.num_batches),
+            metric.get_run_kwargs(),
+            memory_config.repeat_test_num,
+        )
+        return OliveEvaluator.compute_memory(metric, memory_metrics)
+
+    def _evaluate_cold_start(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        """Measure the session creation and the first inference in fresh processes."""
+        if not isinstance(model, ONNXModelHandler):
+            return super()._evaluate_cold_start(model, metric, dataloader, device, execution_providers)
+
+        cold_starts = measure_cold_start(
+            model.to_json(),
+            OnnxEvaluator.get_inference_settings(metric, model),
+            device,
+            execution_providers,
+            OnnxEvaluator._get_full_input_feeds(model, dataloader, 1)[0],
+            metric.get_run_kwargs(),
+            metric.sub_types[0].metric_config.repeat_test_num,
+            # the profiler is only needed to split the session creation
+            profile=any(
+                sub_type.name in (ColdStartSubType.MODEL_LOAD, ColdStartSubType.SESSION_INITIALIZATION)
+                for sub_type in metric.sub_types
+            ),
+        )
+        return OliveEvaluator.compute_cold_start(metric, cold_starts)
+
+    @staticmethod
+    def _get_full_input_feeds(
+        model: ONNXModelHandler, dataloader: "DataLoader", num_batches: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Get the input feeds of the first num_batches batches, including the constant inputs of the model."""
+        io_config = model.io_config
+        constant_inputs = (
+            OnnxEvaluator.format_input(load_weights(model.constant_inputs_path), io_config)
+            if model.constant_inputs_path
+            else {}
+        )
+        return [
+            {**OnnxEvaluator.format_input(input_data, io_config), **constant_inputs}
+            for input_data, _ in islice(dataloader, num_batches)
+        ]
+
+    def _evaluate_throughput(
+        self,
+        model: "OliveModelHandler",
+        metric: Metric,
+        dataloader: "DataLoader",
+        post_func=None,
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> MetricResult:
+        throughput_config = get_latency_metric_config(metric)
+        if isinstance(model, ONNXModelHandler) and throughput_config and throughput_config.concurrency:
+            load_test_results = self._evaluate_onnx_load_test(model, metric, dataloader, device, execution_providers)
+            return OliveEvaluator.compute_load_test_throughput(metric, load_test_results)
+        return super()._evaluate_throughput(model, metric, dataloader, post_func, device, execution_providers)
+
+    def _evaluate_onnx_load_test(
+        self,
+        model: ONNXModelHandler,
+        metric: Metric,
+        dataloader: "DataLoader",
+        device: Device = Device.CPU,
+        execution_providers: Union[str, List[str]] = None,
+    ) -> List[LoadTestResult]:
+        """Run the multi-stream load test at each batch size and concurrency level of the throughput metric.
+
+        The clients share the sessions round robin and run them without io binding, since a binding belongs to
+        a single request. With several sessions on CPU, the cores of the host are split between the sessions.
+        """
+        throughput_config = get_latency_metric_config(metric)
+        num_sessions = throughput_config.num_sessions
+        intra_op_num_threads = None
+        if num_sessions > 1 and device == Device.CPU:
+            intra_op_num_threads = max(1, (os.cpu_count() or 1) // num_sessions)
+        sessions = [
+            self.get_session_wrapper(
+                model, metric, dataloader, device, execution_providers, intra_op_num_threads, session_index
+            )[0]
+            for session_index in range(num_sessions)
+        ]
+
+        input_data, _ = next(iter(dataloader))
+        input_feed = OnnxEvaluator.format_input(input_data, model.io_config)
+        default_batch_size = metric.data_config.dataloader_params.get("batch_size", 1) if metric.data_config else 1
+
+        load_test_results = []
+        with pin_to_cpu_cores(throughput_config.cpu_cores):
+            for batch_size in throughput_config.batch_sizes or [None]:
+                batch_input_feed = sessions[0].get_full_input_feed(
+                    resize_batch(input_feed, batch_size) if batch_size else input_feed
+                )
+
+                def run(stream_index: int, batch_input_feed=batch_input_feed):
+                    sessions[stream_index % num_sessions].session.run(None, batch_input_feed)
+
+                load_test_results.extend(
+                    run_load_test(
+                        run,
+                        batch_size or default_batch_size,
+                        concurrency,
+                        throughput_config.warmup_num,
+                        throughput_config.repeat_test_num,
+                    )
+                    for concurrency in throughput_config.concurrency
+                )
+        return load_test_results
+
 
 @Registry.register(str(Framework.PYTORCH))
 @Registry.register("PyTorchEvaluator")
 class PyTorchEvaluator(_OliveEvaluator):
     @torch.no_grad()
-    def _inference(
+    def _inference_batches(
         self,
         model: "PyTorchModelHandler",
         metric: Metric,
@@ -731,39 +1433,35 @@ class PyTorchEvaluator(_OliveEvaluator):
         post_func=None,
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
-    ) -> Tuple[OliveModelOutput, Any]:
+        keep_logits: bool = True,
+    ) -> Iterator[Tuple[OliveModelOutput, Any]]:
         session = model.prepare_session()
-        preds = []
-        targets = []
-        logits = []
         device = _OliveEvaluator.device_string_to_torch_device(device)
         run_kwargs = metric.get_run_kwargs()
         if device:
             session.to(device)
-        for input_data_i, labels in dataloader:
-            input_data = tensor_data_to_device(input_data_i, device)
-            result = model.run_session(session, input_data, **run_kwargs)
-            outputs = post_func(result) if post_func else result
-            # keep the outputs and results as torch tensor on cpu
-            # it is expensive to convert to list and then convert back to torch tensor
-            preds.append(outputs.cpu())
-            targets.append(labels.cpu())
-            logits.append(
-                result.logits.cpu()
-                if not isinstance(result, torch.Tensor) and getattr(result, "logits", None) is not None
-                else result.cpu()
-            )
-        # concatenate along the batch dimension
-        preds = torch.cat(preds, dim=0)
-        targets = torch.cat(targets, dim=0)
-        logits = torch.cat(logits, dim=0)
-        # move model to cpu
-        if device:
-            session.to("cpu")
-        # only move to cpu cannot release gpu memory, call cuda.empty_cache() to release gpu memory
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-        return OliveModelOutput(preds=preds, logits=logits), targets
+        try:
+            for input_data_i, labels in dataloader:
+                input_data = tensor_data_to_device(input_data_i, device)
+                result = model.run_session(session, input_data, **run_kwargs)
+                outputs = post_func(result) if post_func else result
+                # keep the outputs and results as torch tensor on cpu
+                # it is expensive to convert to list and then convert back to torch tensor
+                logits = None
+                if keep_logits:
+                    logits = (
+                        result.logits.cpu()
+                        if not isinstance(result, torch.Tensor) and getattr(result, "logits", None) is not None
+                        else result.cpu()
+                    )
+                yield OliveModelOutput(preds=outputs.cpu(), logits=logits), labels.cpu()
+        finally:
+            # move model to cpu
+            if device:
+                session.to("cpu")
+            # only move to cpu cannot release gpu memory, call cuda.empty_cache() to release gpu memory
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
 
     def _evaluate_accuracy(
         self,
@@ -774,8 +1472,7 @@ class PyTorchEvaluator(_OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
-        inference_output, targets = self._inference(model, metric, dataloader, post_func, device, execution_providers)
-        return OliveEvaluator.compute_accuracy(metric, inference_output, targets)
+        return self._accumulate_accuracy(model, metric, dataloader, post_func, device, execution_providers)
 
     @torch.no_grad()
     def _evaluate_raw_latency(
@@ -789,6 +1486,7 @@ class PyTorchEvaluator(_OliveEvaluator):
     ) -> List[float]:
         # pylint: disable=expression-not-assigned
         warmup_num, repeat_test_num, _ = get_latency_config_from_metric(metric)
+        latency_config = get_latency_metric_config(metric)
         # pytorch model doesn't use inference_settings, so we can pass None
         session = model.prepare_session(inference_settings=None, device=device)
 
@@ -801,26 +1499,45 @@ class PyTorchEvaluator(_OliveEvaluator):
             session.to(torch_device)
             input_data = tensor_data_to_device(input_data, torch_device)
 
-        # warm up
-        for _ in range(warmup_num):
-            model.run_session(session, input_data, **run_kwargs)
-
-        latencies = []
         if is_cuda:
-            # synchronize before starting the test
-            torch.cuda.synchronize()
             # cuda events for measuring latency
             starter = torch.cuda.Event(enable_timing=True)
             ender = torch.cuda.Event(enable_timing=True)
-            for _ in range(repeat_test_num):
+
+            def run() -> float:
                 starter.record()
                 model.run_session(session, input_data, **run_kwargs)
                 ender.record()
                 # synchronize after forward pass
                 torch.cuda.synchronize()
-                # add time in seconds, originally in milliseconds
-                latencies.append(starter.elapsed_time(ender) * 1e-3)
+                # time in seconds, originally in milliseconds
+                return starter.elapsed_time(ender) * 1e-3
 
+        else:
+
+            def run() -> float:
+                t = time.perf_counter()
+                # TODO(jambayk): do we care about the efficiency of if/else here?
+                # probably won't add much overhead compared to the inference time
+                # also we are doing the same for all models
+                model.run_session(session, input_data, **run_kwargs)
+                return time.perf_counter() - t
+
+        with pin_to_cpu_cores(latency_config and latency_config.cpu_cores):
+            if latency_config and latency_config.adaptive:
+                if is_cuda:
+                    torch.cuda.synchronize()
+                latencies = sample_latencies(run, latency_config)
+            else:
+                # warm up
+                for _ in range(warmup_num):
+                    model.run_session(session, input_data, **run_kwargs)
+                if is_cuda:
+                    # synchronize before starting the test
+                    torch.cuda.synchronize()
+                latencies = [run() for _ in range(repeat_test_num)]
+
+        if is_cuda:
             # move model back to cpu
             session.to("cpu")
             tensor_data_to_device(input_data, Device.CPU)
@@ -828,14 +1545,6 @@ class PyTorchEvaluator(_OliveEvaluator):
             # only move to cpu cannot release gpu memory, call cuda.empty_cache() to release gpu memory
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
-        else:
-            for _ in range(repeat_test_num):
-                t = time.perf_counter()
-                # TODO(jambayk): do we care about the efficiency of if/else here?
-                # probably won't add much overhead compared to the inference time
-                # also we are doing the same for all models
-                model.run_session(session, input_data, **run_kwargs)
-                latencies.append(time.perf_counter() - t)
 
         return latencies
 
@@ -894,8 +1603,7 @@ class SNPEEvaluator(_OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
-        inference_output, targets = self._inference(model, metric, dataloader, post_func, device, execution_providers)
-        return OliveEvaluator.compute_accuracy(metric, inference_output, targets)
+        return self._accumulate_accuracy(model, metric, dataloader, post_func, device, execution_providers)
 
     def _evaluate_raw_latency(
         self,
@@ -969,8 +1677,7 @@ class OpenVINOEvaluator(_OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
-        inference_output, targets = self._inference(model, metric, dataloader, post_func, device, execution_providers)
-        return OliveEvaluator.compute_accuracy(metric, inference_output, targets)
+        return self._accumulate_accuracy(model, metric, dataloader, post_func, device, execution_providers)
 
     def _evaluate_raw_latency(
         self,
@@ -1041,8 +1748,7 @@ class QNNEvaluator(_OliveEvaluator):
         device: Device = Device.CPU,
         execution_providers: Union[str, List[str]] = None,
     ) -> MetricResult:
-        inference_output, targets = self._inference(model, metric, dataloader, post_func, device, execution_providers)
-        return OliveEvaluator.compute_accuracy(metric, inference_output, targets)
+        return self._accumulate_accuracy(model, metric, dataloader, post_func, device, execution_providers)
 
     def _evaluate_raw_latency(
         self,
@@ -0,0 +1,83 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from itertools import islice
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+
+class ShapeBucket(NamedTuple):
+    # shapes of the inputs, such as "attention_mask=1x128,input_ids=1x128"
+    key: str
+    # number of sampled batches with these shapes
+    num_batches: int
+    # latencies of the first batch with these shapes in seconds
+    latencies: List[float]
+    # number of samples in the batches with these shapes, the last batch of the data can be partial
+    batch_size: int = 1
+
+
+def get_shape_key(data: Any, prefix: str = "") -> str:
+    """Get a key of the shapes of the tensors in the input data."""
+    if isinstance(data, (torch.Tensor, np.ndarray)):
+        shape = "x".join(str(dim) for dim in data.shape) or "scalar"
+        return f"{prefix}={shape}" if prefix else shape
+    if isinstance(data, dict):
+        items = sorted(data.items())
+    elif isinstance(data, (list, tuple)):
+        items = enumerate(data)
+    else:
+        return ""
+    keys = [get_shape_key(value, f"{prefix}.{name}" if prefix else str(name)) for name, value in items]
+    return ",".join(key for key in keys if key)
+
+
+def get_batch_size(data: Any) -> int:
+    """Get the leading dimension of the first tensor in the input data, 1 if there is none."""
+    if isinstance(data, (torch.Tensor, np.ndarray)):
+        return data.shape[0] if data.ndim else 1
+    if isinstance(data, dict):
+        data = list(data.values())
+    if isinstance(data, (list, tuple)):
+        for value in data:
+            if isinstance(value, (torch.Tensor, np.ndarray, dict, list, tuple)):
+                return get_batch_size(value)
+    return 1
+
+
+def bucket_by_shape(dataloader: Iterable, num_batches: Optional[int]) -> Dict[str, Tuple[Any, int]]:
+    """Group the first num_batches batches of the dataloader by the shapes of their inputs.
+
+    Returns the first batch and the number of batches of each shape. None groups all the batches.
+    """
+    buckets = {}
+    for batch in islice(dataloader, num_batches):
+        key = get_shape_key(batch[0])
+        first_batch, count = buckets.get(key, (batch, 0))
+        buckets[key] = (first_batch, count + 1)
+    return buckets
+
+
+def pool_shape_buckets(buckets: Sequence[ShapeBucket], per_sample: bool = False) -> Tuple[List[float], List[float]]:
+    """Pool the latencies of the buckets with weights that give each bucket the share of its batches.
+
+    With per_sample, the latencies are divided by the batch size of their bucket and each bucket gets the share of its
+    samples instead.
+    """
+    latencies, weights = [], []
+    for bucket in buckets:
+        scale = bucket.batch_size if per_sample else 1
+        latencies.extend(latency / scale for latency in bucket.latencies)
+        weights.extend([bucket.num_batches * scale / len(bucket.latencies)] * len(bucket.latencies))
+    return latencies, weights
+
+
+def weighted_percentile(values: Sequence[float], weights: Sequence[float], percentile: float) -> float:
+    """Get the smallest value whose cumulative weight reaches the percentile of the total weight."""
+    order = np.argsort(values)
+    cumulative_weights = np.cumsum(np.asarray(weights, dtype=float)[order])
+    index = np.searchsorted(cumulative_weights, percentile / 100 * cumulative_weights[-1])
+    return float(np.asarray(values)[order][min(index, len(values) - 1)])
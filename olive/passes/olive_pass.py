@@ -48,6 +48,11 @@ class Pass(ABC):
     # True if the pass processes a composite model at once. Otherwise, the components of the
     # composite model will be processed individually.
     _accepts_composite_model: bool = False
+    # estimated peak host and accelerator memory of the pass as multiples of the size of the input model, and the
+    # number of cpu threads it uses (None for all the cores). Used to schedule passes that run concurrently.
+    peak_memory_factor: ClassVar[float] = 2.0
+    peak_device_memory_factor: ClassVar[float] = 0.0
+    num_threads: ClassVar[Optional[int]] = 1
 
     @classmethod
     def __init_subclass__(cls, **kwargs) -> None:
@@ -298,7 +303,7 @@ class Pass(ABC):
             # The follow up pass could have *potentially* generated a file with the same name.
             output_filepath = output_model_path / input_filepath.name
             if not output_filepath.exists():
-                # TODO(team): Use symlinks instead of copying the files.
+                # copy since the input model can be outside the cache, the cache dedups the files of its runs
                 shutil.copy(str(input_filepath), str(output_filepath))
             # always add the file_path to the output model's additional files
             # this covers the case where the output model_path is the same as the input model_path
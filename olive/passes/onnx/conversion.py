@@ -46,6 +46,10 @@ class TraceModelWrapper(torch.nn.Module):
 class OnnxConversion(Pass):
     """Convert a PyTorch model to ONNX model using torch.onnx.export on CPU."""
 
+    # holds the torch model, the exported graph and its serialized proto at the same time
+    peak_memory_factor = 3.0
+    num_threads = None
+
     @classmethod
     def _default_config(cls, accelerator_spec: AcceleratorSpec) -> Dict[str, PassConfigParam]:
         return {
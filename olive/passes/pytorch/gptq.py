@@ -28,6 +28,10 @@ logger = logging.getLogger(__name__)
 class GptqQuantizer(Pass):
     """GPTQ quantization using Hugging Face Optimum and export model with onnxruntime optimized kernel."""
 
+    # the model is quantized on the accelerator along with the calibration activations
+    peak_device_memory_factor = 1.5
+    num_threads = None
+
     @classmethod
     def _default_config(cls, accelerator_spec: AcceleratorSpec) -> Dict[str, PassConfigParam]:
         return {
@@ -39,6 +39,10 @@ class SparseGPT(Pass):
     The transformers model type must be one of [bloom, gpt2, gpt_neox, llama, opt].
     """
 
+    # the layers are pruned one at a time on the accelerator while the whole model stays on the host
+    peak_device_memory_factor = 0.5
+    num_threads = None
+
     @classmethod
     def _default_config(cls, accelerator_spec: AcceleratorSpec) -> Dict[str, PassConfigParam]:
         return {
@@ -3,7 +3,8 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, Tuple
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Tuple
 
 import optuna
 
@@ -34,10 +35,14 @@ class OptunaSearchAlgorithm(SearchAlgorithm):
     def initialize(self):
         # pylint: disable=attribute-defined-outside-init
         """Initialize the searcher."""
+        # whether several trials are suggested before their results are reported
+        self._concurrent = False
         self._sampler = self._create_sampler()
         directions = ["maximize" if higher_is_better else "minimize" for higher_is_better in self._higher_is_betters]
         self._study = optuna.create_study(directions=directions, sampler=self._sampler)
-        self._trial_ids = {}
+        # numbers of the trials that are not reported yet, by the hash of their search point. The same point can be
+        # suggested again before the first trial is reported.
+        self._pending_trials: Dict[str, Deque[int]] = defaultdict(deque)
         self._num_samples_suggested = 0
 
     def should_stop(self):
@@ -51,6 +56,13 @@ class OptunaSearchAlgorithm(SearchAlgorithm):
     def _create_sampler(self) -> optuna.samplers.BaseSampler:
         """Create the sampler."""
 
+    def suggest_batch(self, num_points: int) -> List[Dict[str, Dict[str, Any]]]:
+        if num_points > 1 and not self._concurrent:
+            # the sampler might need to account for the pending trials
+            self._concurrent = True
+            self._sampler = self._study.sampler = self._create_sampler()
+        return super().suggest_batch(num_points)
+
     def suggest(self) -> Dict[str, Dict[str, Any]]:
         """Suggest a new configuration to try."""
         if self.should_stop():
@@ -62,8 +74,7 @@ class OptunaSearchAlgorithm(SearchAlgorithm):
             return self.suggest()
 
         # save history
-        search_point_hash = hash_dict(search_point)
-        self._trial_ids[search_point_hash] = trial.number
+        self._pending_trials[hash_dict(search_point)].append(trial.number)
 
         self._num_samples_suggested += 1
 
@@ -93,7 +104,10 @@ class OptunaSearchAlgorithm(SearchAlgorithm):
 
     def report(self, search_point: Dict[str, Dict[str, Any]], result: "MetricResult", should_prune: bool = False):
         search_point_hash = hash_dict(search_point)
-        trial_id = self._trial_ids[search_point_hash]
+        # tell the trials of the same search point in the order they were suggested
+        trial_id = self._pending_trials[search_point_hash].popleft()
+        if not self._pending_trials[search_point_hash]:
+            del self._pending_trials[search_point_hash]
         if should_prune:
             self._study.tell(trial_id, state=optuna.trial.TrialState.PRUNED)
         else:
@@ -52,6 +52,19 @@ class SearchAlgorithm(AutoConfigClass):
     def suggest(self) -> Dict[str, Dict[str, Any]]:
         """Suggest a new configuration to try."""
 
+    def suggest_batch(self, num_points: int) -> List[Dict[str, Dict[str, Any]]]:
+        """Suggest up to num_points new configurations to try before any of their results are reported.
+
+        Returns an empty list if there are no more configurations to try.
+        """
+        search_points = []
+        for _ in range(num_points):
+            search_point = self.suggest()
+            if search_point is None:
+                break
+            search_points.append(search_point)
+        return search_points
+
     @abstractmethod
     def report(
         self, search_point: Dict[str, Dict[str, Any]], result: Dict[str, Union[float, int]], should_prune: bool = False
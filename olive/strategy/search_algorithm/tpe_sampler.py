@@ -36,10 +36,25 @@ class TPESearchAlgorithm(OptunaSearchAlgorithm):
                     "optuna.samplers.TPESampler.html for more information."
                 ),
             ),
+            "constant_liar": ConfigParam(
+                type_=bool,
+                default_value=None,
+                description=(
+                    "If True, trials that have been suggested but not reported yet are treated as if they had the"
+                    " worst objective values. This avoids suggesting the same region of the search space repeatedly"
+                    " when several trials are run concurrently. If None, it is enabled when trials are suggested in"
+                    " batches of more than one. Refer to 'constant_liar' at"
+                    " https://optuna.readthedocs.io/en/stable/reference/samplers/generated/"
+                    "optuna.samplers.TPESampler.html for more information."
+                ),
+            ),
         }
 
     def _create_sampler(self) -> optuna.samplers.TPESampler:
         """Create the sampler."""
         return optuna.samplers.TPESampler(
-            multivariate=self.config.multivariate, group=self.config.group, seed=self.config.seed
+            multivariate=self.config.multivariate,
+            group=self.config.group,
+            constant_liar=self._concurrent if self.config.constant_liar is None else self.config.constant_liar,
+            seed=self.config.seed,
         )
@@ -68,6 +68,10 @@ class SearchStrategy:
         self._initialized = False
         self.exit_criteria_met = False
 
+    @property
+    def config(self) -> SearchStrategyConfig:
+        return self._config
+
     def initialize(
         self,
         pass_flows_search_spaces: List[List[Tuple[str, Dict[str, "SearchParameter"]]]],
@@ -221,28 +225,46 @@ class SearchStrategy:
 
     def next_step(self) -> Optional[Dict[str, Any]]:
         """Get the next step in the search."""
+        next_steps = self.next_steps(1)
+        return next_steps[0] if next_steps else None
+
+    def next_steps(self, num_steps: int, next_group: bool = True) -> List[Dict[str, Any]]:
+        """Get up to num_steps next steps in the search.
+
+        All the steps belong to the active search space group so they can be run concurrently. The feedback signal
+        of every step must be recorded before moving on to the next search space group since it might depend on the
+        results of the active one. If next_group is False, an empty list is returned instead of moving on when the
+        active group is done, so the caller can record the pending feedback signals first.
+        """
         if not self._initialized:
             raise ValueError("Search strategy is not initialized")
 
         if self.exit_criteria_met:
+            if not next_group:
+                return []
             self._next_search_group()
 
         # if there is no active searcher, we are done
         if self._active_spaces_group is None:
-            return None
+            return []
 
-        # get the next search point from the active searcher
-        search_point = self._searchers[tuple(self._active_spaces_group)].suggest()
+        # get the next search points from the active searcher
+        search_points = self._searchers[tuple(self._active_spaces_group)].suggest_batch(num_steps)
         # if there are no more search points, move to the next search space group
-        if search_point is None:
+        if not search_points:
+            if not next_group:
+                return []
             self._next_search_group()
-            return self.next_step()
+            return self.next_steps(num_steps)
 
-        return {
-            "search_point": search_point,
-            "model_id": self._init_model_ids[tuple(self._active_spaces_group)],
-            "passes": [(space_name, search_point[space_name]) for space_name in self._active_spaces_group],
-        }
+        return [
+            {
+                "search_point": search_point,
+                "model_id": self._init_model_ids[tuple(self._active_spaces_group)],
+                "passes": [(space_name, search_point[space_name]) for space_name in self._active_spaces_group],
+            }
+            for search_point in search_points
+        ]
 
     def record_feedback_signal(
         self,
@@ -251,9 +273,13 @@ class SearchStrategy:
         model_ids: List[str],
         should_prune: bool = False,
     ):
-        """Record the feedback signal for the given search point."""
+        """Record the feedback signal for the given search point.
+
+        Search points whose evaluation stopped early as the goals cannot be met are pruned.
+        """
         if not self._initialized:
             raise ValueError("Search strategy is not initialized")
+        should_prune = should_prune or (signal is not None and signal.is_pruned())
         self._search_results[tuple(self._active_spaces_group)].record(search_point, signal, model_ids)
         self._searchers[tuple(self._active_spaces_group)].report(search_point, signal, should_prune)
 
@@ -161,6 +161,7 @@ class IsolatedORTEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
         logits_dict = collections.defaultdict(list)
         output_names = io_config["output_names"]
         is_single_tensor_output = len(output_names) == 1
+        keep_output_dtype = getattr(metric.user_config, "keep_output_dtype", False)
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_dir_path = Path(temp_dir)
             # create input and output dir
@@ -207,9 +208,11 @@ class IsolatedORTEvaluator(_OliveEvaluator, OnnxEvaluatorMixin):
             for idx in range(num_batches):
                 result = np.load(output_dir / f"output_{idx}.npy")
                 if is_single_tensor_output:
-                    result = torch.Tensor(result[0])
+                    result = self.output_to_tensor(result[0], keep_output_dtype)
                 else:
-                    result = {name: torch.Tensor(result[i]) for i, name in enumerate(output_names)}
+                    result = {
+                        name: self.output_to_tensor(result[i], keep_output_dtype) for i, name in enumerate(output_names)
+                    }
                 outputs = post_func(result) if post_func else result
                 # keep as numpy or torch arrays
                 preds.append(outputs.cpu())
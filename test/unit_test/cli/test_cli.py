@@ -243,6 +243,30 @@ def test_shared_cache_delete_all_with_confirmation(mock_AzureContainerClientFact
     mock_factory_instance.delete_all.assert_called_once()
 
 
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_cache_gc_command(dry_run, tmp_path, capsys):
+    # setup
+    from olive.cache import CacheConfig
+
+    cache = CacheConfig(cache_dir=tmp_path).create_cache()
+    (cache.get_model_cache_path("model_1") / "model.onnx").write_bytes(b"0" * 1000)
+    cache.cache_model("model_1", {"config": {}})
+    # run directory cached without the index
+    (cache.get_model_cache_path("model_2") / "model.onnx").write_bytes(b"0" * 1000)
+    command_args = ["cache", "gc", "--cache_dir", str(tmp_path), "--max_cache_size", "1500"]
+    if dry_run:
+        command_args.append("--dry_run")
+
+    # execute
+    cli_main(command_args)
+
+    # assert
+    output = capsys.readouterr().out
+    assert "has 2 runs" in output
+    assert ("Would evict 1 runs" if dry_run else "Evicted 1 runs") in output
+    assert len(list(cache.dirs.runs.iterdir())) == (2 if dry_run else 1)
+
+
 @pytest.mark.parametrize("algorithm_name", ["awq", "gptq", "rtn"])
 @patch("olive.workflows.run")
 @patch("huggingface_hub.repo_exists")
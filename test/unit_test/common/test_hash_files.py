@@ -0,0 +1,61 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import hashlib
+import json
+from unittest.mock import patch
+
+from olive.common.utils import hash_file, hash_files
+
+
+def test_hash_file(tmp_path):
+    file_path = tmp_path / "file"
+    content = b"0123456789" * 1000
+    file_path.write_bytes(content)
+
+    assert hash_file(file_path, block_size=4096) == hashlib.sha256(content).hexdigest()
+
+
+def test_hash_files_with_memo(tmp_path):
+    file_paths = [tmp_path / "file_0", tmp_path / "file_1"]
+    for idx, file_path in enumerate(file_paths):
+        file_path.write_text(f"content {idx}")
+    memo_path = tmp_path / "memo.json"
+
+    file_hashes = hash_files(file_paths, memo_path)
+    assert file_hashes == [hash_file(file_path) for file_path in file_paths]
+    assert memo_path.exists()
+
+    # unchanged files are not hashed again
+    with patch("olive.common.utils.hash_file", side_effect=hash_file) as mock_hash_file:
+        assert hash_files(file_paths, memo_path) == file_hashes
+        assert mock_hash_file.call_count == 0
+
+        # changed files are hashed again
+        file_paths[1].write_text("new content 1")
+        new_file_hashes = hash_files(file_paths, memo_path)
+        assert mock_hash_file.call_count == 1
+        assert new_file_hashes[0] == file_hashes[0]
+        assert new_file_hashes[1] == hash_file(file_paths[1])
+
+
+def test_hash_files_memo_is_merged_and_pruned(tmp_path):
+    file_paths = [tmp_path / "file_0", tmp_path / "file_1", tmp_path / "file_2"]
+    for idx, file_path in enumerate(file_paths):
+        file_path.write_text(f"content {idx}")
+    memo_path = tmp_path / "memo.json"
+    hash_files(file_paths[:2], memo_path)
+
+    # another writer saved the memo after this one loaded it
+    with patch("olive.common.utils._load_file_hash_memo", side_effect=[{}, json.loads(memo_path.read_text())]):
+        hash_files(file_paths[2:], memo_path)
+    memo = json.loads(memo_path.read_text())
+    assert set(memo) == {str(file_path.resolve()) for file_path in file_paths}
+
+    # the entries of deleted files are dropped when the memo is saved
+    file_paths[0].unlink()
+    file_paths[2].write_text("new content 2")
+    hash_files(file_paths[1:], memo_path)
+    memo = json.loads(memo_path.read_text())
+    assert set(memo) == {str(file_path.resolve()) for file_path in file_paths[1:]}
@@ -0,0 +1,27 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import os
+
+from olive.common.profiling import collect_stages, profile_stage
+
+
+def test_profile_stage_without_collector():
+    with profile_stage("stage"):
+        pass
+
+
+def test_collect_stages(tmp_path):
+    with collect_stages() as stages:
+        with profile_stage("write"):
+            (tmp_path / "file").write_bytes(b"0" * 1024)
+        with collect_stages() as nested_stages, profile_stage("nested"):
+            pass
+
+    assert [stage.name for stage in stages] == ["write"]
+    assert [stage.name for stage in nested_stages] == ["nested"]
+    stage = stages[0]
+    assert stage.end_time >= stage.start_time
+    assert stage.pid == os.getpid()
+    assert stage.peak_rss is None or stage.peak_rss > 0
@@ -0,0 +1,229 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import io
+import time
+from unittest.mock import patch
+
+import pytest
+
+from olive.common.shared_cache_backend import FileSystemBackend, S3Backend, create_shared_cache_backend
+
+# pylint: disable=W0201
+
+
+class LocalS3Client:
+    """Stand-in for the S3 client of boto3 that stores the objects in memory."""
+
+    def __init__(self, max_keys=2):
+        self.objects = {}
+        # small page size to exercise the pagination
+        self.max_keys = max_keys
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = Body
+
+    def upload_fileobj(self, Fileobj, Bucket, Key):
+        self.objects[(Bucket, Key)] = Fileobj.read()
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(i) for i in Range[len("bytes=") :].split("-"))
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)][start : end + 1])}
+
+    def download_file(self, Bucket, Key, Filename):
+        with open(Filename, "wb") as f:
+            f.write(self.objects[(Bucket, Key)])
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys=None, ContinuationToken=None):
+        keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        end = start + min(MaxKeys or self.max_keys, self.max_keys)
+        response = {
+            "Contents": [{"Key": key, "Size": len(self.objects[(Bucket, key)])} for key in keys[start:end]],
+            "IsTruncated": end < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(end)
+        return response
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop((Bucket, obj["Key"]), None)
+
+
+class TestSharedCacheBackend:
+    @pytest.fixture(autouse=True, params=["filesystem", "s3"])
+    def setup(self, request, tmp_path):
+        if request.param == "filesystem":
+            self.backend = FileSystemBackend(tmp_path / "shared_cache")
+        else:
+            self.backend = S3Backend("bucket", "olive/cache", client=LocalS3Client())
+
+    def test_upload_and_download(self, tmp_path):
+        # execute
+        self.backend.upload_blob("model_1/model.json", b"{}")
+        self.backend.upload_blob("model_1/model/model.onnx", io.BytesIO(b"model"))
+        self.backend.download_blob("model_1/model/model.onnx", tmp_path / "download" / "model.onnx")
+
+        # assert
+        assert (tmp_path / "download" / "model.onnx").read_bytes() == b"model"
+        with pytest.raises(FileExistsError):
+            self.backend.upload_blob("model_1/model.json", b"{}")
+        self.backend.upload_blob("model_1/model.json", b"[]", overwrite=True)
+        blob = next(blob for blob in self.backend.get_blob_list("model_1/model.json"))
+        self.backend.download_blob(blob, tmp_path / "model.json")
+        assert (tmp_path / "model.json").read_bytes() == b"[]"
+
+    def test_list_exists_and_delete(self):
+        # setup
+        for blob_name in ["model_1/run.json", "model_1/model/model.onnx", "model_12/run.json", "model_2/run.json"]:
+            self.backend.upload_blob(blob_name, b"data")
+
+        # execute and assert
+        assert [blob.name for blob in self.backend.get_blob_list("model_1/")] == [
+            "model_1/model/model.onnx",
+            "model_1/run.json",
+        ]
+        assert len(self.backend.get_blob_list("model_1")) == 3
+        assert len(self.backend.get_blob_list()) == 4
+        assert self.backend.get_blob_list("model_1/run.json")[0].size == 4
+        assert self.backend.exists("model_2")
+        assert not self.backend.exists("model_3")
+
+        self.backend.delete_blob("model_1/")
+        assert not self.backend.exists("model_1/")
+        assert self.backend.exists("model_12")
+
+        self.backend.delete_all()
+        assert not self.backend.exists()
+
+    def test_exists_many(self):
+        # setup
+        for blob_name in ["model_1/run.json", "model_1/model.json", "model_2/run.json"]:
+            self.backend.upload_blob(blob_name, b"data")
+
+        # execute
+        result = self.backend.exists_many(["model_1/run.json", "model_2/model.json", "model_3/run.json", "model_2"])
+
+        # assert
+        assert result == {
+            "model_1/run.json": True,
+            "model_2/model.json": False,
+            "model_3/run.json": False,
+            "model_2": True,
+        }
+
+    def test_upload_files_and_download_blobs(self, tmp_path):
+        # setup
+        self.backend.chunk_size = 4
+        contents = {f"model/file_{i}.bin": bytes(range(i * 3)) for i in range(5)}
+        for blob_name, content in contents.items():
+            (tmp_path / blob_name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / blob_name).write_bytes(content)
+
+        # execute
+        self.backend.upload_files((tmp_path / blob_name, blob_name) for blob_name in contents)
+        self.backend.download_blobs(
+            (blob, tmp_path / "download" / blob.name) for blob in self.backend.get_blob_list("model/")
+        )
+
+        # assert
+        for blob_name, content in contents.items():
+            assert (tmp_path / "download" / blob_name).read_bytes() == content
+        assert sorted(path.name for path in (tmp_path / "download" / "model").iterdir()) == sorted(
+            blob_name.split("/")[-1] for blob_name in contents
+        )
+
+    def test_resume_chunked_download(self, tmp_path):
+        # setup
+        self.backend.chunk_size = 4
+        content = bytes(range(30))
+        self.backend.upload_blob("model/model.bin", content)
+        blob = self.backend.get_blob_list("model/model.bin")[0]
+        read_blob_range = self.backend.read_blob_range
+
+        def interrupted_read_blob_range(blob_name, offset, length):
+            if offset == 12:
+                raise ConnectionError("connection reset")
+            return read_blob_range(blob_name, offset, length)
+
+        # execute
+        mock_interrupted = patch.object(self.backend, "read_blob_range", side_effect=interrupted_read_blob_range)
+        with mock_interrupted, pytest.raises(ConnectionError):
+            self.backend.download_blobs([(blob, tmp_path / "model.bin")], max_workers=1)
+        assert not (tmp_path / "model.bin").exists()
+        with patch.object(self.backend, "read_blob_range", side_effect=read_blob_range) as mock_read_blob_range:
+            self.backend.download_blobs([(blob, tmp_path / "model.bin")])
+
+        # assert
+        assert (tmp_path / "model.bin").read_bytes() == content
+        # only the chunks that were not downloaded before the interruption are read again
+        assert sorted(call.args[1] for call in mock_read_blob_range.call_args_list) == [12, 16, 20, 24, 28]
+        assert not list(tmp_path.glob(".model.bin.*"))
+
+
+class LatencyFileSystemBackend(FileSystemBackend):
+    """Local shared cache that waits before each request, like a remote store."""
+
+    latency = 0.05
+
+    def download_blob(self, blob, file_path):
+        time.sleep(self.latency)
+        super().download_blob(blob, file_path)
+
+    def read_blob_range(self, blob_name, offset, length):
+        time.sleep(self.latency)
+        return super().read_blob_range(blob_name, offset, length)
+
+
+def test_concurrent_download_benchmark(tmp_path):
+    # setup
+    backend = LatencyFileSystemBackend(tmp_path / "shared_cache")
+    backend.chunk_size = 1024
+    for i in range(8):
+        backend.upload_blob(f"model/file_{i}.bin", b"0" * 100)
+    # a large file is downloaded in 8 chunks
+    backend.upload_blob("model/model.onnx.data", b"1" * 8 * 1024)
+    blob_list = backend.get_blob_list("model/")
+
+    def download(output_dir, max_workers):
+        start = time.perf_counter()
+        backend.download_blobs(((blob, output_dir / blob.name) for blob in blob_list), max_workers=max_workers)
+        return time.perf_counter() - start
+
+    # execute
+    sequential_time = download(tmp_path / "sequential", 1)
+    concurrent_time = download(tmp_path / "concurrent", None)
+
+    # assert
+    # 16 requests one after the other take at least 16 times the latency, concurrently they take about one latency
+    assert sequential_time >= 16 * backend.latency
+    assert concurrent_time < sequential_time / 4
+    assert (tmp_path / "concurrent" / "model" / "model.onnx.data").read_bytes() == b"1" * 8 * 1024
+
+
+def test_create_file_system_backend(tmp_path):
+    # execute
+    backend = create_shared_cache_backend(f"file://{tmp_path.as_posix()}/shared_cache")
+
+    # assert
+    assert isinstance(backend, FileSystemBackend)
+    assert backend.root_dir == (tmp_path / "shared_cache").resolve()
+
+
+def test_create_s3_backend():
+    pytest.importorskip("boto3")
+
+    # execute
+    backend = create_shared_cache_backend("s3://bucket/olive/cache/")
+
+    # assert
+    assert isinstance(backend, S3Backend)
+    assert backend.bucket_name == "bucket"
+    assert backend.prefix == "olive/cache"
+
+
+def test_create_unsupported_backend():
+    with pytest.raises(ValueError, match="Unsupported shared cache url"):
+        create_shared_cache_backend("ftp://server/cache")
@@ -0,0 +1,148 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import os
+import time
+from test.unit_test.utils import create_raw_data
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+
+from olive.data.config import DataConfig
+from olive.data.dataset_cache import (
+    CachingDataLoader,
+    DatasetStore,
+    create_cached_dataloader,
+    get_data_config_hash,
+)
+
+# pylint: disable=attribute-defined-outside-init
+
+
+class TestDatasetCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.data_dir = tmp_path / "data"
+        self.cache_dir = tmp_path / "cache"
+        create_raw_data(self.data_dir, ["float_input", "int_input"], [[3], [2]], ["float32", "int32"], num_samples=5)
+        self.data_config = DataConfig(
+            name="raw_data",
+            type="RawDataContainer",
+            load_dataset_config={
+                "params": {
+                    "data_dir": str(self.data_dir),
+                    "input_names": ["float_input", "int_input"],
+                    "input_shapes": [[3], [2]],
+                    "input_types": ["float32", "int32"],
+                }
+            },
+            dataloader_config={"params": {"batch_size": 2}},
+        )
+
+    def _create_dataloader(self):
+        return create_cached_dataloader(self.data_config.to_data_container(), self.cache_dir)
+
+    def test_cached_batches_match_dataloader(self):
+        # execute
+        dataloader = self._create_dataloader()
+        batches = list(dataloader)
+        os.utime(dataloader.store_dir / "index.json", (1, 1))
+        start_time = time.time() - 1
+        with patch("olive.data.container.data_container.DataContainer.create_dataloader") as mock_create_dataloader:
+            cached_dataloader = self._create_dataloader()
+            cached_batches = list(cached_dataloader)
+
+        # assert
+        assert isinstance(dataloader, CachingDataLoader)
+        # attributes of the torch dataloader are passed through
+        assert len(dataloader.dataset) == 5
+        assert isinstance(cached_dataloader, DatasetStore)
+        # the dataset is not loaded or preprocessed again
+        mock_create_dataloader.assert_not_called()
+        # the use of the store is recorded for the garbage collection of the cache
+        assert (cached_dataloader.store_dir / "index.json").stat().st_mtime >= start_time
+        assert len(cached_dataloader) == len(dataloader) == 5
+        for (inputs, labels), (cached_inputs, cached_labels) in zip(batches, cached_batches):
+            assert inputs.keys() == cached_inputs.keys()
+            for name, value in inputs.items():
+                assert isinstance(cached_inputs[name], torch.Tensor)
+                assert cached_inputs[name].dtype == value.dtype
+                assert torch.equal(cached_inputs[name], value)
+            assert cached_labels == labels
+
+    def test_incomplete_iteration_is_not_cached(self):
+        # execute
+        next(iter(self._create_dataloader()))
+
+        # assert
+        assert not list(self.cache_dir.iterdir())
+        assert isinstance(self._create_dataloader(), CachingDataLoader)
+
+    def test_unsupported_batches_are_not_cached(self):
+        # setup
+        dataloader = CachingDataLoader(
+            torch.utils.data.DataLoader([{"input": object()}], collate_fn=lambda x: x), self.cache_dir / "store"
+        )
+
+        # execute
+        batches = list(dataloader)
+
+        # assert
+        assert len(batches) == 1
+        assert not DatasetStore.exists(self.cache_dir / "store")
+
+    def test_data_config_hash(self):
+        # setup
+        data_config_hash = get_data_config_hash(self.data_config)
+
+        # execute and assert
+        assert get_data_config_hash(self.data_config) == data_config_hash
+        self.data_config.dataloader_config.params["batch_size"] = 1
+        assert get_data_config_hash(self.data_config) != data_config_hash
+        self.data_config.dataloader_config.params["batch_size"] = 2
+        # adding a data file changes the data directory
+        create_raw_data(self.data_dir / "extra", ["input"], [[1]])
+        assert get_data_config_hash(self.data_config) != data_config_hash
+
+    def test_shuffled_batches_are_not_cached(self):
+        # setup
+        self.data_config.dataloader_config.params["shuffle"] = True
+
+        # execute
+        dataloader = self._create_dataloader()
+
+        # assert
+        assert not isinstance(dataloader, CachingDataLoader)
+
+
+def test_dataset_store_nested_batches(tmp_path):
+    # setup
+    batches = [
+        (
+            {"input_ids": torch.arange(6).reshape(2, 3), "mask": np.ones((2, 3), dtype=bool)},
+            [torch.tensor([1.5, 2.5], dtype=torch.float16), 7, "label", None],
+        ),
+        ({"input_ids": torch.zeros((0, 3), dtype=torch.int64), "mask": np.zeros((0, 3), dtype=bool)}, []),
+    ]
+
+    # execute
+    list(CachingDataLoader(batches, tmp_path / "store"))
+    store = DatasetStore(tmp_path / "store")
+
+    # assert
+    assert len(store) == 2
+    inputs, labels = store[0]
+    assert torch.equal(inputs["input_ids"], batches[0][0]["input_ids"])
+    assert np.array_equal(inputs["mask"], batches[0][0]["mask"])
+    assert inputs["mask"].dtype == bool
+    assert torch.equal(labels[0], batches[0][1][0])
+    assert labels[1:] == [7, "label", None]
+    inputs, labels = store[1]
+    assert inputs["input_ids"].shape == (0, 3)
+    assert labels == []
+    # the batches are copy on write, changing them does not change the store
+    store[0][0]["input_ids"][0, 0] = 100
+    assert DatasetStore(tmp_path / "store")[0][0]["input_ids"][0, 0] == 0
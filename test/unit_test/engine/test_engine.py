@@ -4,10 +4,12 @@
 # --------------------------------------------------------------------------
 import json
 import logging
+import threading
 from pathlib import Path
 from test.unit_test.utils import (
     get_accuracy_metric,
     get_composite_onnx_model_config,
+    get_latency_metric,
     get_onnx_model_config,
     get_onnxconversion_pass,
     get_pytorch_model_config,
@@ -17,12 +19,15 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from olive.cache import OliveCache
 from olive.data.config import DataComponentConfig, DataConfig
 from olive.engine import Engine
-from olive.evaluator.metric import AccuracySubType
+from olive.engine.worker_pool import EngineWorkerPool
+from olive.evaluator.metric import AccuracySubType, LatencySubType
 from olive.evaluator.metric_result import MetricResult, joint_metric_key
 from olive.evaluator.olive_evaluator import OliveEvaluatorConfig
 from olive.hardware import DEFAULT_CPU_ACCELERATOR
+from olive.hardware.accelerator import AcceleratorSpec, Device
 from olive.passes.onnx.conversion import OnnxConversion
 from olive.passes.onnx.optimum_conversion import OptimumConversion
 from olive.passes.onnx.quantization import OnnxDynamicQuantization, OnnxStaticQuantization
@@ -203,6 +208,72 @@ class TestEngine:
         assert system_object.evaluate_model.call_count == 3
         system_object.evaluate_model.assert_called_with(onnx_model_config, evaluator_config, DEFAULT_CPU_ACCELERATOR)
 
+    @patch("olive.systems.local.LocalSystem")
+    def test_run_search_with_early_stop(self, mock_local_system, tmp_path):
+        # setup
+        model_config = get_pytorch_model_config()
+        metric = get_accuracy_metric(
+            AccuracySubType.ACCURACY_SCORE,
+            user_config={"early_stop": True},
+            goal_type="max-degradation",
+            goal_value=0.01,
+        )
+        evaluator_config = OliveEvaluatorConfig(metrics=[metric])
+        options = {
+            "cache_config": {
+                "cache_dir": tmp_path,
+                "clean_cache": True,
+                "clean_evaluation_cache": True,
+            },
+            "search_strategy": {
+                "execution_order": "joint",
+                "search_algorithm": "random",
+            },
+            "evaluator": evaluator_config,
+        }
+        metric_key = joint_metric_key(metric.name, AccuracySubType.ACCURACY_SCORE)
+        evaluated_goals = []
+
+        def evaluate_model(model_config, evaluator_config, accelerator_spec):
+            goal = evaluator_config.metrics[0].sub_types[0].goal
+            evaluated_goals.append((goal.type, goal.value))
+            # the baseline is evaluated against the relative goal, the candidate is pruned against the threshold
+            pruned = goal.type == "threshold"
+            return MetricResult.parse_obj(
+                {
+                    metric_key: {
+                        "value": 0.5 if pruned else 0.9,
+                        "priority": 1,
+                        "higher_is_better": True,
+                        "pruned": pruned,
+                    }
+                }
+            )
+
+        system_object = MagicMock()
+        mock_local_system.return_value = system_object
+        system_object.system_type = SystemType.Local
+        system_object.run_pass.return_value = get_onnx_model_config()
+        system_object.evaluate_model.side_effect = evaluate_model
+        system_object.get_supported_execution_providers.return_value = ["CPUExecutionProvider"]
+        system_object.olive_managed_env = False
+
+        engine = Engine(**options)
+        engine.register(OnnxConversion)
+
+        # execute
+        actual_res = engine.run(model_config, [DEFAULT_CPU_ACCELERATOR], output_dir=tmp_path)
+
+        # assert
+        assert evaluated_goals == [("max-degradation", 0.01), ("threshold", pytest.approx(0.89))]
+        # the pruned model does not meet the goals and its evaluation is not cached
+        assert DEFAULT_CPU_ACCELERATOR not in actual_res
+        footprint = engine.footprints[DEFAULT_CPU_ACCELERATOR]
+        pruned_nodes = [node for node in footprint.nodes.values() if node.metrics and node.metrics.is_pruned]
+        assert len(pruned_nodes) == 1
+        assert not pruned_nodes[0].metrics.if_goals_met
+        assert engine.cache.load_evaluation(f"{pruned_nodes[0].model_id}-{DEFAULT_CPU_ACCELERATOR}") is None
+
     @patch("olive.systems.local.LocalSystem")
     def test_run_no_search_model_components(self, mock_local_system_init, tmpdir):
         model_config = get_pytorch_model_config()
@@ -650,3 +721,251 @@ class TestEngine:
                     evaluate_input_model=False,
                 )
                 assert not actual_res[DEFAULT_CPU_ACCELERATOR].nodes, "Expect empty dict when quantization fails"
+
+    def test_run_search_with_max_workers(self, tmp_path):
+        # setup
+        metric = get_latency_metric(LatencySubType.AVG)
+        options = {
+            "cache_config": {
+                "cache_dir": tmp_path / "cache",
+                "clean_cache": True,
+                "clean_evaluation_cache": True,
+            },
+            "search_strategy": {
+                "execution_order": "joint",
+                "search_algorithm": "random",
+                "search_algorithm_config": {"num_samples": 4},
+            },
+            "evaluator": OliveEvaluatorConfig(metrics=[metric]),
+            "max_workers": 2,
+        }
+        engine = Engine(**options)
+        engine.register(OnnxDynamicQuantization)
+
+        # execute
+        with patch.object(
+            EngineWorkerPool, "submit", side_effect=EngineWorkerPool.submit, autospec=True
+        ) as mock_submit:
+            engine.run(get_onnx_model_config(), [DEFAULT_CPU_ACCELERATOR], output_dir=tmp_path / "output")
+
+        # assert
+        assert mock_submit.call_count > 0
+        footprint = engine.footprints[DEFAULT_CPU_ACCELERATOR]
+        pass_nodes = [node for node in footprint.nodes.values() if node.from_pass == "OnnxDynamicQuantization"]
+        assert len(pass_nodes) == 4
+        assert all(node.metrics and node.metrics.value[f"{metric.name}-avg"] for node in pass_nodes)
+
+    def test_run_search_with_pipeline_evaluation(self, tmp_path):
+        # setup
+        metric = get_latency_metric(LatencySubType.AVG)
+        options = {
+            "cache_config": {
+                "cache_dir": tmp_path / "cache",
+                "clean_cache": True,
+                "clean_evaluation_cache": True,
+            },
+            "search_strategy": {
+                "execution_order": "joint",
+                "search_algorithm": "random",
+                "search_algorithm_config": {"num_samples": 3},
+            },
+            "evaluator": OliveEvaluatorConfig(metrics=[metric]),
+            "pipeline_evaluation": True,
+        }
+        engine = Engine(**options)
+        engine.register(OnnxDynamicQuantization)
+        evaluation_threads = []
+        original_evaluate_output_model = Engine._evaluate_output_model
+
+        def evaluate_output_model(*args, **kwargs):
+            evaluation_threads.append(threading.current_thread())
+            return original_evaluate_output_model(*args, **kwargs)
+
+        # execute
+        with patch.object(Engine, "_evaluate_output_model", side_effect=evaluate_output_model, autospec=True):
+            engine.run(get_onnx_model_config(), [DEFAULT_CPU_ACCELERATOR], output_dir=tmp_path / "output")
+
+        # assert
+        # the output models are evaluated in the background while the next step runs
+        assert len(evaluation_threads) == 3
+        assert threading.main_thread() not in evaluation_threads
+        footprint = engine.footprints[DEFAULT_CPU_ACCELERATOR]
+        pass_nodes = [node for node in footprint.nodes.values() if node.from_pass == "OnnxDynamicQuantization"]
+        assert len(pass_nodes) == 3
+        assert all(node.metrics and node.metrics.value[f"{metric.name}-avg"] for node in pass_nodes)
+
+    def test_pipeline_evaluation_disabled_with_max_workers(self, caplog, tmp_path):
+        # setup
+        options = {
+            "cache_config": {"cache_dir": tmp_path / "cache"},
+            "max_workers": 2,
+            "pipeline_evaluation": True,
+        }
+
+        # execute
+        with caplog.at_level(logging.WARNING):
+            engine = Engine(**options)
+
+        # assert
+        assert not engine.pipeline_evaluation
+        assert "pipeline_evaluation is disabled since max_workers is 2" in caplog.text
+
+    def test_run_no_search_with_shared_prefix(self, tmp_path):
+        # setup
+        options = {
+            "cache_config": {
+                "cache_dir": tmp_path / "cache",
+                "clean_cache": True,
+            },
+            "search_strategy": None,
+            "max_workers": 2,
+        }
+        engine = Engine(**options)
+        _, p_config = get_onnxconversion_pass(ignore_pass_config=False, target_opset=13)
+        engine.register(OnnxConversion, name="converter", config=p_config)
+        engine.register(OnnxDynamicQuantization, name="quantizer")
+        engine.register(OnnxDynamicQuantization, name="per_channel_quantizer", config={"per_channel": True})
+        engine.set_pass_flows([["converter", "quantizer"], ["converter", "per_channel_quantizer"]])
+
+        # execute
+        with patch.object(
+            EngineWorkerPool, "submit", side_effect=EngineWorkerPool.submit, autospec=True
+        ) as mock_submit:
+            outputs = engine.run(
+                get_pytorch_model_config(),
+                [DEFAULT_CPU_ACCELERATOR],
+                output_dir=tmp_path / "output",
+                evaluate_input_model=False,
+            )
+
+        # assert
+        # the shared conversion runs once in the engine, the two quantization branches run in workers
+        assert mock_submit.call_count == 2
+        assert {call.args[2] for call in mock_submit.call_args_list} == {"quantizer", "per_channel_quantizer"}
+        output_nodes = list(outputs[DEFAULT_CPU_ACCELERATOR].nodes.values())
+        assert len(output_nodes) == 2
+        assert output_nodes[0].model_id != output_nodes[1].model_id
+        assert output_nodes[0].parent_model_id == output_nodes[1].parent_model_id
+        footprint = engine.footprints[DEFAULT_CPU_ACCELERATOR]
+        assert footprint.nodes[output_nodes[0].parent_model_id].from_pass == "OnnxConversion"
+        # stages recorded by the workers are merged into the footprint
+        for output_node in output_nodes:
+            assert "run_pass" in {stage.name for stage in footprint.nodes[output_node.model_id].stages}
+
+    def test_run_no_search_with_shared_cache_prefetch(self, tmp_path):
+        # setup
+        shared_cache_dir = (tmp_path / "shared_cache").as_uri()
+
+        def run_engine(cache_dir):
+            engine = Engine(cache_config={"cache_dir": [str(cache_dir), shared_cache_dir]})
+            engine.register(OnnxDynamicQuantization, name="quantizer")
+            engine.register(OnnxDynamicQuantization, name="per_channel_quantizer", config={"per_channel": True})
+            engine.set_pass_flows([["quantizer", "per_channel_quantizer"]])
+            return engine.run(
+                get_onnx_model_config(),
+                [DEFAULT_CPU_ACCELERATOR],
+                output_dir=tmp_path / "output",
+                evaluate_input_model=False,
+            )
+
+        # the first run populates the shared cache
+        run_engine(tmp_path / "cache_1")
+
+        # execute
+        prefetch_patch = patch.object(
+            OliveCache, "prefetch_shared_cache", autospec=True, side_effect=OliveCache.prefetch_shared_cache
+        )
+        with patch.object(LocalSystem, "run_pass") as mock_run_pass, prefetch_patch as mock_prefetch:
+            outputs = run_engine(tmp_path / "cache_2")
+
+        # assert
+        # both output models are checked at once before the first pass runs and downloaded instead of run
+        mock_run_pass.assert_not_called()
+        mock_prefetch.assert_called_once()
+        prefetched_model_ids = list(mock_prefetch.call_args.args[1])
+        assert len(prefetched_model_ids) == 2
+        output_node = next(iter(outputs[DEFAULT_CPU_ACCELERATOR].nodes.values()))
+        assert output_node.model_id == prefetched_model_ids[-1]
+        model_path = Path(output_node.model_config["config"]["model_path"])
+        assert model_path.exists()
+        assert (tmp_path / "cache_2") in model_path.parents
+
+    def test_run_accelerators_with_max_workers(self, tmp_path):
+        # setup
+        options = {
+            "cache_config": {
+                "cache_dir": tmp_path / "cache",
+                "clean_cache": True,
+            },
+            "search_strategy": None,
+            "max_workers": 2,
+        }
+        engine = Engine(**options)
+        _, p_config = get_onnxconversion_pass(ignore_pass_config=False, target_opset=13)
+        engine.register(OnnxConversion, config=p_config)
+        accelerator_specs = [
+            DEFAULT_CPU_ACCELERATOR,
+            AcceleratorSpec(accelerator_type=Device.CPU, execution_provider="DnnlExecutionProvider"),
+        ]
+
+        # execute
+        with patch.object(
+            EngineWorkerPool, "submit", side_effect=EngineWorkerPool.submit, autospec=True
+        ) as mock_submit, patch.object(
+            OnnxConversion, "_run_for_config", side_effect=OnnxConversion._run_for_config, autospec=True
+        ) as mock_run:
+            outputs = engine.run(
+                get_pytorch_model_config(),
+                accelerator_specs,
+                output_dir=tmp_path / "output",
+                evaluate_input_model=False,
+            )
+
+        # assert
+        # the accelerator agnostic conversion runs once in the engine, the accelerators are optimized in workers
+        assert mock_run.call_count == 1
+        assert mock_submit.call_count == 2
+        assert set(outputs) == set(accelerator_specs)
+        output_model_ids = [next(iter(outputs[accelerator_spec].nodes)) for accelerator_spec in accelerator_specs]
+        assert output_model_ids[0] == output_model_ids[1]
+        for accelerator_spec in accelerator_specs:
+            assert engine.footprints[accelerator_spec].nodes[output_model_ids[0]].from_pass == "OnnxConversion"
+        # the workers are given the output model of the conversion instead of loading it from the cache
+        for submit_call in mock_submit.call_args_list:
+            assert set(submit_call.args[-1]) == {output_model_ids[0]}
+
+    def test_run_accelerator_with_agnostic_runs(self, tmp_path):
+        # setup
+        options = {
+            "cache_config": {
+                "cache_dir": tmp_path / "cache",
+                "clean_cache": True,
+            },
+            "search_strategy": None,
+        }
+        engine = Engine(**options)
+        _, p_config = get_onnxconversion_pass(ignore_pass_config=False, target_opset=13)
+        engine.register(OnnxConversion, config=p_config)
+        engine.initialize()
+        accelerator_spec = AcceleratorSpec(accelerator_type=Device.CPU, execution_provider="DnnlExecutionProvider")
+        input_model_config = get_pytorch_model_config()
+        agnostic_runs = engine._run_accelerator_agnostic_passes(
+            input_model_config, [DEFAULT_CPU_ACCELERATOR, accelerator_spec]
+        )
+
+        # execute
+        with patch.object(
+            Engine, "_load_run", autospec=True, side_effect=Engine._load_run
+        ) as mock_load_run, patch.object(
+            OnnxConversion, "_run_for_config", autospec=True, side_effect=OnnxConversion._run_for_config
+        ) as mock_run:
+            output_footprint = engine._run_accelerator_with_system(
+                input_model_config, tmp_path / "output", False, accelerator_spec, agnostic_runs
+            )
+
+        # assert
+        assert len(agnostic_runs) == 1
+        mock_run.assert_not_called()
+        mock_load_run.assert_not_called()
+        assert set(output_footprint.nodes) == set(agnostic_runs)
+        assert engine.agnostic_runs == {}
@@ -2,11 +2,13 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
+import json
 from copy import deepcopy
 from pathlib import Path
 
 import pytest
 
+from olive.common.profiling import collect_stages, profile_stage
 from olive.engine.footprint import Footprint
 
 # pylint: disable=attribute-defined-outside-init, protected-access
@@ -37,6 +39,21 @@ class TestFootprint:
         fp2 = Footprint.from_json(json_fp)
         assert len(fp2.nodes) == 3
 
+    def test_trace_file_dump(self, tmp_path):
+        model_id = next(iter(self.fp.nodes))
+        with collect_stages() as stages, profile_stage("stage"):
+            pass
+        self.fp.record_stages(model_id, stages)
+        self.fp.to_trace_file(tmp_path / "trace.json")
+
+        with (tmp_path / "trace.json").open() as f:
+            trace_events = json.load(f)["traceEvents"]
+        assert len(trace_events) == 1
+        assert trace_events[0]["name"] == "stage"
+        assert trace_events[0]["ph"] == "X"
+        assert trace_events[0]["args"]["model_id"] == model_id
+        assert Footprint.from_json(self.fp.to_json()).nodes[model_id].stages == stages
+
     def test_pareto_frontier(self):
         pareto_frontier_fp = self.fp.create_pareto_frontier()
         assert isinstance(pareto_frontier_fp, Footprint)
@@ -0,0 +1,74 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+from olive.engine.scheduler import ResourceRequest, ResourceScheduler
+from olive.engine.worker_pool import EngineWorkerPool
+from olive.hardware.accelerator import AcceleratorSpec, Device
+
+# pylint: disable=protected-access
+
+
+class TestResourceScheduler:
+    def test_union(self):
+        request = ResourceRequest(memory=10, device_memory=5, num_threads=2).union(ResourceRequest(memory=20))
+        assert request == ResourceRequest(memory=20, device_memory=5, num_threads=2)
+        assert request.union(ResourceRequest(num_threads=None)).num_threads is None
+
+    @patch.object(ResourceScheduler, "_get_host_memory_budget", return_value=100)
+    def test_admit_within_budget(self, _):
+        scheduler = ResourceScheduler(AcceleratorSpec(accelerator_type=Device.GPU, memory=50))
+        scheduler.num_threads_budget = 4
+
+        # a job is always admitted when nothing else is running
+        large_request = ResourceRequest(memory=200)
+        assert scheduler.try_acquire(large_request)
+        assert not scheduler.try_acquire(ResourceRequest(memory=1))
+        scheduler.release(large_request)
+
+        request = ResourceRequest(memory=60, device_memory=30)
+        assert scheduler.try_acquire(request)
+        # host memory
+        assert not scheduler.try_acquire(ResourceRequest(memory=60))
+        # accelerator memory
+        assert not scheduler.try_acquire(ResourceRequest(device_memory=30))
+        # cpu threads
+        assert not scheduler.try_acquire(ResourceRequest(num_threads=None))
+        assert scheduler.try_acquire(ResourceRequest(memory=40, device_memory=20, num_threads=3))
+        assert scheduler.num_jobs == 2
+
+
+class TestEngineWorkerPool:
+    @patch.object(EngineWorkerPool, "_create_executor")
+    def test_restart_with_fewer_workers_after_worker_killed(self, mock_create_executor):
+        executor_futures = []
+
+        def create_executor():
+            executor = MagicMock()
+
+            def submit(*args, **kwargs):
+                executor_futures.append(Future())
+                return executor_futures[-1]
+
+            executor.submit.side_effect = submit
+            return executor
+
+        mock_create_executor.side_effect = create_executor
+        pool = EngineWorkerPool(MagicMock(), None, 4)
+        job_future = pool.submit("method")
+
+        # the worker running the job is killed
+        executor_futures[0].set_exception(BrokenProcessPool())
+
+        # the job is run again in a new pool with half the workers
+        assert pool.max_workers == 2
+        assert mock_create_executor.call_count == 2
+        assert len(executor_futures) == 2
+        assert not job_future.done()
+
+        executor_futures[1].set_result(("result", {}))
+        assert pool.get_result(job_future) == "result"
@@ -31,7 +31,7 @@ def test_evaluate_accuracyscore(mock_torchmetrics, mock_torch_tensor, metric_con
     expected_res = 0.99
     mock_res = MagicMock()
     mock_res.item.return_value = expected_res
-    mock_torchmetrics.Accuracy().return_value = mock_res
+    mock_torchmetrics.Accuracy().compute.return_value = mock_res
 
     # execute
     actual_res = acc.measure(model_output, targets)
@@ -52,7 +52,7 @@ def test_evaluate_f1score(mock_torchmetrics, mock_torch_tensor):
     expected_res = 0.99
     mock_res = MagicMock()
     mock_res.item.return_value = expected_res
-    mock_torchmetrics.F1Score().return_value = mock_res
+    mock_torchmetrics.F1Score().compute.return_value = mock_res
 
     # execute
     actual_res = acc.measure(model_output, targets)
@@ -73,7 +73,7 @@ def test_evaluate_precision(mock_torchmetrics, mock_torch_tensor):
     expected_res = 0.99
     mock_res = MagicMock()
     mock_res.item.return_value = expected_res
-    mock_torchmetrics.Precision().return_value = mock_res
+    mock_torchmetrics.Precision().compute.return_value = mock_res
 
     # execute
     actual_res = acc.measure(model_output, targets)
@@ -94,7 +94,7 @@ def test_evaluate_recall(mock_torchmetrics, mock_torch_tensor):
     expected_res = 0.99
     mock_res = MagicMock()
     mock_res.item.return_value = expected_res
-    mock_torchmetrics.Recall().return_value = mock_res
+    mock_torchmetrics.Recall().compute.return_value = mock_res
 
     # execute
     actual_res = acc.measure(model_output, targets)
@@ -115,14 +115,14 @@ def test_evaluate_auc(mock_torchmetrics, mock_torch_tensor):
     expected_res = 0.99
     mock_res = MagicMock()
     mock_res.item.return_value = expected_res
-    mock_torchmetrics.AUROC().return_value = mock_res
+    mock_torchmetrics.AUROC().compute.return_value = mock_res
 
     # execute
     actual_res = acc.measure(model_output, targets)
 
     # assert
     mock_torch_tensor.assert_any_call(model_output.logits, dtype=torch.float)
-    mock_torch_tensor.assert_any_call(targets, dtype=torch.int32)
+    mock_torch_tensor.assert_any_call(targets, dtype=torch.long)
     assert actual_res == expected_res
 
 
@@ -149,3 +149,65 @@ def test_evaluate_perplexity(mock_torchmetrics, mock_torch_tensor):
         mock_torch_tensor.assert_any_call(model_output.preds[i], dtype=torch.float)
         mock_torch_tensor.assert_any_call(targets[i], dtype=torch.long)
     assert actual_res == expected_res
+
+
+@pytest.mark.parametrize(
+    ("metric_cls", "config", "uses_logits"),
+    [
+        (AccuracyScore, {"task": "multiclass", "num_classes": 3}, False),
+        (F1Score, {"task": "multiclass", "num_classes": 3, "average": "macro"}, False),
+        (AUROC, {"task": "multiclass", "num_classes": 3}, True),
+    ],
+)
+def test_update_in_batches_matches_measure(metric_cls, config, uses_logits):
+    # setup
+    torch.manual_seed(0)
+    logits = torch.rand(20, 3)
+    preds = logits.argmax(dim=-1)
+    targets = torch.randint(0, 3, (20,))
+    acc = metric_cls(config)
+
+    # execute
+    for start in range(0, 20, 6):
+        end = start + 6
+        acc.update(OliveModelOutput(preds[start:end], logits[start:end]), targets[start:end])
+    actual_res = acc.compute()
+
+    # assert
+    assert metric_cls.requires_logits == uses_logits
+    expected_res = metric_cls(config).measure(OliveModelOutput(preds, logits), targets)
+    assert actual_res == pytest.approx(expected_res)
+
+
+@pytest.mark.parametrize(
+    ("config", "bounded"),
+    [
+        ({"task": "binary"}, True),
+        ({"task": "multiclass", "num_classes": 3}, True),
+        ({"task": "binary", "thresholds": None}, False),
+    ],
+)
+def test_auroc_state_is_bounded(config, bounded):
+    # setup
+    torch.manual_seed(0)
+    acc = AUROC(config)
+    num_classes = config.get("num_classes")
+
+    def state_numel():
+        return sum(
+            sum(t.numel() for t in state) if isinstance(state, list) else state.numel()
+            for state in acc._metric.metric_state.values()
+        )
+
+    # execute
+    numels = []
+    for _ in range(2):
+        for _ in range(10):
+            logits = torch.rand(100, num_classes) if num_classes else torch.rand(100)
+            targets = torch.randint(0, num_classes or 2, (100,))
+            acc.update(OliveModelOutput(None, logits), targets)
+        numels.append(state_numel())
+
+    # assert
+    assert (numels[0] == numels[1]) == bounded
+    assert 0 <= acc.compute() <= 1
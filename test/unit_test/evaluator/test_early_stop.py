@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from test.unit_test.utils import get_accuracy_metric
+
+import numpy as np
+import pytest
+import torch
+
+from olive.common.pydantic_v1 import ValidationError
+from olive.evaluator.early_stop import SequentialGoalTest, get_num_samples, hoeffding_radius
+from olive.evaluator.metric import AccuracySubType
+
+
+def run_test(goal_test: SequentialGoalTest, scores: np.ndarray, batch_size: int = 10):
+    """Feed the per-sample scores to the test batch by batch, return the number of samples when it rejects."""
+    for start in range(0, len(scores), batch_size):
+        if goal_test.update(batch_size) and goal_test.test({"accuracy_score": scores[: start + batch_size].mean()}):
+            return goal_test.num_samples
+    return None
+
+
+class TestSequentialGoalTest:
+    def test_tests_at_doubling_sample_counts(self):
+        goal_test = SequentialGoalTest({"accuracy_score": (0.5, True)}, min_samples=100)
+        looks = []
+        for _ in range(100):
+            if goal_test.update(10):
+                goal_test.test({"accuracy_score": 1.0})
+                looks.append(goal_test.num_samples)
+
+        assert looks == [100, 200, 400, 800]
+
+    def test_rejects_hopeless_goal_early(self):
+        rng = np.random.default_rng(0)
+        scores = (rng.random(10000) < 0.5).astype(float)
+        goal_test = SequentialGoalTest({"accuracy_score": (0.9, True)}, confidence=0.99, min_samples=100)
+
+        num_samples = run_test(goal_test, scores)
+
+        assert num_samples is not None
+        assert num_samples <= 200
+
+    def test_keeps_goal_that_is_met(self):
+        rng = np.random.default_rng(0)
+        scores = (rng.random(10000) < 0.95).astype(float)
+        goal_test = SequentialGoalTest({"accuracy_score": (0.9, True)}, confidence=0.99, min_samples=100)
+
+        assert run_test(goal_test, scores) is None
+
+    def test_lower_is_better_goal(self):
+        goal_test = SequentialGoalTest({"accuracy_score": (0.1, False)}, min_samples=100)
+        goal_test.update(1000)
+
+        assert goal_test.test({"accuracy_score": 0.5}) == "accuracy_score"
+
+    def test_false_rejections_within_confidence(self):
+        # the accuracy on the whole dataset is exactly the threshold, so every rejection is wrong
+        rng = np.random.default_rng(0)
+        scores = np.zeros(2000)
+        scores[:1600] = 1
+        rejections = 0
+        for _ in range(200):
+            goal_test = SequentialGoalTest({"accuracy_score": (0.8, True)}, confidence=0.95, min_samples=20)
+            rejections += run_test(goal_test, rng.permutation(scores)) is not None
+
+        assert rejections / 200 <= 0.05
+
+    def test_from_metric(self):
+        metric = get_accuracy_metric(
+            AccuracySubType.ACCURACY_SCORE,
+            AccuracySubType.F1_SCORE,
+            user_config={"early_stop": True, "early_stop_confidence": 0.9, "early_stop_min_samples": 50},
+            goal_value=0.8,
+        )
+
+        goal_test = SequentialGoalTest.from_metric(metric)
+
+        # only the accuracy score is a mean of bounded per-sample scores
+        assert goal_test.goals == {AccuracySubType.ACCURACY_SCORE: (0.8, True)}
+        assert goal_test.confidence == 0.9
+        assert not goal_test.update(49)
+        assert goal_test.update(1)
+
+    @pytest.mark.parametrize(
+        ("user_config", "goal_type"),
+        [(None, "threshold"), ({"early_stop": True}, "max-degradation")],
+    )
+    def test_from_metric_without_threshold_goal(self, user_config, goal_type):
+        metric = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE, user_config=user_config, goal_type=goal_type)
+
+        assert SequentialGoalTest.from_metric(metric) is None
+
+    def test_invalid_confidence(self):
+        with pytest.raises(ValidationError, match="early_stop_confidence must be between 0 and 1"):
+            get_accuracy_metric(
+                AccuracySubType.ACCURACY_SCORE, user_config={"early_stop": True, "early_stop_confidence": 1}
+            )
+
+
+@pytest.mark.parametrize(
+    ("targets", "expected"),
+    [
+        (torch.zeros(4), 4),
+        (np.zeros((3, 8)), 3),
+        ({"labels": torch.zeros(5, 2)}, 5),
+        ([0, 1], 2),
+    ],
+)
+def test_get_num_samples(targets, expected):
+    assert get_num_samples(targets) == expected
+
+
+def test_hoeffding_radius():
+    # P(mean - true mean >= radius) <= exp(-2 * n * radius ** 2) = delta
+    radius = hoeffding_radius(1000, 0.01)
+
+    assert np.exp(-2 * 1000 * radius**2) == pytest.approx(0.01)
@@ -0,0 +1,124 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import math
+import os
+import random
+
+import numpy as np
+import pytest
+
+from olive.evaluator.latency_sampling import (
+    LATENCY_PERCENTILES,
+    get_latency_confidence_interval,
+    get_percentile_confidence_interval,
+    pin_to_cpu_cores,
+    reject_outliers,
+    sample_latencies,
+)
+from olive.evaluator.metric_config import LatencyMetricConfig
+
+
+class FakeRunner:
+    def __init__(self, warmup_decay=0, noise=0.0001, seed=0):
+        self.warmup_decay = warmup_decay
+        self.noise = noise
+        self.num_runs = 0
+        self.random = random.Random(seed)
+
+    def __call__(self):
+        self.num_runs += 1
+        # the first runs are slow until the caches are warm
+        slowdown = 10 * math.exp(-self.num_runs / self.warmup_decay) if self.warmup_decay else 0
+        return 0.01 * (1 + slowdown) + self.random.uniform(0, self.noise)
+
+
+def test_sample_latencies_warms_up_until_steady():
+    # setup
+    runner = FakeRunner(warmup_decay=10)
+    config = LatencyMetricConfig(adaptive=True, warmup_num=10, repeat_test_num=20, sleep_num=0)
+
+    # execute
+    latencies = sample_latencies(runner, config)
+
+    # assert
+    assert len(latencies) >= 20
+    # the slow runs are not measured
+    assert max(latencies) < 0.0115
+    assert runner.num_runs - len(latencies) > config.warmup_num
+
+
+def test_sample_latencies_samples_until_confidence_interval_is_narrow():
+    # setup
+    config = LatencyMetricConfig(
+        adaptive=True, warmup_num=5, repeat_test_num=10, sleep_num=0, ci_rel_width=0.01, max_repeat_test_num=2000
+    )
+
+    # execute
+    precise_latencies = sample_latencies(FakeRunner(noise=0.00001), config)
+    noisy_latencies = sample_latencies(FakeRunner(noise=0.001), config)
+
+    # assert
+    assert len(precise_latencies) < len(noisy_latencies) < 2000
+    lower, upper = get_percentile_confidence_interval(noisy_latencies, 50, config.confidence_level)
+    assert upper - lower <= 0.01 * np.percentile(noisy_latencies, 50)
+
+
+def test_sample_latencies_stops_at_max_repeat_test_num():
+    # setup
+    config = LatencyMetricConfig(
+        adaptive=True, warmup_num=5, repeat_test_num=10, sleep_num=0, ci_rel_width=0.0001, max_repeat_test_num=50
+    )
+
+    # execute
+    latencies = sample_latencies(FakeRunner(noise=0.01), config)
+
+    # assert
+    assert len(latencies) <= 50
+
+
+def test_reject_outliers():
+    # setup
+    latencies = [0.01 + i * 0.0001 for i in range(20)] + [0.5]
+
+    # execute and assert
+    assert reject_outliers(latencies, 3.5) == latencies[:-1]
+    assert reject_outliers(latencies, None) == latencies
+    # latencies without spread are kept
+    assert reject_outliers([0.01] * 5, 3.5) == [0.01] * 5
+
+
+@pytest.mark.parametrize(
+    ("sub_type", "has_interval"),
+    [("avg", True), ("p50", True), ("p90", True), ("p999", True), ("max", False), ("min", False)],
+)
+def test_latency_confidence_interval(sub_type, has_interval):
+    # setup
+    latencies = np.random.default_rng(0).normal(0.01, 0.001, 1000).tolist()
+
+    # execute
+    confidence_interval = get_latency_confidence_interval(latencies, sub_type, 0.95)
+
+    # assert
+    if not has_interval:
+        assert confidence_interval is None
+        return
+    lower, upper = confidence_interval
+    estimate = np.mean(latencies) if sub_type == "avg" else np.percentile(latencies, LATENCY_PERCENTILES[sub_type])
+    assert lower <= estimate <= upper
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="cpu affinity is only supported on linux")
+def test_pin_to_cpu_cores():
+    # setup
+    original_affinity = os.sched_getaffinity(0)
+    core = min(original_affinity)
+
+    # execute
+    with pin_to_cpu_cores([core]):
+        pinned_affinity = os.sched_getaffinity(0)
+
+    # assert
+    assert pinned_affinity == {core}
+    assert os.sched_getaffinity(0) == original_affinity
@@ -0,0 +1,60 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from olive.evaluator.load_test import resize_batch, run_load_test
+
+
+def test_run_load_test():
+    # setup
+    lock = threading.Lock()
+    calls = []
+
+    def run(stream_index):
+        with lock:
+            calls.append(stream_index)
+        time.sleep(0.001)
+
+    # execute
+    result = run_load_test(run, batch_size=2, concurrency=4, num_warmup=2, num_requests=5)
+
+    # assert
+    assert sorted(set(calls)) == [0, 1, 2, 3]
+    assert len(calls) == 4 * (2 + 5)
+    assert len(result.latencies) == 20
+    assert min(result.latencies) >= 0.001
+    # the clients run concurrently
+    assert result.duration < sum(result.latencies)
+    assert result.throughput == pytest.approx(2 * 20 / result.duration)
+    assert result.key == "batch_size=2,concurrency=4"
+
+
+def test_run_load_test_raises_client_error():
+    # setup
+    def run(stream_index):
+        if stream_index == 1:
+            raise RuntimeError("inference failed")
+
+    # execute and assert
+    with pytest.raises(RuntimeError, match="inference failed"):
+        run_load_test(run, batch_size=1, concurrency=3, num_warmup=1, num_requests=1)
+
+
+def test_resize_batch():
+    # setup
+    input_feed = {"input": np.arange(6).reshape(3, 2), "scalar": np.array(1)}
+
+    # execute
+    larger = resize_batch(input_feed, 5)
+    smaller = resize_batch(input_feed, 2)
+
+    # assert
+    assert np.array_equal(larger["input"], [[0, 1], [2, 3], [4, 5], [0, 1], [2, 3]])
+    assert np.array_equal(smaller["input"], [[0, 1], [2, 3]])
+    assert larger["scalar"] == 1
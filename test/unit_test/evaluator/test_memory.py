@@ -0,0 +1,48 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+from unittest.mock import patch
+
+import numpy as np
+
+from olive.evaluator.memory import MB, PeakRssTracker
+
+
+def _allocate(num_mb):
+    # touch the pages so that they are resident
+    return np.ones(num_mb * MB // 8)
+
+
+def _check_tracker(tracker):
+    baseline = tracker.reset()
+    data = _allocate(64)
+    assert tracker.peak() - baseline >= 60 * MB
+    del data
+
+    # the peak of the allocation is forgotten after the reset
+    current = tracker.reset()
+    assert tracker.peak() - current < 60 * MB
+    tracker.stop()
+
+
+def test_peak_rss_tracker():
+    _check_tracker(PeakRssTracker())
+
+
+def test_peak_rss_tracker_sampling():
+    with patch("olive.evaluator.memory._PROC_CLEAR_REFS") as mock_clear_refs:
+        mock_clear_refs.exists.return_value = False
+        tracker = PeakRssTracker()
+    _check_tracker(tracker)
+
+
+def test_peak_rss_tracker_clear_refs_not_writable():
+    with patch("olive.evaluator.memory._PROC_CLEAR_REFS") as mock_clear_refs:
+        mock_clear_refs.exists.return_value = True
+        mock_clear_refs.write_text.side_effect = PermissionError
+        tracker = PeakRssTracker()
+        # the rss is sampled instead of resetting the high water mark
+        _check_tracker(tracker)
+
+    assert mock_clear_refs.write_text.call_count == 1
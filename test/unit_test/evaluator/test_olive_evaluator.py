@@ -4,10 +4,13 @@
 # --------------------------------------------------------------------------
 from functools import partial
 from test.unit_test.utils import (
+    create_onnx_model_with_dynamic_axis,
     get_accuracy_metric,
+    get_cold_start_metric,
     get_custom_metric,
     get_custom_metric_no_eval,
     get_latency_metric,
+    get_memory_metric,
     get_mock_openvino_model,
     get_mock_snpe_model,
     get_onnx_model,
@@ -16,12 +19,23 @@ from test.unit_test.utils import (
 )
 from types import FunctionType
 from typing import ClassVar, List
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import numpy as np
 import pytest
+import torch
 
 from olive.common.pydantic_v1 import ValidationError
-from olive.evaluator.metric import AccuracySubType, LatencySubType, ThroughputSubType
+from olive.common.utils import run_in_fresh_process
+from olive.evaluator.accuracy import AccuracyBase
+from olive.evaluator.metric import (
+    AccuracySubType,
+    ColdStartSubType,
+    LatencySubType,
+    MemorySubType,
+    ThroughputSubType,
+)
+from olive.evaluator.metric_config import LatencyMetricConfig, ThroughputMetricConfig
 from olive.evaluator.olive_evaluator import (
     OliveEvaluator,
     OliveEvaluatorConfig,
@@ -32,6 +46,9 @@ from olive.evaluator.olive_evaluator import (
 )
 from olive.exception import OliveEvaluationError
 from olive.hardware.accelerator import Device
+from olive.model import ONNXModelHandler
+
+# pylint: disable=protected-access
 
 
 class TestOliveEvaluator:
@@ -114,7 +131,8 @@ class TestOliveEvaluator:
     )
     def test_evaluate_accuracy(self, evaluator, model_loader, metric_func, acc_subtype, expected_res):
         # setup
-        with patch(f"{acc_subtype}.measure") as mock_acc:
+        mock_update = patch(f"{acc_subtype}.update")
+        with mock_update, patch(f"{acc_subtype}.compute") as mock_acc:
             mock_acc.return_value = expected_res
 
             olive_model = model_loader()
@@ -214,6 +232,203 @@ class TestOliveEvaluator:
         ):
             evaluator.evaluate(model, [latency_metric], Device.CPU, execution_providers)
 
+    def test_evaluate_shares_session_and_inference(self):
+        # setup
+        model = get_onnx_model()
+        evaluator = OnnxEvaluator()
+        accuracy_metric = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE)
+        # same data as the accuracy metric, so the model outputs are the same
+        accuracy_metric_2 = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE)
+        accuracy_metric_2.name = "accuracy_2"
+        latency_metric = get_latency_metric(LatencySubType.AVG)
+
+        # execute
+        with patch.object(
+            ONNXModelHandler, "prepare_session", autospec=True, side_effect=ONNXModelHandler.prepare_session
+        ) as mock_prepare_session, patch.object(
+            OnnxEvaluator, "_inference_batches", autospec=True, side_effect=OnnxEvaluator._inference_batches
+        ) as mock_inference:
+            result = evaluator.evaluate(model, [accuracy_metric, accuracy_metric_2, latency_metric], Device.CPU)
+
+        # assert
+        # one session for all the metrics and one inference pass for both accuracy metrics
+        mock_prepare_session.assert_called_once()
+        mock_inference.assert_called_once()
+        assert result.get_value("accuracy", "accuracy_score") is not None
+        assert result.get_value("accuracy_2", "accuracy_score") == result.get_value("accuracy", "accuracy_score")
+        assert result.get_value("latency", "avg") > 0
+        # the sessions are released after the evaluation
+        assert evaluator._sessions is None
+
+    @pytest.mark.parametrize("custom_first", [True, False])
+    def test_evaluate_shares_inference_between_accuracy_and_custom(self, custom_first):
+        # setup
+        model = get_onnx_model()
+        accuracy_metric = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE)
+        # custom metric with a metric_func on the same data as the accuracy metric
+        custom_metric = get_custom_metric(
+            {"metric_func": "metric_func", "user_script": get_custom_metric().user_config.user_script}
+        )
+        custom_metric.data_config = accuracy_metric.data_config
+        metrics = [custom_metric, accuracy_metric] if custom_first else [accuracy_metric, custom_metric]
+
+        # execute
+        with patch.object(
+            ONNXModelHandler, "run_session", autospec=True, side_effect=ONNXModelHandler.run_session
+        ) as mock_run:
+            result = OnnxEvaluator().evaluate(model, metrics, Device.CPU)
+
+        # assert
+        # the model runs once on each batch of the data for both metrics
+        dataloader, _, _ = OliveEvaluator.get_user_config(model.framework, accuracy_metric)
+        assert mock_run.call_count == len(list(dataloader))
+        assert result.get_value("accuracy", "accuracy_score") is not None
+        assert result.get_value("custom", "custom") is not None
+
+    def test_evaluate_accuracy_batch_by_batch(self):
+        # setup
+        model = get_onnx_model()
+        evaluator = OnnxEvaluator()
+        metric = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE)
+        dataloader, _, post_func = OliveEvaluator.get_user_config(model.framework, metric)
+        expected_output, expected_targets = evaluator._inference(model, metric, dataloader, post_func)
+        expected_res = OliveEvaluator.compute_accuracy(metric, expected_output, expected_targets)
+
+        # execute
+        with patch.object(
+            OnnxEvaluator, "_inference_batches", autospec=True, side_effect=OnnxEvaluator._inference_batches
+        ) as mock_inference_batches, patch.object(OnnxEvaluator, "_concat_batches") as mock_concat_batches:
+            result = evaluator.evaluate(model, [metric], Device.CPU)
+
+        # assert
+        # the outputs of the batches are not concatenated and the logits are not kept since the metric does not use them
+        mock_concat_batches.assert_not_called()
+        assert mock_inference_batches.call_args.kwargs["keep_logits"] is False
+        assert result.get_value(metric.name, AccuracySubType.ACCURACY_SCORE) == pytest.approx(
+            expected_res[AccuracySubType.ACCURACY_SCORE].value
+        )
+
+    @pytest.mark.parametrize(
+        ("output_dtype", "keep_output_dtype", "expected_dtype"),
+        [
+            (np.float32, False, torch.float32),
+            (np.float16, False, torch.float32),
+            (np.float16, True, torch.float16),
+        ],
+    )
+    def test_onnx_inference_output_dtype(self, output_dtype, keep_output_dtype, expected_dtype):
+        # setup
+        model = get_onnx_model()
+        metric = get_accuracy_metric(
+            AccuracySubType.ACCURACY_SCORE, user_config={"keep_output_dtype": keep_output_dtype}
+        )
+        dataloader, _, post_func = OliveEvaluator.get_user_config(model.framework, metric)
+        session_outputs = []
+
+        def run_session(session, input_feed, **kwargs):
+            session_outputs.append(np.random.rand(1, 10).astype(output_dtype))
+            return [session_outputs[-1]]
+
+        # execute
+        with patch.object(ONNXModelHandler, "run_session", side_effect=run_session):
+            batches = list(OnnxEvaluator()._inference_batches(model, metric, dataloader, post_func))
+
+        # assert
+        for (model_output, _), session_output in zip(batches, session_outputs):
+            # the outputs are cast to float32 unless keep_output_dtype is set
+            assert model_output.logits.dtype == expected_dtype
+            # the logits share the memory of the session output if they are not cast
+            shares_memory = model_output.logits.data_ptr() == session_output.ctypes.data
+            assert shares_memory == (torch.from_numpy(session_output).dtype == expected_dtype)
+            if shares_memory:
+                # the accuracy metrics use the logits as is
+                logits, _ = AccuracyBase.prepare_tensors(model_output.logits, [1], [expected_dtype, torch.int])
+                assert logits.data_ptr() == session_output.ctypes.data
+
+    def test_onnx_inference_with_parallel_sessions(self):
+        # setup
+        model = get_onnx_model()
+        metric = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE, user_config={"num_sessions": 3})
+        single_session_metric = get_accuracy_metric(AccuracySubType.ACCURACY_SCORE)
+        dataloader = [(torch.rand(1, 1), torch.tensor([i])) for i in range(10)]
+        evaluator = OnnxEvaluator()
+
+        # execute
+        expected_batches = list(evaluator._inference_batches(model, single_session_metric, dataloader))
+        with patch.object(
+            ONNXModelHandler, "prepare_session", autospec=True, side_effect=ONNXModelHandler.prepare_session
+        ) as mock_prepare_session:
+            batches = list(evaluator._inference_batches(model, metric, dataloader))
+
+        # assert
+        assert mock_prepare_session.call_count == 3
+        for call in mock_prepare_session.call_args_list:
+            assert call.kwargs["inference_settings"]["session_options"]["intra_op_num_threads"] >= 1
+        # the outputs are in the order of the batches
+        assert [labels.item() for _, labels in batches] == list(range(10))
+        for (model_output, _), (expected_output, _) in zip(batches, expected_batches):
+            assert torch.allclose(model_output.logits, expected_output.logits)
+
+    @patch("olive.evaluator.olive_evaluator.dump_tuning_result")
+    def test_onnx_inference_with_parallel_sessions_dumps_tuning_result(self, mock_dump_tuning_result, tmp_path):
+        # setup
+        model = get_onnx_model()
+        tuning_result_file = str(tmp_path / "tuning_result.json")
+        metric = get_accuracy_metric(
+            AccuracySubType.ACCURACY_SCORE,
+            user_config={"num_sessions": 2, "inference_settings": {"onnx": {"tuning_result_file": tuning_result_file}}},
+        )
+        dataloader = [(torch.rand(1, 1), torch.tensor([i])) for i in range(4)]
+
+        # execute
+        list(OnnxEvaluator()._inference_batches(model, metric, dataloader))
+
+        # assert
+        # the tuning results are dumped once from one of the sessions
+        mock_dump_tuning_result.assert_called_once_with(ANY, tuning_result_file)
+
+    def test_evaluate_accuracy_keeps_logits_for_auroc(self):
+        # setup
+        model = get_onnx_model()
+        metric = get_accuracy_metric(AccuracySubType.AUROC)
+
+        # execute
+        mock_compute = patch("olive.evaluator.accuracy.AUROC.compute", return_value=0.5)
+        with mock_compute, patch("olive.evaluator.accuracy.AUROC.update", autospec=True) as mock_update:
+            OnnxEvaluator().evaluate(model, [metric], Device.CPU)
+
+        # assert
+        model_output = mock_update.call_args.args[1]
+        assert model_output.logits is not None
+
+    @pytest.mark.parametrize(("label", "pruned"), [(1, True), (0, False)])
+    def test_evaluate_accuracy_with_early_stop(self, label, pruned):
+        # setup
+        model = get_onnx_model()
+        metric = get_accuracy_metric(
+            AccuracySubType.ACCURACY_SCORE, user_config={"early_stop": True, "early_stop_min_samples": 50}
+        )
+        _, _, post_func = OliveEvaluator.get_user_config(model.framework, metric)
+        dataloader = [(torch.rand(1, 1), torch.tensor([label])) for _ in range(1000)]
+        # the model always predicts class 0
+        logits = np.eye(1, 10, dtype=np.float32)
+
+        # execute
+        with patch.object(ONNXModelHandler, "run_session", return_value=[logits]) as mock_run_session:
+            result = OnnxEvaluator()._accumulate_accuracy(model, metric, dataloader, post_func)
+
+        # assert
+        sub_result = result[AccuracySubType.ACCURACY_SCORE]
+        assert sub_result.pruned == pruned
+        assert result.is_pruned() == pruned
+        if pruned:
+            # the goal of 0.99 is rejected at the first test
+            assert mock_run_session.call_count == 50
+            assert sub_result.value == 0
+        else:
+            assert mock_run_session.call_count == 1000
+            assert sub_result.value == 1
+
     THROUGHPUT_TEST_CASE: ClassVar[List] = [
         (
             PyTorchEvaluator(),
@@ -254,6 +469,145 @@ class TestOliveEvaluator:
         for sub_type in metric.sub_types:
             assert expected_res > actual_res.get_value(metric.name, sub_type.name)
 
+    @pytest.mark.parametrize(
+        ("evaluator", "model_loader"), [(PyTorchEvaluator(), get_pytorch_model), (OnnxEvaluator(), get_onnx_model)]
+    )
+    def test_evaluate_adaptive_latency_reports_confidence_interval(self, evaluator, model_loader):
+        # setup
+        sampling_config = {"adaptive": True, "warmup_num": 5, "repeat_test_num": 10, "max_duration": 5}
+        latency_metric = get_latency_metric(LatencySubType.AVG, LatencySubType.P50, LatencySubType.MAX)
+        latency_metric.sub_types[0].metric_config = LatencyMetricConfig(**sampling_config)
+        throughput_metric = get_throughput_metric(ThroughputSubType.AVG)
+        throughput_metric.sub_types[0].metric_config = ThroughputMetricConfig(**sampling_config)
+
+        # execute
+        result = evaluator.evaluate(model_loader(), [latency_metric, throughput_metric])
+
+        # assert
+        for metric_name, sub_type_name in (("latency", "avg"), ("latency", "p50"), ("throughput", "avg")):
+            sub_metric_result = result[f"{metric_name}-{sub_type_name}"]
+            lower, upper = sub_metric_result.confidence_interval
+            assert lower <= sub_metric_result.value <= upper
+        assert result["latency-max"].confidence_interval is None
+
+    def test_evaluate_multi_stream_throughput(self, tmp_path):
+        # setup
+        model_path = tmp_path / "model.onnx"
+        create_onnx_model_with_dynamic_axis(model_path)
+        metric = get_throughput_metric(ThroughputSubType.AVG, ThroughputSubType.P90)
+        metric.sub_types[0].metric_config = ThroughputMetricConfig(
+            warmup_num=2, repeat_test_num=5, concurrency=[1, 2], batch_sizes=[1, 4], num_sessions=2
+        )
+
+        # execute
+        result = OnnxEvaluator().evaluate(ONNXModelHandler(model_path), [metric])
+
+        # assert
+        for sub_type_name in ("avg", "p90"):
+            sub_metric_result = result[f"throughput-{sub_type_name}"]
+            assert set(sub_metric_result.breakdown) == {
+                "batch_size=1,concurrency=1",
+                "batch_size=1,concurrency=2",
+                "batch_size=4,concurrency=1",
+                "batch_size=4,concurrency=2",
+            }
+            assert all(value > 0 for value in sub_metric_result.breakdown.values())
+        # the value is taken at the level with the highest sustained throughput
+        avg_result = result["throughput-avg"]
+        assert avg_result.value == max(avg_result.breakdown.values())
+
+    @pytest.mark.parametrize("metric_type", ["latency", "throughput"])
+    def test_evaluate_latency_over_shape_buckets(self, tmp_path, metric_type):
+        # setup
+        model_path = tmp_path / "model.onnx"
+        create_onnx_model_with_dynamic_axis(model_path)
+        if metric_type == "latency":
+            metric = get_latency_metric(LatencySubType.AVG, LatencySubType.P90)
+            metric.sub_types[0].metric_config = LatencyMetricConfig(warmup_num=1, repeat_test_num=5, num_batches=None)
+        else:
+            metric = get_throughput_metric(ThroughputSubType.AVG, ThroughputSubType.P90)
+            metric.sub_types[0].metric_config = ThroughputMetricConfig(
+                warmup_num=1, repeat_test_num=5, num_batches=None
+            )
+        dataloader = [(torch.randn(batch_size, 1), torch.zeros(batch_size)) for batch_size in (1, 4, 1, 1)]
+
+        # execute
+        evaluator = OnnxEvaluator()
+        evaluate = evaluator._evaluate_latency if metric_type == "latency" else evaluator._evaluate_throughput
+        result = evaluate(ONNXModelHandler(model_path), metric, dataloader)
+
+        # assert
+        for sub_type_name in ("avg", "p90"):
+            assert set(result[sub_type_name].breakdown) == {"1x1", "4x1"}
+        # the average of the buckets is weighted by their number of batches
+        breakdown = result["avg"].breakdown
+        assert min(breakdown.values()) <= result["avg"].value <= max(breakdown.values())
+
+    def test_evaluate_memory(self):
+        # setup
+        metric = get_memory_metric(
+            MemorySubType.SESSION_RSS, MemorySubType.INFERENCE_RSS, MemorySubType.PEAK_RSS, MemorySubType.DEVICE
+        )
+
+        # execute
+        result = OnnxEvaluator().evaluate(get_onnx_model(), [metric])
+
+        # assert
+        assert result.get_value("memory", "peak_rss") >= max(
+            result.get_value("memory", "session_rss"), result.get_value("memory", "inference_rss")
+        )
+        assert result.get_value("memory", "peak_rss") > 0
+        # no gpu is used on cpu
+        assert result.get_value("memory", "device") == 0
+        assert not result["memory-session_rss"].higher_is_better
+
+    def test_evaluate_memory_unsupported_model(self):
+        with pytest.raises(TypeError, match="Cannot evaluate memory"):
+            PyTorchEvaluator().evaluate(get_pytorch_model(), [get_memory_metric(MemorySubType.PEAK_RSS)])
+
+    def test_evaluate_cold_start(self):
+        # setup
+        metric = get_cold_start_metric(
+            ColdStartSubType.MODEL_LOAD,
+            ColdStartSubType.SESSION_INITIALIZATION,
+            ColdStartSubType.FIRST_INFERENCE,
+            ColdStartSubType.TOTAL,
+        )
+
+        # execute
+        with patch("olive.evaluator.cold_start.run_in_fresh_process", wraps=run_in_fresh_process) as mock_run:
+            result = OnnxEvaluator().evaluate(get_onnx_model(), [metric])
+
+        # assert
+        # each cold start is measured in a new process without the profiler, the split of the session creation is
+        # measured in another new process with the profiler
+        assert [call.args[-1] for call in mock_run.call_args_list] == [False, True, False, True]
+        values = result.get_all_sub_type_metric_value("cold_start")
+        assert all(value > 0 for value in values.values())
+        assert values["total"] >= values["first_inference"]
+        assert not result["cold_start-total"].higher_is_better
+
+    def test_evaluate_cold_start_without_profiler(self):
+        # setup
+        metric = get_cold_start_metric(ColdStartSubType.TOTAL, ColdStartSubType.FIRST_INFERENCE)
+
+        # execute
+        with patch("olive.evaluator.cold_start.run_in_fresh_process", wraps=run_in_fresh_process) as mock_run:
+            result = OnnxEvaluator().evaluate(get_onnx_model(), [metric])
+
+        # assert
+        # the profiler is only used to split the session creation
+        assert [call.args[-1] for call in mock_run.call_args_list] == [False, False]
+        values = result.get_all_sub_type_metric_value("cold_start")
+        assert values["total"] >= values["first_inference"] > 0
+
+    def test_evaluate_latency_without_adaptive_has_no_confidence_interval(self):
+        # execute
+        result = OnnxEvaluator().evaluate(get_onnx_model(), [get_latency_metric(LatencySubType.AVG)])
+
+        # assert
+        assert result["latency-avg"].confidence_interval is None
+
     CUSTOM_TEST_CASE: ClassVar[List] = [
         (PyTorchEvaluator(), get_pytorch_model, get_custom_metric, 0.382715310),
         (OnnxEvaluator(), get_onnx_model, get_custom_metric, 0.382715310),
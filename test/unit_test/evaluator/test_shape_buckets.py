@@ -0,0 +1,112 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import numpy as np
+import pytest
+import torch
+
+from olive.evaluator.metric import LatencySubType, Metric, MetricType, ThroughputSubType
+from olive.evaluator.olive_evaluator import OliveEvaluator
+from olive.evaluator.shape_buckets import (
+    ShapeBucket,
+    bucket_by_shape,
+    get_batch_size,
+    get_shape_key,
+    pool_shape_buckets,
+    weighted_percentile,
+)
+
+
+@pytest.mark.parametrize(
+    ("data", "expected_key"),
+    [
+        (torch.zeros(2, 3), "2x3"),
+        (np.array(1), "scalar"),
+        (
+            {"input_ids": torch.zeros(1, 8), "attention_mask": torch.zeros(1, 8), "use_cache": True},
+            "attention_mask=1x8,input_ids=1x8",
+        ),
+        ([torch.zeros(4), {"pixel_values": np.zeros((4, 3))}], "0=4,1.pixel_values=4x3"),
+    ],
+)
+def test_get_shape_key(data, expected_key):
+    assert get_shape_key(data) == expected_key
+
+
+@pytest.mark.parametrize(
+    ("data", "expected_batch_size"),
+    [
+        (torch.zeros(4, 3), 4),
+        (np.array(1), 1),
+        ({"use_cache": True, "input_ids": torch.zeros(2, 8)}, 2),
+        ([[np.zeros((3, 8))], torch.zeros(5)], 3),
+        ("text", 1),
+    ],
+)
+def test_get_batch_size(data, expected_batch_size):
+    assert get_batch_size(data) == expected_batch_size
+
+
+def test_bucket_by_shape():
+    # setup
+    batches = [(torch.zeros(1, 8), 0), (torch.ones(1, 16), 1), (torch.ones(1, 8), 2), (torch.ones(1, 32), 3)]
+
+    # execute
+    all_buckets = bucket_by_shape(batches, None)
+    sampled_buckets = bucket_by_shape(batches, 3)
+
+    # assert
+    assert {key: count for key, (_, count) in all_buckets.items()} == {"1x8": 2, "1x16": 1, "1x32": 1}
+    # the first batch of each shape is kept
+    assert all_buckets["1x8"][0][1] == 0
+    assert {key: count for key, (_, count) in sampled_buckets.items()} == {"1x8": 2, "1x16": 1}
+
+
+def test_pooled_shape_buckets_are_weighted_by_batches():
+    # setup
+    buckets = [ShapeBucket("1x8", 3, [0.01] * 10), ShapeBucket("1x128", 1, [0.05] * 20)]
+
+    # execute
+    latencies, weights = pool_shape_buckets(buckets)
+
+    # assert
+    assert np.average(latencies, weights=weights) == pytest.approx(0.75 * 0.01 + 0.25 * 0.05)
+    assert weighted_percentile(latencies, weights, 50) == 0.01
+    assert weighted_percentile(latencies, weights, 90) == 0.05
+
+
+def test_bucketed_throughput_counts_partial_batches():
+    # setup
+    metric = Metric(name="throughput", type=MetricType.THROUGHPUT, sub_types=[{"name": ThroughputSubType.AVG}])
+    # 3 full batches of 32 samples and a last batch of 4 samples, 1 ms per sample
+    buckets = [ShapeBucket("32x8", 3, [0.032] * 10, 32), ShapeBucket("4x8", 1, [0.004] * 10, 4)]
+
+    # execute
+    result = OliveEvaluator.compute_bucketed_throughput(metric, buckets)
+
+    # assert
+    assert result[ThroughputSubType.AVG].value == pytest.approx(1000)
+    assert result[ThroughputSubType.AVG].breakdown == {"32x8": pytest.approx(1000), "4x8": pytest.approx(1000)}
+    assert result[ThroughputSubType.AVG].confidence_interval is None
+
+
+@pytest.mark.parametrize("num_buckets", [1, 2])
+def test_bucketed_latency_confidence_interval(num_buckets):
+    # setup
+    metric = Metric(
+        name="latency",
+        type=MetricType.LATENCY,
+        sub_types=[{"name": LatencySubType.AVG, "metric_config": {"adaptive": True}}],
+    )
+    buckets = [ShapeBucket("1x8", 1, [0.01, 0.011, 0.012] * 10, 1), ShapeBucket("1x16", 1, [0.02] * 10, 1)]
+
+    # execute
+    result = OliveEvaluator.compute_bucketed_latency(metric, buckets[:num_buckets])
+
+    # assert
+    confidence_interval = result[LatencySubType.AVG].confidence_interval
+    if num_buckets == 1:
+        assert confidence_interval[0] <= result[LatencySubType.AVG].value <= confidence_interval[1]
+    else:
+        assert confidence_interval is None
@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+# --------------------------------------------------------------------------
+import optuna
+import pytest
+
+from olive.evaluator.metric_result import MetricResult
+from olive.strategy.search_algorithm.tpe_sampler import TPESearchAlgorithm
+from olive.strategy.search_parameter import Categorical
+
+# pylint: disable=protected-access
+
+
+def create_tpe_searcher(**config):
+    searcher = TPESearchAlgorithm(
+        {"pass": {"param": Categorical([1, 2])}},
+        objectives=["accuracy-accuracy_score"],
+        higher_is_betters=[True],
+        config={"num_samples": 10, **config},
+    )
+    searcher.initialize()
+    return searcher
+
+
+def get_result(value):
+    return MetricResult.parse_obj(
+        {"accuracy-accuracy_score": {"value": value, "priority": 1, "higher_is_better": True}}
+    )
+
+
+class TestOptunaSearchAlgorithm:
+    def test_report_duplicate_search_points_in_batch(self):
+        searcher = create_tpe_searcher()
+
+        # there are only two points in the search space, so the batch holds duplicates
+        search_points = searcher.suggest_batch(4)
+        assert len(search_points) == 4
+        for idx, search_point in enumerate(search_points):
+            searcher.report(search_point, get_result(idx), should_prune=idx == 0)
+
+        # every trial is told once
+        states = [trial.state for trial in searcher._study.trials]
+        assert states == [optuna.trial.TrialState.PRUNED] + [optuna.trial.TrialState.COMPLETE] * 3
+        assert not searcher._pending_trials
+
+    @pytest.mark.parametrize(
+        ("constant_liar", "num_points", "expected"),
+        [(None, 1, False), (None, 2, True), (False, 2, False), (True, 1, True)],
+    )
+    def test_constant_liar(self, constant_liar, num_points, expected):
+        searcher = create_tpe_searcher(constant_liar=constant_liar)
+
+        searcher.suggest_batch(num_points)
+
+        assert searcher._study.sampler._constant_liar == expected
@@ -3,17 +3,20 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
 import json
+import os
 import shutil
+import threading
+import time
 from pathlib import Path
 from unittest.mock import ANY, mock_open, patch
 
 import pytest
 
 from olive.cache import CacheConfig, OliveCache, SharedCache
-from olive.common.constants import DEFAULT_WORKFLOW_ID
+from olive.common.constants import DATASET_CACHE_DIR_ENV, DEFAULT_WORKFLOW_ID
 from olive.resource_path import AzureMLModel
 
-# pylint: disable=W0201
+# pylint: disable=W0201, protected-access
 
 
 class TestCache:
@@ -261,6 +264,328 @@ class TestCache:
         assert loaded_run == run_json
         mock_shared_cache_load_run.assert_called_once_with(model_id, cache.get_run_json_path(model_id))
 
+    def test_cache_index(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        model_json = {"config": {"model_path": "path/to/model"}}
+        evaluation_json = {"accuracy": 0.95}
+
+        # execute
+        cache.cache_run("pass_1", {}, "input_model", "model_1", None)
+        cache.cache_run("pass_2", {}, "model_1", "model_2", None)
+        cache.cache_run("pass_1", {"param": "value"}, "input_model", "model_3", None)
+        cache.cache_model("model_1", model_json)
+        cache.cache_evaluation("model_1", evaluation_json)
+        # overwrite the json files so that the lookups must be answered by the index
+        for json_path in [*cache.dirs.runs.glob("*/*.json"), *cache.dirs.evaluations.glob("*.json")]:
+            json_path.write_text("{}")
+
+        # assert
+        assert cache.load_run_from_model_id("model_2")["input_model_id"] == "model_1"
+        assert cache.load_model("model_1") == model_json
+        assert cache.load_evaluation("model_1") == evaluation_json
+        assert [run["output_model_id"] for run in cache.find_runs(pass_name="pass_1")] == ["model_1", "model_3"]
+        assert [run["output_model_id"] for run in cache.find_runs(input_model_id="model_1")] == ["model_2"]
+
+    def test_cache_index_removes_stale_entries(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        (cache.get_model_cache_path("model_1") / "model.onnx").write_text("model")
+        cache.cache_model("model_1", {"config": {}})
+        cache.cache_run("pass_1", {}, "input_model", "model_1", None)
+        cache.cache_evaluation("model_1", {"accuracy": 0.95})
+
+        # execute
+        # the run directory and the evaluation are deleted by hand
+        shutil.rmtree(cache.get_run_path("model_1"))
+        cache.get_evaluation_json_path("model_1").unlink()
+
+        # assert
+        assert cache.load_run_from_model_id("model_1") == {}
+        assert cache.load_model("model_1") is None
+        assert cache.load_evaluation("model_1") is None
+        assert cache.index.get_run("model_1") is None
+        assert cache.index.get_model("model_1") is None
+        assert cache.index.get_evaluation("model_1") is None
+
+    def test_cache_index_clean_evaluation_cache(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        cache.cache_evaluation("model", {"accuracy": 0.95})
+
+        # execute
+        cache = CacheConfig(cache_dir=tmp_path, clean_evaluation_cache=True).create_cache()
+
+        # assert
+        assert cache.load_evaluation("model") is None
+
+    def test_collect_garbage(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        # input_model -> model_1 -> model_2 (output), input_model -> model_3 -> model_4
+        for input_model_id, model_id in [
+            ("input_model", "model_1"),
+            ("model_1", "model_2"),
+            ("input_model", "model_3"),
+            ("model_3", "model_4"),
+        ]:
+            (cache.get_model_cache_path(model_id) / "model.onnx").write_bytes(model_id.encode() * 1000)
+            cache.cache_model(model_id, {"config": {}})
+            cache.cache_run("pass", {"id": model_id}, input_model_id, model_id, None)
+            cache.cache_evaluation(f"{model_id}-cpu-cpu", {"accuracy": 0.95})
+        cache.pin_model_lineage(["model_2"])
+        # model_3 is the least recently used
+        cache.index.touch_run("model_3", accessed_at=1)
+        cache.index.touch_run("model_1", accessed_at=2)
+        num_runs, size = cache.get_usage()
+
+        # execute
+        dry_run_evicted, _ = cache.collect_garbage(max_cache_size=size - 1, dry_run=True)
+        evicted, reclaimed = cache.collect_garbage(max_cache_size=size - 1)
+
+        # assert
+        # the lineage of the output model is protected, the run derived from the evicted model is evicted with it
+        assert dry_run_evicted == evicted == ["model_3", "model_4"]
+        assert reclaimed > 14000
+        # the blobs of the evicted runs are deleted
+        assert len([path for path in cache.dirs.blobs.rglob("*") if path.is_file()]) == 2
+        assert cache.get_usage() == (num_runs - 2, size - reclaimed)
+        assert not (cache.dirs.runs / "model_3").exists()
+        assert cache.load_model("model_4") is None
+        assert cache.load_evaluation("model_3-cpu-cpu") is None
+        assert cache.load_model("model_1") is not None
+        assert cache.collect_garbage(max_cache_size=0) == ([], 0)
+
+    def test_dedup_model_files(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        for model_id in ["model_1", "model_2"]:
+            model_dir = cache.get_model_cache_path(model_id)
+            (model_dir / "tokenizer.json").write_text("tokenizer")
+            (model_dir / "model.onnx").write_text(model_id)
+
+        # execute
+        cache.cache_model("model_1", {"config": {}})
+        cache.cache_model("model_2", {"config": {}})
+
+        # assert
+        tokenizer_1 = cache.get_model_cache_path("model_1") / "tokenizer.json"
+        tokenizer_2 = cache.get_model_cache_path("model_2") / "tokenizer.json"
+        assert tokenizer_1.samefile(tokenizer_2)
+        assert tokenizer_2.read_text() == "tokenizer"
+        assert not (cache.get_model_cache_path("model_1") / "model.onnx").samefile(
+            cache.get_model_cache_path("model_2") / "model.onnx"
+        )
+        # tokenizer and two model files
+        blobs = [path for path in cache.dirs.blobs.rglob("*") if path.is_file()]
+        assert len(blobs) == 3
+
+        # the shared blob is only deleted with the last run that links to it
+        cache.collect_garbage(max_cache_size=0)
+        assert not [path for path in cache.dirs.blobs.rglob("*") if path.is_file()]
+
+    def test_save_model_copies_dedup_files(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path / "cache").create_cache()
+        model_dir = cache.get_model_cache_path("model_1")
+        (model_dir / "model.onnx").write_text("model")
+        (model_dir / "tokenizer.json").write_text("tokenizer")
+        model_json = {
+            "type": "onnxmodel",
+            "config": {
+                "model_path": str(model_dir),
+                "onnx_file_name": "model.onnx",
+                "model_attributes": {"additional_files": [str(model_dir / "tokenizer.json")]},
+            },
+        }
+        cache.cache_model("model_1", model_json)
+
+        # execute
+        output_dir = tmp_path / "output"
+        cache.save_model("model_1", output_dir, True)
+
+        # assert
+        # the output files do not share the blobs of the cache, so editing them cannot corrupt the cache
+        for file_name in ["model.onnx", "tokenizer.json"]:
+            output_file = output_dir / "model" / file_name
+            assert output_file.read_text() == (model_dir / file_name).read_text()
+            assert not output_file.samefile(model_dir / file_name)
+            output_file.write_text("edited")
+        assert (model_dir / "model.onnx").read_text() == "model"
+        assert (model_dir / "tokenizer.json").read_text() == "tokenizer"
+
+    @pytest.mark.parametrize("cache_datasets", [True, False])
+    def test_set_cache_env(self, cache_datasets, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=str(tmp_path), cache_datasets=cache_datasets).create_cache()
+
+        # execute
+        with patch.dict("os.environ", {DATASET_CACHE_DIR_ENV: "stale"}):
+            cache.set_cache_env()
+            dataset_cache_dir = os.environ.get(DATASET_CACHE_DIR_ENV)
+
+        # assert
+        assert dataset_cache_dir == (str(cache.dirs.datasets) if cache_datasets else None)
+
+    def test_collect_garbage_evicts_dataset_stores(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        (cache.get_model_cache_path("model_1") / "model.onnx").write_bytes(b"0" * 1000)
+        cache.cache_model("model_1", {"config": {}})
+        cache.index.touch_run("model_1", accessed_at=2)
+        # dataset_1 was used before model_1 and dataset_2 after it
+        for name, used_at in [("dataset_1", 1), ("dataset_2", 3)]:
+            store_dir = cache.dirs.datasets / name
+            store_dir.mkdir()
+            (store_dir / "data.bin").write_bytes(b"0" * 1000)
+            (store_dir / "index.json").write_text(json.dumps({"batches": []}))
+            os.utime(store_dir / "index.json", (used_at, used_at))
+        num_runs, size = cache.get_usage()
+
+        # execute
+        evicted, reclaimed = cache.collect_garbage(max_cache_size=size - 1)
+
+        # assert
+        # the dataset stores count towards the budget and the least recently used one is evicted first
+        assert size > 3000
+        assert evicted == []
+        assert reclaimed > 1000
+        assert not (cache.dirs.datasets / "dataset_1").exists()
+        assert cache.get_usage() == (num_runs, size - reclaimed)
+        evicted, _ = cache.collect_garbage(max_cache_size=0)
+        assert evicted == ["model_1"]
+        assert not list(cache.dirs.datasets.iterdir())
+
+    def test_stale_dataset_stores_are_removed(self, tmp_path):
+        # setup
+        datasets_dir = CacheConfig(cache_dir=tmp_path).create_cache().dirs.datasets
+        stale_dir = datasets_dir / ".dataset_1.1.1.tmp"
+        writing_dir = datasets_dir / ".dataset_2.1.1.tmp"
+        tombstone = datasets_dir / ".dataset_3.1.1.deleting"
+        for store_dir in [stale_dir, writing_dir, tombstone]:
+            store_dir.mkdir()
+            (store_dir / "data.bin").write_bytes(b"0")
+        for path in [stale_dir, stale_dir / "data.bin"]:
+            os.utime(path, (1, 1))
+
+        # execute
+        CacheConfig(cache_dir=tmp_path).create_cache()
+
+        # assert
+        # stores left behind by dead processes are removed, the store being written by another process is kept
+        assert not stale_dir.exists()
+        assert not tombstone.exists()
+        assert writing_dir.exists()
+
+    def test_collect_garbage_by_age(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        for model_id in ["model_1", "model_2"]:
+            cache.cache_model(model_id, {"config": {}})
+        cache.index.touch_run("model_1", accessed_at=1)
+
+        # execute
+        evicted, _ = cache.collect_garbage(max_cache_age_days=1)
+
+        # assert
+        assert evicted == ["model_1"]
+
+    def test_background_garbage_collection(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        cache.cache_model("model_1", {"config": {}})
+
+        # execute
+        # runs of previous sessions are evicted in the background to fit the budget
+        cache = CacheConfig(cache_dir=tmp_path, max_cache_size=0).create_cache()
+        cache.cache_model("model_2", {"config": {}})
+        for _ in range(100):
+            if cache.get_usage()[0] == 1:
+                break
+            time.sleep(0.1)
+
+        # assert
+        # runs of the current session are kept
+        assert cache.load_model("model_1") is None
+        assert cache.load_model("model_2") is not None
+
+    def test_stop_garbage_collection(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path, max_cache_size=0).create_cache()
+        gc_thread = cache._gc_thread
+
+        # execute
+        cache.stop_garbage_collection()
+
+        # assert
+        assert not gc_thread.is_alive()
+        # the garbage collection is started again by the next cached model
+        cache.cache_model("model_1", {"config": {}})
+        assert cache._gc_thread is not None
+        cache.stop_garbage_collection()
+
+    def test_interrupted_eviction(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        (cache.get_model_cache_path("model_1") / "model.onnx").write_text("model")
+        cache.cache_model("model_1", {"config": {}})
+        cache.cache_run("pass_1", {}, "input_model", "model_1", None)
+
+        def interrupted_rmtree(path, ignore_errors=False):
+            # the process exits after deleting some of the files of the run
+            next(Path(path).rglob("model.onnx")).unlink()
+            raise SystemExit
+
+        # execute
+        with patch("olive.cache.shutil.rmtree", side_effect=interrupted_rmtree), pytest.raises(SystemExit):
+            cache.collect_garbage(max_cache_size=0)
+
+        # assert
+        # the partially deleted run is never loaded, even after its index entry is gone
+        cache.index.remove_run("model_1")
+        assert cache.load_run_from_model_id("model_1") == {}
+        assert cache.load_model("model_1") is None
+        # the deletion is finished when the cache is next opened
+        assert list(cache.dirs.runs.glob(".*.deleting"))
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        assert not list(cache.dirs.runs.iterdir())
+
+    def test_lock_run(self, tmp_path):
+        # setup
+        cache = CacheConfig(cache_dir=tmp_path).create_cache()
+        model_id = "model"
+        # partial output of a process that died while running the pass
+        (cache.get_model_cache_path(model_id) / "model.onnx").write_text("partial")
+        claimed = threading.Event()
+        release = threading.Event()
+
+        def run_pass():
+            with cache.lock_run(model_id) as locked:
+                assert locked
+                # the partial output was removed when the lock was acquired
+                assert not cache.get_run_path(model_id).joinpath("models").exists()
+                claimed.set()
+                release.wait()
+                cache.cache_model(model_id, {"config": {}})
+                cache.cache_run("pass", {}, "input_model", model_id, None)
+
+        # execute
+        thread = threading.Thread(target=run_pass)
+        thread.start()
+        claimed.wait()
+        with cache.lock_run(model_id, blocking=False) as locked:
+            assert not locked
+        release.set()
+        # wait for the process that claimed the run and reuse its output
+        with cache.lock_run(model_id) as locked:
+            assert locked
+            run_json = cache.load_run_from_model_id(model_id)
+        thread.join()
+
+        # assert
+        assert run_json["output_model_id"] == model_id
+        assert cache.load_model(model_id) == {"config": {}}
+
     def test_load_run_from_model_id_not_found(self, tmp_path):
         # setup
         cache_config = CacheConfig(cache_dir=tmp_path)
@@ -330,6 +655,7 @@ class TestCache:
 
         # cache model to cache_dir
         model_cache_file_path = cache.get_model_json_path(model_id)
+        model_cache_file_path.parent.mkdir(parents=True, exist_ok=True)
         model_json = {"type": "onnxmodel", "config": {"model_path": model_p}}
         with open(model_cache_file_path, "w") as f:
             json.dump(model_json, f)
@@ -502,3 +828,62 @@ class TestSharedCache:
 
         # assert
         mock_upload_blob.assert_called_once_with(f"{model_blob}/file.txt", ANY)
+
+
+def test_shared_cache_file_system_backend(tmp_path):
+    # setup
+    shared_cache_dir = tmp_path / "shared_cache"
+    model_id = "model"
+    model_path = tmp_path / "output_model"
+    model_path.mkdir()
+    (model_path / "model.onnx").write_text("dummy model")
+    model_json = {"type": "ONNXModel", "config": {"model_path": str(model_path)}}
+    cache_config = CacheConfig(cache_dir=[str(tmp_path / "cache"), shared_cache_dir.as_uri()])
+    assert cache_config.enable_shared_cache
+    assert cache_config.shared_cache_dir == shared_cache_dir.as_uri()
+    shared_cache = cache_config.create_cache().shared_cache
+
+    # execute
+    shared_cache.cache_model(model_id, model_json)
+    loaded_model_json = shared_cache.load_model(model_id, tmp_path / "loaded" / "model.json")
+
+    # assert
+    assert (shared_cache_dir / model_id / "model.json").exists()
+    assert loaded_model_json["config"]["shared_cache"]
+    assert shared_cache.exist_in_shared_cache(f"{model_id}/model/model")
+    assert not shared_cache.exist_in_shared_cache("other_model")
+
+
+def test_prefetch_shared_cache(tmp_path):
+    # setup
+    shared_cache_dir = (tmp_path / "shared_cache").as_uri()
+    model_id = "model"
+    model_path = tmp_path / "output_model" / "model.onnx"
+    model_path.parent.mkdir()
+    model_path.write_text("dummy model")
+    model_json = {"type": "ONNXModel", "config": {"model_path": str(model_path)}}
+    cache = CacheConfig(cache_dir=[str(tmp_path / "cache_1"), shared_cache_dir]).create_cache()
+    cache.cache_model(model_id, model_json)
+    cache.cache_run("Pass", {}, "input_model", model_id, None)
+    prefetch_cache = CacheConfig(cache_dir=[str(tmp_path / "cache_2"), shared_cache_dir]).create_cache()
+
+    # execute
+    with patch.object(
+        prefetch_cache.shared_cache,
+        "exist_in_shared_cache_batch",
+        wraps=prefetch_cache.shared_cache.exist_in_shared_cache_batch,
+    ) as mock_exist_batch:
+        prefetch_cache.prefetch_shared_cache([model_id, "missing_model"])
+    run_json = prefetch_cache.load_run_from_model_id(model_id)
+    loaded_model_json = prefetch_cache.load_model(model_id)
+
+    # assert
+    mock_exist_batch.assert_called_once()
+    assert list(prefetch_cache._prefetches) == [model_id]
+    assert run_json["output_model_id"] == model_id
+    assert prefetch_cache.get_run_json_path(model_id).exists()
+    # the prefetched model points to the downloaded files
+    assert "shared_cache" not in loaded_model_json["config"]
+    loaded_model_path = Path(loaded_model_json["config"]["model_path"])
+    assert loaded_model_path == prefetch_cache.get_model_cache_path(model_id) / "model" / "model.onnx"
+    assert loaded_model_path.read_text() == "dummy model"
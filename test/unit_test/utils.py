@@ -235,6 +235,28 @@ def get_throughput_metric(*lat_subtype, user_config=None):
     )
 
 
+def get_memory_metric(*memory_subtype, user_config=None):
+    sub_types = [{"name": sub} for sub in memory_subtype]
+    return Metric(
+        name="memory",
+        type=MetricType.MEMORY,
+        sub_types=sub_types,
+        user_config=user_config,
+        data_config=_get_dummy_data_config("memory_metric_data_config", [[1, 1]]),
+    )
+
+
+def get_cold_start_metric(*cold_start_subtype, user_config=None):
+    sub_types = [{"name": sub, "metric_config": {"repeat_test_num": 2}} for sub in cold_start_subtype]
+    return Metric(
+        name="cold_start",
+        type=MetricType.COLD_START,
+        sub_types=sub_types,
+        user_config=user_config,
+        data_config=_get_dummy_data_config("cold_start_metric_data_config", [[1, 1]]),
+    )
+
+
 def get_onnxconversion_pass(ignore_pass_config=True, target_opset=13):
     from olive.passes.onnx.conversion import OnnxConversion
 